@@ -130,6 +130,19 @@ class BatchFileProcessor(Dialogs.GenForm):
             # Add the element to the sizer
             r2Sizer.Add(self.overwrite, 0, wx.ALIGN_RIGHT)
 
+            # Add a horizontal spacer to the row sizer        
+            r2Sizer.Add((10, 0))
+
+            # Create a label for the number of simultaneous extractions
+            processLabel = wx.StaticText(self.panel, -1, _('Simultaneous extractions:'))
+            # Add the element to the sizer
+            r2Sizer.Add(processLabel, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+            # Create a control for the number of simultaneous extractions, which defaults to the number of processors
+            self.processCount = wx.SpinCtrl(self.panel, -1, size=(60, -1), min=1, max=32,
+                                            initial=WaveformProgress.GetDefaultProcessCount())
+            # Add the element to the sizer
+            r2Sizer.Add(self.processCount, 0, wx.ALIGN_RIGHT)
+
         # Add the row sizer to the main vertical sizer
         mainSizer.Add(r2Sizer, 0, wx.EXPAND)
         # Add a vertical spacer to the main sizer        
@@ -206,41 +219,34 @@ class BatchFileProcessor(Dialogs.GenForm):
             # to do waveform extraction.  (This logic could just as easily be part of the calling
             # routine -- we'd just need to pass teh file list and the value of the "overwrite" checkbox.)
             if self.mode == "waveform":
+                # Initialize the list of (media file, wave file) pairs needing extraction
+                extractionList = []
                 # Iterate through the file list
                 for loop in range(0, self.fileList.GetCount()):
                     # Get the current filename
                     filename = self.fileList.GetString(loop)
-                    # Remember the original File Name that is passed in
-                    originalFilename = filename
                     # Split the path off of the file name
-                    (path, filename) = os.path.split(filename)
+                    (path, filenameroot) = os.path.split(filename)
                     # Split the extension off the file name
-                    (filenameroot, extension) = os.path.splitext(filename)
-                    # Build the progress box's label
-                    if 'unicode' in wx.PlatformInfo:
-                        # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
-                        prompt = unicode(_("Extracting %s\nfrom %s"), 'utf8')
-                    else:
-                        prompt = _("Extracting %s\nfrom %s")
+                    (filenameroot, extension) = os.path.splitext(filenameroot)
                     # Build the filename for the extracted audio out of the filename parts
-                    self.waveFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
-                    # If there is no extracted audio file, OR if we're over-writing extracted audio ...
-                    if not(os.path.exists(self.waveFilename)) or self.overwrite.GetValue():
-                        # Build the correct filename for the Waveform Graphic
-                        self.waveformFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.png')
-                        # Create the Waveform Progress Dialog
-                        self.progressDialog = WaveformProgress.WaveformProgress(self, prompt % (self.waveFilename, originalFilename))
-                        # Tell the Waveform Progress Dialog to handle the audio extraction modally.
-                        self.progressDialog.Extract(originalFilename, self.waveFilename)
-                        # Get the Error Log that may have been created
-                        errorLog = self.progressDialog.GetErrorMessages()
-                        # Okay, we're done with the Progress Dialog here!
-                        self.progressDialog.Destroy()
-                        # If the user cancelled the audio extraction ...
-                        if (len(errorLog) == 1) and (errorLog[0] == 'Cancelled'):
-                            break
-                    else:
-                        continue
+                    waveFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
+                    # If we're over-writing extracted audio, OR if the extracted audio is missing or out of date ...
+                    if self.overwrite.GetValue() or not WaveformProgress.WaveFileIsCurrent(filename, waveFilename):
+                        # ... add the file to the list to be processed
+                        extractionList.append((filename, waveFilename))
+                # If there are files to process ...
+                if len(extractionList) > 0:
+                    # If the Waveforms Directory does not exist, create it.
+                    if not os.path.exists(TransanaGlobal.configData.visualizationPath):
+                        # (os.makedirs is a recursive call to create ALL needed folders!)
+                        os.makedirs(TransanaGlobal.configData.visualizationPath)
+                    # Create the Batch Waveform Progress Dialog, which runs several extractions at once
+                    self.progressDialog = WaveformProgress.BatchWaveformProgress(self, extractionList, self.processCount.GetValue())
+                    # Tell the Batch Waveform Progress Dialog to handle the audio extraction modally.
+                    self.progressDialog.Extract()
+                    # Okay, we're done with the Progress Dialog here!
+                    self.progressDialog.Destroy()
             
             # We don't DO anything here for the Batch Episode Creation routine.  We just
             # return the File List to the calling routine for processing!!  The calling routine
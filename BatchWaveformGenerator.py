@@ -60,6 +60,11 @@ class BatchWaveformGenerator(Dialogs.GenForm):
         self.fileList = wx.ListBox(self.panel, -1, style=wx.LB_MULTIPLE)
         self.overwrite = wx.CheckBox(self.panel, -1, _('Overwrite existing wave files?'))
         remfile = wx.Button(self.panel, wx.ID_FILE3, _("Remove Selected File(s)"), wx.DefaultPosition)
+        # Create a label for the number of simultaneous extractions
+        processLabel = wx.StaticText(self.panel, -1, _('Simultaneous extractions:'))
+        # Create a control for the number of simultaneous extractions, which defaults to the number of processors
+        self.processCount = wx.SpinCtrl(self.panel, -1, size=(60, -1), min=1, max=32,
+                                        initial=WaveformProgress.GetDefaultProcessCount())
 
         # Bind the events that we'll need.
         wx.EVT_BUTTON(self, wx.ID_FILE1, self.OnBrowse)
@@ -125,6 +130,22 @@ class BatchWaveformGenerator(Dialogs.GenForm):
         lay.height.AsIs()
         remfile.SetConstraints(lay)
 
+        # place the number of simultaneous extractions to the lower-right of the ListBox
+        lay = wx.LayoutConstraints()
+        lay.top.Below(self.fileList, 17)
+        lay.right.SameAs(self.panel, wx.Right, 10)
+        lay.width.AsIs()
+        lay.height.AsIs()
+        self.processCount.SetConstraints(lay)
+
+        # and its label to the left of it
+        lay = wx.LayoutConstraints()
+        lay.centreY.SameAs(self.processCount, wx.CentreY)
+        lay.right.LeftOf(self.processCount, 4)
+        lay.width.AsIs()
+        lay.height.AsIs()
+        processLabel.SetConstraints(lay)
+
         self.Layout()
         self.SetAutoLayout(True)
         self.CenterOnScreen()
@@ -136,42 +157,30 @@ class BatchWaveformGenerator(Dialogs.GenForm):
         data = self.fileList.GetStrings()
 
         if (val == wx.ID_OK) and (not self.fileList.IsEmpty()):
+            # Initialize the list of (media file, wave file) pairs needing extraction
+            extractionList = []
             for loop in range(0, self.fileList.GetCount()):
-                #WaveformProgress.Extract(self.fileList.GetString(loop), 'test.wav')
                 filename = self.fileList.GetString(loop)
-                # Build the progress box's label
-                if 'unicode' in wx.PlatformInfo:
-                    # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
-                    prompt = unicode(_("Extracting %s\nfrom %s"), 'utf8')
-                else:
-                    prompt = _("Extracting %s\nfrom %s")
-
-                # Remember the original File Name that is passed in
-                originalFilename = filename
-
-                filename = filename
-                (path, filename) = os.path.split(filename)
-
+                (path, filenameroot) = os.path.split(filename)
                 # prepare the filenames for extraction
-                (filenameroot, extension) = os.path.splitext(filename)
-
-                self.waveFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
-                #print os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
-
-                if not(os.path.exists(self.waveFilename)) or self.overwrite.GetValue():
-                    # Build the correct filename for the Waveform Graphic
-                    self.waveformFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.png')
-                    # Build the file name for the extracted audio
-                    self.waveFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
-                    # Create the Waveform Progress Dialog
-                    self.progressDialog = WaveformProgress.WaveformProgress(self, self.waveFilename, prompt % (self.waveFilename, originalFilename))
-                    # Tell the Waveform Progress Dialog to handle the audio extraction modally.
-                    self.progressDialog.Extract(originalFilename, self.waveFilename)
-                    # Okay, we're done with the Progress Dialog here!
-                    self.progressDialog.Destroy()
-                    # We just have to assume that audio extraction worked.  Signal success!
-                else:
-                    continue
+                (filenameroot, extension) = os.path.splitext(filenameroot)
+                # Build the file name for the extracted audio
+                waveFilename = os.path.join(TransanaGlobal.configData.visualizationPath, filenameroot + '.wav')
+                # Skip files whose extracted audio is up to date, unless we're over-writing
+                if self.overwrite.GetValue() or not WaveformProgress.WaveFileIsCurrent(filename, waveFilename):
+                    extractionList.append((filename, waveFilename))
+            # If there are files to process ...
+            if len(extractionList) > 0:
+                # If the Waveforms Directory does not exist, create it.
+                if not os.path.exists(TransanaGlobal.configData.visualizationPath):
+                    # (os.makedirs is a recursive call to create ALL needed folders!)
+                    os.makedirs(TransanaGlobal.configData.visualizationPath)
+                # Create the Batch Waveform Progress Dialog, which runs several extractions at once
+                self.progressDialog = WaveformProgress.BatchWaveformProgress(self, extractionList, self.processCount.GetValue())
+                # Tell the Batch Waveform Progress Dialog to handle the audio extraction modally.
+                self.progressDialog.Extract()
+                # Okay, we're done with the Progress Dialog here!
+                self.progressDialog.Destroy()
                 
             return data
         else:
@@ -45,8 +45,14 @@ import TransanaGlobal
 import TransanaExceptions
 # import Transana's Images
 import TransanaImages
+# import Transana's Data Object Cache
+import DataObjectCache
 # import Transana's Database Interface
 import DBInterface
+# import Transana's Keyword Index
+import KeywordIndex
+# import Transana's Search Cache
+import SearchCache
 # import Transana Dialogs
 import Dialogs
 # import Transana's Series object
@@ -742,6 +748,14 @@ class ChatWindow(wx.Frame):
             else:
                 # The remaining messages should not be processed if this user was the message sender
                 if self.userName != messageSender:
+                    # Another user has changed the database, so our cached Data Objects may be out of date
+                    DataObjectCache.Clear()
+                    # ... as may our Collection Path Index
+                    DBInterface.ResetCollectionPathIndex()
+                    # ... and our Keyword Index
+                    KeywordIndex.Clear()
+                    # ... and our cached Search results
+                    SearchCache.Clear()
                     # We can't have the tree selection changing because of the activity of other users.  That creates all kinds of
                     # problems if we're in the middle of editing something.  So let's note the current selection
                     currentSelection = self.ControlObject.DataWindow.DBTab.tree.GetSelections()
@@ -342,9 +342,9 @@ class Clip(DataObject.DataObject):
                       self.clip_start, self.clip_stop, self.offset, self.audio, comment, \
                       self.sort_order)
         if (self._db_start_save() == 0):
-            if DBInterface.record_match_count("Clips2", \
+            if DBInterface.record_exists("Clips2", \
                                 ("ClipID", "CollectNum"), \
-                                (id, self.collection_num) ) > 0:
+                                (id, self.collection_num) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Clip named "%s" already exists in this Collection.\nPlease enter a different Clip ID.'), 'utf8') % self.id
@@ -361,9 +361,9 @@ class Clip(DataObject.DataObject):
                 (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
         else:
-            if DBInterface.record_match_count("Clips2", \
+            if DBInterface.record_exists("Clips2", \
                             ("ClipID", "CollectNum", "!ClipNum"), \
-                            (id, self.collection_num, self.number)) > 0:
+                            (id, self.collection_num, self.number)):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Clip named "%s" already exists in this Collection.\nPlease enter a different Clip ID.'), 'utf8') % self.id
@@ -437,11 +437,7 @@ class Clip(DataObject.DataObject):
         else:
             # ... signal that the record number was not changed
             numberChanged = False
-            # If we are dealing with an existing Clip, delete all the Keywords
-            # in anticipation of putting them all back in after we deal with the
-            # Clip Transcript
-            DBInterface.delete_all_keywords_for_a_group(0, self.number, 0)
-            
+
         # Now let's deal with the Clip's Transcripts
 
         # If we're NOT skipping the Transcripts ...
@@ -485,20 +481,25 @@ class Clip(DataObject.DataObject):
             data = (0, self.number, tmpFilename, vid['length'], vid['offset'], vid['audio'])
             # Execute the query
             c.execute(query, data)
+            # Record the Additional Video's Media Path
+            DBInterface.UpdateMediaPath(c, 'AdditionalVids2', c.lastrowid, tmpFilename)
+        # Record the Clip's Media Path
+        DBInterface.UpdateMediaPath(c, 'Clips2', self.number, tempMediaFilename)
 
         # Initialize a blank error prompt
         prompt = ''
-        # Add the Clip keywords back.  Iterate through the Keyword List
-        for kws in self._kwlist:
-            # Try to add the Clip Keyword record.  If it is NOT added, the keyword has been changed by another user!
-            if not DBInterface.insert_clip_keyword(0, self.number, 0, kws.keywordGroup, kws.keyword, kws.example):
-                # if the prompt isn't blank ...
-                if prompt != '':
-                    # ... add a couple of line breaks to it
-                    prompt += u'\n\n'
-                # Add the current keyword to the error prompt
-                # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
-                prompt += unicode(_('Keyword "%s : %s" cannot be added to Clip "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kws.keywordGroup, kws.keyword, self.id)
+        # Bring the Clip keywords in the database up to date with the Keyword List.  Keywords that can't be added
+        # have been changed by another user!
+        missingKeywords = DBInterface.set_keywords_for_a_group(0, self.number, 0, [(kws.keywordGroup, kws.keyword, kws.example) for kws in self._kwlist])
+        # For each keyword that couldn't be added ...
+        for (kwg, kw) in missingKeywords:
+            # if the prompt isn't blank ...
+            if prompt != '':
+                # ... add a couple of line breaks to it
+                prompt += u'\n\n'
+            # Add the current keyword to the error prompt
+            # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
+            prompt += unicode(_('Keyword "%s : %s" cannot be added to Clip "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kwg, kw, self.id)
 
         # If there is an error prompt ...
         if prompt != '':
@@ -218,9 +218,9 @@ class Collection(DataObject.DataObject):
         values = (id, self.parent, comment, owner, keyword_group)
         if (self._db_start_save() == 0):        # Add new collection
             # Duplicate Collection IDs are not allowed within a collection
-            if DBInterface.record_match_count("Collections2", \
+            if DBInterface.record_exists("Collections2", \
                             ("CollectID", "ParentCollectNum"),
-                            (id, self.parent) ) > 0:
+                            (id, self.parent) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Collection named "%s" already exists.\nPlease enter a different Collection ID.'), 'utf8')
@@ -238,9 +238,9 @@ class Collection(DataObject.DataObject):
         else:               # Update existing collection
             
             # check for dupes
-            if DBInterface.record_match_count("Collections2", \
+            if DBInterface.record_exists("Collections2", \
                             ("CollectID", "ParentCollectNum", "!CollectNum"),
-                            (id, self.parent, self.number) ) > 0:
+                            (id, self.parent, self.number) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Collection named "%s" already exists.\nPlease enter a different Collection ID.'), 'utf8')
@@ -264,6 +264,8 @@ class Collection(DataObject.DataObject):
         # if new collection, Number was auto assigned, so resync.
         if (self.number == 0):
             self.db_load_by_name(self.id, self.parent)
+        # Record the added, renamed, or moved Collection in the Collection Path Index
+        DBInterface.UpdateCollectionPathIndex(self.number, self.id, self.parent)
         
 
     def db_delete(self, use_transactions=1):
@@ -318,6 +320,8 @@ class Collection(DataObject.DataObject):
 
             # Delete the actual record
             self._db_do_delete(use_transactions, c, result)
+            # Remove the Collection from the Collection Path Index
+            DBInterface.RemoveFromCollectionPathIndex(self.number)
             
             # Cleanup
             c.close()
@@ -359,18 +363,10 @@ class Collection(DataObject.DataObject):
         """ Returns the Node Data list (list of parent collections) needed for Database Tree Manipulation """
         # Initialize the nodeData structure
         nodeData = ()
-        # If this is a nested collection (parent != 0), we have to load the full nesting structure here
+        # If this is a nested collection (parent != 0), get the names of the parent collections from the
+        # Collection Path Index
         if self.parent != 0:
-            # Load the parent collection
-            parentColl = Collection(self.parent)
-            # add the parent's name to the data structure
-            nodeData = (parentColl.id,) + nodeData
-            # repeat until we get to the root, where the parent is 0
-            while parentColl.parent != 0:
-                # Load the parent collection
-                parentColl = Collection(parentColl.parent)
-                # add the parent's name to the data structure
-                nodeData = (parentColl.id,) + nodeData
+            nodeData = DBInterface.GetCollectionPath(self.parent)
         # Complete the nodeData structure by the Collection Name to the end
         nodeData = nodeData + (self.id,)
         return nodeData
@@ -424,8 +420,8 @@ class Collection(DataObject.DataObject):
             return ""
         # ELSE if Parent Name is not known, look it up
         elif self._parentName == "":
-            tempColl = Collection(self.parent)
-            self._parentName = tempColl.id
+            # Get the parent's name from the Collection Path Index
+            self._parentName = DBInterface.GetCollectionPath(self.parent)[-1]
             return self._parentName
         # ELSE if Parent Name IS known, return it
         else:
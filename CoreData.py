@@ -207,7 +207,7 @@ class CoreData(DataObject.DataObject):
         # Determine if we have a new record (_db_start_save() == 0) or an existing record (inherited from DataObject)
         if (self._db_start_save() == 0):
             # Duplicate Identifiers are not allowed.
-            if DBInterface.record_match_count("CoreData2", ("Identifier",), (id,)) > 0:
+            if DBInterface.record_exists("CoreData2", ("Identifier",), (id,)):
                 # If a duplicate is found, interrupt the Save by raising an exception
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
@@ -233,7 +233,7 @@ class CoreData(DataObject.DataObject):
             query = query[:-1] + ')'
         else:
             # check for duplicate records.  (This should not be possible!)
-            if DBInterface.record_match_count("CoreData2", ("Identifier", "!CoreDataNum"), (id, self.number) ) > 0:
+            if DBInterface.record_exists("CoreData2", ("Identifier", "!CoreDataNum"), (id, self.number) ):
                 # If a duplicate is found, interrupt the Save by raising an exception
                 raise SaveError, _("A Core Data Record with that ID already exists.")
             
@@ -25,6 +25,14 @@ if DEBUG:
 
 # import Transana's Constants
 import TransanaConstants
+# import the Data Object Cache, which must be emptied when the database is closed
+import DataObjectCache
+# import the Keyword Index, which must be kept up to date as keywords are saved
+import KeywordIndex
+# import the Search Cache, whose results go out of date as keywords are saved
+import SearchCache
+# Import Transana's Text Index
+import TextIndex
 
 if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server']:
     # import MySQLdb
@@ -66,6 +74,10 @@ import os
 import sys
 # import Python's string module
 import string
+# import Python's time module, for timing queries
+import time
+# import Python's threading module, for the Connection Pool
+import threading
 # import Transana's Clip object
 import Clip
 # import Transana's Collection Object
@@ -94,6 +106,31 @@ import Transcript
 # Declare Global Variables
 # Database Reference
 _dbref = None
+# Queries that have already been adjusted by FixQuery(), keyed by the original query text.  (FixQuery() runs for
+# every query, so this is a plain dictionary.  Single dictionary operations are safe in any thread.)
+_fixedQueries = {}
+# Named Queries registered with RegisterQuery(), keyed by name
+_namedQueries = {}
+# Execution counts for the Named Queries, keyed by name
+_queryCounters = {}
+# The number of compiled statements sqlite keeps for each connection.  Statements are cached by their query text,
+# so queries that FixQuery() and the Named Queries always return the same text for are only compiled once.
+SQLITE_STATEMENT_CACHE_SIZE = 500
+# The number of converted queries FixQuery() keeps.  Queries with values written into them, such as "IN (...)" lists,
+# are all different, so when the limit is reached the cache is emptied and starts over.
+FIXED_QUERY_CACHE_SIZE = 500
+# How to open more connections like _dbref, recorded by get_db() for the Connection Pool
+_connectionSettings = None
+# The arguments most recently passed to MySQLdb.connect()
+_mysqlConnectArgs = None
+# The thread that the program started in.  get_db() gives this thread _dbref, and other threads their own connections.
+_mainThread = threading.currentThread()
+# The maximum number of idle connections the Connection Pool keeps for re-use
+CONNECTION_POOL_SIZE = 4
+# The Collection Path Index, mapping each CollectNum to its (CollectID, ParentCollectNum).  None until it is loaded.
+_collectionPathIndex = None
+# Whether the Text Index has been brought up to date with SyncTextIndex() since the database was opened
+_textIndexSynced = False
 
 def InitializeSingleUserDatabase():
     """ For single-user Transana only, this initializes (starts) the embedded MySQL Server. """
@@ -760,6 +797,203 @@ def CreateAdditionalVidsTableQuery(num):
     # Return the query to the calling routine
     return query % (num, autoIncrementSyntax)
 
+def CreateMediaPathsTableQuery(num):
+    """ Create query for the Media Paths table, which holds a normalized copy of the media file name of each Episode,
+        Clip, Additional Video, and Snapshot record so that records can be found by path prefix or file name in SQL """
+
+    # NOTE:  This table is maintained by UpdateMediaPath() and SyncMediaPaths() below in this file.  It can be
+    #        rebuilt from the other tables at any time, so it is never exported.
+
+    # Media Paths Table: Test for existence and create if needed
+    query = """
+              CREATE TABLE IF NOT EXISTS MediaPaths%d
+                (TableName      VARCHAR(20),
+                 RecNum         INTEGER,
+                 MediaFile      VARCHAR(255),
+                 MediaPath      VARCHAR(255),
+                 FileName       VARCHAR(255),
+                 PRIMARY KEY (TableName, RecNum))
+            """
+    # Add MySQL-specific SQL if appropriate
+    if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']:
+        query += """
+                 DEFAULT CHARACTER SET utf8
+                 COLLATE utf8_bin
+            """
+    # Add the appropriate Table Type to the CREATE Query
+    query = SetTableType(TransanaGlobal.hasInnoDB, query)
+    # Return the query to the calling routine
+    return query % num
+
+def CreateTextIndexTableQuery(num):
+    """ Create query for the Text Index table, which holds the words in the text of each Transcript and Note record,
+        and the endings of those words, so that records can be found by the text they contain without reading all
+        their text """
+
+    # NOTE:  This table is maintained by UpdateTextIndex() and SyncTextIndex() below in this file.  It can be
+    #        rebuilt from the other tables at any time, so it is never exported.
+
+    # Text Index Table: Test for existence and create if needed
+    query = """
+              CREATE TABLE IF NOT EXISTS TextIndex%d
+                (ObjectType     VARCHAR(20),
+                 ObjectNum      INTEGER,
+                 Word           VARCHAR(50),
+                 PRIMARY KEY (ObjectType, ObjectNum, Word))
+            """
+    # Add MySQL-specific SQL if appropriate
+    if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']:
+        query += """
+                 DEFAULT CHARACTER SET utf8
+                 COLLATE utf8_bin
+            """
+    # Add the appropriate Table Type to the CREATE Query
+    query = SetTableType(TransanaGlobal.hasInnoDB, query)
+    # Return the query to the calling routine
+    return query % num
+
+
+# The secondary indexes on the columns Transana uses to join and filter its tables.  Each entry is
+# (Index Version, Index Name, Table Name, Columns).  UpdateIndexes() adds the indexes with an Index Version
+# later than the one recorded in the ConfigInfo table.  To add an index, add an entry with a higher Index Version.
+# (Index names must be unique within a sqlite database, so they include the table name.)
+SECONDARY_INDEXES = [(1, 'ClipKeywords2_EpisodeNum',  'ClipKeywords2', ('EpisodeNum', )),
+                     (1, 'ClipKeywords2_ClipNum',     'ClipKeywords2', ('ClipNum', )),
+                     (1, 'ClipKeywords2_SnapshotNum', 'ClipKeywords2', ('SnapshotNum', )),
+                     (1, 'ClipKeywords2_Keyword',     'ClipKeywords2', ('KeywordGroup', 'Keyword')),
+                     (1, 'Clips2_EpisodeNum',         'Clips2',        ('EpisodeNum', )),
+                     (1, 'Clips2_CollectNum',         'Clips2',        ('CollectNum', 'SortOrder')),
+                     (1, 'Transcripts2_SourceTranscriptNum', 'Transcripts2', ('SourceTranscriptNum', )),
+                     (1, 'Transcripts2_ClipNum',      'Transcripts2',  ('ClipNum', )),
+                     (1, 'Snapshots2_EpisodeNum',     'Snapshots2',    ('EpisodeNum', )),
+                     (1, 'Snapshots2_CollectNum',     'Snapshots2',    ('CollectNum', 'SortOrder')),
+                     (1, 'Notes2_SeriesNum',          'Notes2',        ('SeriesNum', )),
+                     (1, 'Notes2_EpisodeNum',         'Notes2',        ('EpisodeNum', )),
+                     (1, 'Notes2_CollectNum',         'Notes2',        ('CollectNum', )),
+                     (1, 'Notes2_ClipNum',            'Notes2',        ('ClipNum', )),
+                     (1, 'Notes2_TranscriptNum',      'Notes2',        ('TranscriptNum', )),
+                     (1, 'Notes2_SnapshotNum',        'Notes2',        ('SnapshotNum', )),
+                     (2, 'MediaPaths2_MediaPath',     'MediaPaths2',   ('MediaPath', )),
+                     (2, 'MediaPaths2_FileName',      'MediaPaths2',   ('FileName', )),
+                     (3, 'TextIndex2_Word',           'TextIndex2',    ('ObjectType', 'Word')),
+                     (4, 'Notes2_NoteID',             'Notes2',        ('NoteID', 'NoteNum'))]
+
+# The queries timed by TimeIndexedQueries().  Each entry is (Description, Query, Parameter Query), where the
+# Parameter Query gets the values for the timed query's parameters from the database.
+INDEXED_QUERIES = [('Clips by Episode', 'SELECT ClipNum FROM Clips2 WHERE EpisodeNum = %s',
+                    'SELECT MAX(EpisodeNum) FROM Clips2'),
+                   ('Clips by Collection', 'SELECT ClipNum FROM Clips2 WHERE CollectNum = %s ORDER BY SortOrder',
+                    'SELECT MAX(CollectNum) FROM Clips2'),
+                   ('Clip Transcripts by Source Transcript', 'SELECT TranscriptNum FROM Transcripts2 WHERE SourceTranscriptNum = %s',
+                    'SELECT MAX(SourceTranscriptNum) FROM Transcripts2'),
+                   ('Keywords by Episode', 'SELECT KeywordGroup, Keyword FROM ClipKeywords2 WHERE EpisodeNum = %s',
+                    'SELECT MAX(EpisodeNum) FROM ClipKeywords2'),
+                   ('Keywords by Clip', 'SELECT KeywordGroup, Keyword FROM ClipKeywords2 WHERE ClipNum = %s',
+                    'SELECT MAX(ClipNum) FROM ClipKeywords2'),
+                   ('Clips by Keyword', 'SELECT ClipNum FROM ClipKeywords2 WHERE KeywordGroup = %s AND Keyword = %s',
+                    'SELECT MAX(KeywordGroup), MAX(Keyword) FROM ClipKeywords2'),
+                   ('Snapshots by Episode', 'SELECT SnapshotNum FROM Snapshots2 WHERE EpisodeNum = %s',
+                    'SELECT MAX(EpisodeNum) FROM Snapshots2'),
+                   ('Notes by Clip', 'SELECT NoteNum FROM Notes2 WHERE ClipNum = %s',
+                    'SELECT MAX(ClipNum) FROM Notes2'),
+                   ('Media Files by Name', 'SELECT TableName, RecNum FROM MediaPaths2 WHERE FileName = %s',
+                    'SELECT MAX(FileName) FROM MediaPaths2'),
+                   ('Notes by Word', "SELECT ObjectNum FROM TextIndex2 WHERE ObjectType = 'Note' AND Word = %s",
+                    "SELECT MAX(Word) FROM TextIndex2 WHERE ObjectType = 'Note'"),
+                   ('Notes Browser page', 'SELECT NoteNum, NoteID FROM Notes2 WHERE NoteID > %s ORDER BY NoteID, NoteNum LIMIT 100',
+                    'SELECT MIN(NoteID) FROM Notes2')]
+
+def IndexExists(dbCursor, table, indexName):
+    """ Determine whether the named index exists on the table """
+    # If we're using MySQL ...
+    if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']:
+        # ... list the table's indexes.  The third column is the index name.
+        dbCursor.execute('SHOW INDEX FROM %s' % table)
+        return indexName in [row[2] for row in dbCursor.fetchall()]
+    # If we're using sqlite ...
+    else:
+        # ... look for the index in the sqlite schema table
+        dbCursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name = ?", (table, indexName))
+        return len(dbCursor.fetchall()) > 0
+
+def UpdateIndexes(dbCursor, benchmark=False):
+    """ Add any secondary indexes in SECONDARY_INDEXES that the database doesn't have yet, and record the Index Version
+        in the ConfigInfo table.  The Index Version is kept separately from the Database Version because the indexes
+        don't change what older versions of Transana can read.  If benchmark is True, the queries in INDEXED_QUERIES
+        are timed before and after the indexes are added, and ((description, before, after), ...) is returned. """
+    # Get the Index Version recorded in the database
+    dbCursor.execute("SELECT Value FROM ConfigInfo WHERE KeyVal = 'IndexVersion'")
+    data = dbCursor.fetchall()
+    # If there is one, use it.  Otherwise, no indexes have been added yet.
+    if len(data) > 0:
+        indexVersion = int(data[0][0])
+    else:
+        indexVersion = 0
+    # Determine the current Index Version
+    newIndexVersion = max([version for (version, indexName, table, columns) in SECONDARY_INDEXES])
+    # If the database is up to date, there's nothing to do
+    if indexVersion >= newIndexVersion:
+        return ()
+    # If requested, time the queries before we add the indexes
+    if benchmark:
+        before = TimeIndexedQueries(dbCursor)
+    # Note whether all the indexes could be added
+    success = True
+    # For each index added since the database's Index Version ...
+    for (version, indexName, table, columns) in SECONDARY_INDEXES:
+        if version > indexVersion:
+            try:
+                # ... if the index doesn't already exist, add it
+                if not IndexExists(dbCursor, table, indexName):
+                    dbCursor.execute('CREATE INDEX %s ON %s (%s)' % (indexName, table, ', '.join(columns)))
+            # If the index can't be added (for example, if the user lacks the INDEX privilege on a MySQL Server) ...
+            except:
+
+                if DEBUG:
+                    print "DBInterface.UpdateIndexes():  Could not create index", indexName
+                    print sys.exc_info()[0], sys.exc_info()[1]
+
+                # ... the database can still be used, but we'll try again next time.
+                success = False
+    # If all the indexes were added ...
+    if success:
+        # ... record the new Index Version
+        if len(data) > 0:
+            query = "UPDATE ConfigInfo SET Value = %s WHERE KeyVal = 'IndexVersion'"
+        else:
+            query = "INSERT INTO ConfigInfo (Value, KeyVal) VALUES (%s, 'IndexVersion')"
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        dbCursor.execute(query, ('%d' % newIndexVersion, ))
+    # If requested, time the queries again and return the results
+    if benchmark:
+        after = TimeIndexedQueries(dbCursor)
+        return tuple([(description, before[description], after[description]) for (description, query, parameterQuery) in INDEXED_QUERIES])
+    return ()
+
+def TimeIndexedQueries(dbCursor, repeat=20):
+    """ Time each of the queries in INDEXED_QUERIES, which use the columns that SECONDARY_INDEXES indexes.
+        Returns a dictionary of the average time in seconds for each query, keyed by description. """
+    # Initialize the results
+    results = {}
+    # For each query ...
+    for (description, query, parameterQuery) in INDEXED_QUERIES:
+        # ... get values for the query's parameters
+        dbCursor.execute(parameterQuery)
+        params = dbCursor.fetchone()
+        # If the table is empty, there's nothing to time
+        if (params == None) or (None in params):
+            results[description] = None
+            continue
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        # Run the query repeatedly, timing it
+        startTime = time.time()
+        for x in range(repeat):
+            dbCursor.execute(query, tuple(params))
+            dbCursor.fetchall()
+        results[description] = (time.time() - startTime) / repeat
+    return results
 
 def establish_db_exists(dbToOpen=None):
     """ Check for the existence of all database tables and create them
@@ -1309,6 +1543,16 @@ def establish_db_exists(dbToOpen=None):
         # Execute the Query
         dbCursor.execute(query)
 
+        # MediaPaths2 (Media Paths) Table: Test for existence and create if needed
+        query = CreateMediaPathsTableQuery(2)
+        # Execute the Query
+        dbCursor.execute(query)
+
+        # TextIndex2 (Text Index) Table: Test for existence and create if needed
+        query = CreateTextIndexTableQuery(2)
+        # Execute the Query
+        dbCursor.execute(query)
+
         if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']:
             # Let's test for COLLATION.  ** NOTE:  THIS DOESN'T WORK for CHINESE!! **
             # Create a list of table to check
@@ -1396,6 +1640,13 @@ def establish_db_exists(dbToOpen=None):
                         # signal failure to connect to the database
                         return False
 
+        # Add any secondary indexes the database doesn't have yet
+        timings = UpdateIndexes(dbCursor, benchmark=DEBUG)
+
+        if DEBUG:
+            for (description, before, after) in timings:
+                print "Index Benchmark:  %s:  %s before, %s after" % (description, before, after)
+
         # See if this (username, server, database) combination has defined paths.
         if TransanaGlobal.configData.pathsByDB.has_key((TransanaGlobal.userName.encode('utf8'), TransanaGlobal.configData.host.encode('utf8'), TransanaGlobal.configData.database.encode('utf8'))):
             # If so, load the video root and visualization paths.
@@ -1421,12 +1672,21 @@ def FixQuery(query):
         This method converts the SQL query string as needed. """
     # If we're using sqlite ...
     if TransanaConstants.DBInstalled in ['sqlite3']:
+        # If we've already converted this query, we can just return the converted version
+        query2 = _fixedQueries.get(query)
+        if query2 != None:
+            return query2
         # ... replace all "%s" parameters with "?" parameters
         query2 = query.replace('%s', '?')
         # Check the query for apostrophes around paramters or the presence of the "%" character (from %d parameters, for example)
         if (query2.find("'?") > -1) or (query2.find('%') > -1):
             # If found, raise a ProgrammingError exception.  We will need to fix the query
             raise TransanaExceptions.ProgrammingError('Query Format Error')
+        # If the cache is full, empty it.  The queries Transana uses repeatedly are soon converted again.
+        if len(_fixedQueries) >= FIXED_QUERY_CACHE_SIZE:
+            _fixedQueries.clear()
+        # Remember the converted query
+        _fixedQueries[query] = query2
         # Return the modified query
         return query2
     # If we're NOT using sqlite ...
@@ -1434,6 +1694,65 @@ def FixQuery(query):
         # ... just return the query unaltered
         return query
 
+def RegisterQuery(name, query):
+    """ Register a Named Query.  Named Queries are written with "%s" parameters, like all Transana queries, and are
+        adjusted for the database in use only once, the first time they are used. """
+    # If the name is already used for a different query ...
+    if _namedQueries.has_key(name) and (_namedQueries[name][0] != query):
+        # ... that's a programming error
+        raise TransanaExceptions.ProgrammingError('Query "%s" is already registered' % name)
+    # Remember the query.  It hasn't been adjusted for the database yet.
+    _namedQueries[name] = (query, None)
+    # Initialize the query's execution counter
+    if not _queryCounters.has_key(name):
+        _queryCounters[name] = 0
+
+def GetQuery(name):
+    """ Return the text of a Named Query, adjusted for the database in use """
+    # Get the original and adjusted query text
+    (query, fixedQuery) = _namedQueries[name]
+    # If the query hasn't been adjusted yet ...
+    if fixedQuery == None:
+        # ... adjust it ...
+        fixedQuery = FixQuery(query)
+        # ... and remember the adjusted version
+        _namedQueries[name] = (query, fixedQuery)
+    return fixedQuery
+
+def ExecuteQuery(dbCursor, name, values=()):
+    """ Execute a Named Query on the cursor passed in, and count the execution """
+    # Execute the query
+    dbCursor.execute(GetQuery(name), values)
+    # Count the execution
+    _queryCounters[name] += 1
+    # Return the cursor so results can be fetched directly
+    return dbCursor
+
+def ExecuteManyQuery(dbCursor, name, valueList):
+    """ Execute a Named Query on the cursor passed in once for each set of values in valueList, and count the executions """
+    # Make a list of the values, in case we are passed an iterator, so we can count them
+    valueList = list(valueList)
+    # Execute the query
+    dbCursor.executemany(GetQuery(name), valueList)
+    # Count the executions
+    _queryCounters[name] += len(valueList)
+    # Return the cursor
+    return dbCursor
+
+def GetQueryCounters():
+    """ Return a dictionary of the number of times each Named Query has been executed, plus the number of converted
+        queries FixQuery() is holding for sqlite under the key None """
+    # Copy the Named Query counters
+    counters = _queryCounters.copy()
+    # Add the number of queries FixQuery() has cached
+    counters[None] = len(_fixedQueries)
+    return counters
+
+def ResetQueryCounters():
+    """ Reset the execution counts for all Named Queries """
+    for name in _queryCounters.keys():
+        _queryCounters[name] = 0
+
 def UpdateTranscriptRecsfor240(self):
     """ For release 2.40, I changed the way clips created from other clips track their source transcript.
         Instead of remembering the Clip Transcript they were taken from, which often may get deleted,
@@ -1507,10 +1826,30 @@ def UpdateTranscriptRecsfor240(self):
         # Execute the query
         dbCursor2.execute(query, (TNum2, TranscriptNum))
 
+def _connect_mysql(**kwargs):
+    """ Connect to MySQL, remembering the connection arguments so the Connection Pool can make more connections """
+    global _mysqlConnectArgs
+    _mysqlConnectArgs = kwargs
+    return MySQLdb.connect(**kwargs)
+
 def get_db(dbToOpen=None):
     """ Get a connection object reference to the database.  If a connection has not yet been established, then create the connection.
-        dbToOpen is passed if we are automatically importing a database following 2.42 to 2.50 Data Conversion. """
+        dbToOpen is passed if we are automatically importing a database following 2.42 to 2.50 Data Conversion.
+        With MySQL, threads other than the main program thread get their own connection from the Connection Pool,
+        which they keep until they finish.  sqlite connections can only be used by the thread that opened them, so
+        sqlite databases are only used from the main program thread. """
     global _dbref
+    global _connectionSettings
+    # If we're not in the main program thread ...
+    if threading.currentThread() is not _mainThread:
+        # ... we can't ask the user for a database, so if none is open, there's no connection.
+        if _dbref == None:
+            return None
+        # sqlite databases aren't pooled.  Their connection belongs to the main program thread.
+        if TransanaConstants.DBInstalled in ['sqlite3']:
+            return _dbref
+        # Otherwise, get this thread's connection from the Connection Pool
+        return _connectionPool.CheckOut()
     # If a database reference is not defined ...
     if (_dbref == None):
         # If we are NOT passed a database name, we need to get information from the user.
@@ -1594,7 +1933,8 @@ def get_db(dbToOpen=None):
                 # If we should connect to the database ...
                 if result == wx.ID_YES:
                     # ... connect to it.
-                    _dbref = sqlite3.connect(dbName)
+                    # Keep enough compiled statements for all the queries Transana uses repeatedly.
+                    _dbref = sqlite3.connect(dbName, cached_statements=SQLITE_STATEMENT_CACHE_SIZE)
                     # Enable AutoCommit
                     _dbref.isolation_level = None
                     # Have sqlite use Strings rather than Unicode, as all fields in Transana are manually encoded
@@ -1622,10 +1962,10 @@ def get_db(dbToOpen=None):
                         if TransanaConstants.DBInstalled in ['MySQLdb-embedded']:
                             if 'unicode' in wx.PlatformInfo:
                                 # The single-user version requires no parameters
-                                _dbref = MySQLdb.connect(use_unicode=True)
+                                _dbref = _connect_mysql(use_unicode=True)
                             else:
                                 # The single-user version requires no parameters
-                                _dbref = MySQLdb.connect()
+                                _dbref = _connect_mysql()
                         elif TransanaConstants.DBInstalled in ['sqlite3']:
                             pass
                     else:
@@ -1660,7 +2000,7 @@ def get_db(dbToOpen=None):
                                     print sslData
                                 
                                 # Use MySQLdb to establish the SSL and Unicode connection to the database server
-                                _dbref = MySQLdb.connect(host=dbServer, user=userName, passwd=password, port=int(port), use_unicode=True, ssl=sslData)
+                                _dbref = _connect_mysql(host=dbServer, user=userName, passwd=password, port=int(port), use_unicode=True, ssl=sslData)
 
                                 if DEBUG:
                                     print "Connected 1"
@@ -1668,13 +2008,13 @@ def get_db(dbToOpen=None):
                             # If we're NOT requesting an SSL Connection ...
                             else:
                                 # ... use MySQLdb to establish the Unicode connection to the database server without SSL
-                                _dbref = MySQLdb.connect(host=dbServer, user=userName, passwd=password, port=int(port), use_unicode=True)
+                                _dbref = _connect_mysql(host=dbServer, user=userName, passwd=password, port=int(port), use_unicode=True)
 
                                 if DEBUG:
                                     print "Connected 2"
                         else:
                             # The multi-user version requires all information to connect to the database server
-                            _dbref = MySQLdb.connect(host=dbServer, user=userName, passwd=password, port=int(port))
+                            _dbref = _connect_mysql(host=dbServer, user=userName, passwd=password, port=int(port))
 
                             if DEBUG:
                                 print "Connected 3"
@@ -1779,10 +2119,10 @@ def get_db(dbToOpen=None):
                             # Re-establish a connection to the Database Server.
                             if 'unicode' in wx.PlatformInfo:
                                 # The single-user version requires no parameters
-                                _dbref = MySQLdb.connect(use_unicode=True)
+                                _dbref = _connect_mysql(use_unicode=True)
                             else:
                                 # The single-user version requires no parameters
-                                _dbref = MySQLdb.connect()
+                                _dbref = _connect_mysql()
                             # We need to know what the max allowed packet size is later, so save it to the Globals
                             TransanaGlobal.max_allowed_packet = long(desiredPacket * 1024 * 1024)
                         # If we have the multi-user version ...
@@ -2071,11 +2411,27 @@ def get_db(dbToOpen=None):
                     _dbref = None
             else:
                 TransanaExceptions.ProgrammingError('Database Undefined in DBInterface.get_db()')
+        # If we made a MySQL connection, remember how it was made so the Connection Pool can make more like it
+        if (_dbref != None) and (TransanaConstants.DBInstalled not in ['sqlite3']):
+            _connectionSettings = {'connect' : _mysqlConnectArgs, 'databaseName' : databaseName}
     # Return the database reference
     return _dbref
 
 def close_db():
     """ This method flushes all database tables (saving data to disk) and closes the Database Connection. """
+    # Close the Connection Pool's connections, which are all connected to the same database
+    _connectionPool.Close()
+    # Record numbers are only meaningful within a database, so empty the Data Object Cache
+    DataObjectCache.Clear()
+    # ... and the Keyword Index
+    KeywordIndex.Clear()
+    # ... and the Search Cache
+    SearchCache.Clear()
+    # ... and the Collection Path Index
+    ResetCollectionPathIndex()
+    # The next database's Text Index hasn't been checked
+    global _textIndexSynced
+    _textIndexSynced = False
     # obtain the Database
     db = get_db()
 
@@ -2084,8 +2440,169 @@ def close_db():
         db.close()
 
     global _dbref
+    global _connectionSettings
     # Remove all reference to the database
     _dbref = None
+    _connectionSettings = None
+
+def _open_pooled_connection():
+    """ Open a new connection to the current MySQL database, set up the same way as _dbref """
+    # Connect using the same arguments as _dbref
+    db = MySQLdb.connect(**_connectionSettings['connect'])
+    # Get a Database Cursor
+    dbCursor = db.cursor()
+    # If we have MySQL 4.1 or later, set the Character Encoding settings
+    if TransanaGlobal.DBVersion >= u'4.1':
+        dbCursor.execute('SET CHARACTER SET utf8')
+        dbCursor.execute('SET character_set_connection = utf8')
+        dbCursor.execute('SET character_set_client = utf8')
+        dbCursor.execute('SET character_set_server = utf8')
+        dbCursor.execute('SET character_set_database = utf8')
+        dbCursor.execute('SET character_set_results = utf8')
+    # Select the database
+    dbCursor.execute('USE %s' % _connectionSettings['databaseName'].encode(TransanaGlobal.encoding))
+    # Close the Database Cursor
+    dbCursor.close()
+    return db
+
+def _check_pooled_connection(db):
+    """ Make sure a pooled connection is still usable.  Returns the connection, or None if it has gone away. """
+    try:
+        # Ping the server.  This fails if the server has closed the connection ("MySQL server has gone away").
+        db.ping()
+        return db
+    except MySQLdb.OperationalError:
+        # Close what's left of the connection
+        try:
+            db.close()
+        except:
+            pass
+        return None
+
+
+class ConnectionPool(object):
+    """ A pool of MySQL database connections for threads other than the main program thread.  Each thread keeps its
+        connection until the thread finishes, and the connection is then returned to the pool for re-use.  Idle
+        connections are checked before re-use and replaced if the server has dropped them. """
+
+    def __init__(self, maxIdle=CONNECTION_POOL_SIZE):
+        """ Initialize the Connection Pool """
+        # The maximum number of idle connections to keep
+        self.maxIdle = maxIdle
+        # The idle connections
+        self.idle = []
+        # A lock protecting the idle and in-use connections
+        self.lock = threading.Lock()
+        # Each thread's connection
+        self.local = threading.local()
+        # The pool's generation number, which changes when the pool is closed.  Connections from an earlier
+        # generation are connected to a database that is no longer open, and are closed rather than re-used.
+        self.generation = 0
+        # The connections in use, as {thread : (connection, generation)}, so that the connections of threads
+        # that have finished can be reclaimed
+        self.inUse = {}
+
+    def CheckOut(self):
+        """ Get the current thread's connection, checking one out if the thread doesn't have one """
+        # If the thread already has a connection to the current database, use it
+        if getattr(self.local, 'db', None) != None:
+            if self.local.generation == self.generation:
+                return self.local.db
+            # If the database has been closed since the thread got its connection, close the connection
+            self._Release(threading.currentThread())
+        # Take back the connections of threads that have finished
+        self._ReclaimFinishedThreads()
+        # Look for a usable idle connection
+        db = None
+        while db == None:
+            self.lock.acquire()
+            try:
+                # If there aren't any idle connections, stop looking
+                if len(self.idle) == 0:
+                    break
+                db = self.idle.pop()
+            finally:
+                self.lock.release()
+            # Make sure the connection still works
+            db = _check_pooled_connection(db)
+        # If there is no usable idle connection ...
+        if db == None:
+            # ... open a new one
+            db = _open_pooled_connection()
+        # Give the connection to this thread
+        self.local.db = db
+        self.local.generation = self.generation
+        self.lock.acquire()
+        try:
+            self.inUse[threading.currentThread()] = (db, self.generation)
+        finally:
+            self.lock.release()
+        return db
+
+    def _Release(self, thread):
+        """ Return the connection of the current thread, or of a thread that has finished, to the pool """
+        self.lock.acquire()
+        try:
+            (db, generation) = self.inUse.pop(thread)
+        finally:
+            self.lock.release()
+        # If it's the current thread's connection, the thread no longer has it
+        if thread is threading.currentThread():
+            self.local.db = None
+        self._Return(db, generation)
+
+    def _ReclaimFinishedThreads(self):
+        """ Return the connections of threads that have finished to the pool """
+        self.lock.acquire()
+        try:
+            # Find the threads that have finished
+            finished = [thread for thread in self.inUse.keys() if not thread.isAlive()]
+        finally:
+            self.lock.release()
+        # Return each one's connection to the pool
+        for thread in finished:
+            self._Release(thread)
+
+    def _Return(self, db, generation):
+        """ Keep a connection that is no longer in use for re-use, or close it """
+        self.lock.acquire()
+        try:
+            # If the connection is for the current database and there's room in the pool ...
+            if (generation == self.generation) and (len(self.idle) < self.maxIdle):
+                # ... keep it for re-use
+                self.idle.append(db)
+                db = None
+        finally:
+            self.lock.release()
+        # If we didn't keep the connection ...
+        if db != None:
+            # ... close it
+            try:
+                db.close()
+            except:
+                pass
+
+    def Close(self):
+        """ Close all idle connections.  Connections still in use are closed when their threads finish or next ask
+            for a connection. """
+        self.lock.acquire()
+        try:
+            # Remove the idle connections from the pool
+            idle = self.idle
+            self.idle = []
+            # Start a new generation
+            self.generation += 1
+        finally:
+            self.lock.release()
+        # Close the idle connections
+        for db in idle:
+            try:
+                db.close()
+            except:
+                pass
+
+# The Connection Pool
+_connectionPool = ConnectionPool()
 
 
 def get_username():
@@ -2093,16 +2610,97 @@ def get_username():
     return TransanaGlobal.userName
 
 
+# The number of rows fetched per query by the page_of_...() functions
+PAGE_SIZE = 1000
+
+def _keyset_condition(keyColumns, lastKey):
+    """ Return a WHERE condition, and its values, that selects the rows that come after lastKey when the rows are
+        sorted by keyColumns.  NULL values sort first, as they do in both MySQL and sqlite. """
+    # A row comes after the key if its first column is greater, or if its first column is equal and its second
+    # column is greater, and so on.
+    alternatives = []
+    values = ()
+    for index in range(len(keyColumns)):
+        terms = []
+        # All the earlier columns are equal
+        for (column, value) in zip(keyColumns[:index], lastKey[:index]):
+            if value is None:
+                terms.append("%s IS NULL" % column)
+            else:
+                terms.append("%s = %%s" % column)
+                values += (value, )
+        # This column is greater
+        if lastKey[index] is None:
+            terms.append("%s IS NOT NULL" % keyColumns[index])
+        else:
+            terms.append("%s > %%s" % keyColumns[index])
+            values += (lastKey[index], )
+        alternatives.append("(%s)" % " AND ".join(terms))
+    return (" OR ".join(alternatives), values)
+
+def fetch_page(columns, table, keyColumns, conditions=(), values=(), lastKey=None, pageSize=PAGE_SIZE):
+    """ Fetch one page of rows from a table using keyset pagination.  The rows are sorted by keyColumns, which must
+        identify a row uniquely and must be included in columns.  lastKey is None for the first page, and after that
+        is the key returned with the previous page.  conditions are additional WHERE conditions, using "%s"
+        parameters with the values given.  Returns (rows, nextKey), where nextKey is None if there are no more rows.
+        Because each page starts where the last one ended, rather than at an OFFSET, every page takes about as
+        long to get as the first. """
+    # Make lists of the conditions and values, as we may add to them
+    conditions = list(conditions)
+    values = tuple(values)
+    # If this isn't the first page ...
+    if lastKey != None:
+        # ... start after the last row of the previous page
+        (condition, keyValues) = _keyset_condition(keyColumns, lastKey)
+        conditions.append(condition)
+        values += keyValues
+    # Build the Query
+    query = "SELECT %s FROM %s" % (', '.join(columns), table)
+    if len(conditions) > 0:
+        query += " WHERE " + " AND ".join(["(%s)" % condition for condition in conditions])
+    query += " ORDER BY %s LIMIT %d" % (', '.join(keyColumns), pageSize)
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    # Get a Database Cursor
+    DBCursor = get_db().cursor()
+    # Execute the Query
+    DBCursor.execute(query, values)
+    # Get the Results
+    rows = DBCursor.fetchall()
+    # Close the Database Cursor
+    DBCursor.close()
+    # If this was a full page, there may be more rows.  The next page starts after the last row of this one.
+    if len(rows) == pageSize:
+        nextKey = tuple([rows[-1][columns.index(column)] for column in keyColumns])
+    # Otherwise, there are no more rows.
+    else:
+        nextKey = None
+    return (rows, nextKey)
+
+def iter_pages(pageFunction, *args, **kwargs):
+    """ Iterate through all the results of one of the page_of_...() functions, fetching one page at a time, so that
+        callers can process the first results without waiting for the whole table to be read. """
+    # Start with the first page
+    lastKey = None
+    while True:
+        # Get the next page
+        (results, lastKey) = pageFunction(lastKey=lastKey, *args, **kwargs)
+        for result in results:
+            yield result
+        # If that was the last page, we're done
+        if lastKey is None:
+            break
+
 def list_of_series():
     """Get a list of all Series record names."""
     l = []
     query = "SELECT SeriesNum, SeriesID FROM Series2 ORDER BY SeriesID"
     DBCursor = get_db().cursor()
     DBCursor.execute(query)
-    for row in fetchall_named(DBCursor):
-        id = row['SeriesID']
-        if 'unicode' in wx.PlatformInfo:
-            id = ProcessDBDataForUTF8Encoding(id)
+    rows = fetchall_named(DBCursor)
+    # Decode all the Series IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row['SeriesID'] for row in rows])
+    for (row, id) in zip(rows, ids):
         l.append((row['SeriesNum'], id))
     DBCursor.close()
     return l
@@ -2117,14 +2715,12 @@ def list_of_episodes():
     DBCursor = get_db().cursor()
     # Execute the Query
     DBCursor.execute(query)
+    # Get the Results set
+    rows = fetchall_named(DBCursor)
+    # Decode all the Episode IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row['EpisodeID'] for row in rows])
     # Iterate through the Results set
-    for row in fetchall_named(DBCursor):
-        # Get the Episode ID
-        id = row['EpisodeID']
-        # If we're using Unicode ...
-        if 'unicode' in wx.PlatformInfo:
-            # ... we need to handle the Unicode decoding
-            id = ProcessDBDataForUTF8Encoding(id)
+    for (row, id) in zip(rows, ids):
         # Add the results to the list
         l.append((row['EpisodeNum'], id, row['SeriesNum']))
     # Close the Database Cursor
@@ -2209,6 +2805,37 @@ def list_transcripts(SeriesName, EpisodeName):
     DBCursor.close()
     return l
 
+def list_transcripts_for_episodes(episodeNums, batchSize=500):
+    """ Get the Transcripts for a number of Episodes at once.  Returns a dictionary of lists of
+        (TranscriptNum, TranscriptID, EpisodeNum) values, sorted by Transcript ID, keyed by Episode Number.
+        Episodes without Transcripts are not included. """
+    transcripts = {}
+    # Make a list of the Episode Numbers, in case we are passed a set
+    episodeNums = list(episodeNums)
+    DBCursor = get_db().cursor()
+    # Process the Episodes in batches
+    for start in range(0, len(episodeNums), batchSize):
+        batch = tuple(episodeNums[start:start + batchSize])
+        query = """
+        SELECT TranscriptNum, TranscriptID, EpisodeNum FROM Transcripts2
+            WHERE   ClipNum = 0 AND
+                    EpisodeNum IN (%s)
+            ORDER BY TranscriptID
+        """ % ', '.join(['%s'] * len(batch))
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        DBCursor.execute(query, batch)
+        rows = DBCursor.fetchall()
+        # Decode all the Transcript IDs at once
+        if 'unicode' in wx.PlatformInfo:
+            ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+        else:
+            ids = [row[1] for row in rows]
+        for ((transcriptNum, transcriptID, episodeNum), id) in zip(rows, ids):
+            transcripts.setdefault(episodeNum, []).append((transcriptNum, id, episodeNum))
+    DBCursor.close()
+    return transcripts
+
 def list_clip_transcripts(clipNum):
     """ Return a list of all Clip Transcripts for the given Clip """
     l = []
@@ -2287,6 +2914,89 @@ def list_of_all_collections():
     # Return the List as the function result
     return l
 
+def LoadCollectionPathIndex():
+    """ Load the Collection Path Index, which records the name and parent of every Collection, in a single query """
+    global _collectionPathIndex
+    # Get a Database Cursor
+    DBCursor = get_db().cursor()
+    # Define and execute the Query
+    DBCursor.execute('SELECT CollectNum, CollectID, ParentCollectNum FROM Collections2')
+    rows = DBCursor.fetchall()
+    # Close the Database Cursor
+    DBCursor.close()
+    # Decode all the Collection IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    # Build the index.  A NULL Parent Collection Number means the Collection is at the root.
+    _collectionPathIndex = {}
+    for ((collectNum, collectID, parentNum), id) in zip(rows, ids):
+        _collectionPathIndex[collectNum] = (id, parentNum or 0)
+
+def ResetCollectionPathIndex():
+    """ Discard the Collection Path Index, so it will be re-loaded the next time it is needed """
+    global _collectionPathIndex
+    _collectionPathIndex = None
+
+def UpdateCollectionPathIndex(collectNum, collectID, parentNum):
+    """ Record a Collection that has been added, renamed, or moved in the Collection Path Index """
+    # If the index has been loaded ...
+    if _collectionPathIndex != None:
+        # ... update the Collection's entry
+        _collectionPathIndex[collectNum] = (collectID, parentNum or 0)
+
+def RemoveFromCollectionPathIndex(collectNum):
+    """ Remove a deleted Collection from the Collection Path Index """
+    # If the index has been loaded and includes the Collection ...
+    if (_collectionPathIndex != None) and _collectionPathIndex.has_key(collectNum):
+        # ... remove it
+        del(_collectionPathIndex[collectNum])
+
+def GetCollectionPath(collectNum):
+    """ Return a tuple of the Collection IDs from the root Collection down to Collection collectNum, using the
+        Collection Path Index rather than loading each parent Collection """
+    return tuple([collectID for (num, collectID) in GetCollectionPathItems(collectNum)])
+
+def GetCollectionPathItems(collectNum):
+    """ Return a tuple of the (CollectNum, CollectID) pairs from the root Collection down to Collection
+        collectNum, using the Collection Path Index """
+    # If the index hasn't been loaded, or doesn't know about the Collection or one of its parents,
+    # (which can happen if another user has added it), load the index.
+    if (_collectionPathIndex == None) or not _CollectionPathIsIndexed(collectNum):
+        LoadCollectionPathIndex()
+    # Initialize the path
+    path = ()
+    # Start with the Collection itself
+    num = collectNum
+    # Repeat until we reach the root.  (Stop if the path gets longer than the number of Collections, which
+    # could only happen if the data had a loop in it.)
+    while (num != 0) and (len(path) <= len(_collectionPathIndex)):
+        # If the Collection doesn't exist ...
+        if not _collectionPathIndex.has_key(num):
+            # ... raise the exception that loading the Collection would have raised
+            raise TransanaExceptions.RecordNotFoundError, (num, 0)
+        # Get the Collection's name and parent
+        (collectID, parentNum) = _collectionPathIndex[num]
+        # Add this Collection to the FRONT of the path
+        path = ((num, collectID),) + path
+        # Move on to the parent
+        num = parentNum
+    return path
+
+def _CollectionPathIsIndexed(collectNum):
+    """ Determine whether the Collection Path Index includes Collection collectNum and all of its parents """
+    # Start with the Collection itself
+    num = collectNum
+    # Count the steps, in case the data has a loop in it
+    steps = 0
+    # Repeat until we reach the root
+    while (num != 0) and (steps <= len(_collectionPathIndex)):
+        # If the Collection isn't in the index, the index is incomplete
+        if not _collectionPathIndex.has_key(num):
+            return False
+        # Move on to the parent
+        num = _collectionPathIndex[num][1]
+        steps += 1
+    return True
+
 def locate_quick_clips_collection():
     """ Determine the collection number of the Quick Clips Collection, creating it if necessary. """
     # Get a Database Cursor
@@ -2336,14 +3046,12 @@ def list_of_clips():
     DBCursor = get_db().cursor()
     # Execute the Query
     DBCursor.execute(query)
+    # Get the Results
+    rows = fetchall_named(DBCursor)
+    # Decode all the Clip IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row['ClipID'] for row in rows])
     # Iterate through the Results
-    for row in fetchall_named(DBCursor):
-        # Get the Clip ID
-        id = row['ClipID']
-        # If we're using Unicode ...
-        if 'unicode' in wx.PlatformInfo:
-            # ... we need to decode the ClipID
-            id = ProcessDBDataForUTF8Encoding(id)
+    for (row, id) in zip(rows, ids):
         # Add the results to the list
         l.append((row['ClipNum'], id, row['CollectNum'], row['SortOrder']))
     # Close the Database Cursor
@@ -2351,6 +3059,20 @@ def list_of_clips():
     # Return the list as the funtion results
     return l
 
+def page_of_clips(lastKey=None, pageSize=PAGE_SIZE):
+    """ Get one page of the list of all Clips, regardless of collection, in Clip Number order.  See fetch_page(). """
+    # Get the page of Clips
+    (rows, nextKey) = fetch_page(['ClipNum', 'ClipID', 'CollectNum', 'SortOrder'], 'Clips2', ['ClipNum'],
+                                 lastKey=lastKey, pageSize=pageSize)
+    # Decode all the Clip IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    # Return the page, in the same form as list_of_clips()
+    return ([(clipNum, id, collectNum, sortOrder) for ((clipNum, clipID, collectNum, sortOrder), id) in zip(rows, ids)], nextKey)
+
+def iter_clips(pageSize=PAGE_SIZE):
+    """ Iterate through all Clips, regardless of collection, in Clip Number order, a page at a time """
+    return iter_pages(page_of_clips, pageSize=pageSize)
+
 def list_of_clips_by_collection(CollectionID, ParentNum):
     """Get a list of all Clips for a named Collection."""
     if 'unicode' in wx.PlatformInfo:
@@ -2376,10 +3098,10 @@ def list_of_clips_by_collection(CollectionID, ParentNum):
     DBCursor.execute(query, values)
     # This method will return the Clip's Record Number, its ID, and
     # the Record Number for the Parent Collection for each record
-    for row in fetchall_named(DBCursor):
-        id = row['ClipID']
-        if 'unicode' in wx.PlatformInfo:
-            id = ProcessDBDataForUTF8Encoding(id)
+    rows = fetchall_named(DBCursor)
+    # Decode all the Clip IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row['ClipID'] for row in rows])
+    for (row, id) in zip(rows, ids):
         l.append((row['ClipNum'], id, row['CollectNum']))
     DBCursor.close()
     return l
@@ -2394,10 +3116,10 @@ def list_of_clips_by_collectionnum(collectionNum, includeSortOrder=False):
     query = FixQuery(query)
     cursor = get_db().cursor()
     cursor.execute(query, (collectionNum, ))
-    for (clipNum, clipID, collectNum, sortOrder) in cursor.fetchall():
-        id = clipID
-        if 'unicode' in wx.PlatformInfo:
-            id = ProcessDBDataForUTF8Encoding(id)
+    rows = cursor.fetchall()
+    # Decode all the Clip IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    for ((clipNum, clipID, collectNum, sortOrder), id) in zip(rows, ids):
         if includeSortOrder:
             clipList.append((clipNum, id, collectNum, sortOrder))
         else:
@@ -2405,6 +3127,27 @@ def list_of_clips_by_collectionnum(collectionNum, includeSortOrder=False):
     cursor.close()
     return clipList
 
+def page_of_clips_by_collectionnum(collectionNum, includeSortOrder=False, lastKey=None, pageSize=PAGE_SIZE):
+    """ Get one page of the list of the Clips in a Collection, in the same order and form as
+        list_of_clips_by_collectionnum().  See fetch_page(). """
+    # Get the page of Clips.  The key uses the Clips2_CollectNum index.
+    (rows, nextKey) = fetch_page(['ClipNum', 'ClipID', 'CollectNum', 'SortOrder'], 'Clips2', ['SortOrder', 'ClipID', 'ClipNum'],
+                                 ['CollectNum = %s'], (collectionNum, ), lastKey, pageSize)
+    # Decode all the Clip IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    # Build the page of Clips
+    clipList = []
+    for ((clipNum, clipID, collectNum, sortOrder), id) in zip(rows, ids):
+        if includeSortOrder:
+            clipList.append((clipNum, id, collectNum, sortOrder))
+        else:
+            clipList.append((clipNum, id, collectNum))
+    return (clipList, nextKey)
+
+def iter_clips_by_collectionnum(collectionNum, includeSortOrder=False, pageSize=PAGE_SIZE):
+    """ Iterate through the Clips in a Collection, in the same order as list_of_clips_by_collectionnum(), a page at a time """
+    return iter_pages(page_of_clips_by_collectionnum, collectionNum, includeSortOrder=includeSortOrder, pageSize=pageSize)
+
 def list_of_clips_by_episode(EpisodeNum, TimeCode=None):
     """Get a list of all Clips that have been created from a given Episode
     Number.  Optionally restrict list to contain only a given timecode."""
@@ -2546,6 +3289,20 @@ def list_of_snapshots():
     # Return the list as the funtion results
     return l
 
+def page_of_snapshots(lastKey=None, pageSize=PAGE_SIZE):
+    """ Get one page of the list of all Snapshots, regardless of collection, in Snapshot Number order.  See fetch_page(). """
+    # Get the page of Snapshots
+    (rows, nextKey) = fetch_page(['SnapshotNum', 'SnapshotID', 'CollectNum', 'SortOrder'], 'Snapshots2', ['SnapshotNum'],
+                                 lastKey=lastKey, pageSize=pageSize)
+    # Decode all the Snapshot IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    # Return the page, in the same form as list_of_snapshots()
+    return ([(snapshotNum, id, collectNum, sortOrder) for ((snapshotNum, snapshotID, collectNum, sortOrder), id) in zip(rows, ids)], nextKey)
+
+def iter_snapshots(pageSize=PAGE_SIZE):
+    """ Iterate through all Snapshots, regardless of collection, in Snapshot Number order, a page at a time """
+    return iter_pages(page_of_snapshots, pageSize=pageSize)
+
 def list_of_snapshots_by_episode(EpisodeNum, TimeCode=None):
     """Get a list of all Snapshots that have been attached to a given Episode
     Number.  Optionally restrict list to contain only a given timecode."""
@@ -2632,6 +3389,28 @@ def list_of_snapshots_by_collectionnum(collectionNum, includeSortOrder=False):
     cursor.close()
     return snapshotList
 
+def page_of_snapshots_by_collectionnum(collectionNum, includeSortOrder=False, lastKey=None, pageSize=PAGE_SIZE):
+    """ Get one page of the list of the Snapshots in a Collection, in the same order and form as
+        list_of_snapshots_by_collectionnum().  See fetch_page(). """
+    # Get the page of Snapshots.  The key uses the Snapshots2_CollectNum index.
+    (rows, nextKey) = fetch_page(['SnapshotNum', 'SnapshotID', 'CollectNum', 'SortOrder'], 'Snapshots2', ['SortOrder', 'SnapshotID', 'SnapshotNum'],
+                                 ['CollectNum = %s'], (collectionNum, ), lastKey, pageSize)
+    # Decode all the Snapshot IDs at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    # Build the page of Snapshots
+    snapshotList = []
+    for ((snapshotNum, snapshotID, collectNum, sortOrder), id) in zip(rows, ids):
+        if includeSortOrder:
+            snapshotList.append((snapshotNum, id, collectNum, sortOrder))
+        else:
+            snapshotList.append((snapshotNum, id, collectNum))
+    return (snapshotList, nextKey)
+
+def iter_snapshots_by_collectionnum(collectionNum, includeSortOrder=False, pageSize=PAGE_SIZE):
+    """ Iterate through the Snapshots in a Collection, in the same order as list_of_snapshots_by_collectionnum(),
+        a page at a time """
+    return iter_pages(page_of_snapshots_by_collectionnum, collectionNum, includeSortOrder=includeSortOrder, pageSize=pageSize)
+
 def GetSortOrderData(collectionNum):
     """ Get the Sort Order information for a Collection's Clips and Snapshots.
         This function returns a dictionary of sort orders which can be looked
@@ -3061,6 +3840,214 @@ def list_of_node_notes(** kwargs):
     # Return the list as the function results
     return notelist
 
+# The tables whose text is kept in the TextIndex2 table.  Each entry is
+# Object Type : (Table Name, Record Number Field, Text Field).
+TEXT_INDEX_TABLES = {'Note' :       ('Notes2',       'NoteNum',       'NoteText'),
+                     'Transcript' : ('Transcripts2', 'TranscriptNum', 'RTFText')}
+
+def _TextIndexRows(objectType, num, text):
+    """ Return the TextIndex2 rows for the text of record num of type objectType.  The first row has an empty
+        Word, which notes that the record has been indexed even if its text has no words. """
+    rows = [(objectType, num, '')]
+    # The words are always encoded as UTF-8, as the older encodings used with MySQL before 4.1 can't hold every
+    # word.  The Word column is only compared with search words encoded the same way.
+    for word in TextIndex.GetIndexWords(TextIndex.GetPlainText(text)):
+        rows.append((objectType, num, word.encode('utf8')))
+    return rows
+
+def _DBText(text):
+    """ Convert text from the database, which may be an array, to a string """
+    # (If MySQLDB returns an Array, convert it to a String!)
+    if type(text).__name__ == 'array':
+        if text.typecode == 'u':
+            return text.tounicode()
+        else:
+            return text.tostring()
+    return text
+
+def UpdateTextIndex(dbCursor, objectType, num, text):
+    """ Record the words in the text just saved in record num of type objectType (see TEXT_INDEX_TABLES) in the
+        TextIndex2 table.  Call this on the cursor used for the save, so it is part of the same transaction. """
+    # Remove the record's previous words
+    query = "DELETE FROM TextIndex2 WHERE ObjectType = %s AND ObjectNum = %s"
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    # Execute the query
+    dbCursor.execute(query, (objectType, num))
+    # Add the record's words
+    query = "INSERT INTO TextIndex2 (ObjectType, ObjectNum, Word) VALUES (%s, %s, %s)"
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    # Execute the query
+    dbCursor.executemany(query, _TextIndexRows(objectType, num, text))
+
+def SyncTextIndex(dbCursor, batchSize=500):
+    """ Bring the TextIndex2 table up to date with the Notes2 and Transcripts2 tables.  Records are normally indexed as
+        they are saved, but records that were deleted, imported, or added by an older version of Transana are caught
+        here. """
+    for objectType in TEXT_INDEX_TABLES.keys():
+        (tableName, numName, textName) = TEXT_INDEX_TABLES[objectType]
+        # Find the indexed records that no longer exist
+        query = """SELECT ObjectNum FROM TextIndex2
+                     WHERE ObjectType = '%s' AND
+                           Word = '' AND
+                           NOT EXISTS (SELECT 1 FROM %s
+                                         WHERE %s.%s = TextIndex2.ObjectNum)""" % (objectType, tableName, tableName, numName)
+        dbCursor.execute(query)
+        deletedNums = [row[0] for row in dbCursor.fetchall()]
+        # Remove their words, in batches
+        for start in range(0, len(deletedNums), batchSize):
+            batch = tuple(deletedNums[start:start + batchSize])
+            query = "DELETE FROM TextIndex2 WHERE ObjectType = '%s' AND ObjectNum IN (%s)" % (objectType, ', '.join(['%s'] * len(batch)))
+            # Adjust the query for sqlite if needed
+            query = FixQuery(query)
+            dbCursor.execute(query, batch)
+        # Find the records that haven't been indexed
+        query = """SELECT %s FROM %s
+                     WHERE NOT EXISTS (SELECT 1 FROM TextIndex2
+                                         WHERE ObjectType = '%s' AND
+                                               ObjectNum = %s.%s AND
+                                               Word = '')""" % (numName, tableName, objectType, tableName, numName)
+        dbCursor.execute(query)
+        newNums = [row[0] for row in dbCursor.fetchall()]
+        # Index them, in batches
+        for start in range(0, len(newNums), batchSize):
+            batch = tuple(newNums[start:start + batchSize])
+            query = "SELECT %s, %s FROM %s WHERE %s IN (%s)" % (numName, textName, tableName, numName, ', '.join(['%s'] * len(batch)))
+            # Adjust the query for sqlite if needed
+            query = FixQuery(query)
+            dbCursor.execute(query, batch)
+            rows = []
+            for (num, text) in dbCursor.fetchall():
+                rows += _TextIndexRows(objectType, num, _DBText(text))
+            query = "INSERT INTO TextIndex2 (ObjectType, ObjectNum, Word) VALUES (%s, %s, %s)"
+            # Adjust the query for sqlite if needed
+            query = FixQuery(query)
+            dbCursor.executemany(query, rows)
+        if DEBUG and (len(deletedNums) + len(newNums) > 0):
+            print "SyncTextIndex():", objectType, len(deletedNums), "removed,", len(newNums), "added"
+
+def RefreshTextIndex():
+    """ Bring the Text Index up to date with SyncTextIndex() the first time it is used after the database is opened.
+        Records saved after that are indexed as they are saved.  Returns False if the Text Index couldn't be updated. """
+    global _textIndexSynced
+    # If the Text Index has already been updated, there's nothing to do
+    if _textIndexSynced:
+        return True
+    # Get a Database Cursor
+    dbCursor = get_db().cursor()
+    # Begin a Transaction, so a partial update isn't left behind
+    dbCursor.execute("BEGIN")
+    try:
+        # Update the Text Index
+        SyncTextIndex(dbCursor)
+        # Commit the changes
+        dbCursor.execute("COMMIT")
+        _textIndexSynced = True
+    # If the update fails ...
+    except:
+
+        if DEBUG:
+            print "DBInterface.RefreshTextIndex():  Could not update the Text Index"
+            print sys.exc_info()[0], sys.exc_info()[1]
+
+        # ... roll back the changes.  Searches can still be done without the Text Index.
+        dbCursor.execute("ROLLBACK")
+    # Close the Database Cursor
+    dbCursor.close()
+    return _textIndexSynced
+
+def FindTextIndexMatches(objectType, searchText):
+    """ Return the set of numbers of the records of type objectType (see TEXT_INDEX_TABLES) that have index words
+        starting with each of the words in searchText.  As the Text Index holds the endings of words too (see
+        TextIndex.GetIndexWords()), this includes every record whose text contains searchText, even in the middle of a
+        word.  The text of these records must still be checked for searchText.  Returns None if the Text Index can't
+        help with the search, as when searchText has no words. """
+    # Get the words in the search text
+    words = TextIndex.GetWords(searchText)
+    # If there aren't any, the index can't help
+    if len(words) == 0:
+        return None
+    # Make sure the Text Index is up to date.  If it can't be, the index can't help.
+    if not RefreshTextIndex():
+        return None
+    # Get a Database Cursor
+    dbCursor = get_db().cursor()
+    # Initialize the results
+    results = None
+    # Find the records with each word, starting with the longest, which is likely to be found in the fewest records
+    for word in sorted(words, key=len, reverse=True):
+        # A range query on the TextIndex2_Word index finds the words with the right prefix.  (LIKE can't be used, as
+        # it would need the "_" character escaped.)
+        query = "SELECT DISTINCT ObjectNum FROM TextIndex2 WHERE ObjectType = %s AND Word >= %s AND Word < %s"
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        # Index words are encoded as UTF-8 (see _TextIndexRows()), so the upper bound is the encoded word followed by the
+        # encoding of the highest character a word can have.  (A "\xff" byte would not be valid UTF-8 for MySQL.)
+        encodedWord = word.encode('utf8')
+        dbCursor.execute(query, (objectType, encodedWord, encodedWord + u'\uffff'.encode('utf8')))
+        nums = set([row[0] for row in dbCursor.fetchall()])
+        # Keep the records that have all the words so far
+        if results == None:
+            results = nums
+        else:
+            results &= nums
+        # If no records are left, we're done
+        if len(results) == 0:
+            break
+    # Close the Database Cursor
+    dbCursor.close()
+    return results
+
+def _NoteSearchCondition(searchText):
+    """ Return the SQL condition that limits Notes to the ones the Text Index shows might contain searchText, or None
+        if the Text Index can't help.  Returns '1 = 0' if no Notes can contain searchText. """
+    # Look up the Notes in the Text Index
+    noteNums = FindTextIndexMatches('Note', searchText)
+    # If the Text Index can't help, there's no condition
+    if noteNums == None:
+        return None
+    # If no Notes match, the condition is always false
+    elif len(noteNums) == 0:
+        return '1 = 0'
+    # Otherwise, limit the search to the Notes that may match.  (They are record numbers, so they can be
+    # included in the query directly.)
+    else:
+        return 'NoteNum IN (%s)' % ', '.join(['%d' % noteNum for noteNum in sorted(noteNums)])
+
+def list_transcripts_with_text(searchText, batchSize=500):
+    """ Return a list of the (TranscriptNum, EpisodeNum, ClipNum) values of the Transcripts whose text contains
+        searchText, without regard to case or formatting.  When it can, the Text Index narrows the search, so only the
+        Transcripts that have the words in searchText are read. """
+    # Initialize the results
+    results = []
+    # Look up the Transcripts in the Text Index
+    transcriptNums = FindTextIndexMatches('Transcript', searchText)
+    # Get a Database Cursor
+    dbCursor = get_db().cursor()
+    # If the Text Index can't help, we need to check all the Transcripts
+    if transcriptNums == None:
+        dbCursor.execute("SELECT TranscriptNum FROM Transcripts2")
+        transcriptNums = [row[0] for row in dbCursor.fetchall()]
+    # Sort the Transcript numbers so the batches are consistent
+    transcriptNums = sorted(transcriptNums)
+    # Compare search text to the plain text in lower case
+    searchText = TextIndex.GetPlainText(searchText).lower()
+    # Check the Transcripts in batches
+    for start in range(0, len(transcriptNums), batchSize):
+        batch = tuple(transcriptNums[start:start + batchSize])
+        query = "SELECT TranscriptNum, EpisodeNum, ClipNum, RTFText FROM Transcripts2 WHERE TranscriptNum IN (%s)" % ', '.join(['%s'] * len(batch))
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        dbCursor.execute(query, batch)
+        for (transcriptNum, episodeNum, clipNum, text) in dbCursor.fetchall():
+            # If the Transcript's plain text includes the search text, it's a match
+            if TextIndex.GetPlainText(_DBText(text)).lower().find(searchText) > -1:
+                results.append((transcriptNum, episodeNum, clipNum))
+    # Close the Database Cursor
+    dbCursor.close()
+    return results
+
 def list_of_all_notes(reportType=None, searchText=None):
     """ Get a list of all Notes for the Notes Browser """
     # initialize the Notes List as empty
@@ -3096,6 +4083,10 @@ def list_of_all_notes(reportType=None, searchText=None):
             query += " AND "
         else:
             query += " WHERE "
+        # Use the Text Index to limit the search to the Notes that might contain the text, so only their text is read
+        condition = _NoteSearchCondition(searchText)
+        if condition != None:
+            query += condition + " AND "
         query += "LOWER(CAST(NoteText AS CHAR)) like '%%%s%%'" % searchText.lower().encode(TransanaGlobal.encoding)
         
     # We always want to sort by NoteID
@@ -3132,17 +4123,60 @@ def list_of_all_notes(reportType=None, searchText=None):
     # Return the Note List as the Function Result
     return notelist
 
+def page_of_all_notes(reportType=None, searchText=None, lastKey=None, pageSize=PAGE_SIZE):
+    """ Get one page of the list of Notes for the Notes Browser, in the same order and form as list_of_all_notes().
+        See fetch_page(). """
+    # Initialize the conditions and their values
+    conditions = []
+    values = ()
+    # If we want a single report type, limit the query to notes of that type
+    if reportType != None:
+        conditions.append("%s <> 0" % {'SeriesNode' : 'SeriesNum',
+                                      'EpisodeNode' : 'EpisodeNum',
+                                      'TranscriptNode' : 'TranscriptNum',
+                                      'CollectionNode' : 'CollectNum',
+                                      'ClipNode' : 'ClipNum',
+                                      'SnapshotNode' : 'SnapshotNum'}[reportType])
+    # If searchText is passed in, we want to limit the results to notes containing that text.
+    if searchText != None:
+        # Use the Text Index to limit the search to the Notes that might contain the text, so only their text is read
+        condition = _NoteSearchCondition(searchText)
+        if condition != None:
+            conditions.append(condition)
+        conditions.append("LOWER(CAST(NoteText AS CHAR)) LIKE %s")
+        values += ('%' + searchText.lower().encode(TransanaGlobal.encoding) + '%', )
+    # Get the page of Notes, sorted by NoteID.  (NoteNum makes the key unique.)
+    (rows, nextKey) = fetch_page(['NoteNum', 'NoteID', 'SeriesNum', 'EpisodeNum', 'TranscriptNum', 'CollectNum', 'ClipNum', 'SnapshotNum', 'NoteTaker'],
+                                 'Notes2', ['NoteID', 'NoteNum'], conditions, values, lastKey, pageSize)
+    # Decode all the Note IDs and Note Takers at once
+    ids = ProcessDBColumnForUTF8Encoding([row[1] for row in rows])
+    noteTakers = ProcessDBColumnForUTF8Encoding([row[8] for row in rows])
+    # Build the page of Note dictionaries
+    notelist = []
+    for (row, ID, noteTaker) in zip(rows, ids, noteTakers):
+        notelist.append({'NoteNum' : row[0],
+                         'NoteID' : ID,
+                         'SeriesNum' : row[2],
+                         'EpisodeNum' : row[3],
+                         'TranscriptNum' : row[4],
+                         'CollectionNum' : row[5],
+                         'ClipNum' : row[6],
+                         'SnapshotNum' : row[7],
+                         'NoteTaker' : noteTaker})
+    return (notelist, nextKey)
+
+def iter_all_notes(reportType=None, searchText=None, pageSize=PAGE_SIZE):
+    """ Iterate through the Notes for the Notes Browser, in the same order as list_of_all_notes(), a page at a time """
+    return iter_pages(page_of_all_notes, reportType=reportType, searchText=searchText, pageSize=pageSize)
+
 def list_of_keyword_groups():
     """Get a list of all keyword groups."""
     l = []
     query = "SELECT KeywordGroup FROM Keywords2 GROUP BY KeywordGroup"
     DBCursor = get_db().cursor()
     DBCursor.execute(query)
-    for row in fetchall_named(DBCursor):
-        id = row['KeywordGroup']
-        if 'unicode' in wx.PlatformInfo:
-            id = ProcessDBDataForUTF8Encoding(id)
-        l.append(id)
+    # Decode all the Keyword Groups at once
+    l = ProcessDBColumnForUTF8Encoding([row['KeywordGroup'] for row in fetchall_named(DBCursor)])
     DBCursor.close()
     return l
 
@@ -3156,11 +4190,8 @@ def list_of_keywords_by_group(KeywordGroup):
     query = FixQuery(query)
     DBCursor = get_db().cursor()
     DBCursor.execute(query, (KeywordGroup, ))
-    for row in fetchall_named(DBCursor):
-        id = row['Keyword']
-        if 'unicode' in wx.PlatformInfo:
-            id = ProcessDBDataForUTF8Encoding(id)
-        l.append(id)
+    # Decode all the Keywords at once
+    l = ProcessDBColumnForUTF8Encoding([row['Keyword'] for row in fetchall_named(DBCursor)])
     DBCursor.close()
     return l
 
@@ -3353,35 +4384,259 @@ def check_username_as_keyword():
         return False
 
 
+# The tables whose media file names are kept in the MediaPaths2 table.  Each entry is
+# (Table Name, Record Number Field, Media File Field).
+MEDIA_PATH_TABLES = (('Episodes2',       'EpisodeNum',  'MediaFile'),
+                     ('Clips2',          'ClipNum',     'MediaFile'),
+                     ('AdditionalVids2', 'AddVidNum',   'MediaFile'),
+                     ('Snapshots2',      'SnapshotNum', 'ImageFile'))
+
+def NormalizeMediaPath(mediaFile):
+    """ Return a media file name in the form used for comparing paths.  Files are stored in the database inconsistently,
+        sometimes with a single separator character and sometimes with a pair, probably because of differences between
+        how Delphi and Python stored them.  Doubled backslashes are made single, and backslashes are replaced with the
+        more universal slash character. """
+    # (Python requires a double backslash in a string to represent a single backslash, so this replaces double
+    # backslashes ('\\') with single ones ('\') even though it looks like it replaces quadruples with doubles.)
+    mediaFile = mediaFile.replace('\\\\', '\\')
+    # Now replace the backslash with the slash character
+    return mediaFile.replace('\\', '/')
+
+def _MediaPathValues(mediaFile):
+    """ Return the (MediaPath, FileName) values for the MediaPaths2 table for a unicode media file name """
+    # Normalize the path
+    mediaPath = NormalizeMediaPath(mediaFile)
+    # The File Name is the upper case file name without its path, as file names are compared without regard to case
+    fileName = mediaPath.split('/')[-1].upper()
+    # Encode the values for the database
+    return (mediaPath.encode(TransanaGlobal.encoding), fileName.encode(TransanaGlobal.encoding))
+
+def _DecodeMediaFile(mediaFile):
+    """ Convert a media file name from the database to unicode """
+    # If we're using Unicode ...
+    if 'unicode' in wx.PlatformInfo:
+        # ... then decode the file name appropriately
+        return ProcessDBDataForUTF8Encoding(mediaFile)
+    # Otherwise, use the value as is
+    return mediaFile
+
+def UpdateMediaPath(dbCursor, tableName, recNum, mediaFile):
+    """ Record the media file name just saved in record recNum of tableName (see MEDIA_PATH_TABLES) in the MediaPaths2
+        table.  mediaFile must be the value exactly as it was saved.  Call this on the cursor used for the save, so
+        it is part of the same transaction. """
+    # Remove any previous entry for the record
+    query = "DELETE FROM MediaPaths2 WHERE TableName = %s AND RecNum = %s"
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    # Execute the query
+    dbCursor.execute(query, (tableName, recNum))
+    # If the record has a media file ...
+    if mediaFile != None:
+        # ... get the unicode form of the file name.  It's encoded if we're using Unicode.
+        if isinstance(mediaFile, str):
+            tempMediaFile = mediaFile.decode(TransanaGlobal.encoding)
+        else:
+            tempMediaFile = mediaFile
+        # Define the query to add the entry
+        query = "INSERT INTO MediaPaths2 (TableName, RecNum, MediaFile, MediaPath, FileName) VALUES (%s, %s, %s, %s, %s)"
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        # Execute the query
+        dbCursor.execute(query, (tableName, recNum, mediaFile) + _MediaPathValues(tempMediaFile))
+
+def SyncMediaPaths(dbCursor):
+    """ Bring the MediaPaths2 table up to date with the Episodes2, Clips2, AdditionalVids2, and Snapshots2 tables.
+        Records are normally added to MediaPaths2 as they are saved, but records that were deleted, imported, or
+        saved by an older version of Transana are caught here.  Entries are checked against the stored media file
+        name in SQL, so only new or changed records are processed in Python. """
+    # For each table that has media files ...
+    for (tableName, numName, fileName) in MEDIA_PATH_TABLES:
+        # ... remove the entries for records that no longer exist or whose media file has changed
+        query = """DELETE FROM MediaPaths2
+                     WHERE TableName = '%s' AND
+                           NOT EXISTS (SELECT 1 FROM %s
+                                         WHERE %s.%s = MediaPaths2.RecNum AND
+                                               %s.%s = MediaPaths2.MediaFile)""" % (tableName, tableName, tableName, numName, tableName, fileName)
+        dbCursor.execute(query)
+        # ... and add entries, not yet normalized, for the records that don't have one
+        query = """INSERT INTO MediaPaths2 (TableName, RecNum, MediaFile)
+                     SELECT '%s', %s, %s FROM %s
+                       WHERE %s IS NOT NULL AND
+                             NOT EXISTS (SELECT 1 FROM MediaPaths2
+                                           WHERE TableName = '%s' AND
+                                                 RecNum = %s.%s)""" % (tableName, numName, fileName, tableName, fileName, tableName, tableName, numName)
+        dbCursor.execute(query)
+    # Get the entries that haven't been normalized yet
+    query = "SELECT TableName, RecNum, MediaFile FROM MediaPaths2 WHERE MediaPath IS NULL"
+    dbCursor.execute(query)
+    # Calculate their normalized values
+    values = []
+    for (tableName, recNum, mediaFile) in dbCursor.fetchall():
+        values.append(_MediaPathValues(_DecodeMediaFile(mediaFile)) + (tableName, recNum))
+    # If there are any ...
+    if len(values) > 0:
+        # ... update them all at once
+        query = "UPDATE MediaPaths2 SET MediaPath = %s, FileName = %s WHERE TableName = %s AND RecNum = %s"
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        dbCursor.executemany(query, values)
+
+def _MediaPathMatches(dbCursor, query, values):
+    """ Run a query against MediaPaths2 that returns (TableName, RecNum, MediaPath), and return a dictionary of
+        lists of (RecNum, MediaPath) by Table Name, with the MediaPaths in unicode """
+    # Initialize the results with every table, so callers don't have to check for missing tables
+    results = {}
+    for (tableName, numName, fileName) in MEDIA_PATH_TABLES:
+        results[tableName] = []
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    # Execute the query
+    dbCursor.execute(query, values)
+    # Add each entry to the results
+    for (tableName, recNum, mediaPath) in dbCursor.fetchall():
+        results[tableName].append((recNum, _DecodeMediaFile(mediaPath)))
+    return results
+
+def FindMediaPathsByPrefix(dbCursor, prefix):
+    """ Return the records whose normalized media file names start with prefix, which should already be normalized.
+        Returns a dictionary of lists of (RecNum, MediaPath) by Table Name. """
+    # A range query on the MediaPaths2_MediaPath index finds the candidates.  (LIKE can't be used, as it isn't case
+    # sensitive in sqlite and would need the "%" and "_" characters in the path escaped.)
+    query = "SELECT TableName, RecNum, MediaPath FROM MediaPaths2 WHERE MediaPath >= %s AND MediaPath < %s"
+    # Encode the prefix for the lower bound
+    lowerBound = prefix.encode(TransanaGlobal.encoding)
+    # The upper bound is the prefix followed by the highest character the encoding has
+    try:
+        upperBound = (prefix + u'\uffff').encode(TransanaGlobal.encoding)
+    # The legacy encodings used with MySQL before 4.1 (latin1, koi8_r, and so on) can't encode u'\uffff', so
+    # follow the encoded prefix with the highest byte instead
+    except UnicodeEncodeError:
+        upperBound = lowerBound + '\xff'
+    results = _MediaPathMatches(dbCursor, query, (lowerBound, upperBound))
+    # Check the prefix exactly, in case the database compares strings differently than Python
+    for tableName in results.keys():
+        results[tableName] = [(recNum, mediaPath) for (recNum, mediaPath) in results[tableName] if mediaPath[:len(prefix)] == prefix]
+    return results
+
+def FindMediaPathsByFileName(dbCursor, fileName):
+    """ Return the records whose media file names, without their paths, match fileName without regard to case.
+        Returns a dictionary of lists of (RecNum, MediaPath) by Table Name. """
+    # Look up the file name on the MediaPaths2_FileName index
+    query = "SELECT TableName, RecNum, MediaPath FROM MediaPaths2 WHERE FileName = %s"
+    return _MediaPathMatches(dbCursor, query, (fileName.upper().encode(TransanaGlobal.encoding), ))
+
+def _AdditionalVidParents(dbCursor, addVidNums, batchSize=500):
+    """ Return a dictionary of (EpisodeNum, ClipNum) for each of the Additional Video records in addVidNums """
+    # Initialize the results
+    results = {}
+    # Process the records in batches
+    for start in range(0, len(addVidNums), batchSize):
+        batch = addVidNums[start:start + batchSize]
+        # Define the query for this batch
+        query = "SELECT AddVidNum, EpisodeNum, ClipNum FROM AdditionalVids2 WHERE AddVidNum IN (%s)" % ', '.join(['%s'] * len(batch))
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        # Execute the query
+        dbCursor.execute(query, tuple(batch))
+        for (addVidNum, episodeNum, clipNum) in dbCursor.fetchall():
+            results[addVidNum] = (episodeNum, clipNum)
+    return results
+
+def LockedRecords(dbCursor, tableName, numName, recNums, batchSize=500, forUpdate=False):
+    """ Return a dictionary of the lock holders of the records in recNums in tableName that are locked, by record
+        number.  As in DataObject.lock_record(), a record is locked if it has a RecordLock that is less than a day old.
+        If forUpdate is True, the records are about to be updated directly within the current transaction.  MySQL then
+        holds the rows until the transaction ends, so no other user can lock them between the check and the update. """
+    # Initialize the results
+    results = {}
+    # Make a list of the record numbers, in case we are passed a set
+    recNums = list(recNums)
+    # Process the records in batches
+    for start in range(0, len(recNums), batchSize):
+        batch = recNums[start:start + batchSize]
+        # If we're updating the records using MySQL ...
+        if forUpdate and (TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']):
+            # ... read ALL of the records FOR UPDATE, so the unlocked ones can't be locked before we're done with them.
+            # (sqlite is single-user, so there's no one else to lock them.)
+            query = "SELECT %s, RecordLock, LockTime FROM %s WHERE %s IN (%s) FOR UPDATE" % (numName, tableName, numName, ', '.join(['%s'] * len(batch)))
+        else:
+            # Define the query for this batch
+            query = "SELECT %s, RecordLock, LockTime FROM %s WHERE RecordLock <> '' AND %s IN (%s)" % (numName, tableName, numName, ', '.join(['%s'] * len(batch)))
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        # Execute the query
+        dbCursor.execute(query, tuple(batch))
+        for (recNum, recordLock, lockTime) in dbCursor.fetchall():
+            # If the lock is current, note the record
+            if (recordLock != None) and (recordLock != '') and (lockTime != None) and ((ServerDateTime() - lockTime).days <= 1):
+                results[recNum] = recordLock
+    return results
+
+def _UpdateMediaFiles(dbCursor, tableName, changes):
+    """ Change the media file names of the records in tableName to the new values in changes, a list of
+        (RecNum, New Media File) with the new names in unicode, and update MediaPaths2 to match.  As in the objects'
+        db_save() methods, the Video Root is removed from names that start with it.  The records are updated directly,
+        so the caller must make sure they aren't locked, using LockedRecords() with forUpdate=True. """
+    # If there are no changes, there's nothing to do
+    if len(changes) == 0:
+        return
+    # Look up the record number and media file field names for the table
+    for (table, numName, fileName) in MEDIA_PATH_TABLES:
+        if table == tableName:
+            break
+    # Get the Video Root
+    videoPath = TransanaGlobal.configData.videoPath
+    # Initialize the values for the queries
+    values = []
+    mediaPathValues = []
+    # For each change ...
+    for (recNum, mediaFile) in changes:
+        # If the file is on the Video Root, store it relative to the Video Root, as the Save methods do
+        if (videoPath != '') and (videoPath == mediaFile[:len(videoPath)]):
+            mediaFile = mediaFile[len(videoPath):]
+        # Substitute the generic OS seperator "/" for the Windows "\", as the Save methods do.
+        mediaFile = NormalizeMediaPath(mediaFile)
+        # If we're using Unicode, encode the file name
+        if 'unicode' in wx.PlatformInfo:
+            tempMediaFile = mediaFile.encode(TransanaGlobal.encoding)
+        else:
+            tempMediaFile = mediaFile
+        values.append((tempMediaFile, recNum))
+        mediaPathValues.append((tempMediaFile, ) + _MediaPathValues(mediaFile) + (tableName, recNum))
+    # Update the records all at once
+    query = "UPDATE %s SET %s = %%s WHERE %s = %%s" % (tableName, fileName, numName)
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    dbCursor.executemany(query, values)
+    # Update the Media Paths all at once
+    query = "UPDATE MediaPaths2 SET MediaFile = %s, MediaPath = %s, FileName = %s WHERE TableName = %s AND RecNum = %s"
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    dbCursor.executemany(query, mediaPathValues)
+
 def VideoFilePaths(filePath, update=False):
     """ This method returns the number of Collections and Clips that would be affected by
         implementing the Video Root Path, and optionally makes the changes. """
 
-    # Okay, this wasn't simple.  It's convoluted, but the simple way doesn't work.
-    #
-    # First, I can't make the query "SELECT * FROM Episodes2 WHERE MediaFile LIKE 'V:\Demo\%'" work.
-    # Something about the "%" character breaks it, and I tried many things that didn't help.
-    #
-    # Second, files appear to be stored in the database inconsistently, sometimes with a single
-    # separator character and sometimes with a pair.  This is probably a difference between how
-    # Delphi and Python store the path separators as part of file names.  But the end result is that
-    # the SQL "LIKE" comparison fails sometimes when it should succeed because "V:\Demo" isn't
-    # LIKE "V:\\Demo".
-    #
-    # The solution I've come up with is to pull ALL the file names and do the comparisons manually.
-    # You are welcome to optimize this code if you can figure out a better way.
-    #
-    # David Woods
-    # 1/27/2004
+    # Files are stored in the database inconsistently, sometimes with a single separator character and sometimes
+    # with a pair, so the SQL "LIKE" comparison fails sometimes when it should succeed because "V:\Demo" isn't
+    # LIKE "V:\\Demo".  We used to pull ALL the file names and do the comparisons manually.  Now the MediaPaths2
+    # table keeps a normalized copy of each file name, indexed so records can be found by path prefix, and the
+    # changes are made with a handful of bulk UPDATEs.
+
     # If the filePath is empty, just return.  This happens when the user deletes the Video Path.
     if filePath == '':
         return (0, 0)
+    # Replace the backslash with the more universal slash character in the filePath
+    filePath = filePath.replace('\\', '/')
+    # Make sure the filePath is unicode
+    if isinstance(filePath, str):
+        filePath = filePath.decode(TransanaGlobal.encoding)
 
     # Get a Database Cursor
     dbCursor = get_db().cursor()
     # If update is True, but some records are locked, we will need to know that the Database Transaction
-    # needs to be rolled back.  If it fails early, we may skip some of the processing that becomes clearly
-    # pointless.  Here, we declare a variable to track whether we should continue with the Transaction.
+    # needs to be rolled back.  Here, we declare a variable to track whether we should continue with the Transaction.
     # It needs to be declared regardless of update status.
     transactionStatus = True
     # If we are updating records, begin a Transaction so that everything can be undone
@@ -3389,195 +4644,50 @@ def VideoFilePaths(filePath, update=False):
     if update:
         dbCursor.execute("BEGIN")
 
-    # Initialize the Episode Counter        
-    episodeCount = 0
-    # Create the Query for the Episode Table
-    query = "SELECT EpisodeNum, MediaFile FROM Episodes2 "
-    # Execute the Query
-    dbCursor.execute(query)
-    # Fetch all the Database Results, and process them row by row
-    for (episodeNum, mediafile) in dbCursor.fetchall():
-        # If we're using Unicode ...
-        if 'unicode' in wx.PlatformInfo:
-            # ... then encode the file names appropriately
-            mediafile = ProcessDBDataForUTF8Encoding(mediafile)
-        # Some Filenames have doubled backslashes, though not all do.  Let's eliminate them if they are present.
-        # (Python requires a double backslash in a string to represent a single backslash, so this replaces double
-        # backslashes ('\\') with single ones ('\') even though it looks like it replaces quadruples with doubles.)
-        mediafile = string.replace(mediafile, '\\\\', '\\')
-        # Now replace the backslash with the more universal slash character in both the file name and the filePath
-        mediafile = string.replace(mediafile, '\\', '/')
-        filePath = string.replace(filePath, '\\', '/')
-        # Compare the Video Root filePath passed in with the front portion of the File Name from the Database.
-        if filePath == mediafile[:len(filePath)]:
-            # If they are the same, increment the Episode Counter
+    # Make sure the Media Paths are up to date
+    SyncMediaPaths(dbCursor)
+    # Find the records whose media files are on the Video Root filePath
+    matches = FindMediaPathsByPrefix(dbCursor, filePath)
+    # Find the Episodes and Clips the Additional Videos belong to
+    parents = _AdditionalVidParents(dbCursor, [addVidNum for (addVidNum, mediafile) in matches['AdditionalVids2']])
+    # Note the Episodes and Clips that are affected
+    episodeNums = set([episodeNum for (episodeNum, mediafile) in matches['Episodes2']])
+    clipNums = set([clipNum for (clipNum, mediafile) in matches['Clips2']])
+    for (addVidNum, mediafile) in matches['AdditionalVids2']:
+        (episodeNum, clipNum) = parents.get(addVidNum, (0, 0))
+        if clipNum > 0:
+            clipNums.add(clipNum)
+        elif episodeNum > 0:
+            episodeNums.add(episodeNum)
+    # Count the records.  Additional Videos are counted with the records they belong to.
+    episodeCount = len(matches['Episodes2'])
+    clipCount = len(matches['Clips2'])
+    for (addVidNum, mediafile) in matches['AdditionalVids2']:
+        if parents.get(addVidNum, (0, 0))[1] > 0:
+            clipCount += 1
+        else:
             episodeCount += 1
-            # If update is True, we should update the records we find.
-            if update:
-                # Load the Episode using the Episode Number.
-                tempEpisode = Episode.Episode(episodeNum)
-                # We need a "try .. except" block to catch record lock exceptions
-                try:
-                    # Try to lock the Episode
-                    tempEpisode.lock_record()
-                    # Remove the Video Root from the File Name
-                    tempEpisode.media_filename = mediafile[len(filePath):]
-                    # Save the Episode
-                    tempEpisode.db_save()
-                    # Unlock the Episode
-                    tempEpisode.unlock_record()
-                # Catch failed record locks or Saves
-                except:
-                    # TODO:  Detect exception type and customize the error message below.
-                    print sys.exc_info()[0], sys.exc_info()[1]
-
-                    # If it fails, set the transactionStatus Flag to False
-                    transactionStatus = False
-                    # and stop processing records.
-                    break
-
-    # If we've already failed, there's no reason to continue trying.  Make sure we should continue.
-    if transactionStatus:
-        # Initialize the Clip Counter
-        clipCount = 0
-        # Create the Query for the Episode Table
-        query = "SELECT ClipNum, MediaFile FROM Clips2 "
-        # Execute the Query
-        dbCursor.execute(query)
-        # Fetch all the Database Results, and process them row by row
-        for (clipNum, mediafile) in dbCursor.fetchall():
-            # If we're using Unicode ...
-            if 'unicode' in wx.PlatformInfo:
-                # ... then encode the file names appropriately
-                mediafile = ProcessDBDataForUTF8Encoding(mediafile)
-            # Some Filenames have doubled backslashes, though not all do.  Let's eliminate them if they are present.
-            # (Python requires a double backslash in a string to represent a single backslash, so this replaces double
-            # backslashes ('\\') with single ones ('\') even though it looks like it replaces quadruples with doubles.)
-            mediafile = string.replace(mediafile, '\\\\', '\\')
-            # Now replace the backslash with the more universal slash character in both the file name and the filePath
-            mediafile = string.replace(mediafile, '\\', '/')
-            filePath = string.replace(filePath, '\\', '/')
-            # Compare the Video Root filePath passed in with the front portion of the File Name from the Database.
-            if filePath == mediafile[:len(filePath)]:
-                # If they are the same, increment the Clip Counter
-                clipCount += 1
-                # If update is True, we should update the record we find.
-                if update:
-                    # Load the Clip using the Clip Number. 
-                    tempClip = Clip.Clip(clipNum)
-                    # We need a "try .. except" block to catch record lock exceptions
-                    try:
-                        # Try to lock the Episode
-                        tempClip.lock_record()
-                        # Remove the Video Root from the File Name
-                        tempClip.media_filename = mediafile[len(filePath):]
-                        # Save the Clip
-                        tempClip.db_save()
-                        # Unlock the Clip
-                        tempClip.unlock_record()
-                    # Catch failed record locks or Saves
-                    except:
-                        # TODO:  Detect exception type and customize the error message below.
-                        print sys.exc_info()[0], sys.exc_info()[1]
-                        import traceback
-                        traceback.print_exc(file=sys.stdout)
-
-                        # If it fails, set the transactionStatus Flag to False
-                        transactionStatus = False
-                        # and stop processing records.
-                        break
-
-    if transactionStatus:
-        # Create the Query for the Episode Table
-        query = "SELECT EpisodeNum, ClipNum, MediaFile FROM AdditionalVids2 "
-        # Execute the Query
-        dbCursor.execute(query)
-        # Fetch all the Database Results, and process them row by row
-        for (episodeNum, clipNum, mediafile) in dbCursor.fetchall():
-            # If we're using Unicode ...
-            if 'unicode' in wx.PlatformInfo:
-                # ... then encode the file names appropriately
-                mediafile = ProcessDBDataForUTF8Encoding(mediafile)
-            # Some Filenames have doubled backslashes, though not all do.  Let's eliminate them if they are present.
-            # (Python requires a double backslash in a string to represent a single backslash, so this replaces double
-            # backslashes ('\\') with single ones ('\') even though it looks like it replaces quadruples with doubles.)
-            mediafile = string.replace(mediafile, '\\\\', '\\')
-            # Now replace the backslash with the more universal slash character in both the file name and the filePath
-            mediafile = string.replace(mediafile, '\\', '/')
-            filePath = string.replace(filePath, '\\', '/')
-            # Compare the Video Root filePath passed in with the front portion of the File Name from the Database.
-            if filePath == mediafile[:len(filePath)]:
-                # If they are the same, increment the appropriate Counter
-                if clipNum > 0:
-                    clipCount += 1
-                else:
-                    episodeCount += 1
-                # If update is True, we should update the record we find.
-                if update:
-                    if clipNum > 0:
-                        # Load the Clip using the Clip Number.
-                        tempClip = Clip.Clip(clipNum)
-                        # We need a "try .. except" block to catch record lock exceptions
-                        try:
-                            # Try to lock the Episode
-                            tempClip.lock_record()
-                            # Remove the Video Root from the File Name
-                            # Start by initializing a file counter to 0
-                            filCount = 0
-                            # Iterate through the Additional Media Files ...
-                            for fil in tempClip.additional_media_files:
-                                # ... if the data from the database matches the data passed in by parameter ...
-                                if (mediafile.upper().replace('/', os.sep) == fil['filename'].upper()):
-                                    # ... then rename the Clip's Additional Media File
-                                    tempClip.additional_media_files[filCount]['filename'] = mediafile[len(filePath):]
-                                    # Iterate the file counter
-                                    filCount += 1
-                            # Save the Clip
-                            tempClip.db_save()
-                            # Unlock the Clip
-                            tempClip.unlock_record()
-                        # Catch failed record locks or Saves
-                        except:
-                            # TODO:  Detect exception type and customize the error message below.
-                            print sys.exc_info()[0], sys.exc_info()[1]
-                            import traceback
-                            traceback.print_exc(file=sys.stdout)
-
-                            # If it fails, set the transactionStatus Flag to False
-                            transactionStatus = False
-                            # and stop processing records.
-                            break
-                    else:
-                       # Load the Episode using the Episode Number.
-                        tempEpisode = Episode.Episode(episodeNum)
-                        # We need a "try .. except" block to catch record lock exceptions
-                        try:
-                            # Try to lock the Episode
-                            tempEpisode.lock_record()
-                            # Remove the Video Root from the File Name
-                            # Start by initializing a file counter to 0
-                            filCount = 0
-                            # Iterate through the Additional Media Files ...
-                            for fil in tempEpisode.additional_media_files:
-                                # ... if the data from the database matches the data passed in by parameter ...
-                                if (mediafile.upper().replace('/', os.sep) == fil['filename'].upper()):
-                                    # ... then rename the Clip's Additional Media File
-                                    tempEpisode.additional_media_files[filCount]['filename'] = mediafile[len(filePath):]
-                                    # Iterate the file counter
-                                    filCount += 1
-                            # Save the Episode
-                            tempEpisode.db_save()
-                            # Unlock the Episode
-                            tempEpisode.unlock_record()
-                        # Catch failed record locks or Saves
-                        except:
-                            # TODO:  Detect exception type and customize the error message below.
-                            print sys.exc_info()[0], sys.exc_info()[1]
 
-                            # If it fails, set the transactionStatus Flag to False
-                            transactionStatus = False
-                            # and stop processing records.
-                            break
+    # If update is True, we should update the records we found.
+    if update:
+        # If any of the Episodes or Clips are locked, we can't update them.
+        if (len(LockedRecords(dbCursor, 'Episodes2', 'EpisodeNum', episodeNums, forUpdate=True)) > 0) or \
+           (len(LockedRecords(dbCursor, 'Clips2', 'ClipNum', clipNums, forUpdate=True)) > 0):
+            transactionStatus = False
+        else:
+            try:
+                # Remove the Video Root from the File Names
+                for tableName in ['Episodes2', 'Clips2', 'AdditionalVids2']:
+                    _UpdateMediaFiles(dbCursor, tableName, [(recNum, mediafile[len(filePath):]) for (recNum, mediafile) in matches[tableName]])
+            # Catch failed updates
+            except:
+                if DEBUG:
+                    (exctype, excvalue) = sys.exc_info()[:2]
+                    print "DBInterface.VideoFilePaths() Exception: \n%s\n%s" % (exctype, excvalue)
+                # If it fails, set the transactionStatus Flag to False
+                transactionStatus = False
+            # Objects loaded before the update have the old file names
+            DataObjectCache.Clear()
 
     # If we are updating data...
     if update:
@@ -3616,37 +4726,112 @@ def IsDatabaseEmpty():
     dbCursor.close()
     return result
         
+class NamedRow(tuple):
+    """ A row result whose values can be read by database field name, as in row['ClipID'], as well as by position.
+        Rows are tuples, so they take no more memory than the rows the cursor returns.  A sub-class that knows the
+        field names is created once for each distinct cursor description by named_row_class(). """
+    # Rows don't need a dictionary of their own
+    __slots__ = ()
+    # The field names, in column order
+    _fields = ()
+    # A dictionary of the column position for each field name
+    _index = {}
+
+    def __getitem__(self, key):
+        """ Get a value by field name or by position """
+        # If we're passed a field name ...
+        if isinstance(key, basestring):
+            # ... look up its position
+            key = self._index[key]
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """ Get a value by field name, or the default if there's no such field """
+        # If there's no such field ...
+        if not self._index.has_key(key):
+            # ... return the default
+            return default
+        return tuple.__getitem__(self, self._index[key])
+
+    def has_key(self, key):
+        """ Determine whether the row has the named field """
+        return self._index.has_key(key)
+
+    def keys(self):
+        """ Return a list of the field names """
+        return list(self._fields)
+
+    def values(self):
+        """ Return a list of the values """
+        return list(self)
+
+    def items(self):
+        """ Return a list of (field name, value) pairs """
+        return zip(self._fields, self)
+
+    def __repr__(self):
+        """ Show the field names along with the values """
+        return 'NamedRow(%s)' % ', '.join(['%s=%r' % (field, value) for (field, value) in zip(self._fields, self)])
+
+# The NamedRow sub-classes created so far, keyed by the tuple of field names
+_namedRowClasses = {}
+
+def named_row_class(description):
+    """ Return the NamedRow sub-class for a cursor description, creating it the first time it is needed """
+    # Get the field names from the description
+    fields = tuple([column[0] for column in description])
+    # If we haven't seen these field names before ...
+    if not _namedRowClasses.has_key(fields):
+        # ... build the field name to column position dictionary.  As with the dictionaries we used to build,
+        # if the same name is used for two columns, the last one wins.
+        index = {}
+        for (position, field) in enumerate(fields):
+            index[field] = position
+        # Create the row class
+        _namedRowClasses[fields] = type('NamedRow', (NamedRow,), {'__slots__' : (), '_fields' : fields, '_index' : index})
+    return _namedRowClasses[fields]
+
 def fetch_named(cursor, row_result=None):
-    """Fetch a row result from the cursor object, but return it as a dictionary
-    including the database field names.  Optionally specify an already-fetched
-    row result by passing the optional `row_result' as something other than
-    None."""
+    """Fetch a row result from the cursor object, but return it as a NamedRow
+    that can be read like a dictionary using the database field names.  Optionally
+    specify an already-fetched row result by passing the optional `row_result' as
+    something other than None.  If there is no row, an empty dictionary is returned."""
     d = cursor.description
     if row_result == None:
         row_result = cursor.fetchone()
-    dict = {}
     # with sqlite3, row_result == None if the data is not found!
     if not d or row_result == None:
-        return dict
-    for c, r in map(None, d, row_result):
-        dict[c[0]] = r
-
-    return dict
+        return {}
+    return named_row_class(d)(row_result)
 
 def fetchall_named(cursor):
-    """Fetch all row results from the cursor object, and return it as a 
-    sequence of dictionaries including the database field names."""
+    """Fetch all row results from the cursor object, and return them as a 
+    list of NamedRows that can be read like dictionaries using the database field names."""
     d = cursor.description
     rows = cursor.fetchall()
     if not d:
         return ()
-    l = []
-    for row in rows:
-        dict = {}
-        for c, r in map(None, d, row):
-            dict[c[0]] = r
-        l.append(dict)
-    return l
+    # Get the row class once, rather than once per row
+    rowClass = named_row_class(d)
+    return [rowClass(row) for row in rows]
+
+def iter_named(cursor, batchSize=500):
+    """Iterate through the row results from the cursor object as NamedRows, fetching
+    batchSize rows at a time, so that the whole result set is never held in a list.
+    The cursor must not be used for another query until the iteration is complete."""
+    d = cursor.description
+    if not d:
+        return
+    # Get the row class once, rather than once per row
+    rowClass = named_row_class(d)
+    while True:
+        # Get the next batch of rows
+        rows = cursor.fetchmany(batchSize)
+        # If there are no more rows, we're done
+        if not rows:
+            break
+        for row in rows:
+            yield rowClass(row)
 
 def list_all_keyword_examples_for_all_clips_in_a_collection(collectionNum):
     """ Lists all Keyword Examples for all Clips in the specified Collection and all
@@ -3698,25 +4883,8 @@ def list_all_keyword_examples_for_a_clip(clipnum):
 
 def delete_all_keywords_for_a_group(epnum, clipnum, snapshotnum):
     """ Given an Episode, Clip, or Snapshot number, delete the appropriate keywordgroup/word pairs. """
-    # If we have an Episode Number ...
-    if epnum != 0:
-        # .. delete the Episode Keywords
-        specifier = "EpisodeNum"
-        num = epnum
-    # If we have a Clip Number ...
-    elif clipnum != 0:
-        # ... delete the Clip Keywords
-        specifier = "ClipNum"
-        num = clipnum
-    # If we have a Snapshot Number ...
-    elif snapshotnum != 0:
-        # ... delete the Snapshot Keywords
-        specifier = "SnapshotNum"
-        num = snapshotnum
-    # If we don't have any of those ...
-    else:
-        # ... raise an exception
-        raise Exception, _("All keywords would have been deleted!")
+    # Determine which field identifies the object's keywords
+    (specifier, num) = _keyword_group_specifier(epnum, clipnum, snapshotnum)
 
     # Create the Delete query 
     query = "DELETE FROM ClipKeywords2 WHERE %s = %%s " % (specifier)
@@ -3728,6 +4896,9 @@ def delete_all_keywords_for_a_group(epnum, clipnum, snapshotnum):
     DBCursor.execute(query, (num, ))
     # Close the database cursor
     DBCursor.close()
+    # The object's keywords have changed
+    KeywordIndex.Invalidate(KEYWORD_OBJECT_TYPES[specifier], num)
+    SearchCache.Changed('ClipKeywords2')
 
 def insert_clip_keyword(ep_num, clip_num, snapshot_num, kw_group, kw, exampleValue=0):
     """Insert a new record in the Clip Keywords table."""
@@ -3761,6 +4932,10 @@ def insert_clip_keyword(ep_num, clip_num, snapshot_num, kw_group, kw, exampleVal
         query = FixQuery(query)
         DBCursor.execute(query, (ep_num, clip_num, snapshot_num, kw_group, kw, exampleValue))
         DBCursor.close()
+        # The object's keywords have changed
+        (specifier, num) = _keyword_group_specifier(ep_num, clip_num, snapshot_num)
+        KeywordIndex.Invalidate(KEYWORD_OBJECT_TYPES[specifier], num)
+        SearchCache.Changed('ClipKeywords2')
         # Signal success
         return True
     # If the keyword doesn't exist ...
@@ -3769,6 +4944,304 @@ def insert_clip_keyword(ep_num, clip_num, snapshot_num, kw_group, kw, exampleVal
         # ... signal failure
         return False
 
+# The type of object identified by each ClipKeywords2 field
+KEYWORD_OBJECT_TYPES = {'EpisodeNum' : 'Episode', 'ClipNum' : 'Clip', 'SnapshotNum' : 'Snapshot'}
+
+def _keyword_group_specifier(epnum, clipnum, snapshotnum):
+    """ Return the ClipKeywords2 field name and record number for an Episode, Clip, or Snapshot number """
+    # If we have an Episode Number ...
+    if epnum != 0:
+        return ("EpisodeNum", epnum)
+    # If we have a Clip Number ...
+    elif clipnum != 0:
+        return ("ClipNum", clipnum)
+    # If we have a Snapshot Number ...
+    elif snapshotnum != 0:
+        return ("SnapshotNum", snapshotnum)
+    # If we don't have any of those ...
+    else:
+        # ... raise an exception
+        raise Exception, _("All keywords would have been deleted!")
+
+def _keyword_bytes(kw_group, kw):
+    """ Return a keyword group / keyword pair in the form used to save it in the database """
+    if 'unicode' in wx.PlatformInfo:
+        kw_group = kw_group.encode(TransanaGlobal.encoding)
+        kw = kw.encode(TransanaGlobal.encoding)
+    return (kw_group, kw)
+
+def existing_keywords(keywordPairs, batchSize=500):
+    """ Given a list of (kw_group, kw) pairs in the form used to save them in the database, return the set of
+        the pairs that are defined in the Keywords2 table. """
+    # Initialize the results
+    found = set()
+    # Make a list of the keyword groups to look up
+    groups = list(set([kw_group for (kw_group, kw) in keywordPairs]))
+    # Get a database cursor
+    DBCursor = get_db().cursor()
+    # Process the keyword groups in batches
+    for start in range(0, len(groups), batchSize):
+        batch = groups[start:start + batchSize]
+        # Get all the keywords in this batch of keyword groups
+        query = "SELECT KeywordGroup, Keyword FROM Keywords2 WHERE KeywordGroup IN (%s)" % ', '.join(['%s'] * len(batch))
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        DBCursor.execute(query, tuple(batch))
+        # Put the values back into byte form so they can be compared with the pairs passed in
+        for (kw_group, kw) in DBCursor.fetchall():
+            found.add((_DBDataBytes(kw_group), _DBDataBytes(kw)))
+    # Close the database cursor
+    DBCursor.close()
+    # Return the pairs that were found
+    return set([pair for pair in keywordPairs if pair in found])
+
+# The table, object number field, and conditions for the keywords applied to each type of object.  ('Snapshot' is
+# for keywords applied to whole Snapshots, 'SnapshotCoding' for the visible keywords drawn on them.)
+KEYWORD_ASSIGNMENT_TABLES = {'Episode'        : ('ClipKeywords2', 'EpisodeNum', ''),
+                             'Clip'           : ('ClipKeywords2', 'ClipNum', ''),
+                             'Snapshot'       : ('ClipKeywords2', 'SnapshotNum', ''),
+                             'SnapshotCoding' : ('SnapshotKeywords2', 'SnapshotNum', ' AND (Visible = 1)')}
+
+def iter_keyword_assignments(objectType, nums=None, batchSize=500):
+    """ Iterate through the (num, kw_group, kw) keywords applied to objects of type objectType ('Episode', 'Clip',
+        'Snapshot', or 'SnapshotCoding'), with the keyword group and keyword in the form used to save them in the
+        database.  If a list of object numbers is passed in nums, only the keywords for those objects are included. """
+    (table, numName, conditions) = KEYWORD_ASSIGNMENT_TABLES[objectType]
+    query = "SELECT %s, KeywordGroup, Keyword FROM %s WHERE (%s > 0)%s" % (numName, table, numName, conditions)
+    # If we want all the objects, there is one batch with no object numbers
+    if nums == None:
+        batches = [()]
+    # Otherwise, process the objects in batches
+    else:
+        nums = list(nums)
+        batches = [tuple(nums[start:start + batchSize]) for start in range(0, len(nums), batchSize)]
+    # Get a database cursor
+    DBCursor = get_db().cursor()
+    for batch in batches:
+        # If we have object numbers, limit the query to them
+        if len(batch) > 0:
+            tempQuery = query + " AND (%s IN (%s))" % (numName, ', '.join(['%s'] * len(batch)))
+        else:
+            tempQuery = query
+        # Adjust the query for sqlite if needed
+        tempQuery = FixQuery(tempQuery)
+        DBCursor.execute(tempQuery, batch)
+        while True:
+            # Get the next batch of rows
+            rows = DBCursor.fetchmany(batchSize)
+            # If there are no more rows, this batch is done
+            if not rows:
+                break
+            for (num, kw_group, kw) in rows:
+                yield (num, _DBDataBytes(kw_group), _DBDataBytes(kw))
+    # Close the database cursor
+    DBCursor.close()
+
+def list_coded_segments(clipNums, snapshotNums, batchSize=500):
+    """ Get the Episode and the position in the Episode of a number of Clips and Snapshots at once, for the time-window
+        operators in Searches.  Returns a list of (EpisodeNum, Start, Stop, key) values, with times in milliseconds and
+        a key of ('Clip', ClipNum) or ('Snapshot', SnapshotNum).  Clips and Snapshots that aren't tied to a point in
+        an Episode are not included. """
+    segments = []
+    DBCursor = get_db().cursor()
+    for (objectType, nums, query) in \
+        (('Clip', list(clipNums),
+          "SELECT ClipNum, EpisodeNum, ClipStart, ClipStop FROM Clips2 WHERE ClipNum IN (%s)"),
+         ('Snapshot', list(snapshotNums),
+          "SELECT SnapshotNum, EpisodeNum, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration FROM Snapshots2 WHERE SnapshotNum IN (%s)")):
+        # Process the records in batches
+        for start in range(0, len(nums), batchSize):
+            batch = tuple(nums[start:start + batchSize])
+            # Add a parameter for each record number in the batch, and adjust the query for sqlite if needed
+            tempQuery = FixQuery(query % ', '.join(['%s'] * len(batch)))
+            DBCursor.execute(tempQuery, batch)
+            for (num, episodeNum, segmentStart, segmentStop) in DBCursor.fetchall():
+                # Skip records without an Episode or a time code
+                if (episodeNum in [None, 0]) or (segmentStart == None):
+                    continue
+                # A Snapshot without a duration is at a single point in time
+                if segmentStop == None:
+                    segmentStop = segmentStart
+                segments.append((episodeNum, int(segmentStart), int(segmentStop), (objectType, num)))
+    DBCursor.close()
+    return segments
+
+def _example_value(example):
+    """ Convert an Example value to an integer.  The Example field is a nullable CHAR(1), so, as in
+        ClipKeywordObject, anything that isn't a number is treated as 0. """
+    try:
+        return int(example)
+    except:
+        return 0
+
+def set_keywords_for_a_group(epnum, clipnum, snapshotnum, keywords):
+    """ Make the keywords for an Episode, Clip, or Snapshot match the list of (kw_group, kw, example) values in
+        keywords.  The rows in the Clip Keywords table are compared with the list, and only the differences are
+        written, with one executemany() each for deletions, Example changes, and additions.  This does not start a
+        transaction, so it becomes part of the caller's.  Returns a list of the (kw_group, kw) pairs that could not be
+        added because they are no longer in the Keywords table, which happens when another user edits a keyword while
+        it is being applied. """
+    # Determine which field identifies the object's keywords
+    (specifier, num) = _keyword_group_specifier(epnum, clipnum, snapshotnum)
+    # Get a database cursor
+    DBCursor = get_db().cursor()
+    # Get the keywords currently in the database for the object
+    query = "SELECT KeywordGroup, Keyword, Example FROM ClipKeywords2 WHERE %s = %%s" % specifier
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)
+    DBCursor.execute(query, (num, ))
+    # Index the current keywords by their byte form.  Duplicate rows are noted so they can be replaced.
+    current = {}
+    duplicates = set()
+    for (kw_group, kw, example) in DBCursor.fetchall():
+        key = (_DBDataBytes(kw_group), _DBDataBytes(kw))
+        if current.has_key(key):
+            duplicates.add(key)
+        current[key] = _example_value(example)
+    # Index the keywords that should be in the database by their byte form, remembering the original values
+    wanted = {}
+    for (kw_group, kw, example) in keywords:
+        wanted[_keyword_bytes(kw_group, kw)] = (kw_group, kw, example)
+    # Determine the differences
+    deletions = []
+    exampleChanges = []
+    additions = []
+    for key in current.keys():
+        # Keywords that are no longer wanted, and duplicated keywords, are deleted
+        if (not wanted.has_key(key)) or (key in duplicates):
+            deletions.append((num, ) + key)
+        # Keywords whose Example status has changed are updated
+        elif current[key] != _example_value(wanted[key][2]):
+            exampleChanges.append((_example_value(wanted[key][2]), num) + key)
+    for key in wanted.keys():
+        # Keywords that aren't in the database, and duplicated keywords, are added
+        if (not current.has_key(key)) or (key in duplicates):
+            additions.append(key)
+    # Check the continued existance of the keywords being added.  It's possible in the multi-user version for
+    # one user to edit a keyword while another user is applying it to an Episode, Clip, or Snapshot.
+    existing = existing_keywords(additions)
+    # Note the keywords that can't be added
+    missing = [wanted[key][:2] for key in additions if not key in existing]
+    # Delete the keywords that are no longer wanted
+    if len(deletions) > 0:
+        query = "DELETE FROM ClipKeywords2 WHERE %s = %%s AND KeywordGroup = %%s AND Keyword = %%s" % specifier
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        DBCursor.executemany(query, deletions)
+    # Update the Example status of the keywords that have changed
+    if len(exampleChanges) > 0:
+        query = "UPDATE ClipKeywords2 SET Example = %%s WHERE %s = %%s AND KeywordGroup = %%s AND Keyword = %%s" % specifier
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        DBCursor.executemany(query, exampleChanges)
+    # Add the new keywords that still exist
+    values = []
+    for key in additions:
+        if key in existing:
+            # Only the field for this type of object gets the object number
+            values.append((epnum, clipnum, snapshotnum) + key + (_example_value(wanted[key][2]), ))
+    if len(values) > 0:
+        query = """
+        INSERT INTO ClipKeywords2
+            (EpisodeNum, ClipNum, SnapshotNum, KeywordGroup, Keyword, Example)
+            VALUES
+            (%s, %s, %s, %s, %s, %s)
+        """
+        # Adjust the query for sqlite if needed
+        query = FixQuery(query)
+        DBCursor.executemany(query, values)
+    # Close the database cursor
+    DBCursor.close()
+    # The object's keywords may have changed
+    KeywordIndex.Invalidate(KEYWORD_OBJECT_TYPES[specifier], num)
+    SearchCache.Changed('ClipKeywords2')
+    # Return the keywords that could not be added
+    return missing
+
+def add_keyword_to_groups(kw_group, kw, epnums=(), clipnums=(), snapshotnums=(), exampleValue=0, batchSize=500, dbCursor=None):
+    """ Add a keyword to a number of Episodes, Clips, and Snapshots at once, in a single transaction.  Objects that
+        already have the keyword are skipped.  The caller is responsible for making sure the objects aren't locked.
+        If dbCursor is passed, the keyword is added within the caller's transaction, which should have checked the
+        objects with LockedRecords() with forUpdate=True.  Otherwise, this function uses its own transaction.
+        Returns False if the keyword is no longer in the Keywords table, True otherwise. """
+    # Get the keyword in the form used to save it in the database
+    key = _keyword_bytes(kw_group, kw)
+    # Check the continued existance of the keyword
+    if len(existing_keywords([key])) == 0:
+        return False
+    # If we're working within the caller's transaction ...
+    if dbCursor != None:
+        # ... just add the keyword
+        _add_keyword_to_groups(dbCursor, key, epnums, clipnums, snapshotnums, exampleValue, batchSize)
+    else:
+        # Get a database cursor
+        DBCursor = get_db().cursor()
+        # Begin a Database Transaction
+        DBCursor.execute("BEGIN")
+        try:
+            # Add the keyword
+            _add_keyword_to_groups(DBCursor, key, epnums, clipnums, snapshotnums, exampleValue, batchSize)
+        # If anything goes wrong, undo the changes and pass the exception on
+        except:
+            DBCursor.execute("ROLLBACK")
+            DBCursor.close()
+            raise
+        # Commit the changes
+        DBCursor.execute("COMMIT")
+        # Close the database cursor
+        DBCursor.close()
+    # Cached Search results may be out of date
+    SearchCache.Changed('ClipKeywords2')
+    return True
+
+def _add_keyword_to_groups(DBCursor, key, epnums, clipnums, snapshotnums, exampleValue, batchSize):
+    """ Add the keyword key, as returned by _keyword_bytes(), to the Episodes, Clips, and Snapshots that don't have it
+        yet, within the current transaction """
+    # For each type of object ...
+    for (specifier, nums, objectType) in (("EpisodeNum", epnums, 'Episode'), ("ClipNum", clipnums, 'Clip'), ("SnapshotNum", snapshotnums, 'Snapshot')):
+        # Make a list of the object numbers, in case we are passed a set
+        nums = list(nums)
+        # Process the objects in batches
+        for start in range(0, len(nums), batchSize):
+            batch = nums[start:start + batchSize]
+            # Find the objects in this batch that already have the keyword
+            query = "SELECT %s FROM ClipKeywords2 WHERE KeywordGroup = %%s AND Keyword = %%s AND %s IN (%s)" % (specifier, specifier, ', '.join(['%s'] * len(batch)))
+            # Adjust the query for sqlite if needed
+            query = FixQuery(query)
+            DBCursor.execute(query, key + tuple(batch))
+            found = set([num for (num, ) in DBCursor.fetchall()])
+            # Add the keyword to the others
+            values = []
+            for num in batch:
+                if not num in found:
+                    # Only the field for this type of object gets the object number
+                    if objectType == 'Episode':
+                        values.append((num, 0, 0) + key + (exampleValue, ))
+                    elif objectType == 'Clip':
+                        values.append((0, num, 0) + key + (exampleValue, ))
+                    else:
+                        values.append((0, 0, num) + key + (exampleValue, ))
+                    # Objects loaded before the change have the old keyword list
+                    DataObjectCache.Invalidate(objectType, num)
+                    # ... as does the Keyword Index
+                    KeywordIndex.Invalidate(objectType, num)
+            if len(values) > 0:
+                query = """
+                INSERT INTO ClipKeywords2
+                    (EpisodeNum, ClipNum, SnapshotNum, KeywordGroup, Keyword, Example)
+                    VALUES
+                    (%s, %s, %s, %s, %s, %s)
+                """
+                # Adjust the query for sqlite if needed
+                query = FixQuery(query)
+                DBCursor.executemany(query, values)
+                # Snapshot windows detect changes by other users through the LastSaveTime, so update it.
+                if objectType == 'Snapshot':
+                    query = "UPDATE Snapshots2 SET LastSaveTime = CURRENT_TIMESTAMP WHERE SnapshotNum = %s"
+                    # Adjust the query for sqlite if needed
+                    query = FixQuery(query)
+                    DBCursor.executemany(query, [(value[2], ) for value in values])
+
 def add_keyword(group, kw_name):
     """Add a keyword to the database."""
     DBCursor = get_db().cursor()
@@ -3943,6 +5416,10 @@ def delete_keyword_group(name):
 
         # Finish the transaction
         DBCursor.execute("COMMIT")
+        # The keyword group is gone from every object that had it, including the cached ones
+        DataObjectCache.Clear()
+        KeywordIndex.Clear()
+        SearchCache.Clear()
     else:
         DBCursor.execute("ROLLBACK")
         DBCursor.close()
@@ -4117,6 +5594,10 @@ def delete_keyword(group, kw_name):
 
         # Finish the transaction
         DBCursor.execute("COMMIT")
+        # The keyword is gone from every object that had it, including the cached ones
+        DataObjectCache.Clear()
+        KeywordIndex.Clear()
+        SearchCache.Clear()
     else:
         DBCursor.execute("ROLLBACK")
         DBCursor.close()
@@ -4195,21 +5676,11 @@ def delete_filter_records(reportType, reportScope):
     # Close the Database Cursor
     DBCursor.close()
 
-def record_match_count(table, field_names, field_values):
-    """Find number of records in the given table where the given fields
-    contain the given values.  If the field name begins with the `!'
-    character, then it will match only if the value does NOT equal the given
-    field value."""
-    # Get a database Cursor
-    DBCursor = get_db().cursor()
-    # If we're NOT in the Transcript table ...
-    if table != 'Transcripts2':
-        # ... we can get ALL row values
-        query = "SELECT * FROM %s\n   WHERE" % table
-    # If we ARE in the Transcript table ...
-    else:
-        # ... just get TranscriptID.  With images, getting the RTF Text takes too long!
-        query = "SELECT TranscriptID FROM %s\n   WHERE" % table
+def _match_conditions(field_names):
+    """ Build the WHERE conditions for record_match_count() and record_exists().  If the field name begins with
+        the `!' character, then it will match only if the value does NOT equal the given field value. """
+    # Initialize a list of conditions
+    conditions = []
     # Set up the fields and values that identify the record(s) to find
     for field in field_names:
         if field[0] == "!":
@@ -4217,31 +5688,114 @@ def record_match_count(table, field_names, field_values):
             field = field[1:]
         else:
             cmp_op = "="
-        query = "%s    %s %s %%s AND\n" % (query, field, cmp_op)
-    # The query will have a trailing " AND\n".  Remove it.
-    query = query[:-5]
+        conditions.append("%s %s %%s" % (field, cmp_op))
+    # Join the conditions
+    return " AND\n          ".join(conditions)
+
+def record_match_count(table, field_names, field_values):
+    """Find number of records in the given table where the given fields
+    contain the given values.  If the field name begins with the `!'
+    character, then it will match only if the value does NOT equal the given
+    field value.  The records are counted by the database rather than fetched."""
+    # Get a database Cursor
+    DBCursor = get_db().cursor()
+    # Define the query
+    query = "SELECT COUNT(*) FROM %s\n   WHERE %s" % (table, _match_conditions(field_names))
     # Adjust the query for sqlite if needed
     query = FixQuery(query)    
     # Execute the query
     DBCursor.execute(query, field_values)
-    # If we are using MySQL ...
-    if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server', 'PyMySQL']:
-        # ... determine the number of records returned by checking rowcount
-        num = DBCursor.rowcount
-    # If we're using sqlite ...
-    else:
-        # rowcount doesn't work, so get the results and count them
-        data = DBCursor.fetchall()
-        num = len(data)
+    # Get the count
+    num = DBCursor.fetchone()[0]
     # Close the Database Cursor
     DBCursor.close()
     # Return the number of records found
     return num
 
+def record_exists(table, field_names, field_values):
+    """Determine whether any record in the given table has the given values in the given
+    fields, using the same field name conventions as record_match_count().  The database
+    can stop looking at the first matching record, so this is the fastest way to check
+    for duplicate names."""
+    # Get a database Cursor
+    DBCursor = get_db().cursor()
+    # Define the query.  We don't need any data, just whether a row is found.
+    query = "SELECT 1 FROM %s\n   WHERE %s\n   LIMIT 1" % (table, _match_conditions(field_names))
+    # Adjust the query for sqlite if needed
+    query = FixQuery(query)    
+    # Execute the query
+    DBCursor.execute(query, field_values)
+    # See if a record was found
+    result = (DBCursor.fetchone() != None)
+    # Close the Database Cursor
+    DBCursor.close()
+    # Return the result
+    return result
+
 def ProcessDBDataForUTF8Encoding(text):
     """ MySQL's UTF8 Encoding isn't straight-forward because of variable character length.  For example, the
         Chinese character 4EB0 is stored as \xE4\xBA\xB0 .  Therefore, we need to do some translation
-        of the data read from the database to get it into the format that wxPython wants. """
+        of the data read from the database to get it into the format that wxPython wants.
+        Data that is valid in the current encoding is decoded in a single call.  Anything else, including legacy
+        data from Transana 2.05 and earlier, is passed to ProcessDBDataForUTF8EncodingLegacy(). """
+    # If we're using a unicode version of wxPython and MySQLdb (either server or embedded) ...
+    if ('unicode' in wx.PlatformInfo) and (TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server']):
+        try:
+            # ... decode the data's bytes all at once
+            return _DBDataBytes(text).decode(TransanaGlobal.encoding)
+        # If the data isn't a string, or isn't valid in the current encoding ...
+        except (AttributeError, UnicodeError):
+            # ... let the original character-by-character routine sort it out
+            pass
+    return ProcessDBDataForUTF8EncodingLegacy(text)
+
+def _DBDataBytes(text):
+    """ MySQLdb returns each byte of the database's UTF-8 data as a separate character of a unicode object.
+        Put the bytes back into a string so they can be decoded. """
+    # If we have a unicode object ...
+    if isinstance(text, unicode):
+        # ... each character holds one byte.  (This raises a UnicodeEncodeError if that's not the case.)
+        return text.encode('latin1')
+    # Otherwise, we already have the bytes (or something that isn't a string, which the caller will deal with)
+    else:
+        return text
+
+def ProcessDBColumnForUTF8Encoding(values):
+    """ Decode a whole column of data read from the database, such as all the Clip IDs in a result set, and return
+        the values as a list.  Where possible, the column is decoded in a single call rather than one call per value. """
+    # Make a list of the values, in case we are passed an iterator
+    values = list(values)
+    # If we're using a unicode version of wxPython and MySQLdb (either server or embedded) ...
+    if ('unicode' in wx.PlatformInfo) and (TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server']):
+        # Note which values are strings.  (Other values, such as NULLs, are left to ProcessDBDataForUTF8Encoding().)
+        stringPositions = [index for index in range(len(values)) if isinstance(values[index], basestring)]
+        # If there's more than one string ...
+        if len(stringPositions) > 1:
+            try:
+                # ... join the strings' bytes, separated by NUL characters, and decode them all at once
+                column = '\x00'.join([_DBDataBytes(values[index]) for index in stringPositions]).decode(TransanaGlobal.encoding).split(u'\x00')
+                # If we got back the same number of values (which we won't if the data contains NUL characters) ...
+                if len(column) == len(stringPositions):
+                    # ... put the decoded strings back into the list ...
+                    for (index, value) in zip(stringPositions, column):
+                        values[index] = value
+                    # ... and process anything that wasn't a string
+                    for index in range(len(values)):
+                        if not isinstance(values[index], unicode):
+                            values[index] = ProcessDBDataForUTF8Encoding(values[index])
+                    return values
+            # If any of the data isn't valid in the current encoding ...
+            except UnicodeError:
+                # ... we'll process the values one at a time, below
+                pass
+    # Process the values one at a time
+    return [ProcessDBDataForUTF8Encoding(value) for value in values]
+
+def ProcessDBDataForUTF8EncodingLegacy(text):
+    """ The original character-by-character version of ProcessDBDataForUTF8Encoding().  It rebuilds multi-byte
+        characters one byte at a time, and switches TransanaGlobal.encoding for data that can't be decoded, so it
+        is still used for data that isn't valid in the current encoding.  (It is also useful for benchmarking
+        ProcessDBDataForUTF8Encoding().) """
     # If we're not using a unicode version of wxPython ...
     if not 'unicode' in wx.PlatformInfo:
         # ... do nothing
@@ -4370,229 +5924,76 @@ def UpdateDBFilenames(parent, filePath, fileList, newName=''):
     # Begin a Database Transaction
     DBCursor.execute("BEGIN")
 
-    # Define Queries for Episode, Clip, and Snapshot Records.  Because some records might be locked by other users,
-    # we can't simply use this:
-    #
-    #   query = "UPDATE Episodes2 SET MediaFile = %s WHERE MediaFile LIKE %s"
-    #
-    # Instead, we have to load each record, lock it, change it, save it, and unlock it.
-    episodeQuery = "SELECT EpisodeNum FROM Episodes2 WHERE MediaFile LIKE '%s'"
-    clipQuery = "SELECT ClipNum FROM Clips2 WHERE MediaFile LIKE '%s'"
-    additionalQuery = "SELECT AddVidNum, EpisodeNum, ClipNum FROM AdditionalVids2 WHERE MediaFile LIKE '%s'"
-    snapshotQuery = "SELECT SnapshotNum FROM Snapshots2 WHERE ImageFile LIKE '%s'"
-
-    # Let's count the number of records changed
-    episodeCounter = 0
-    clipCounter = 0
-    snapshotCounter = 0
-
-    # Go through the fileList and run the query repeatedly
+    # Records are found by file name in the MediaPaths2 table, and all the changes are made with a few bulk UPDATEs.
+    # Because some records might be locked by other users, we check the locks first and make no changes if
+    # any of the records are locked.  The check holds the records until the transaction ends, so they can't be
+    # locked by anyone else while we update them.
+
+    # Make sure the Media Paths are up to date
+    SyncMediaPaths(DBCursor)
+
+    # Initialize the lists of changes, by table
+    changes = {}
+    for (tableName, numName, fieldName) in MEDIA_PATH_TABLES:
+        changes[tableName] = []
+
+    # Go through the fileList and find the records that use each file
     for fileName in fileList:
         # let's remember the original file name
         originalFileName = fileName
-        # Manipulate the file name in the ways that the database data has been manipulated
-        queryFileName = fileName.encode(TransanaGlobal.encoding)
         # If we are CHANGING the file name (as with Media File Conversion), we do that here.
         if (newName != '') and (len(fileList) == 1):
             fileName = newName
-        
-        # Add a "%" character to the beginning of the File Name so that the "LIKE" operator will work
-        # Execute the Episode Query
-        query = episodeQuery % ('%' + queryFileName.replace("'", "''"))
-        DBCursor.execute(query)
-
-        # Iterate through the records returned from the Database
-        for (episodeNum, ) in DBCursor.fetchall():
-            # Load the Episode
-            tempEpisode = Episode.Episode(episodeNum)
-            # Be ready to catch exceptions
-            try:
-                # Lock the Record
-                tempEpisode.lock_record()
-                # Make sure the file names match, that we don't have a subset name.
-                # ('mens group.mov' was substituted for 'womens group.mov', for instance.)
-                if (fileName == newName) or (os.path.split(tempEpisode.media_filename)[1].upper() == fileName.upper()):
-                    # Update the Media Filename
-                    tempEpisode.media_filename = filePath + fileName
-                # Save the Record
-                tempEpisode.db_save()
-                # Unlock the Record
-                tempEpisode.unlock_record()
-                # Increment the Counter
-                episodeCounter += 1
-            # If an exception is raised, catch it
-            except:
-                if DEBUG:
-                    (exctype, excvalue) = sys.exc_info()[:2]
-                    print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
-                # Indicate that we have failed.
-                success = False
-                # Don't bother to contine processing DB Records
-                break
-        # If we failed during Episodes, there's no reason to look at Clips
-        if not success:
-            break
-        
-        # Execute the Clip Query
-        query = clipQuery % ('%' + queryFileName.replace("'", "''"))
-        DBCursor.execute(query)
-
-        # Iterate through the records returned from the Database
-        for (clipNum, ) in DBCursor.fetchall():
-            # Load the Clip.
-            tempClip = Clip.Clip(clipNum)
-            # Be ready to catch exceptions
-            try:
-                # Lock the Record
-                tempClip.lock_record()
-                # Make sure the file names match, that we don't have a subset name.
-                # ('mens group.mov' was substituted for 'womens group.mov', for instance.)
-                if (fileName == newName) or (os.path.split(tempClip.media_filename)[1].upper() == fileName.upper()):
-                    # Update the Media Filename
-                    tempClip.media_filename = filePath + fileName
-                # Save the Record
-                tempClip.db_save()
-                # Unlock the Record
-                tempClip.unlock_record()
-                # Increment the Counter
-                clipCounter += 1
-            # If an exception is raised, catch it
-            except:
-                if DEBUG:
-                    (exctype, excvalue) = sys.exc_info()[:2]
-                    print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
-                # Indicate that we have failed.
-                success = False
-                # Don't bother to contine processing DB Records
-                break
-
-        # If we failed during Clips, there's no reason to look at Additional Media Files
-        if not success:
-            break
-
-        # Execute the Additional Query
-        query = additionalQuery % ('%' + queryFileName.replace("'", "''"))
-        DBCursor.execute(query)
-
-        # Iterate through the records returned from the Database
-        for (addVidNum, episodeNum, clipNum) in DBCursor.fetchall():
-            # If we're dealing with an Episode ...
-            if episodeNum > 0:
-                # Load the Episode
-                tempEpisode = Episode.Episode(episodeNum)
-                # Be ready to catch exceptions
-                try:
-                    # Lock the Record
-                    tempEpisode.lock_record()
-                    # Remember the Additional Media Files
-                    additionalMediaFiles = tempEpisode.additional_media_files
-                    # Clear the Additional Media Files from the Episode
-                    del(tempEpisode.additional_media_files)
-                    # Update the Additional Media Files.  Iterate through the list of files
-                    for vid in additionalMediaFiles:
-                        # Extract the video filename
-                        fn = vid['filename']
-                        # If the file matches the name being updated ...
-                        if (os.path.split(fn)[1].upper() == originalFileName.upper()):
-                            # ... then update the additional filename entry
-                            tempEpisode.additional_media_files = {'filename' : filePath + fileName,
-                                                                  'length'   : vid['length'],
-                                                                  'offset'   : vid['offset'],
-                                                                  'audio'    : vid['audio']}
-                        # If there's NOT a match ...
-                        else:
-                            # ... then continue to use the existing file name
-                            tempEpisode.additional_media_files = vid
-                    # Save the Record
-                    tempEpisode.db_save()
-                    # Unlock the Record
-                    tempEpisode.unlock_record()
-                    # Increment the Counter
-                    episodeCounter += 1
-                # If an exception is raised, catch it
-                except:
-                    if DEBUG:
-                        (exctype, excvalue) = sys.exc_info()[:2]
-                        print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
-                    # Indicate that we have failed.
-                    success = False
-                    # Don't bother to contine processing DB Records
-                    break
-
-            elif clipNum > 0:
-                # Load the Clip.
-                tempClip = Clip.Clip(clipNum)
-                # Be ready to catch exceptions
-                try:
-                    # Lock the Record
-                    tempClip.lock_record()
-                    # Remember the Additional Media Files
-                    additionalMediaFiles = tempClip.additional_media_files
-                    # Clear the Additional Media Files from the Clip
-                    del(tempClip.additional_media_files)
-                    # Update the Additional Media Files.  Iterate through the list of files
-                    for vid in additionalMediaFiles:
-                        # Extract the video filename
-                        fn = vid['filename']
-                        # If the file matches the name being updated ...
-                        if (os.path.split(fn)[1].upper() == originalFileName.upper()):
-                            # ... then update the additional filename entry
-                            tempClip.additional_media_files = {'filename' : filePath + fileName,
-                                                               'length'   : vid['length'],
-                                                               'offset'   : vid['offset'],
-                                                               'audio'    : vid['audio']}
-                        # If there's NOT a match ...
-                        else:
-                            # ... then continue to use the existing file name
-                            tempClip.additional_media_files = vid
-                    # Save the Record
-                    tempClip.db_save()
-                    # Unlock the Record
-                    tempClip.unlock_record()
-                    # Increment the Counter
-                    clipCounter += 1
-                # If an exception is raised, catch it
-                except:
-                    if DEBUG:
-                        (exctype, excvalue) = sys.exc_info()[:2]
-                        print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
-                    # Indicate that we have failed.
-                    success = False
-                    # Don't bother to contine processing DB Records
-                    break
-
-        # Execute the Snapshot Query
-        query = snapshotQuery % ('%' + queryFileName.replace("'", "''"))
-        DBCursor.execute(query)
-
-        # Iterate through the records returned from the Database
-        for (snapshotNum, ) in DBCursor.fetchall():
-            # Load the Snapshot.
-            tempSnapshot = Snapshot.Snapshot(snapshotNum)
-            # Be ready to catch exceptions
-            try:
-                # Lock the Record
-                tempSnapshot.lock_record()
-                # Make sure the file names match, that we don't have a subset name.
-                # ('mens group.mov' was substituted for 'womens group.mov', for instance.)
-                if (fileName == newName) or (os.path.split(tempSnapshot.image_filename)[1].upper() == fileName.upper()):
-                    # Update the Media Filename
-                    tempSnapshot.image_filename = filePath + fileName
-                # Save the Record
-                tempSnapshot.db_save()
-                # Unlock the Record
-                tempSnapshot.unlock_record()
-                # Increment the Counter
-                snapshotCounter += 1
-            # If an exception is raised, catch it
-            except:
-                if DEBUG:
-                    (exctype, excvalue) = sys.exc_info()[:2]
-                    print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
-                # Indicate that we have failed.
-                success = False
-                # Don't bother to contine processing DB Records
-                break
+        # Find the records whose file names match, without regard to path or case
+        matches = FindMediaPathsByFileName(DBCursor, originalFileName)
+        # Add the records to the lists of changes
+        for tableName in matches.keys():
+            changes[tableName] += [(recNum, filePath + fileName) for (recNum, mediaPath) in matches[tableName]]
+
+    # Find the Episodes and Clips the Additional Videos belong to
+    parents = _AdditionalVidParents(DBCursor, [addVidNum for (addVidNum, mediaFile) in changes['AdditionalVids2']])
+    # Note the Episodes, Clips, and Snapshots that are affected
+    episodeNums = set([episodeNum for (episodeNum, mediaFile) in changes['Episodes2']])
+    clipNums = set([clipNum for (clipNum, mediaFile) in changes['Clips2']])
+    snapshotNums = set([snapshotNum for (snapshotNum, mediaFile) in changes['Snapshots2']])
+    for (addVidNum, mediaFile) in changes['AdditionalVids2']:
+        (episodeNum, clipNum) = parents.get(addVidNum, (0, 0))
+        if episodeNum > 0:
+            episodeNums.add(episodeNum)
+        elif clipNum > 0:
+            clipNums.add(clipNum)
+
+    # Let's count the number of records changed.  Additional Videos are counted with the records they belong to.
+    episodeCounter = len(changes['Episodes2'])
+    clipCounter = len(changes['Clips2'])
+    snapshotCounter = len(changes['Snapshots2'])
+    for (addVidNum, mediaFile) in changes['AdditionalVids2']:
+        if parents.get(addVidNum, (0, 0))[0] > 0:
+            episodeCounter += 1
+        else:
+            clipCounter += 1
+
+    # If any of the records are locked, we can't update them.
+    if (len(LockedRecords(DBCursor, 'Episodes2', 'EpisodeNum', episodeNums, forUpdate=True)) > 0) or \
+       (len(LockedRecords(DBCursor, 'Clips2', 'ClipNum', clipNums, forUpdate=True)) > 0) or \
+       (len(LockedRecords(DBCursor, 'Snapshots2', 'SnapshotNum', snapshotNums, forUpdate=True)) > 0):
+        # Indicate that we have failed.
+        success = False
+    else:
+        # Be ready to catch exceptions
+        try:
+            # Update the Media Filenames
+            for (tableName, numName, fieldName) in MEDIA_PATH_TABLES:
+                _UpdateMediaFiles(DBCursor, tableName, changes[tableName])
+        # If an exception is raised, catch it
+        except:
+            if DEBUG:
+                (exctype, excvalue) = sys.exc_info()[:2]
+                print "DBInterface.UpdateDBFilenames() Exception: \n%s\n%s" % (exctype, excvalue)
+            # Indicate that we have failed.
+            success = False
+        # Objects loaded before the update have the old file names
+        DataObjectCache.Clear()
 
     # If there have been no problems, Commit the Transaction to the Database
     if success:
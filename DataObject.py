@@ -31,7 +31,10 @@ if DEBUG:
 
 __author__ = 'Nathaniel Case, David Woods <dwoods@wcer.wisc.edu>'
 
+import DataObjectCache
 import DBInterface
+import KeywordIndex
+import SearchCache
 import inspect
 import copy
 import Misc
@@ -342,6 +345,10 @@ class DataObject(object):
     def _db_start_save(self):
         """Return 0 if creating new record, 1 if updating an existing one."""
         tname = type(self).__name__
+        # The cached copy of this record, if there is one, is about to be out of date
+        DataObjectCache.Invalidate(tname, self.number)
+        # ... and cached Search results that include the table may be too
+        SearchCache.Changed(self._table())
         # You can save a Clip Transcript with a blank Transcript ID!
         if (self.id == "") and (tname != 'Transcript'):
             if 'unicode' in wx.PlatformInfo:
@@ -372,6 +379,14 @@ class DataObject(object):
             self.clear()
             raise DeleteError, _("Invalid record number (0)")
 
+        # Deletes can cascade to other records (an Episode's Transcripts, a Collection's Clips and nested
+        # Collections, and so on), so empty the whole Data Object Cache
+        DataObjectCache.Clear()
+        # ... and the Keyword Index
+        KeywordIndex.Clear()
+        # ... and the Search Cache
+        SearchCache.Clear()
+
         self.lock_record()
 
         if DEBUG:
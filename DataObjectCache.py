@@ -0,0 +1,124 @@
+# Copyright (C) 2003 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+#
+
+"""This module implements a shared cache of the Data Objects (Series, Episodes, Collections, and so on) that have been
+   loaded from the database, so that code that looks up the same records over and over, such as climbing a Collection's
+   parents, doesn't have to reload them each time.  It provides the following public functions:
+
+    Get(objectClass, num)
+    Invalidate(objectType, num)
+    Clear()
+
+   Objects returned by Get() are shared, and must be treated as read-only.  Code that edits, locks, or saves an object
+   must load its own copy in the usual way.  Entries are invalidated when a record is saved or deleted (see DataObject),
+   when a keyword is renamed or deleted (see KeywordObject and DBInterface), when another user changes the database
+   (see ChatWindow), and when the database is closed (see DBInterface).
+"""
+
+__author__ = 'David Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "DataObjectCache DEBUG is ON!"
+
+# import Python's collections module for the OrderedDict, which keeps the cache in Least Recently Used order
+import collections
+# import Python's threading module, as background threads may use the cache too
+import threading
+
+# The maximum number of objects to keep in the cache
+CACHE_SIZE = 1000
+
+
+class DataObjectCache(object):
+    """ A Least Recently Used cache of Data Objects, keyed by object type and record number """
+
+    def __init__(self, size=CACHE_SIZE):
+        """ Initialize the cache """
+        # The maximum number of objects to keep
+        self.size = size
+        # The cached objects, from least to most recently used
+        self.objects = collections.OrderedDict()
+        # A lock protecting the cached objects
+        self.lock = threading.Lock()
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+
+    def Get(self, objectClass, num):
+        """ Return the object of class objectClass with record number num, loading it if it isn't in the cache """
+        # Objects are keyed by type name and record number
+        key = (objectClass.__name__, num)
+        self.lock.acquire()
+        try:
+            # If the object is in the cache ...
+            if self.objects.has_key(key):
+                # ... move it to the most recently used position and return it
+                obj = self.objects.pop(key)
+                self.objects[key] = obj
+                self.hits += 1
+                return obj
+            self.misses += 1
+        finally:
+            self.lock.release()
+        # Load the object.  (This is done without holding the lock.  If the record doesn't exist, the exception
+        # is passed on and nothing is cached.)
+        obj = objectClass(num)
+        self.lock.acquire()
+        try:
+            # Add the object as the most recently used
+            self.objects[key] = obj
+            # If the cache is too big, drop the least recently used objects
+            while len(self.objects) > self.size:
+                self.objects.popitem(last=False)
+        finally:
+            self.lock.release()
+        return obj
+
+    def Invalidate(self, objectType, num):
+        """ Remove the object with type name objectType and record number num from the cache """
+        self.lock.acquire()
+        try:
+            # If the object is cached ...
+            if self.objects.has_key((objectType, num)):
+                # ... remove it
+                del(self.objects[(objectType, num)])
+        finally:
+            self.lock.release()
+
+    def Clear(self):
+        """ Remove all objects from the cache """
+        self.lock.acquire()
+        try:
+            self.objects.clear()
+        finally:
+            self.lock.release()
+
+
+# The shared Data Object Cache
+_cache = DataObjectCache()
+
+def Get(objectClass, num):
+    """ Return the shared, read-only copy of the object of class objectClass with record number num """
+    return _cache.Get(objectClass, num)
+
+def Invalidate(objectType, num):
+    """ Remove the object with type name objectType (such as 'Collection') and record number num from the cache """
+    _cache.Invalidate(objectType, num)
+
+def Clear():
+    """ Remove all objects from the cache """
+    _cache.Clear()
@@ -1781,6 +1781,15 @@ class _NodeData:
         return str
 
 
+# The icon used for each type of Search Result node
+SEARCH_NODE_IMAGES = {'SearchSeriesNode'     : 'Series16',
+                      'SearchEpisodeNode'    : 'Episode16',
+                      'SearchTranscriptNode' : 'Transcript16',
+                      'SearchCollectionNode' : 'Collection16',
+                      'SearchClipNode'       : 'Clip16',
+                      'SearchSnapshotNode'   : 'Snapshot16'}
+
+
 class _DBTreeCtrl(wx.TreeCtrl):
     """Private class that implements the details of the tree widget."""
     def __init__(self, parent, id, pos, size, style):
@@ -2349,8 +2358,9 @@ class _DBTreeCtrl(wx.TreeCtrl):
                 # has been added to the database tree
                 deferredItems.append((collNo, collID, parentCollNo))
                 
-        # Populate the tree with all Clip records
-        for (clipNo, clipID, collNo, sortOrder) in DBInterface.list_of_clips():
+        # Populate the tree with all Clip records.  (The Clips are read a page at a time.  Their order doesn't matter,
+        # as each Collection's children are sorted below.)
+        for (clipNo, clipID, collNo, sortOrder) in DBInterface.iter_clips():
             # Check to see if the Clip's parent collection is in the tree.  It should be there, but I did
             # have a testing database where one collection was missing, despite the presence of Clips and Notes.
             if mapDict['Collection'].has_key(collNo):
@@ -2370,7 +2380,7 @@ class _DBTreeCtrl(wx.TreeCtrl):
 
         if TransanaConstants.proVersion:
             # Populate the tree with all Snapshot records
-            for (snapshotNo, snapshotID, collNo, sortOrder) in DBInterface.list_of_snapshots():
+            for (snapshotNo, snapshotID, collNo, sortOrder) in DBInterface.iter_snapshots():
                 # Check to see if the Snapshot's parent collection is in the tree.  It should be there, but I did
                 # have a testing database where one collection was missing, despite the presence of Clips and Notes.
                 if mapDict['Collection'].has_key(collNo):
@@ -3077,6 +3087,18 @@ class _DBTreeCtrl(wx.TreeCtrl):
             except:
                 pass
 
+    def add_Search_Result_Node(self, parentNode, nodeType, nodeText, nodeRecNum, nodeParent, sortOrder=None):
+        """ Add a Search Result node at the end of parentNode's children and return it.  Unlike add_Node(), this
+            doesn't climb the tree from the root, position the node, sort, or refresh the tree, so the caller must add
+            the nodes in order.  It is used to add large Search Results quickly. """
+        # Add the new Node to the Tree at the end
+        newNode = self.AppendItem(parentNode, Misc.unistrip(nodeText))
+        # Give the new Node the appropriate Graphic
+        self.set_image(newNode, SEARCH_NODE_IMAGES[nodeType])
+        # Create the Node Data and attach it to the Node
+        self.SetPyData(newNode, _NodeData(nodetype=nodeType, recNum=nodeRecNum, parent=nodeParent, sortOrder=sortOrder))
+        return newNode
+
     def select_Node(self, nodeData, nodeType, ensureVisible=True):
         """ This method is used to select nodes in the tree.
             nodeData is a list that gives the tree structure that describes where the node should be selected. """
@@ -7344,11 +7366,8 @@ class _DBTreeCtrl(wx.TreeCtrl):
             clipname = self.GetItemText(sel)
             # Load the Clip.  To save time, we can skip the Clip Transcripts.
             tempClip = Clip.Clip(selData.recNum, skipText=True)
-            tempCollection = Collection.Collection(tempClip.collection_num)
-            collectionList = [tempCollection.id]                     # Initialize a List
-            while tempCollection.parent != 0:
-                tempCollection = Collection.Collection(tempCollection.parent)
-                collectionList.insert(0, tempCollection.id)
+            # Get the names of the Clip's Collection and its parents from the Collection Path Index
+            collectionList = list(DBInterface.GetCollectionPath(tempClip.collection_num))
             nodeList = [_('Collections')] + collectionList + [clipname]
             self.select_Node(nodeList, 'ClipNode')
             
@@ -9198,16 +9217,9 @@ class _DBTreeCtrl(wx.TreeCtrl):
         self.parent.ControlObject.LoadClipByNumber(clipNum)
         # Get the Clip Object
         tempClip = self.parent.ControlObject.currentObj
-        # Get the parent Collection
-        tempCollection = Collection.Collection(tempClip.collection_num)
-        # Initialize a List for the node list to point to the collection in the database tree
-        collectionList = [tempCollection.id]
-        # While the collection has a parent ...
-        while tempCollection.parent != 0:
-            # ... load the parent ...
-            tempCollection = Collection.Collection(tempCollection.parent)
-            # ... and add it to the node list
-            collectionList.insert(0, tempCollection.id)
+        # Get the names of the Clip's Collection and its parents from the Collection Path Index for the node list
+        # to point to the collection in the database tree
+        collectionList = list(DBInterface.GetCollectionPath(tempClip.collection_num))
         # Add the Collection Root and the Clip to the node list
         nodeList = [_('Collections')] + collectionList + [tempClip.id]
         # Now signal the DB Tree to select / display the selected Clip
@@ -59,6 +59,7 @@ import cPickle                      # use Python's fast cPickle tool instead of
 import sys                          # import Python's sys module
 
 import DBInterface                  # Import Transana's Database Interface
+import DataObjectCache              # Import Transana's Data Object Cache
 import Series                       # Import the Transana Series object
 import Episode                      # Import the Transana Episode Object
 import Transcript                   # Import the Transana Transcript Object
@@ -878,8 +879,9 @@ def CreateClip(clipData, dropData, tree, dropNode):
         # Remember the Collection Node which should be the parent for the new Clip Node to be created later.
         collectionNode = tree.GetItemParent(dropNode)
 
-    # Load the Episode that is connected to the Clip's Originating Transcript
-    tempEpisode = Episode.Episode(tempClip.episode_num)
+    # Get the Episode that is connected to the Clip's Originating Transcript.  It is only read, so the
+    # Data Object Cache's shared copy will do.
+    tempEpisode = DataObjectCache.Get(Episode.Episode, tempClip.episode_num)
     # Start the clip off with the Episode's offset, though this could change if the first video wasn't used!
     tempClip.offset = tempEpisode.offset
     # Initially, assume that we don't need to shift the Clip offset, i.e. that the offset shift is ZERO
@@ -1212,65 +1214,76 @@ def DropKeyword(parent, sourceData, targetType, targetName, targetRecNum, target
             # Lock the Collection Record, just to be on the safe side (Is this necessary??  I don't think so, but maybe that can confirm that all Clips are available.)
             tempCollection.lock_record()
 
-            # Now load a list of all the Clips in the Collection and iterate through them
-            for tempClipNum, tempClipID, tempCollectNum in DBInterface.list_of_clips_by_collection(tempCollection.id, tempCollection.parent):
-                # Load the Clip.
-                tempClip = Clip.Clip(id_or_num=tempClipNum)
-                try:
-                    # Lock the Clip
-                    tempClip.lock_record()
-                    # Add the Keyword to the Clip
-                    tempClip.add_keyword(sourceData.parent, sourceData.text)
-                    # Save the Clip
-                    tempClip.db_save()
-                    # If the affected clip is for the current Episode, we need to update the
-                    # Keyword Visualization
-                    if (isinstance(parent.parent.ControlObject.currentObj, Episode.Episode)) and \
-                       (tempClip.episode_num == parent.parent.ControlObject.currentObj.number):
-                        # Signal that the Keyword Visualization needs to be updated
-                        updateKeywordVisualization = True
-                    # If the affected clip is the current Clip, we need to update the
-                    # Keyword Visualization
-                    if (isinstance(parent.parent.ControlObject.currentObj, Clip.Clip)) and \
-                       (tempClip.number == parent.parent.ControlObject.currentObj.number):
-                        # Signal that the Keyword Visualization needs to be updated
-                        updateKeywordVisualization = True
-                    # Now let's communicate with other Transana instances if we're in Multi-user mode
-                    if not TransanaConstants.singleUserVersion:
-                        msg = 'Clip %d' % tempClip.number
-                        if TransanaGlobal.chatWindow != None:
-                            # Send the "Update Keyword List" message
-                            TransanaGlobal.chatWindow.SendMessage("UKL %s" % msg)
-                    # Unlock the Clip
-                    tempClip.unlock_record()
-                # Handle "RecordLockedError" exception
-                except TransanaExceptions.RecordLockedError, e:
-                    TransanaExceptions.ReportRecordLockedException(_("Clip"), tempClip.id, e)
-
+            # Now load a list of all the Clips in the Collection
+            clipList = DBInterface.list_of_clips_by_collection(tempCollection.id, tempCollection.parent)
+            # If we're in the Professional Version, we also need a list of all the Snapshots in the Collection
             if TransanaConstants.proVersion:
-                # Now load a list of all the Snapshots in the Collection and iterate through them
-                for tempSnapshotNum, tempSnapshotID, tempCollectNum in DBInterface.list_of_snapshots_by_collectionnum(tempCollection.number):
-                    # Load the Snapshot
-                    tempSnapshot = Snapshot.Snapshot(tempSnapshotNum)
-                    try:
-                        # Lock the Snapshot
-                        tempSnapshot.lock_record()
-                        # Add the Keyword to the Snapshot
-                        tempSnapshot.add_keyword(sourceData.parent, sourceData.text)
-                        # Save the Snapshot
-                        tempSnapshot.db_save()
-
-                        # Now let's communicate with other Transana instances if we're in Multi-user mode
-                        if not TransanaConstants.singleUserVersion:
-                            msg = 'Snapshot %d' % tempSnapshot.number
-                            if TransanaGlobal.chatWindow != None:
-                                # Send the "Update Keyword List" message
-                                TransanaGlobal.chatWindow.SendMessage("UKL %s" % msg)
-                        # Unlock the Snapshot
-                        tempSnapshot.unlock_record()
-                    # Handle "RecordLockedError" exception
-                    except TransanaExceptions.RecordLockedError, e:
-                        TransanaExceptions.ReportRecordLockedException(_("Snapshot"), tempSnapshot.id, e)
+                snapshotList = DBInterface.list_of_snapshots_by_collectionnum(tempCollection.number)
+            else:
+                snapshotList = []
+            # Get a Database Cursor
+            dbCursor = DBInterface.get_db().cursor()
+            # Rather than loading, locking, and saving each Clip and Snapshot, we add the keyword to all the ones that
+            # aren't locked at once.  Start a transaction, so no one can lock them between the check and the update.
+            dbCursor.execute('BEGIN')
+            try:
+                # Find the Clips and Snapshots that are locked
+                lockedClips = DBInterface.LockedRecords(dbCursor, 'Clips2', 'ClipNum', [tempClipNum for (tempClipNum, tempClipID, tempCollectNum) in clipList], forUpdate=True)
+                lockedSnapshots = DBInterface.LockedRecords(dbCursor, 'Snapshots2', 'SnapshotNum', [tempSnapshotNum for (tempSnapshotNum, tempSnapshotID, tempCollectNum) in snapshotList], forUpdate=True)
+                # Make the lists of Clips and Snapshots to add the keyword to
+                clipNums = [tempClipNum for (tempClipNum, tempClipID, tempCollectNum) in clipList if not lockedClips.has_key(tempClipNum)]
+                snapshotNums = [tempSnapshotNum for (tempSnapshotNum, tempSnapshotID, tempCollectNum) in snapshotList if not lockedSnapshots.has_key(tempSnapshotNum)]
+                # Add the Keyword to the Clips and Snapshots within our transaction
+                keywordAdded = DBInterface.add_keyword_to_groups(sourceData.parent, sourceData.text, clipnums=clipNums, snapshotnums=snapshotNums, dbCursor=dbCursor)
+            # If anything goes wrong, undo the changes and pass the exception on
+            except:
+                dbCursor.execute('ROLLBACK')
+                dbCursor.close()
+                raise
+            # If the keyword was added, commit the changes.  Otherwise, there's nothing to keep.
+            if keywordAdded:
+                dbCursor.execute('COMMIT')
+            else:
+                dbCursor.execute('ROLLBACK')
+            # Close the Database Cursor
+            dbCursor.close()
+
+            # Now that the records are released, report the locked Clips ...
+            for (tempClipNum, tempClipID, tempCollectNum) in clipList:
+                if lockedClips.has_key(tempClipNum):
+                    TransanaExceptions.ReportRecordLockedException(_("Clip"), tempClipID, TransanaExceptions.RecordLockedError(lockedClips[tempClipNum]))
+            # ... and Snapshots
+            for (tempSnapshotNum, tempSnapshotID, tempCollectNum) in snapshotList:
+                if lockedSnapshots.has_key(tempSnapshotNum):
+                    TransanaExceptions.ReportRecordLockedException(_("Snapshot"), tempSnapshotID, TransanaExceptions.RecordLockedError(lockedSnapshots[tempSnapshotNum]))
+
+            # If the Keyword was NOT added, the keyword has been changed by another user!
+            if not keywordAdded:
+                if 'unicode' in wx.PlatformInfo:
+                    # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
+                    prompt = unicode(_('Keyword "%s : %s" cannot be added to Collection "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8')
+                else:
+                    prompt = _('Keyword "%s : %s" cannot be added to Collection "%s".\nAnother user must have edited the keyword while you were adding it.')
+                errordlg = Dialogs.ErrorDialog(None, prompt % (sourceData.parent, sourceData.text, tempCollection.id))
+                errordlg.ShowModal()
+                errordlg.Destroy()
+            else:
+                # If the current Episode may have Clips that were affected, or the current Clip was affected, we need to
+                # update the Keyword Visualization
+                if (isinstance(parent.parent.ControlObject.currentObj, Episode.Episode) and (len(clipNums) > 0)) or \
+                   (isinstance(parent.parent.ControlObject.currentObj, Clip.Clip) and (parent.parent.ControlObject.currentObj.number in clipNums)):
+                    # Signal that the Keyword Visualization needs to be updated
+                    updateKeywordVisualization = True
+                # Now let's communicate with other Transana instances if we're in Multi-user mode
+                if not TransanaConstants.singleUserVersion and (TransanaGlobal.chatWindow != None):
+                    # For each Clip ...
+                    for tempClipNum in clipNums:
+                        # Send the "Update Keyword List" message
+                        TransanaGlobal.chatWindow.SendMessage("UKL %s" % ('Clip %d' % tempClipNum))
+                    # For each Snapshot ...
+                    for tempSnapshotNum in snapshotNums:
+                        # Send the "Update Keyword List" message
+                        TransanaGlobal.chatWindow.SendMessage("UKL %s" % ('Snapshot %d' % tempSnapshotNum))
 
             # Unlock the Collection Record
             tempCollection.unlock_record()
@@ -3521,15 +3534,8 @@ def CopyMoveClip(treeCtrl, destNode, sourceClip, sourceCollection, destCollectio
              # Remove the old Clip from the Tree.
              # delete_Node needs to be able to climb the tree, so we need to build the Node List that
              # tells it what to delete.  Start with the sourceCollection.
-             nodeList = (sourceCollection.id,)
-             # Load the Current Collection so we can find out about its parent, and work backwards from here.
-             tempCollection = Collection.Collection(sourceCollection.number)
-             # While the Current Collection has a defined parent...
-             while tempCollection.parent > 0:
-                # Make the Parent the Current Collection
-                tempCollection = Collection.Collection(tempCollection.parent)
-                # Add the Parent (now the Current Collection) to the FRONT of the Node List
-                nodeList = (tempCollection.id,) + nodeList
+             # Get the names of the Collection and all its parents from the Collection Path Index
+             nodeList = DBInterface.GetCollectionPath(sourceCollection.number)
              # Now add the Collections Root to the front of the Node List and the Clip's original name to the end of the Node List
              nodeList = (_('Collections'), ) + nodeList + (clipName, )
              # Now request that the defined node be deleted
@@ -3563,17 +3569,8 @@ def CopyMoveClip(treeCtrl, destNode, sourceClip, sourceCollection, destCollectio
 
           # Add the new Clip to the Database Tree Tab
           # To add a Clip, we need to build the node list for the tree's add_Node method to climb.
-          # We need to add all of the Collection Parents to our Node List, so we'll start by loading
-          # the current Collection
-          tempCollection = Collection.Collection(destCollection.number)
-          # Add the current Collection Name, and work backwards from here.
-          nodeList = (tempCollection.id,)
-          # Repeat this process as long as the Collection we're looking at has a defined Parent...
-          while tempCollection.parent > 0:
-             # Load the Parent Collection
-             tempCollection = Collection.Collection(tempCollection.parent)
-             # Add this Collection's name to the FRONT of the Node List
-             nodeList = (tempCollection.id,) + nodeList
+          # We need to add all of the Collection Parents to our Node List, which we get from the Collection Path Index
+          nodeList = DBInterface.GetCollectionPath(destCollection.number)
           # Now add the Collections Root node to the front of the Node List and the
           # Clip Name to the back of the Node List
           if action == 'Copy':
@@ -3741,15 +3738,8 @@ def CopyMoveSnapshot(treeCtrl, destNode, sourceSnapshot, sourceCollection, destC
              # Remove the old Snapshot from the Tree.
              # delete_Node needs to be able to climb the tree, so we need to build the Node List that
              # tells it what to delete.  Start with the sourceCollection.
-             nodeList = (sourceCollection.id,)
-             # Load the Current Collection so we can find out about its parent, and work backwards from here.
-             tempCollection = Collection.Collection(sourceCollection.number)
-             # While the Current Collection has a defined parent...
-             while tempCollection.parent > 0:
-                # Make the Parent the Current Collection
-                tempCollection = Collection.Collection(tempCollection.parent)
-                # Add the Parent (now the Current Collection) to the FRONT of the Node List
-                nodeList = (tempCollection.id,) + nodeList
+             # Get the names of the Collection and all its parents from the Collection Path Index
+             nodeList = DBInterface.GetCollectionPath(sourceCollection.number)
              # Now add the Collections Root to the front of the Node List and the Snapshot's original name to the end of the Node List
              nodeList = (_('Collections'), ) + nodeList + (snapshotName, )
              # Now request that the defined node be deleted
@@ -3783,17 +3773,8 @@ def CopyMoveSnapshot(treeCtrl, destNode, sourceSnapshot, sourceCollection, destC
 
           # Add the new Snapshot to the Database Tree Tab
           # To add a Snapshot, we need to build the node list for the tree's add_Node method to climb.
-          # We need to add all of the Collection Parents to our Node List, so we'll start by loading
-          # the current DESTINATION Collection
-          tempCollection = Collection.Collection(destCollection.number)
-          # Add the current Collection Name, and work backwards from here.
-          nodeList = (tempCollection.id,)
-          # Repeat this process as long as the Collection we're looking at has a defined Parent...
-          while tempCollection.parent > 0:
-             # Load the Parent Collection
-             tempCollection = Collection.Collection(tempCollection.parent)
-             # Add this Collection's name to the FRONT of the Node List
-             nodeList = (tempCollection.id,) + nodeList
+          # We need to add all of the Collection Parents to our Node List, which we get from the Collection Path Index
+          nodeList = DBInterface.GetCollectionPath(destCollection.number)
           # Now add the Collections Root node to the front of the Node List and the
           # Snapshot Name to the back of the Node List
           if action == 'Copy':
@@ -286,9 +286,9 @@ class Episode(DataObject.DataObject):
         # Start the Save Process (inherited).  If we have a NEW Episode ...
         if (self._db_start_save() == 0):
             # Duplicate Episode IDs within a Series are not allowed.
-            if DBInterface.record_match_count("Episodes2", \
+            if DBInterface.record_exists("Episodes2", \
                     ("EpisodeID", "SeriesNum"),
-                    (id, self.series_num)) > 0:
+                    (id, self.series_num)):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('An Episode named "%s" already exists in Series "%s".\nPlease enter a different Episode ID.'), 'utf8')
@@ -309,9 +309,9 @@ class Episode(DataObject.DataObject):
         # If we have an existing Episode ...
         else:
             # check for dupes
-            if DBInterface.record_match_count("Episodes2", \
+            if DBInterface.record_exists("Episodes2", \
                     ("EpisodeID", "SeriesNum", "!EpisodeNum"),
-                    (id, self.series_num, self.number) ) > 0:
+                    (id, self.series_num, self.number) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('An Episode named "%s" already exists in Series "%s".\nPlease enter a different Episode ID.'), 'utf8')
@@ -362,9 +362,6 @@ class Episode(DataObject.DataObject):
             tempDBCursor.close()
         else:
             numberChanged = False
-            # If we are dealing with an existing Episode, delete all the Keywords
-            # in anticipation of putting them all back later
-            DBInterface.delete_all_keywords_for_a_group(self.number, 0, 0)
 
         # To save the additional video file names, we must first delete them from the database!
         # Craft a query to remove all existing Additonal Videos
@@ -390,20 +387,25 @@ class Episode(DataObject.DataObject):
             data = (self.number, 0, tmpFilename, vid['length'], vid['offset'], vid['audio'])
             # Execute the query
             c.execute(query, data)
+            # Record the Additional Video's Media Path
+            DBInterface.UpdateMediaPath(c, 'AdditionalVids2', c.lastrowid, tmpFilename)
+        # Record the Episode's Media Path
+        DBInterface.UpdateMediaPath(c, 'Episodes2', self.number, tempMediaFilename)
 
         # Initialize a blank error prompt
         prompt = ''
-        # Add the Episode keywords back.  Iterate through the Keyword List
-        for kws in self._kwlist:
-            # Try to add the Clip Keyword record.  If it is NOT added, the keyword has been changed by another user!
-            if not DBInterface.insert_clip_keyword(self.number, 0, 0, kws.keywordGroup, kws.keyword, kws.example):
-                # if the prompt isn't blank ...
-                if prompt != '':
-                    # ... add a couple of line breaks to it
-                    prompt += u'\n\n'
-                # Add the current keyword to the error prompt
-                # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
-                prompt += unicode(_('Keyword "%s : %s" cannot be added to Episode "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kws.keywordGroup, kws.keyword, self.id)
+        # Bring the Episode keywords in the database up to date with the Keyword List.  Keywords that can't be added
+        # have been changed by another user!
+        missingKeywords = DBInterface.set_keywords_for_a_group(self.number, 0, 0, [(kws.keywordGroup, kws.keyword, kws.example) for kws in self._kwlist])
+        # For each keyword that couldn't be added ...
+        for (kwg, kw) in missingKeywords:
+            # if the prompt isn't blank ...
+            if prompt != '':
+                # ... add a couple of line breaks to it
+                prompt += u'\n\n'
+            # Add the current keyword to the error prompt
+            # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
+            prompt += unicode(_('Keyword "%s : %s" cannot be added to Episode "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kwg, kw, self.id)
 
         # If there is an error prompt ...
         if prompt != '':
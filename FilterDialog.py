@@ -1667,9 +1667,9 @@ class FilterDialog(wx.Dialog):
                             configName = 'Default'
                             
                         # Check to see if the Configuration record already exists
-                        if DBInterface.record_match_count('Filters2',
+                        if DBInterface.record_exists('Filters2',
                                                          ('ReportType', 'ReportScope', 'ConfigName'),
-                                                         (self.reportType, reportScope, configName)) > 0:
+                                                         (self.reportType, reportScope, configName)):
                             # Update existing record.  Note that each report may generate multiple records in the database,
                             # FilterDataTypes
                             #   1 = Episodes,
@@ -1760,9 +1760,9 @@ class FilterDialog(wx.Dialog):
                                 keywordColors = cPickle.dumps(self.GetKeywordColors())
                                 # Keyword Colors were implemented late.  Therefore, we need to check whether we need to INSERT
                                 # or UPDATE this record
-                                if DBInterface.record_match_count('Filters2',
+                                if DBInterface.record_exists('Filters2',
                                                          ('ReportType', 'ReportScope', 'ConfigName', 'FilterDataType'),
-                                                         (self.reportType, reportScope, configName, 4)) > 0:
+                                                         (self.reportType, reportScope, configName, 4)):
                                     # Build the values to match the query, including the pickled Keyword Colors data
                                     values = (keywordColors, self.reportType, reportScope, configName, 4)
                                     # Execute the query with the appropriate data
@@ -1805,9 +1805,9 @@ class FilterDialog(wx.Dialog):
 
                                 # Snapshot Records might not have existed when the filter was originally created.
                                 # Therefore, we need to check whether we need to INSERT or UPDATE this record
-                                if DBInterface.record_match_count('Filters2',
+                                if DBInterface.record_exists('Filters2',
                                                          ('ReportType', 'ReportScope', 'ConfigName', 'FilterDataType'),
-                                                         (self.reportType, reportScope, configName, 18)) > 0:
+                                                         (self.reportType, reportScope, configName, 18)):
                                     # Build the values to match the query, including the pickled Keyword Colors data
                                     values = (snapshots, self.reportType, reportScope, configName, 18)
                                     # Execute the query with the appropriate data
@@ -2105,9 +2105,9 @@ class FilterDialog(wx.Dialog):
     def SaveFilterData(self, reportType, reportScope, configName, filterDataType, filterData):
         """  """
         # Check to see if the Configuration record already exists
-        if DBInterface.record_match_count('Filters2',
+        if DBInterface.record_exists('Filters2',
                                          ('ReportType', 'ReportScope', 'ConfigName', 'FilterDataType'),
-                                         (reportType, reportScope, configName, filterDataType)) > 0:
+                                         (reportType, reportScope, configName, filterDataType)):
             # Build the Update Query for Data
             query = """ UPDATE Filters2
                           SET FilterData = %s
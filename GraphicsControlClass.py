@@ -237,6 +237,19 @@ class GraphicsControl(wx.ScrolledWindow):
         self.lines.append((self.colour, self.thickness, newlines))
         self.reInitBuffer = True
 
+    def AddLineList(self, lineList):
+        """ Adds previously recorded lines (as returned by GetLines()) to the drawing """
+        self.lines.extend(lineList)
+        self.reInitBuffer = True
+
+    def GetLines(self, start=0):
+        """ Returns the lines that have been added to the drawing, starting with line number "start" """
+        return self.lines[start:]
+
+    def GetLineCount(self):
+        """ Returns the number of lines that have been added to the drawing """
+        return len(self.lines)
+
     def AddLines2(self, newlines):
         """ Adds new lines (send as a list) to the second layer of the drawing """
         # If the temporary line is in bounds of the graphic ...
@@ -390,30 +403,31 @@ class GraphicsControl(wx.ScrolledWindow):
             # Create a Pen
             self.SetColour(colour)
             pen = wx.Pen(self.colourDef, thickness, self.linepattern)
+            # dc.DrawLine produces a line with rounded ends if it's too thick.  It doesn't look
+            # very good.  So if we're drawing a thick line, let's use DrawRectangle instead.
+            if thickness > 2:
+                # For lines that are thick enough ...
+                if thickness > 3:
+                    # ... let's draw a black border
+                    penCol = wx.Colour(0, 0, 0)
+                # For lines that are too thin ...
+                else:
+                    # We'll just have the border match the bar color
+                    penCol = self.colourDef
+                # Create a pen for the rectangle outline.  The pen and brush are the same for every line in
+                # the line list, so we only create them once.
+                pen = wx.Pen(penCol, 1, wx.SOLID)
+                # Create a brush, which paint the interior of the rectangle.  Set it to our bar color.
+                brush = wx.Brush(self.colourDef, wx.SOLID)
+                # Set the brush to the DC
+                dc.SetBrush(brush)
             # Set the Pen for the Device Context
             dc.SetPen(pen)
             # Draw the lines in the line list
             # dc.DrawLine(**dict(line)) #TODO: This would work if points were (x,y)
             for coords in line:
-                # dc.DrawLine produces a line with rounded ends if it's too thick.  It doesn't look
-                # very good.  So if we're drawing a thick line, let's use DrawRectangle instead.
+                # For thick lines ...
                 if thickness > 2:
-                    # For lines that are thick enough ...
-                    if thickness > 3:
-                        # ... let's draw a black border
-                        penCol = wx.Colour(0, 0, 0)
-                    # For lines that are too thin ...
-                    else:
-                        # We'll just have the border match the bar color
-                        penCol = self.colourDef
-                    # Create a pen for the rectangle outline.
-                    pen = wx.Pen(penCol, 1, wx.SOLID)
-                    # Set the pen for the DC
-                    dc.SetPen(pen)
-                    # Create a brush, which paint the interior of the rectangle.  Set it to our bar color.
-                    brush = wx.Brush(self.colourDef, wx.SOLID)
-                    # Set the brush to the DC
-                    dc.SetBrush(brush)
                     # Draw a rectangle based on the line coordinates and specified thickness.
                     dc.DrawRectangle(coords[0], coords[1]-int(thickness/2), coords[2]-coords[0], thickness)
                 # For "thin" lines ...
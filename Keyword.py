@@ -304,9 +304,9 @@ class Keyword(object):
 
         if (self._db_start_save() == 0):
             # duplicate Keywords are not allowed
-            if DBInterface.record_match_count("Keywords2", \
+            if DBInterface.record_exists("Keywords2", \
                             ("KeywordGroup", "Keyword"), \
-                            (keywordGroup, keyword) ) > 0:
+                            (keywordGroup, keyword) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Keyword named "%s : %s" already exists.'), 'utf8') % (self.keywordGroup, self.keyword)
@@ -328,9 +328,9 @@ class Keyword(object):
             mergeKeywords = False
         else:
             # check for dupes, which are not allowed if either the Keyword Group or Keyword have been changed.
-            if (DBInterface.record_match_count("Keywords2", \
+            if (DBInterface.record_exists("Keywords2", \
                             ("KeywordGroup", "Keyword"), \
-                            (keywordGroup, keyword) ) > 0) and \
+                            (keywordGroup, keyword) )) and \
                ((originalKeywordGroup != keywordGroup) or \
                 (originalKeyword.lower() != keyword.lower())):
                 # If duplication is found, ask the user if we should MERGE the keywords.
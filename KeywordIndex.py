@@ -0,0 +1,179 @@
+# Copyright (C) 2003 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+#
+
+"""This module implements an in-memory index of the keywords applied to Episodes, Clips, and Snapshots, so that
+   Searches can be evaluated as set operations on record numbers rather than as aggregate queries on the Clip
+   Keywords table.  It provides the following public functions:
+
+    Get(objectType, kwg, kw)
+    GetAll(objectType)
+    Invalidate(objectType, num)
+    Clear()
+
+   objectType is 'Episode', 'Clip', 'Snapshot' (for keywords applied to whole Snapshots), or 'SnapshotCoding' (for
+   the visible keywords drawn on Snapshots).  The index is loaded from the database the first time it is used.
+   Objects whose keywords are saved are invalidated (see DBInterface) and re-read the next time the index is used.
+   The whole index is reloaded after keywords are renamed, merged, or deleted (see KeywordObject and DBInterface),
+   after records are deleted (see DataObject) or imported (see XMLImport), when another user changes the database
+   (see ChatWindow), and when the database is closed (see DBInterface).
+"""
+
+__author__ = 'David Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "KeywordIndex DEBUG is ON!"
+
+# Import wxPython
+import wx
+
+# import Python's threading module, as background threads may save objects too
+import threading
+
+# Import the Transana Database Interface
+import DBInterface
+# Import Transana's Globals
+import TransanaGlobal
+
+# The kinds of objects the index covers
+OBJECT_TYPES = ('Episode', 'Clip', 'Snapshot', 'SnapshotCoding')
+
+
+class KeywordIndex(object):
+    """ The sets of Episode, Clip, and Snapshot numbers that have each Keyword Group : Keyword pair """
+
+    def __init__(self):
+        """ Initialize the index """
+        # A lock protecting the index
+        self.lock = threading.Lock()
+        # The index hasn't been loaded yet
+        self.loaded = False
+
+    def _Load(self):
+        """ Load the whole index from the database """
+        # For each object type, the set of object numbers for each (kwg, kw) pair ...
+        self.objects = {}
+        # ... the set of (kwg, kw) pairs for each object number ...
+        self.keywords = {}
+        # ... and the object numbers whose keywords have changed since they were loaded
+        self.dirty = {}
+        for objectType in OBJECT_TYPES:
+            self.objects[objectType] = {}
+            self.keywords[objectType] = {}
+            self.dirty[objectType] = set()
+            # Add all the keywords for this type of object
+            for (num, kwg, kw) in DBInterface.iter_keyword_assignments(objectType):
+                self._Add(objectType, num, (kwg, kw))
+        self.loaded = True
+        if DEBUG:
+            for objectType in OBJECT_TYPES:
+                print "KeywordIndex._Load():", objectType, len(self.keywords[objectType]), "objects,", len(self.objects[objectType]), "keywords"
+
+    def _Add(self, objectType, num, key):
+        """ Record that object num of type objectType has the keyword key """
+        self.objects[objectType].setdefault(key, set()).add(num)
+        self.keywords[objectType].setdefault(num, set()).add(key)
+
+    def _Refresh(self):
+        """ Make sure the index is loaded and that invalidated objects have been re-read """
+        # If the index hasn't been loaded, load all of it
+        if not self.loaded:
+            self._Load()
+            return
+        for objectType in OBJECT_TYPES:
+            # If any objects of this type have been invalidated ...
+            if len(self.dirty[objectType]) > 0:
+                nums = self.dirty[objectType]
+                # ... remove their keywords from the index ...
+                for num in nums:
+                    for key in self.keywords[objectType].pop(num, ()):
+                        self.objects[objectType][key].discard(num)
+                        # Drop keywords no object has any more
+                        if len(self.objects[objectType][key]) == 0:
+                            del(self.objects[objectType][key])
+                # ... and read their current keywords
+                for (num, kwg, kw) in DBInterface.iter_keyword_assignments(objectType, nums):
+                    self._Add(objectType, num, (kwg, kw))
+                self.dirty[objectType] = set()
+
+    def Get(self, objectType, key):
+        """ Return the set of numbers of the objects of type objectType that have the keyword key, a (kwg, kw) pair in
+            the form used to save it in the database """
+        self.lock.acquire()
+        try:
+            self._Refresh()
+            # Return a copy, so the caller can't change the index
+            return set(self.objects[objectType].get(key, ()))
+        finally:
+            self.lock.release()
+
+    def GetAll(self, objectType):
+        """ Return the set of numbers of all the objects of type objectType that have any keywords """
+        self.lock.acquire()
+        try:
+            self._Refresh()
+            return set(self.keywords[objectType].keys())
+        finally:
+            self.lock.release()
+
+    def Invalidate(self, objectType, num):
+        """ Note that the keywords of object num of type objectType have changed """
+        self.lock.acquire()
+        try:
+            # If the index is loaded, the object will be re-read the next time the index is used.  (If the index isn't
+            # loaded, the object will be read when it is.)
+            if self.loaded:
+                self.dirty[objectType].add(num)
+                # A Snapshot's coding is saved along with its keywords
+                if objectType == 'Snapshot':
+                    self.dirty['SnapshotCoding'].add(num)
+        finally:
+            self.lock.release()
+
+    def Clear(self):
+        """ Discard the index, so it will be reloaded the next time it is used """
+        self.lock.acquire()
+        try:
+            self.loaded = False
+            self.objects = {}
+            self.keywords = {}
+            self.dirty = {}
+        finally:
+            self.lock.release()
+
+
+# The shared Keyword Index
+_index = KeywordIndex()
+
+def Get(objectType, kwg, kw):
+    """ Return the set of numbers of the objects of type objectType that have the keyword kwg : kw """
+    # The index holds keywords in the form used to save them in the database
+    if 'unicode' in wx.PlatformInfo:
+        kwg = kwg.encode(TransanaGlobal.encoding)
+        kw = kw.encode(TransanaGlobal.encoding)
+    return _index.Get(objectType, (kwg, kw))
+
+def GetAll(objectType):
+    """ Return the set of numbers of all the objects of type objectType that have any keywords """
+    return _index.GetAll(objectType)
+
+def Invalidate(objectType, num):
+    """ Note that the keywords of object num of type objectType (such as 'Clip') have changed """
+    _index.Invalidate(objectType, num)
+
+def Clear():
+    """ Discard the whole index """
+    _index.Clear()
@@ -42,6 +42,8 @@ import Dialogs
 import Episode
 # Import Transana's Filter Dialog
 import FilterDialog
+# Import Transana's Keyword Map Data model
+import KeywordMapData
 # import Transana's Keyword Object
 import KeywordObject
 # import Transana Miscellaneous functions
@@ -82,7 +84,7 @@ ID_SERIESLIST        = wx.NewId()
 # Episode List Combo Box
 ID_EPISODELIST       = wx.NewId()
 
-class KeywordMap(wx.Frame):
+class KeywordMap(wx.Frame, KeywordMapData.KeywordMapData):
     """ This is the main class for the Keyword Map application.
         It can be instantiated as a free-standing report with a frame, or can be
         called as an embedded graphic display for the Visualization window. """
@@ -144,15 +146,8 @@ class KeywordMap(wx.Frame):
         self.MediaFile = ''
         # Initialize Media Length to 0
         self.MediaLength = 0
-        # Initialize Keyword Lists to empty
-        self.unfilteredKeywordList = []
-        self.filteredKeywordList = []
-        # Intialize the Clip List to empty
-        self.clipList = []
-        self.clipFilterList = []
-        # Initialize the Snapshot List to empty
-        self.snapshotList = []
-        self.snapshotFilterList = []
+        # Initialize the Keyword, Clip, and Snapshot Lists to empty
+        self.ResetKeywordMapData()
         # To be able to show only parts of an Episode Time Line, we need variables for the time boundaries.
         self.startTime = 0
         self.endTime = 0
@@ -161,6 +156,10 @@ class KeywordMap(wx.Frame):
         # Initialize variables required to avoid crashes when the visualization has been cleared
         self.graphicindent = 0
         self.Bounds = [1, 1, 1, 1]
+        # Initialize the size of the Keyword Map's graphic control, so we know when it needs to be re-created
+        self.graphicBounds = None
+        # Initialize the Row Cache, which holds the lines drawn for each keyword row so unchanged rows don't need to be re-drawn
+        self.rowCache = {}
         # Create a dictionary of the colors for each keyword.
         self.keywordColors = {'lastColor' : -1}
         if not self.embedded:
@@ -278,6 +277,8 @@ class KeywordMap(wx.Frame):
                                                            (self.Bounds[2] - self.Bounds[0], self.Bounds[3] - self.Bounds[1]),
                                                            (self.Bounds[2] - self.Bounds[0], self.Bounds[3] - self.Bounds[1]),
                                                             passMouseEvents=True)
+        # This graphic control will be replaced by DrawGraph() once the size of the Keyword Map is known
+        self.graphicBounds = None
 
         # Add a Status Bar
         self.CreateStatusBar()
@@ -299,12 +300,12 @@ class KeywordMap(wx.Frame):
         # If we have a Series name and Episode Name, we are doing a Keyword Map
         if (self.seriesName != '') and (self.episodeName != ''):
             # Initialize the Clip Filter List to be empty
-            self.clipFilterList = []
+            self.clipFilterList = KeywordMapData.KeywordMapList()
             # Initialize the Snapshot Filter List to be empty
-            self.snapshotFilterList = []
+            self.snapshotFilterList = KeywordMapData.KeywordMapList()
             # Clear the drawing
-            self.filteredKeywordList = []
-            self.unfilteredKeywordList = []
+            self.filteredKeywordList = KeywordMapData.KeywordMapList()
+            self.unfilteredKeywordList = KeywordMapData.KeywordMapList()
             # Populate the drawing
             self.ProcessEpisode()
             # We need to draw the graph before we set the Default filter
@@ -318,8 +319,8 @@ class KeywordMap(wx.Frame):
             # Create a collection object
             self.collection = Collection.Collection(self.collectionNum)
             # Clear the drawing
-            self.filteredKeywordList = []
-            self.unfilteredKeywordList = []
+            self.filteredKeywordList = KeywordMapData.KeywordMapList()
+            self.unfilteredKeywordList = KeywordMapData.KeywordMapList()
             # Populate the drawing
             self.ProcessCollection()
             # We need to draw the graph before we set the Default filter
@@ -359,14 +360,14 @@ class KeywordMap(wx.Frame):
         # If we have a defined Episode (which we always should) ...
         if (self.seriesName != '') and (self.episodeName != ''):
             # Set the initial Clip Lists
-            self.clipFilterList = filteredClipList[:]
-            self.clipList = unfilteredClipList[:]
+            self.clipFilterList = KeywordMapData.KeywordMapList(filteredClipList)
+            self.clipList = KeywordMapData.KeywordMapList(unfilteredClipList)
             # Set the initial Snapshot Lists
-            self.snapshotFilterList = filteredSnapshotList[:]
-            self.snapshotList = unfilteredSnapshotList[:]
+            self.snapshotFilterList = KeywordMapData.KeywordMapList(filteredSnapshotList)
+            self.snapshotList = KeywordMapData.KeywordMapList(unfilteredSnapshotList)
             # set the initial keyword lists
-            self.filteredKeywordList = filteredKeywordList[:]
-            self.unfilteredKeywordList = unfilteredKeywordList[:]
+            self.filteredKeywordList = KeywordMapData.KeywordMapList(filteredKeywordList)
+            self.unfilteredKeywordList = KeywordMapData.KeywordMapList(unfilteredKeywordList)
             # If we got keywordColors, use them!!
             if keywordColors != None:
                 self.keywordColors = keywordColors
@@ -539,8 +540,10 @@ class KeywordMap(wx.Frame):
                     if keywordColors:
                         # ... then get the keyword color data from the Filter Dialog
                         self.keywordColors = dlgFilter.GetKeywordColors()
+                # Make sure the lists we got from the Filter Dialog are indexed
+                self.IndexKeywordMapData()
                 # Reset the Filtered Keyword List
-                self.filteredKeywordList = []
+                self.filteredKeywordList = KeywordMapData.KeywordMapList()
                 # Iterate through the entire Keword List ...
                 for (kwg, kw, checked) in self.unfilteredKeywordList:
                     # ... and determine which keywords were checked.
@@ -912,7 +915,7 @@ class KeywordMap(wx.Frame):
         if (self.filteredKeywordList == []) and (self.unfilteredKeywordList == []):
             # If we deleted the last keyword in a filtered list, the Filter Dialog ended up with
             # duplicate entries.  This should prevent it!!
-            self.unfilteredKeywordList = []
+            self.unfilteredKeywordList = KeywordMapData.KeywordMapList()
             # Get the list of CLIP Keywords to be displayed
             SQLText = """SELECT ck.KeywordGroup, ck.Keyword
                            FROM Clips2 cl, ClipKeywords2 ck
@@ -926,10 +929,7 @@ class KeywordMap(wx.Frame):
             for (kwg, kw) in self.DBCursor.fetchall():
                 kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                 kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                if not (kwg, kw) in self.filteredKeywordList:
-                    self.filteredKeywordList.append((kwg, kw))
-                if not (kwg, kw, True) in self.unfilteredKeywordList:
-                    self.unfilteredKeywordList.append((kwg, kw, True))
+                self.AddKeyword(kwg, kw)
 
             if TransanaConstants.proVersion:
                 # Get the list of WHOLE SNAPSHOT Keywords to be displayed
@@ -945,10 +945,7 @@ class KeywordMap(wx.Frame):
                 for (kwg, kw) in self.DBCursor.fetchall():
                     kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                     kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw, True) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                    self.AddKeyword(kwg, kw)
 
                 # Get the list of SNAPSHOT CODING Keywords to be displayed
                 SQLText = """SELECT ck.KeywordGroup, ck.Keyword
@@ -963,10 +960,7 @@ class KeywordMap(wx.Frame):
                 for (kwg, kw) in self.DBCursor.fetchall():
                     kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                     kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw, True) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                    self.AddKeyword(kwg, kw)
 
         # If we haven't loaded a configuration (which contains its own sort order) ...
         if self.configName == '':
@@ -991,11 +985,7 @@ class KeywordMap(wx.Frame):
             # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
             # If we're dealing with a Clip, we only want to deal with THIS clip!
             if (self.clipNum == None) or (clipNum == self.clipNum):
-                if (kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum) not in self.clipList:
-                    self.clipList.append((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum))
-                if (not ((clipID, collectNum, True) in self.clipFilterList)) and \
-                   (not ((clipID, collectNum, False) in self.clipFilterList)):
-                    self.clipFilterList.append((clipID, collectNum, True))
+                self.AddClip((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum), clipID, collectNum)
 
         if TransanaConstants.proVersion:
             # Create the WHOLE SNAPSHOT Keyword Placement lines to be displayed.  We need them to be in SnapshotTimeCode, SnapshotNum order so colors will be
@@ -1015,11 +1005,7 @@ class KeywordMap(wx.Frame):
                 # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
                 # If we're dealing with a Clip, we only want to deal with THIS clip!
                 if (self.clipNum == None):
-                    if (kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum) not in self.snapshotList:
-                        self.snapshotList.append((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum))
-                    if (not ((SnapshotID, collectNum, True) in self.snapshotFilterList)) and \
-                       (not ((SnapshotID, collectNum, False) in self.snapshotFilterList)):
-                        self.snapshotFilterList.append((SnapshotID, collectNum, True))
+                    self.AddSnapshot((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum), SnapshotID, collectNum)
 
             # Create the SNAPSHOT CODING Keyword Placement lines to be displayed.  We need them to be in SnapshotTimeCode, SnapshotNum order so colors will be
             # distributed properly across bands.
@@ -1038,18 +1024,14 @@ class KeywordMap(wx.Frame):
                 # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
                 # If we're dealing with a Clip, we only want to deal with THIS clip!
                 if (self.clipNum == None):
-                    if (kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum) not in self.snapshotList:
-                        self.snapshotList.append((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum))
-                    if (not ((SnapshotID, collectNum, True) in self.snapshotFilterList)) and \
-                       (not ((SnapshotID, collectNum, False) in self.snapshotFilterList)):
-                        self.snapshotFilterList.append((SnapshotID, collectNum, True))
+                    self.AddSnapshot((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum), SnapshotID, collectNum)
 
     def ProcessCollection(self):
         """ Process a Collection for the Collection Keyword Map variation of the Keyword Map """
         # Initialize the Clip Filter List
-        self.clipFilterList = []
+        self.clipFilterList = KeywordMapData.KeywordMapList()
         # Initialize the Snapshot Filter List
-        self.snapshotFilterList = []
+        self.snapshotFilterList = KeywordMapData.KeywordMapList()
         # We don't have a single Media File here.  Leave it blank
         self.MediaFile = ''
         # Initialize the Media Length, which we will accumulate from the clips
@@ -1060,7 +1042,7 @@ class KeywordMap(wx.Frame):
         if self.filteredKeywordList == []:
             # If we deleted the last keyword in a filtered list, the Filter Dialog ended up with
             # duplicate entries.  This should prevent it!!
-            self.unfilteredKeywordList = []
+            self.unfilteredKeywordList = KeywordMapData.KeywordMapList()
             # Get the list of CLIP Keywords to be displayed.  This query should do it.
             SQLText = """SELECT ck.KeywordGroup, ck.Keyword
                            FROM Clips2 cl, ClipKeywords2 ck
@@ -1078,8 +1060,7 @@ class KeywordMap(wx.Frame):
                 kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                 kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                 # ... and add them to the filtered and unfiltered keyword lists
-                self.filteredKeywordList.append((kwg, kw))
-                self.unfilteredKeywordList.append((kwg, kw, True))
+                self.AddKeyword(kwg, kw)
 
             if TransanaConstants.proVersion:
                 # Get the list of WHOLE SNAPSHOT Keywords to be displayed
@@ -1100,10 +1081,7 @@ class KeywordMap(wx.Frame):
                     kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                     # ... and IF they're not already there, add them to the filtered and unfiltered keyword lists.
                     # Unlike with Clips, a Snapshot can have multiple instances of the same keyword!!
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw, True) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                    self.AddKeyword(kwg, kw)
 
                 # Get the list of SNAPSHOT CODING Keywords to be displayed
                 SQLText = """SELECT ck.KeywordGroup, ck.Keyword
@@ -1123,10 +1101,7 @@ class KeywordMap(wx.Frame):
                     kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                     # ... and IF they're not already there, add them to the filtered and unfiltered keyword lists.
                     # Unlike with Clips, a Snapshot can have multiple instances of the same keyword!!
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw, True) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                    self.AddKeyword(kwg, kw)
 
         # Sort the Keyword Lists
         self.unfilteredKeywordList.sort()
@@ -1243,10 +1218,8 @@ class KeywordMap(wx.Frame):
                     if (self.clipNum == None):
                         # Add the current Clip/keyword combo to the Clip List, placing it to the right of the last clip.
                         self.clipList.append((kwg, kw, self.MediaLength - (clipStop - clipStart) - 50, self.MediaLength - 50, clipNum, clipID, collectNum))
-                        # If the clip ID isn't already in the Clip Filter List ...
-                        if not ((clipID, collectNum, True) in self.clipFilterList):
-                            # ... add the clip to the Clip Filter List
-                            self.clipFilterList.append((clipID, collectNum, True))
+                        # Add the clip to the Clip Filter List if the clip ID isn't already there
+                        self.clipFilterList.AddUnique((clipID, collectNum, True))
                 # If the next record is a SNAPSHOT ...
                 elif recData[0] == 'Snapshot':
                     # ... extract the Snapshot data
@@ -1263,16 +1236,11 @@ class KeywordMap(wx.Frame):
                     snapshotID = DBInterface.ProcessDBDataForUTF8Encoding(snapshotID)
                     # If we're dealing with a Collection Keyword Report, self.clipNum will be None and we want all data.
                     if (self.clipNum == None):
-                        # Snapshots, unlike Clips, can have the same keyword multiple times.  Let's check to see if this Keyword is already
-                        # in the Snapshot List.
-                        if (kwg, kw, self.MediaLength - snapshotDuration - 50, self.MediaLength - 50, snapshotNum, snapshotID, collectNum) not in self.snapshotList:
-                            # Add the current Snapshot/keyword combo to the Snapshot List, placing it to the right of the last snapshot.
-                            self.snapshotList.append((kwg, kw, self.MediaLength - snapshotDuration - 50, self.MediaLength - 50, snapshotNum, snapshotID, collectNum))
-                        # If the snapshot ID isn't already in the Snapshot Filter List ...
-                        if (not ((snapshotID, collectNum, True) in self.snapshotFilterList)) and \
-                           (not ((snapshotID, collectNum, False) in self.snapshotFilterList)):
-                            # ... add it to the Snapshot Filter List
-                            self.snapshotFilterList.append((snapshotID, collectNum, True))
+                        # Snapshots, unlike Clips, can have the same keyword multiple times, so AddSnapshot() skips duplicates.
+                        # Add the current Snapshot/keyword combo to the Snapshot List, placing it to the right of the last snapshot,
+                        # and add the snapshot to the Snapshot Filter List.
+                        self.AddSnapshot((kwg, kw, self.MediaLength - snapshotDuration - 50, self.MediaLength - 50, snapshotNum, snapshotID, collectNum),
+                                         snapshotID, collectNum)
 
         # When we're done adding clips, we know the total width of the graphic.  Set self.endTime to the accumulated
         # Media Length so the graphic will render correctly.
@@ -1288,19 +1256,22 @@ class KeywordMap(wx.Frame):
         # if reset is true (always except Hybrid Visualization!) ...
         if reset:
             # Clear the Clip List
-            self.clipList = []
+            self.clipList = KeywordMapData.KeywordMapList()
             # Clear the Filtered Clip List
-            self.clipFilterList = []
+            self.clipFilterList = KeywordMapData.KeywordMapList()
             # Clear the Snapshot List
-            self.snapshotList = []
+            self.snapshotList = KeywordMapData.KeywordMapList()
             # Clear the Filtered Snapshot List
-            self.snapshotFilterList = []
+            self.snapshotFilterList = KeywordMapData.KeywordMapList()
+        # The Hybrid Visualization's Filter box may have handed us plain lists.  Make sure they're indexed.
+        else:
+            self.IndexKeywordMapData()
         # Clear the graphic itself (Pass on Hybrid Visualization's reset variable!)
         self.graphic.Clear(reset=reset)
 
         # Before we start, make a COPY of the keyword list so we can check for keywords that are no longer
         # included on the Map and need to be deleted from the KeywordLists
-        delList = self.unfilteredKeywordList[:]
+        delList = KeywordMapData.KeywordMapList(self.unfilteredKeywordList)
         
         # Now let's create the SQL to get all relevant Clip and Clip Keyword records
         SQLText = """SELECT ck.KeywordGroup, ck.Keyword, cl.ClipStart, cl.ClipStop, cl.ClipNum, cl.ClipID, cl.CollectNum
@@ -1320,29 +1291,18 @@ class KeywordMap(wx.Frame):
             # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
             # If we're dealing with a Clip, we only want to deal with THIS clip!
             if (self.clipNum == None) or (clipNum == self.clipNum):
-                # If a Clip is not found in the clipList ...
-                if not ((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum) in self.clipList):
-                    # ... add it to the clipList ...
-                    self.clipList.append((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum))
-                    # ... and if it's not in the clipFilter List (which it probably isn't!) ...
-                    if not ((clipID, collectNum, True) in self.clipFilterList):
-                        # ... add it to the clipFilterList.
-                        self.clipFilterList.append((clipID, collectNum, True))
-
-            # If the keyword is not in either of the Keyword Lists, ...
-            if not (((kwg, kw) in self.filteredKeywordList) or ((kwg, kw, False) in self.unfilteredKeywordList)):
-                # ... add it to both keyword lists.
-                if not (kwg, kw) in self.filteredKeywordList:
-                    self.filteredKeywordList.append((kwg, kw))
-                if not (kwg, kw) in self.unfilteredKeywordList:
-                    self.unfilteredKeywordList.append((kwg, kw, True))
+                # Add the Clip to the clipList and the clipFilterList if it's not already there
+                self.AddClip((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum), clipID, collectNum)
+
+            # If the keyword is not in either of the Keyword Lists, add it to both keyword lists.
+            self.AddNewKeyword(kwg, kw)
 
             # If the keyword is in query results, it should be removed from the list of keywords to be deleted.
             # Check that list for either True or False versions of the keyword!
             if (kwg, kw, True) in delList:
-                del(delList[delList.index((kwg, kw, True))])
+                delList.remove((kwg, kw, True))
             if (kwg, kw, False) in delList:
-                del(delList[delList.index((kwg, kw, False))])
+                delList.remove((kwg, kw, False))
 
         # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
         # If we're dealing with a Clip, we don't deal with Snapshots!
@@ -1362,29 +1322,18 @@ class KeywordMap(wx.Frame):
                 kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                 kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                 snapshotID = DBInterface.ProcessDBDataForUTF8Encoding(snapshotID)
-                # If a Snapshot is not found in the snapshotList ...
-                if not ((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum) in self.snapshotList):
-                    # ... add it to the snapshotList ...
-                    self.snapshotList.append((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum))
-                    # ... and if it's not in the snapshotFilter List (which it probably isn't!) ...
-                    if not ((snapshotID, collectNum, True) in self.snapshotFilterList):
-                        # ... add it to the snapshotFilterList.
-                        self.snapshotFilterList.append((snapshotID, collectNum, True))
-
-                # If the keyword is not in either of the Keyword Lists, ...
-                if not (((kwg, kw) in self.filteredKeywordList) or ((kwg, kw, False) in self.unfilteredKeywordList)):
-                    # ... add it to both keyword lists.
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                # Add the Snapshot to the snapshotList and the snapshotFilterList if it's not already there
+                self.AddSnapshot((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum), snapshotID, collectNum)
+
+                # If the keyword is not in either of the Keyword Lists, add it to both keyword lists.
+                self.AddNewKeyword(kwg, kw)
 
                 # If the keyword is in query results, it should be removed from the list of keywords to be deleted.
                 # Check that list for either True or False versions of the keyword!
                 if (kwg, kw, True) in delList:
-                    del(delList[delList.index((kwg, kw, True))])
+                    delList.remove((kwg, kw, True))
                 if (kwg, kw, False) in delList:
-                    del(delList[delList.index((kwg, kw, False))])
+                    delList.remove((kwg, kw, False))
 
             # Now let's create the SQL to get all relevant SNAPSHOT CODING Keyword records
             SQLText = """SELECT ck.KeywordGroup, ck.Keyword, sn.SnapshotTimeCode, sn.SnapshotDuration, sn.SnapshotNum, sn.SnapshotID, sn.CollectNum
@@ -1401,38 +1350,27 @@ class KeywordMap(wx.Frame):
                 kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                 kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                 snapshotID = DBInterface.ProcessDBDataForUTF8Encoding(snapshotID)
-                # If a Snapshot is not found in the snapshotList ...
-                if not ((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum) in self.snapshotList):
-                    # ... add it to the snapshotList ...
-                    self.snapshotList.append((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum))
-                    # ... and if it's not in the snapshotFilter List (which it probably isn't!) ...
-                    if not ((snapshotID, collectNum, True) in self.snapshotFilterList):
-                        # ... add it to the snapshotFilterList.
-                        self.snapshotFilterList.append((snapshotID, collectNum, True))
-
-                # If the keyword is not in either of the Keyword Lists, ...
-                if not (((kwg, kw) in self.filteredKeywordList) or ((kwg, kw, False) in self.unfilteredKeywordList)):
-                    # ... add it to both keyword lists.
-                    if not (kwg, kw) in self.filteredKeywordList:
-                        self.filteredKeywordList.append((kwg, kw))
-                    if not (kwg, kw) in self.unfilteredKeywordList:
-                        self.unfilteredKeywordList.append((kwg, kw, True))
+                # Add the Snapshot to the snapshotList and the snapshotFilterList if it's not already there
+                self.AddSnapshot((kwg, kw, snapshotStart, snapshotStart + snapshotDuration, snapshotNum, snapshotID, collectNum), snapshotID, collectNum)
+
+                # If the keyword is not in either of the Keyword Lists, add it to both keyword lists.
+                self.AddNewKeyword(kwg, kw)
 
                 # If the keyword is in query results, it should be removed from the list of keywords to be deleted.
                 # Check that list for either True or False versions of the keyword!
                 if (kwg, kw, True) in delList:
-                    del(delList[delList.index((kwg, kw, True))])
+                    delList.remove((kwg, kw, True))
                 if (kwg, kw, False) in delList:
-                    del(delList[delList.index((kwg, kw, False))])
+                    delList.remove((kwg, kw, False))
 
         # Iterate through ANY keywords left in the list of keywords to be deleted ...
         for element in delList:
             # ... and delete them from the unfiltered Keyword List
-            del(self.unfilteredKeywordList[self.unfilteredKeywordList.index(element)])
+            self.unfilteredKeywordList.remove(element)
             # If the keyword is also in the filtered keyword list ...
             if (element[0], element[1]) in self.filteredKeywordList:
                 # ... it needs to be deleted from there too!
-                del(self.filteredKeywordList[self.filteredKeywordList.index((element[0], element[1]))])
+                self.filteredKeywordList.remove((element[0], element[1]))
 
         # Now that the underlying data structures have been corrected, we're ready to redraw the Keyword Visualization
         self.DrawGraph()
@@ -1446,16 +1384,29 @@ class KeywordMap(wx.Frame):
     def DrawGraph(self):
         """ Actually Draw the Keyword Map """
         self.keywordClipList = {}
+        self.keywordClipIndex = {}
 
         if not self.embedded:
             # Now that we have all necessary information, let's create and populate the graphic
-            # Start by destroying the existing control and creating a new one with the correct Canvas Size
-            self.graphic.Destroy()
             newheight = max(self.CalcY(len(self.filteredKeywordList) + 1), self.Bounds[3] - self.Bounds[1])
-            self.graphic = GraphicsControlClass.GraphicsControl(self, -1, wx.Point(self.Bounds[0], self.Bounds[1]),
-                                                                (self.Bounds[2] - self.Bounds[0], self.Bounds[3] - self.Bounds[1]),
-                                                                (self.Bounds[2] - self.Bounds[0], newheight + 3),
-                                                                passMouseEvents=True)
+            # Determine the size and position of the control and its Canvas
+            graphicBounds = (tuple(self.Bounds), (self.Bounds[2] - self.Bounds[0], newheight + 3))
+            # If the existing control has the right size and Canvas Size ...
+            if graphicBounds == self.graphicBounds:
+                # ... we can just clear it and re-use it
+                self.graphic.Clear()
+            # Otherwise ...
+            else:
+                # ... destroy the existing control and create a new one with the correct Canvas Size
+                self.graphic.Destroy()
+                self.graphic = GraphicsControlClass.GraphicsControl(self, -1, wx.Point(self.Bounds[0], self.Bounds[1]),
+                                                                    (self.Bounds[2] - self.Bounds[0], self.Bounds[3] - self.Bounds[1]),
+                                                                    graphicBounds[1],
+                                                                    passMouseEvents=True)
+                # Remember the size of the new control
+                self.graphicBounds = graphicBounds
+                # Enable tracking of mouse movement over the new graphic
+                self.graphic.Bind(wx.EVT_MOTION, self.OnMouseMotion)
 
         self.graphic.SetFontColour("BLACK")
         if 'wxMac' in wx.PlatformInfo:
@@ -1722,6 +1673,20 @@ class KeywordMap(wx.Frame):
 
         # Set a counter for missing colors
         nextColour = 0
+        # Create a lookup of the row for each keyword, so we don't have to search the Filtered Keyword List for every bar
+        rowIndexes = {}
+        # Initialize the lists of coding segments to be displayed on each keyword row
+        rowSegments = {}
+        # For each keyword in the Filtered Keyword List ...
+        for index in range(len(self.filteredKeywordList)):
+            # ... if we haven't seen the keyword before ...
+            if not rowIndexes.has_key(self.filteredKeywordList[index]):
+                # ... remember its row and start its segment list
+                rowIndexes[self.filteredKeywordList[index]] = index
+                rowSegments[self.filteredKeywordList[index]] = []
+
+        # Colors are assigned to all segments before any row is drawn.  When colors represent Clips rather than Keywords,
+        # the color changes at each Clip transition across ALL keyword rows, so this has to be done in Clip order.
         # For each record in the Clip List ...
         for (KWG, KW, Start, Stop, ClipNum, ClipName, CollectNum) in self.clipList:
             # If the record should be displayed based on the Clip and Keyword sections of the Filter Dialog ...
@@ -1736,15 +1701,10 @@ class KeywordMap(wx.Frame):
                     Stop = self.endTime
                 if Stop < self.startTime:
                     Stop = self.startTime
+                # Clips with nothing to display get no color
+                colour = None
                 # If there's some Clip to be displayed ...
                 if Start != Stop:
-                    # Determine the line thickness
-                    self.graphic.SetThickness(self.barHeight)
-                    # Initialize a list for Temporary Lines
-                    tempLine = []
-                    # Add the Coding Line
-                    tempLine.append((self.CalcX(Start), self.CalcY(self.filteredKeywordList.index((KWG, KW))),
-                                     self.CalcX(Stop), self.CalcY(self.filteredKeywordList.index((KWG, KW)))))
                     # If we're in the Keyword Map and are NOT using Colors as Keywords (i.e., colors are Clips) ....
                     if (not self.embedded) and (not self.colorAsKeywords):
                         # Update the color index here, at the clip transition
@@ -1770,79 +1730,13 @@ class KeywordMap(wx.Frame):
                         if nextColour >= len(colorSet):
                             nextColour = 0
 
-                    # Set the Color of the line to be drawn
-                    self.graphic.SetColour(colorLookup[colorSet[colourindex]])
-                    # Add this line to the graphic
-                    self.graphic.AddLines(tempLine)
+                    # Determine the Color of the line to be drawn
+                    colour = colorLookup[colorSet[colourindex]]
 
                 # Note what Clip is being processed at the moment
                 lastclip = ClipNum
-
-                # Now add the Clip to the keywordClipList.  This holds all Keyword/Clip data in memory so it can be searched quickly
-                # This dictionary object uses the keyword pair as the key and holds a list of Clip data for all clips with that keyword.
-                # If the list for a given keyword already exists ...
-                if self.keywordClipList.has_key((KWG, KW)):
-                    # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                    overlapClips = self.keywordClipList[(KWG, KW)]
-                    # Iterate through the Clip List ...
-                    for (objType, overlapStartTime, overlapEndTime, overlapClipNum, overlapClipName) in overlapClips:
-                        # Let's look for overlap
-                        overlapStart = Stop
-                        overlapEnd = Start
-
-                        if DEBUG and KWG == 'Transana Users' and KW == 'DavidW':
-                            print "Start = %7d, overStart = %7s, Stop = %7s, overEnd = %7s" % (Start, overlapStartTime, Stop, overlapEndTime)
-
-                        # Look for Start between overlapStartTime and overlapEndTime
-                        if (Start >= overlapStartTime) and (Start < overlapEndTime):
-                            overlapStart = Start
-
-                        # Look for overlapStartTime between Start and Stop
-                        if (overlapStartTime >= Start) and (overlapStartTime < Stop):
-                            overlapStart = overlapStartTime
-
-                        # Look for Stop between overlapStartTime and overlapEndTime
-                        if (Stop > overlapStartTime) and (Stop <= overlapEndTime):
-                            overlapEnd = Stop
-
-                        # Look for overlapEndTime between Start and Stop
-                        if (overlapEndTime > Start) and (overlapEndTime <= Stop):
-                            overlapEnd = overlapEndTime
-                            
-                        # If we've found an overlap, it will be indicated by Start being less than End!
-                        if overlapStart < overlapEnd:
-                            # Draw a multi-colored line to indicate overlap
-                            overlapThickness = int(self.barHeight/ 3) + 1
-                            self.graphic.SetThickness(overlapThickness)
-                            if self.colorOutput:
-                                self.graphic.SetColour("GREEN")
-                            else:
-                                self.graphic.SetColour("WHITE")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW))), self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW))))]
-                            self.graphic.AddLines(tempLine)
-                            if self.colorOutput:
-                                self.graphic.SetColour("RED")
-                            else:
-                                self.graphic.SetColour("BLACK")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-overlapThickness+1, self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-overlapThickness+1)]
-                            self.graphic.AddLines(tempLine)
-                            if self.colorOutput:
-                                self.graphic.SetColour("BLUE")
-                            else:
-                                self.graphic.SetColour("GRAY")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+overlapThickness, self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+overlapThickness)]
-                            self.graphic.AddLines(tempLine)
-                            # Let's remember the clip start and stop boundaries, to be drawn at the end so they won't get over-written
-                            overlapLines.append(((self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-(self.barHeight / 2), self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+(self.barHeight / 2)),))
-                            overlapLines.append(((self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-(self.barHeight / 2), self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+(self.barHeight / 2)),))
-
-                    # ... add the new Clip to the Clip List
-                    self.keywordClipList[(KWG, KW)].append(('Clip', Start, Stop, ClipNum, ClipName))
-
-                # If there is no entry for the given keyword ...
-                else:
-                    # ... create a List object with the first clip's data for this Keyword Pair key
-                    self.keywordClipList[(KWG, KW)] = [('Clip', Start, Stop, ClipNum, ClipName)]
+                # Add the Clip to its keyword row
+                rowSegments[(KWG, KW)].append(('Clip', Start, Stop, ClipNum, ClipName, colour))
 
         # For each record in the Snapshot List ...
         for (KWG, KW, Start, Stop, SnapshotNum, SnapshotName, CollectNum) in self.snapshotList:
@@ -1858,15 +1752,10 @@ class KeywordMap(wx.Frame):
                     Stop = self.endTime
                 if Stop < self.startTime:
                     Stop = self.startTime
+                # Snapshots with nothing to display get no color
+                colour = None
                 # If there's some Snapshot to be displayed ...
                 if Start != Stop:
-                    # Determine the line thickness
-                    self.graphic.SetThickness(self.barHeight)
-                    # Initialize a list for Temporary Lines
-                    tempLine = []
-                    # Add the Coding Line
-                    tempLine.append((self.CalcX(Start), self.CalcY(self.filteredKeywordList.index((KWG, KW))),
-                                     self.CalcX(Stop), self.CalcY(self.filteredKeywordList.index((KWG, KW)))))
                     # If we're in the Keyword Map and are NOT using Colors as Keywords (i.e., colors are Clips) ....
                     if (not self.embedded) and (not self.colorAsKeywords):
                         # Update the color index here, at the clip transition
@@ -1879,79 +1768,54 @@ class KeywordMap(wx.Frame):
                     else:
                         # ... use the keyword's defined color
                         colourindex = self.keywordColors[(KWG, KW)]
-                    # Set the Color of the line to be drawn
-                    self.graphic.SetColour(colorLookup[colorSet[colourindex]])
-                    # Add this line to the graphic
-                    self.graphic.AddLines(tempLine)
+                    # Determine the Color of the line to be drawn
+                    colour = colorLookup[colorSet[colourindex]]
 
                 # Note what Snapshot is being processed at the moment
                 lastsnapshot = SnapshotNum
-
-                # Now add the Snapshot to the keywordClipList.  This holds all Keyword/Clip data in memory so it can be searched quickly
-                # This dictionary object uses the keyword pair as the key and holds a list of Clip data for all clips with that keyword.
-                # If the list for a given keyword already exists ...
-                if self.keywordClipList.has_key((KWG, KW)):
-                    # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                    overlapClips = self.keywordClipList[(KWG, KW)]
-                    # Iterate through the Clip List ...
-                    for (objType, overlapStartTime, overlapEndTime, overlapClipNum, overlapClipName) in overlapClips:
-                        # Let's look for overlap
-                        overlapStart = Stop
-                        overlapEnd = Start
-
-                        if DEBUG and KWG == 'Transana Users' and KW == 'DavidW':
-                            print "Start = %7d, overStart = %7s, Stop = %7s, overEnd = %7s" % (Start, overlapStartTime, Stop, overlapEndTime)
-
-                        # Look for Start between overlapStartTime and overlapEndTime
-                        if (Start >= overlapStartTime) and (Start < overlapEndTime):
-                            overlapStart = Start
-
-                        # Look for overlapStartTime between Start and Stop
-                        if (overlapStartTime >= Start) and (overlapStartTime < Stop):
-                            overlapStart = overlapStartTime
-
-                        # Look for Stop between overlapStartTime and overlapEndTime
-                        if (Stop > overlapStartTime) and (Stop <= overlapEndTime):
-                            overlapEnd = Stop
-
-                        # Look for overlapEndTime between Start and Stop
-                        if (overlapEndTime > Start) and (overlapEndTime <= Stop):
-                            overlapEnd = overlapEndTime
-
-                        # If we've found an overlap, it will be indicated by Start being less than End!
-                        if overlapStart < overlapEnd:
-                            # Draw a multi-colored line to indicate overlap
-                            overlapThickness = int(self.barHeight/ 3) + 1
-                            self.graphic.SetThickness(overlapThickness)
-                            if self.colorOutput:
-                                self.graphic.SetColour("GREEN")
-                            else:
-                                self.graphic.SetColour("WHITE")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW))), self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW))))]
-                            self.graphic.AddLines(tempLine)
-                            if self.colorOutput:
-                                self.graphic.SetColour("RED")
-                            else:
-                                self.graphic.SetColour("BLACK")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-overlapThickness+1, self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-overlapThickness+1)]
-                            self.graphic.AddLines(tempLine)
-                            if self.colorOutput:
-                                self.graphic.SetColour("BLUE")
-                            else:
-                                self.graphic.SetColour("GRAY")
-                            tempLine = [(self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+overlapThickness, self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+overlapThickness)]
-                            self.graphic.AddLines(tempLine)
-                            # Let's remember the clip start and stop boundaries, to be drawn at the end so they won't get over-written
-                            overlapLines.append(((self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-(self.barHeight / 2), self.CalcX(overlapStart), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+(self.barHeight / 2)),))
-                            overlapLines.append(((self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))-(self.barHeight / 2), self.CalcX(overlapEnd), self.CalcY(self.filteredKeywordList.index((KWG, KW)))+(self.barHeight / 2)),))
-
-                    # ... add the new Clip to the Clip List
-                    self.keywordClipList[(KWG, KW)].append(('Snapshot', Start, Stop, SnapshotNum, SnapshotName))
-
-                # If there is no entry for the given keyword ...
-                else:
-                    # ... create a List object with the first clip's data for this Keyword Pair key
-                    self.keywordClipList[(KWG, KW)] = [('Snapshot', Start, Stop, SnapshotNum, SnapshotName)]
+                # Add the Snapshot to its keyword row
+                rowSegments[(KWG, KW)].append(('Snapshot', Start, Stop, SnapshotNum, SnapshotName, colour))
+
+        # Everything about the map's layout that affects where a row's bars are drawn.  If any of this changes,
+        # every row has to be re-drawn.
+        rowLayout = (tuple(self.Bounds), self.graphicindent, self.startTime, self.endTime, self.MediaLength, self.barHeight,
+                     self.whitespaceHeight, self.topOffset, self.colorOutput, TransanaGlobal.configData.LayoutDirection)
+        # Start a new Row Cache, so rows for keywords that are no longer displayed are dropped
+        rowCache = {}
+        # For each keyword row ...
+        for (KWG, KW) in self.filteredKeywordList:
+            # If the row has already been drawn (which only happens if the keyword is in the list twice), skip it
+            if rowCache.has_key((KWG, KW)):
+                continue
+            # A row only needs to be re-drawn if its position, its segments and their colors, or the map layout has changed
+            rowSignature = (rowIndexes[(KWG, KW)], rowLayout, tuple(rowSegments[(KWG, KW)]))
+            # If the row is unchanged since the last time the map was drawn ...
+            if self.rowCache.has_key((KWG, KW)) and (self.rowCache[(KWG, KW)][0] == rowSignature):
+                # ... get the row's lines from the Row Cache ...
+                (rowSignature, rowLines, rowOverlapLines, rowClips, rowClipIndex) = self.rowCache[(KWG, KW)]
+                # ... and add them to the graphic
+                self.graphic.AddLineList(rowLines)
+            # If the row has changed ...
+            else:
+                # ... note where the row's lines will start ...
+                lineCount = self.graphic.GetLineCount()
+                # ... draw the row ...
+                (rowOverlapLines, rowClips) = self.DrawKeywordRow(rowIndexes[(KWG, KW)], rowSegments[(KWG, KW)])
+                # ... remember the lines that were drawn ...
+                rowLines = self.graphic.GetLines(lineCount)
+                # ... and build the Interval Index used to find the row's Clips under the mouse
+                rowClipIndex = KeywordMapData.IntervalIndex(rowClips)
+            # Remember the row in the new Row Cache
+            rowCache[(KWG, KW)] = (rowSignature, rowLines, rowOverlapLines, rowClips, rowClipIndex)
+            # Add the row's overlap boundary lines to the list to be drawn at the end
+            overlapLines += rowOverlapLines
+            # If the row has any Clips or Snapshots ...
+            if rowClips != []:
+                # ... add them to the keywordClipList.  This holds all Keyword/Clip data in memory so it can be searched quickly.
+                self.keywordClipList[(KWG, KW)] = rowClips[:]
+                self.keywordClipIndex[(KWG, KW)] = rowClipIndex
+        # Keep the new Row Cache for the next time the map is drawn
+        self.rowCache = rowCache
 
         # If we are doing a Keyword Visualization, but there are no Clips in the picture, it can be confusing.
         # Let's place a message on the visualization saying it's intentionally left blank.
@@ -1965,10 +1829,6 @@ class KeywordMap(wx.Frame):
             self.graphic.AddLines(tempLine)
 
         if not self.embedded:
-            
-            # Enable tracking of mouse movement over the graphic
-            self.graphic.Bind(wx.EVT_MOTION, self.OnMouseMotion)
-
             if not '__WXMAC__' in wx.PlatformInfo:
                 self.menuFile.Enable(M_FILE_SAVEAS, True)
                 # We can't enable Print Preview for Right-To-Left languages
@@ -1980,6 +1840,80 @@ class KeywordMap(wx.Frame):
             # The DrawGraph routine destroys and recreates self.graphic.  We need to re-point the waveform to it.
             self.parent.waveform = self.graphic
 
+    def DrawKeywordRow(self, rowIndex, segments):
+        """ Draw the coding bars and overlap indicators for a single keyword row.  Returns the row's overlap
+            boundary lines, which are drawn after all rows, and the row's entries for the keywordClipList. """
+        # Determine the vertical position of the row
+        y = self.CalcY(rowIndex)
+        # Initialize the list of overlap boundary lines
+        overlapLines = []
+        # Initialize the list of Clips and Snapshots on this row
+        rowClips = []
+        # For each Clip or Snapshot on the row ...
+        for (objType, Start, Stop, objNum, objName, colour) in segments:
+            # If there's some Clip to be displayed ...
+            if colour != None:
+                # Determine the line thickness
+                self.graphic.SetThickness(self.barHeight)
+                # Set the Color of the line to be drawn
+                self.graphic.SetColour(colour)
+                # Add the Coding Line to the graphic
+                self.graphic.AddLines([(self.CalcX(Start), y, self.CalcX(Stop), y)])
+
+            # Iterate through the Clips already on this row ...
+            for (overlapType, overlapStartTime, overlapEndTime, overlapNum, overlapName) in rowClips:
+                # Let's look for overlap
+                overlapStart = Stop
+                overlapEnd = Start
+
+                # Look for Start between overlapStartTime and overlapEndTime
+                if (Start >= overlapStartTime) and (Start < overlapEndTime):
+                    overlapStart = Start
+
+                # Look for overlapStartTime between Start and Stop
+                if (overlapStartTime >= Start) and (overlapStartTime < Stop):
+                    overlapStart = overlapStartTime
+
+                # Look for Stop between overlapStartTime and overlapEndTime
+                if (Stop > overlapStartTime) and (Stop <= overlapEndTime):
+                    overlapEnd = Stop
+
+                # Look for overlapEndTime between Start and Stop
+                if (overlapEndTime > Start) and (overlapEndTime <= Stop):
+                    overlapEnd = overlapEndTime
+
+                # If we've found an overlap, it will be indicated by Start being less than End!
+                if overlapStart < overlapEnd:
+                    # Draw a multi-colored line to indicate overlap
+                    overlapThickness = int(self.barHeight/ 3) + 1
+                    self.graphic.SetThickness(overlapThickness)
+                    if self.colorOutput:
+                        self.graphic.SetColour("GREEN")
+                    else:
+                        self.graphic.SetColour("WHITE")
+                    tempLine = [(self.CalcX(overlapStart), y, self.CalcX(overlapEnd), y)]
+                    self.graphic.AddLines(tempLine)
+                    if self.colorOutput:
+                        self.graphic.SetColour("RED")
+                    else:
+                        self.graphic.SetColour("BLACK")
+                    tempLine = [(self.CalcX(overlapStart), y - overlapThickness + 1, self.CalcX(overlapEnd), y - overlapThickness + 1)]
+                    self.graphic.AddLines(tempLine)
+                    if self.colorOutput:
+                        self.graphic.SetColour("BLUE")
+                    else:
+                        self.graphic.SetColour("GRAY")
+                    tempLine = [(self.CalcX(overlapStart), y + overlapThickness, self.CalcX(overlapEnd), y + overlapThickness)]
+                    self.graphic.AddLines(tempLine)
+                    # Let's remember the clip start and stop boundaries, to be drawn at the end so they won't get over-written
+                    overlapLines.append(((self.CalcX(overlapStart), y - (self.barHeight / 2), self.CalcX(overlapStart), y + (self.barHeight / 2)),))
+                    overlapLines.append(((self.CalcX(overlapEnd), y - (self.barHeight / 2), self.CalcX(overlapEnd), y + (self.barHeight / 2)),))
+
+            # ... add the new Clip to the row's Clip List
+            rowClips.append((objType, Start, Stop, objNum, objName))
+
+        return (overlapLines, rowClips)
+
     def GetKeywordCount(self):
         """ Returns the number of keywords in the filtered Keyword List and the size of the image that results """
         return (len(self.filteredKeywordList), len(self.filteredKeywordList) * (self.barHeight + self.whitespaceHeight) + self.topOffset + 4)
@@ -2009,22 +1943,20 @@ class KeywordMap(wx.Frame):
                 if (self.keywordClipList.has_key(kw)):
                     # initialize the string that will hold the names of clips being pointed to
                     clipNames = ''
-                    # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                    clips = self.keywordClipList[kw]
+                    # Get the list of Clips with the current Keyword that include the current Time from the Interval Index
+                    clips = self.FindClips(kw, time)
                     # Iterate through the Clip List ...
                     for (objType, startTime, endTime, clipNum, clipName) in clips:
-                        # If the current Time value falls between the Clip's StartTime and EndTime ...
-                        if (startTime < time) and (endTime > time):
-                            # ... calculate the length of the Clip ...
-                            clipLen = endTime - startTime
-                            # ... and add the Clip Name and Length to the list of Clips with this Keyword at this Time
-                            # First, see if the list is empty.
-                            if clipNames == '':
-                                # If so, just add the keyword name and time
-                                clipNames = "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
-                            else:
-                                # ... add the keyword to the end of the list
-                                clipNames += ', ' + "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
+                        # ... calculate the length of the Clip ...
+                        clipLen = endTime - startTime
+                        # ... and add the Clip Name and Length to the list of Clips with this Keyword at this Time
+                        # First, see if the list is empty.
+                        if clipNames == '':
+                            # If so, just add the keyword name and time
+                            clipNames = "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
+                        else:
+                            # ... add the keyword to the end of the list
+                            clipNames += ', ' + "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
                     # If any clips are found for the current mouse position ...
                     if (clipNames != ''):
                         # ... add the Clip Names to the ToolTip so they will show up on screen as a hint
@@ -2042,16 +1974,14 @@ class KeywordMap(wx.Frame):
                     # initialize the string that will hold the names of clips being pointed to.
                     # We don't actually need to know the names, but this signals that we're at least OVER a Clip.
                     clipNames = ''
-                    # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                    clips = self.keywordClipList[kw]
+                    # Get the list of Clips with the current Keyword that include the current Time from the Interval Index
+                    clips = self.FindClips(kw, time)
                     # Iterate through the Clip List ...
                     for (objType, startTime, endTime, clipNum, clipName) in clips:
-                        # If the current Time value falls between the Clip's StartTime and EndTime ...
-                        if (startTime < time) and (endTime > time):
-                            # ... calculate the length of the Clip ...
-                            clipLen = endTime - startTime
-                            # ... and add the Clip LENGTH to the list of Clips with this Keyword at this Time
-                            clipNames += " (%s)" % Misc.time_in_ms_to_str(clipLen)
+                        # ... calculate the length of the Clip ...
+                        clipLen = endTime - startTime
+                        # ... and add the Clip LENGTH to the list of Clips with this Keyword at this Time
+                        clipNames += " (%s)" % Misc.time_in_ms_to_str(clipLen)
                     # If any clips are found for the current mouse position ...
                     if (clipNames != ''):
                         # ... add the KEYWORD names to the ToolTip so they will show up on screen as a hint
@@ -2083,31 +2013,29 @@ class KeywordMap(wx.Frame):
                 prompt = _("Keyword:  %s : %s,  Time: %s")
             # Set the Status Text to indicate the current Keyword and Time values
             self.SetStatusText(prompt % (kw[0], kw[1], Misc.time_in_ms_to_str(time)))
-            # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-            clips = self.keywordClipList[kw]
+            # Get the list of Clips with the current Keyword that include the current Time from the Interval Index
+            clips = self.FindClips(kw, time, inclusive=True)
             # Iterate through the Clip List ...
             for (objType, startTime, endTime, clipNum, clipName) in clips:
-                # If the current Time value falls between the Clip's StartTime and EndTime ...
-                if (startTime <= time) and (endTime >= time):
-                    # Check to see if this is a duplicate Clip
-                    if clipNames.has_key(clipName):
-                        # If so, we need to count the number of duplicates.
-                        # NOTE:  This is not perfect.  If the Clip Name is a shorter version of another Clip Name, the count
-                        #        will be too high.
-                        tmpList = clipNames.keys()
-                        # Initialize the counter to 1 so our end number will be 1 higher than the number counted
-                        cnt = 1
-                        # iterate through the list
-                        for cl in tmpList:
-                            # If we have a match ...
-                            if cl.find(clipName) > -1:
-                                # ... increment the counter
-                                cnt += 1
-                        # Add the clipname and counter to the Clip Names dictionary
-                        clipNames["%s (%d)" % (clipName, cnt)] = (objType, clipNum)
-                    else:
-                        # Add the Clip Name as a Dictionary key pointing to the Clip Number
-                        clipNames[clipName] = (objType, clipNum)
+                # Check to see if this is a duplicate Clip
+                if clipNames.has_key(clipName):
+                    # If so, we need to count the number of duplicates.
+                    # NOTE:  This is not perfect.  If the Clip Name is a shorter version of another Clip Name, the count
+                    #        will be too high.
+                    tmpList = clipNames.keys()
+                    # Initialize the counter to 1 so our end number will be 1 higher than the number counted
+                    cnt = 1
+                    # iterate through the list
+                    for cl in tmpList:
+                        # If we have a match ...
+                        if cl.find(clipName) > -1:
+                            # ... increment the counter
+                            cnt += 1
+                    # Add the clipname and counter to the Clip Names dictionary
+                    clipNames["%s (%d)" % (clipName, cnt)] = (objType, clipNum)
+                else:
+                    # Add the Clip Name as a Dictionary key pointing to the Clip Number
+                    clipNames[clipName] = (objType, clipNum)
 
         # If only 1 Clip is found ...
         if len(clipNames) == 1:
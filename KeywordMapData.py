@@ -0,0 +1,297 @@
+#Copyright (C) 2002-2014  The Board of Regents of the University of Wisconsin System
+
+#This program is free software; you can redistribute it and/or
+#modify it under the terms of the GNU General Public License
+#as published by the Free Software Foundation; either version 2
+#of the License, or (at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+
+"""This module implements the data model shared by the Keyword Map and the Series Map"""
+
+__author__ = "David K. Woods <dwoods@wcer.wisc.edu>"
+
+
+class KeywordMapList(list):
+    """ A list that keeps a count of its items in a dictionary, so that "in" tests take constant time rather than
+        searching the whole list.  It can be used anywhere a list is used. """
+
+    def __init__(self, items=()):
+        """ Initialize the list, and index its initial items """
+        # Initialize the list
+        list.__init__(self, items)
+        # Initialize the item counts
+        self._counts = {}
+        # Count the initial items
+        for item in self:
+            self._Add(item)
+
+    def _Add(self, item):
+        """ Count an item added to the list """
+        self._counts[item] = self._counts.get(item, 0) + 1
+
+    def _Remove(self, item):
+        """ Count an item removed from the list """
+        # Reduce the item's count
+        self._counts[item] -= 1
+        # If there are no more copies of the item, drop it from the index
+        if self._counts[item] == 0:
+            del(self._counts[item])
+
+    def __contains__(self, item):
+        """ Determine whether the item is in the list, using the index """
+        return self._counts.has_key(item)
+
+    def append(self, item):
+        """ Add an item to the end of the list """
+        list.append(self, item)
+        self._Add(item)
+
+    def AddUnique(self, item):
+        """ Add an item to the end of the list if it is not already in the list.  Returns True if it was added. """
+        # If the item is already in the list ...
+        if self._counts.has_key(item):
+            # ... don't add it again
+            return False
+        # Otherwise, add it
+        self.append(item)
+        return True
+
+    def extend(self, items):
+        """ Add several items to the end of the list """
+        # Make a list of the items, in case we are passed an iterator
+        items = list(items)
+        list.extend(self, items)
+        for item in items:
+            self._Add(item)
+
+    def __iadd__(self, items):
+        """ Handle the += operator """
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        """ Handle the *= operator """
+        list.__imul__(self, count)
+        # Rebuild the index
+        self._counts = {}
+        for item in self:
+            self._Add(item)
+        return self
+
+    def insert(self, index, item):
+        """ Insert an item in the list """
+        list.insert(self, index, item)
+        self._Add(item)
+
+    def remove(self, item):
+        """ Remove the first copy of an item from the list """
+        list.remove(self, item)
+        self._Remove(item)
+
+    def pop(self, index=-1):
+        """ Remove and return an item from the list """
+        item = list.pop(self, index)
+        self._Remove(item)
+        return item
+
+    def __setitem__(self, index, value):
+        """ Replace an item, or a slice of items, in the list """
+        # If we're replacing a slice ...
+        if isinstance(index, slice):
+            # ... make a list of the new items, in case we are passed an iterator
+            value = list(value)
+            # ... remember the items being replaced
+            oldItems = list.__getitem__(self, index)
+        # If we're replacing a single item ...
+        else:
+            # ... remember the item being replaced
+            oldItems = [list.__getitem__(self, index)]
+        # Replace the item(s)
+        list.__setitem__(self, index, value)
+        # Update the index
+        for item in oldItems:
+            self._Remove(item)
+        if isinstance(index, slice):
+            for item in value:
+                self._Add(item)
+        else:
+            self._Add(value)
+
+    def __delitem__(self, index):
+        """ Delete an item, or a slice of items, from the list """
+        # Remember the item(s) being deleted
+        if isinstance(index, slice):
+            oldItems = list.__getitem__(self, index)
+        else:
+            oldItems = [list.__getitem__(self, index)]
+        # Delete the item(s)
+        list.__delitem__(self, index)
+        # Update the index
+        for item in oldItems:
+            self._Remove(item)
+
+    def __setslice__(self, i, j, value):
+        """ Replace a simple slice of the list.  (Python 2 lists handle [i:j] slices here rather than in __setitem__.) """
+        self.__setitem__(slice(max(0, i), max(0, j)), value)
+
+    def __delslice__(self, i, j):
+        """ Delete a simple slice of the list.  (Python 2 lists handle [i:j] slices here rather than in __delitem__.) """
+        self.__delitem__(slice(max(0, i), max(0, j)))
+
+
+class KeywordMapData(object):
+    """ The data model shared by the Keyword Map and the Series Map.  It holds the lists of keywords, clips, and
+        snapshots that make up a map, and de-duplicates them as they are built, in linear time. """
+
+    def ResetKeywordMapData(self):
+        """ Initialize all the Keyword Map data lists to empty """
+        # The Keyword Lists
+        self.filteredKeywordList = KeywordMapList()
+        self.unfilteredKeywordList = KeywordMapList()
+        # The Clip Lists
+        self.clipList = KeywordMapList()
+        self.clipFilterList = KeywordMapList()
+        # The Snapshot Lists
+        self.snapshotList = KeywordMapList()
+        self.snapshotFilterList = KeywordMapList()
+        # The Interval Index of the Clips on each keyword row, which is built when the map is drawn
+        self.keywordClipIndex = {}
+
+    def IndexKeywordMapData(self):
+        """ Make sure all the Keyword Map data lists are indexed.  Lists that have been replaced by plain lists,
+            as when they come back from the Filter Dialog, are converted. """
+        for listName in ['filteredKeywordList', 'unfilteredKeywordList', 'clipList', 'clipFilterList', 'snapshotList', 'snapshotFilterList']:
+            # If the list is not indexed ...
+            if not isinstance(getattr(self, listName), KeywordMapList):
+                # ... replace it with an indexed copy
+                setattr(self, listName, KeywordMapList(getattr(self, listName)))
+
+    def AddKeyword(self, kwg, kw):
+        """ Add a keyword to the filtered and unfiltered Keyword Lists, if it isn't already there """
+        self.filteredKeywordList.AddUnique((kwg, kw))
+        self.unfilteredKeywordList.AddUnique((kwg, kw, True))
+
+    def AddNewKeyword(self, kwg, kw):
+        """ Add a keyword found while updating the map.  A keyword the user has filtered out stays filtered out. """
+        # If the keyword is not in either of the Keyword Lists, ...
+        if not (((kwg, kw) in self.filteredKeywordList) or ((kwg, kw, False) in self.unfilteredKeywordList)):
+            # ... add it to both keyword lists.
+            self.AddKeyword(kwg, kw)
+
+    def AddClip(self, clipData, clipID, collectNum):
+        """ Add a Clip Keyword Placement line to the Clip List, and the Clip to the Clip Filter List,
+            skipping duplicates.  A Clip the user has filtered out stays filtered out. """
+        # Add the line to the Clip List if it's not already there
+        self.clipList.AddUnique(clipData)
+        # If the Clip is not in the Clip Filter List, checked or unchecked ...
+        if not ((clipID, collectNum, False) in self.clipFilterList):
+            # ... add it
+            self.clipFilterList.AddUnique((clipID, collectNum, True))
+
+    def AddSnapshot(self, snapshotData, snapshotID, collectNum):
+        """ Add a Snapshot Keyword Placement line to the Snapshot List, and the Snapshot to the Snapshot Filter List,
+            skipping duplicates.  A Snapshot the user has filtered out stays filtered out. """
+        # Add the line to the Snapshot List if it's not already there
+        self.snapshotList.AddUnique(snapshotData)
+        # If the Snapshot is not in the Snapshot Filter List, checked or unchecked ...
+        if not ((snapshotID, collectNum, False) in self.snapshotFilterList):
+            # ... add it
+            self.snapshotFilterList.AddUnique((snapshotID, collectNum, True))
+
+    def IndexKeywordClipList(self):
+        """ Build the Interval Index for each keyword row in the keywordClipList.  This should be called once the map
+            has been drawn, so that finding the Clips under the mouse doesn't require searching every Clip on the row. """
+        # Initialize the Interval Index dictionary
+        self.keywordClipIndex = {}
+        # For each keyword row in the keywordClipList ...
+        for key in self.keywordClipList.keys():
+            # ... build the row's Interval Index
+            self.keywordClipIndex[key] = IntervalIndex(self.keywordClipList[key])
+
+    def FindClips(self, key, time, inclusive=False):
+        """ Return the keywordClipList entries for the keyword row "key" that contain the time "time", in the order
+            they were added to the row.  If inclusive is True, Clips that start or end exactly at "time" are included. """
+        # If the keyword row hasn't been indexed ...
+        if not self.keywordClipIndex.has_key(key):
+            # ... then there are no clips on it
+            return []
+        # Search the row's Interval Index
+        return self.keywordClipIndex[key].Find(time, inclusive)
+
+
+class IntervalIndex(object):
+    """ A static interval tree over the Clip and Snapshot segments of one Keyword Map row.  Segments are keywordClipList
+        entries, tuples whose second and third elements are the segment's start and end times in milliseconds.
+        The segments are sorted by start time and stored as an implicit balanced binary tree, where each node knows the
+        latest end time in its sub-tree, so finding the segments at a given time takes O(log n + k) rather than O(n). """
+
+    def __init__(self, segments):
+        """ Build the Interval Index for a list of segments """
+        # Sort the segments by start time, remembering the original order so results can be returned in that order
+        self.segments = [(segment[1], segment[2], order, segment) for (order, segment) in enumerate(segments)]
+        self.segments.sort()
+        # Initialize the list of the latest end time in each node's sub-tree
+        self.maxStops = [0] * len(self.segments)
+        # Fill in the latest end times
+        if len(self.segments) > 0:
+            self._Build(0, len(self.segments))
+
+    def _Build(self, lo, hi):
+        """ Calculate the latest end time for the sub-tree made up of segments lo to hi - 1, and return it """
+        # The middle segment is the root of the sub-tree
+        mid = (lo + hi) / 2
+        # Start with the root segment's end time
+        maxStop = self.segments[mid][1]
+        # If there is a left sub-tree, include its latest end time
+        if lo < mid:
+            maxStop = max(maxStop, self._Build(lo, mid))
+        # If there is a right sub-tree, include its latest end time
+        if mid + 1 < hi:
+            maxStop = max(maxStop, self._Build(mid + 1, hi))
+        # Remember the latest end time for this sub-tree
+        self.maxStops[mid] = maxStop
+        return maxStop
+
+    def __len__(self):
+        """ Return the number of segments in the index """
+        return len(self.segments)
+
+    def Find(self, time, inclusive=False):
+        """ Return the segments that contain "time", in their original order.  By default a segment must start before and
+            end after "time".  If inclusive is True, segments that start or end exactly at "time" are included. """
+        # Initialize the results
+        results = []
+        # Start with the whole tree
+        subTrees = [(0, len(self.segments))]
+        # While there are sub-trees to search ...
+        while len(subTrees) > 0:
+            (lo, hi) = subTrees.pop()
+            # Skip empty sub-trees
+            if lo >= hi:
+                continue
+            # The middle segment is the root of the sub-tree
+            mid = (lo + hi) / 2
+            # If nothing in this sub-tree ends after the time, none of it can contain the time
+            if (self.maxStops[mid] < time) or ((self.maxStops[mid] == time) and not inclusive):
+                continue
+            # The left sub-tree might contain the time
+            subTrees.append((lo, mid))
+            (start, stop, order, segment) = self.segments[mid]
+            # If the root segment starts before the time ...
+            if (start < time) or (inclusive and (start == time)):
+                # ... see if it ends after the time
+                if (stop > time) or (inclusive and (stop == time)):
+                    results.append((order, segment))
+                # The right sub-tree starts no earlier than the root segment, so it might contain the time too
+                subTrees.append((mid + 1, hi))
+        # Put the results back in their original order
+        results.sort()
+        return [segment for (order, segment) in results]
@@ -27,9 +27,12 @@ __author__ = 'David Woods <dwoods@wcer.wisc.edu>, Nathaniel Case'
 
 import wx
 from TransanaExceptions import *
+import DataObjectCache
 import DBInterface
 import Dialogs
+import KeywordIndex
 import Misc
+import SearchCache
 import TransanaConstants
 import TransanaGlobal
 import inspect
@@ -414,9 +417,9 @@ class Keyword(object):
 
         if (self._db_start_save() == 0):
             # duplicate Keywords are not allowed
-            if DBInterface.record_match_count("Keywords2", \
+            if DBInterface.record_exists("Keywords2", \
                             ("KeywordGroup", "Keyword"), \
-                            (keywordGroup, keyword) ) > 0:
+                            (keywordGroup, keyword) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = _('A Keyword named "%s : %s" already exists.')
@@ -444,9 +447,9 @@ class Keyword(object):
             mergeKeywords = False
         else:
             # check for dupes, which are not allowed if either the Keyword Group or Keyword have been changed.
-            if (DBInterface.record_match_count("Keywords2", \
+            if (DBInterface.record_exists("Keywords2", \
                             ("KeywordGroup", "Keyword"), \
-                            (keywordGroup, keyword) ) > 0) and \
+                            (keywordGroup, keyword) )) and \
                ((originalKeywordGroup != keywordGroup) or \
                 (originalKeyword.lower() != keyword.lower())):
                 # If duplication is found, ask the user if we should MERGE the keywords.
@@ -587,6 +590,12 @@ corrupt the record that is currently locked by %s.  Please try again later.""")
                 if TransanaConstants.DBInstalled in ['sqlite3']:
                     c.commit()
                 c.close()
+                # If the keyword was renamed or merged, every object that had it has changed
+                if ((originalKeywordGroup != keywordGroup) or (originalKeyword != keyword)):
+                    # Cached objects still have the old keyword in their keyword lists
+                    DataObjectCache.Clear()
+                    KeywordIndex.Clear()
+                    SearchCache.Clear()
                 # If the save is successful, we need to update the "original" values to reflect the new record key.
                 # Otherwise, we can't unlock the proper record, among other things.
                 self.originalKeywordGroup = self.keywordGroup
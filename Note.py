@@ -226,10 +226,10 @@ class Note(DataObject.DataObject):
         # Determine if we are creating a new record or saving an existing one
         if (self._db_start_save() == 0):  # Creating new record
             # Check to see that no identical record exists
-            if DBInterface.record_match_count('Notes2', \
+            if DBInterface.record_exists('Notes2', \
                                               ("NoteID", "SeriesNum", "EpisodeNum", "CollectNum", "ClipNum", "TranscriptNum", "SnapshotNum"), \
                                               (id, self.series_num, self.episode_num, self.collection_num, self.clip_num, self.transcript_num, \
-                                               self.snapshot_num) ) > 0:
+                                               self.snapshot_num) ):
                 targetObject = _('object')
                 if (self.series_num != 0) and (self.series_num != None):
                     targetObject = _('Series')
@@ -260,9 +260,9 @@ class Note(DataObject.DataObject):
             
         else:  # Saving an existing record
             # Check to see that no identical record with a different number exists (!NoteNum specifies "Not same note number")
-            if DBInterface.record_match_count('Notes2', \
+            if DBInterface.record_exists('Notes2', \
                                               ("NoteID", "SeriesNum", "EpisodeNum", "CollectNum", "ClipNum", "TranscriptNum", "SnapshotNum", "!NoteNum"), \
-                                              (id, self.series_num, self.episode_num, self.collection_num, self.clip_num, self.transcript_num, self.snapshot_num, self.number) ) > 0:
+                                              (id, self.series_num, self.episode_num, self.collection_num, self.clip_num, self.transcript_num, self.snapshot_num, self.number) ):
                 targetObject = _('object')
                 if (self.series_num != 0) and (self.series_num != None):
                     targetObject = _('Series')
@@ -336,6 +336,8 @@ class Note(DataObject.DataObject):
                 raise RecordNotFoundError, (self.id, len(data))
             # Close the temporary database cursor
             tempDBCursor.close()
+        # Update the Text Index with the Note's words
+        DBInterface.UpdateTextIndex(c, 'Note', self.number, self.text)
         # Close the main database cursor
         c.close()
 
@@ -336,8 +336,8 @@ class NotesBrowser(wx.Dialog):  # (wx.MDIChildFrame)
             snapshotNode = tree.AppendItem(root, _("Snapshot"))
             tree.SetPyData(snapshotNode, DatabaseTreeTab._NodeData('SnapshotNode'))
 
-        # Get a list of all Notes from the Database
-        notes = DBInterface.list_of_all_notes(searchText=searchText)
+        # Get all Notes from the Database, a page at a time
+        notes = DBInterface.iter_all_notes(searchText=searchText)
         # Iterate through the list of notes
         for note in notes:
             if note['SeriesNum'] > 0:
@@ -21,24 +21,33 @@ __author__ = 'David Woods <dwoods@wcer.wisc.edu>'
 # Import wxPython
 import wx
 
-# Import the Transana Series Object
-import Series
-# Import the Transana Episode Object
-import Episode
-# Import the Transana Collection Object
-import Collection
 # Import the Transana Database Interface
 import DBInterface
+# Import the Transana Keyword Index
+import KeywordIndex
+# Import the Transana Search Cache
+import SearchCache
 # Import the Transana Search Dialog Box
 import SearchDialog
+# Import the Transana Time-Window Search operators
+import TemporalSearch
 # import Transana's Constants
 import TransanaConstants
 # Import Transana's Globals
 import TransanaGlobal
 
+# Import the Python Regular Expression module
+import re
 # Import the Python String module
 import string
 
+# The number of records whose display data is requested in each query
+SEARCH_BATCH_SIZE = 500
+
+# The time-window operators that can end a line of the Search Query, such as " OVERLAPS", " WITHIN 5 SECONDS",
+# " FOLLOWED BY", or " FOLLOWED BY WITHIN 5 SECONDS"
+TEMPORAL_OPERATOR = re.compile(r' (OVERLAPS|WITHIN (\d+) SECONDS|FOLLOWED BY( WITHIN (\d+) SECONDS)?)$')
+
 
 class ProcessSearch(object):
     """ This class handles all processing related to Searching. """
@@ -52,6 +61,12 @@ class ProcessSearch(object):
         # Note the Database Tree that accepts Search Results
         self.dbTree = dbTree
         self.collectionList = []
+        # Initialize the results of the time-window operators, which are the same for every type of result
+        self.temporalResults = {}
+        # Initialize the Episode and position of the Clips and Snapshots used by the time-window operators
+        self.segments = {}
+        # Initialize the Transcripts found by each Transcript Text term
+        self.textResults = {}
         # If kwg and kw are None, we are doing a regular (full) search.
         if ((kwg == None) or (kw == None)) and (searchTerms == None):
             # Create the Search Dialog Box
@@ -144,161 +159,28 @@ class ProcessSearch(object):
                 nodeListBase = [_("Search"), searchName]
                 self.dbTree.add_Node('SearchResultsNode', nodeListBase, 0, 0, expandNode=True)
 
-                # Build the appropriate Queries based on the Search Query specified in the Search Dialog.
-                # (This method parses the Natural Language Search Terms into queries for Episode Search
-                #  Terms, for Clip Search Terms, and for Snapshot Search Terms, and includes the appropriate 
-                #  Parameters to be used with the queries.  Parameters are not integrated into the queries 
-                #  in order to allow for automatic processing of apostrophes and other text that could 
-                #  otherwise interfere with the SQL execution.)
-                (episodeQuery, clipQuery, wholeSnapshotQuery, snapshotCodingQuery, params) = self.BuildQueries(searchTerms)
-
-                # Get a Database Cursor
-                dbCursor = DBInterface.get_db().cursor()
-
-                if includeEpisodes:
-                    # Adjust query for sqlite, if needed
-                    episodeQuery = DBInterface.FixQuery(episodeQuery)
-                    # Execute the Series/Episode query
-                    dbCursor.execute(episodeQuery, tuple(params))
-
-                    # Process the results of the Series/Episode query
-                    for line in DBInterface.fetchall_named(dbCursor):
-                        # Add the new Transcript(s) to the Database Tree Tab.
-                        # To add a Transcript, we need to build the node list for the tree's add_Node method to climb.
-                        # We need to add the Series, Episode, and Transcripts to our Node List, so we'll start by loading
-                        # the current Series and Episode
-                        tempSeries = Series.Series(line['SeriesNum'])
-                        tempEpisode = Episode.Episode(line['EpisodeNum'])
-                        # Add the Search Root Node, the Search Name, and the current Series and Episode Names.
-                        nodeList = (_('Search'), searchName, tempSeries.id, tempEpisode.id)
-                        # Find out what Transcripts exist for each Episode
-                        transcriptList = DBInterface.list_transcripts(tempSeries.id, tempEpisode.id)
-                        # If the Episode HAS defined transcripts ...
-                        if len(transcriptList) > 0:
-                            # Add each Transcript to the Database Tree
-                            for (transcriptNum, transcriptID, episodeNum) in transcriptList:
-                                # Add the Transcript Node to the Tree.  
-                                self.dbTree.add_Node('SearchTranscriptNode', nodeList + (transcriptID,), transcriptNum, episodeNum)
-                        # If the Episode has no transcripts, it still has the keywords and SHOULD be displayed!
-                        else:
-                            # Add the Transcript-less Episode Node to the Tree.  
-                            self.dbTree.add_Node('SearchEpisodeNode', nodeList, tempEpisode.number, tempSeries.number)
-
-                if includeClips:
-                    # Adjust query for sqlite, if needed
-                    clipQuery = DBInterface.FixQuery(clipQuery)
-                    # Execute the Collection/Clip query
-                    dbCursor.execute(clipQuery, params)
-
-                    # Process all results of the Collection/Clip query 
-                    for line in DBInterface.fetchall_named(dbCursor):
-                        # Add the new Clip to the Database Tree Tab.
-                        # To add a Clip, we need to build the node list for the tree's add_Node method to climb.
-                        # We need to add all of the Collection Parents to our Node List, so we'll start by loading
-                        # the current Collection
-                        tempCollection = Collection.Collection(line['CollectNum'])
-
-                        # Add the current Collection Name, and work backwards from here.
-                        nodeList = (tempCollection.id,)
-                        # Repeat this process as long as the Collection we're looking at has a defined Parent...
-                        while tempCollection.parent > 0:
-                           # Load the Parent Collection
-                           tempCollection = Collection.Collection(tempCollection.parent)
-                           # Add this Collection's name to the FRONT of the Node List
-                           nodeList = (tempCollection.id,) + nodeList
-                        # Get the DB Values
-                        tempID = line['ClipID']
-                        # If we're in Unicode mode, format the strings appropriately
-                        if 'unicode' in wx.PlatformInfo:
-                            tempID = DBInterface.ProcessDBDataForUTF8Encoding(tempID)
-                        # Now add the Search Root Node and the Search Name to the front of the Node List and the
-                        # Clip Name to the back of the Node List
-                        nodeList = (_('Search'), searchName) + nodeList + (tempID, )
-
-                        # Add the Node to the Tree
-                        self.dbTree.add_Node('SearchClipNode', nodeList, line['ClipNum'], line['CollectNum'], sortOrder=line['SortOrder'])
-
-                if includeSnapshots:
-                    # Adjust query for sqlite, if needed
-                    wholeSnapshotQuery = DBInterface.FixQuery(wholeSnapshotQuery)
-                    # Execute the Whole Snapshot query
-                    dbCursor.execute(wholeSnapshotQuery, params)
-
-                    # Since we have two sources of Snapshots that get included, we need to track what we've already
-                    # added so we don't add the same Snapshot twice
-                    addedSnapshots = []
-
-                    # Process all results of the Whole Snapshot query 
-                    for line in DBInterface.fetchall_named(dbCursor):
-                        # Add the new Snapshot to the Database Tree Tab.
-                        # To add a Snapshot, we need to build the node list for the tree's add_Node method to climb.
-                        # We need to add all of the Collection Parents to our Node List, so we'll start by loading
-                        # the current Collection
-                        tempCollection = Collection.Collection(line['CollectNum'])
-
-                        # Add the current Collection Name, and work backwards from here.
-                        nodeList = (tempCollection.id,)
-                        # Repeat this process as long as the Collection we're looking at has a defined Parent...
-                        while tempCollection.parent > 0:
-                           # Load the Parent Collection
-                           tempCollection = Collection.Collection(tempCollection.parent)
-                           # Add this Collection's name to the FRONT of the Node List
-                           nodeList = (tempCollection.id,) + nodeList
-                        # Get the DB Values
-                        tempID = line['SnapshotID']
-                        # If we're in Unicode mode, format the strings appropriately
-                        if 'unicode' in wx.PlatformInfo:
-                            tempID = DBInterface.ProcessDBDataForUTF8Encoding(tempID)
-                        # Now add the Search Root Node and the Search Name to the front of the Node List and the
-                        # Clip Name to the back of the Node List
-                        nodeList = (_('Search'), searchName) + nodeList + (tempID, )
-
-                        # Add the Node to the Tree
-                        self.dbTree.add_Node('SearchSnapshotNode', nodeList, line['SnapshotNum'], line['CollectNum'], sortOrder=line['SortOrder'])
-                        # Add the Snapshot to the list of Snapshots added to the Search Result
-                        addedSnapshots.append(line['SnapshotNum'])
-                        
-                        tmpNode = self.dbTree.select_Node(nodeList[:-1], 'SearchCollectionNode', ensureVisible=False)
-                        self.dbTree.SortChildren(tmpNode)
-                    # Adjust query for sqlite if needed
-                    snapshotCodingQuery = DBInterface.FixQuery(snapshotCodingQuery)
-                    # Execute the Snapshot Coding query
-                    dbCursor.execute(snapshotCodingQuery, params)
-
-                    # Process all results of the Snapshot Coding query 
-                    for line in DBInterface.fetchall_named(dbCursor):
-                        # If the Snapshot is NOT already in the Search Results ...
-                        if not (line['SnapshotNum'] in addedSnapshots):
-                            # Add the new Snapshot to the Database Tree Tab.
-                            # To add a Snapshot, we need to build the node list for the tree's add_Node method to climb.
-                            # We need to add all of the Collection Parents to our Node List, so we'll start by loading
-                            # the current Collection
-                            tempCollection = Collection.Collection(line['CollectNum'])
-
-                            # Add the current Collection Name, and work backwards from here.
-                            nodeList = (tempCollection.id,)
-                            # Repeat this process as long as the Collection we're looking at has a defined Parent...
-                            while tempCollection.parent > 0:
-                               # Load the Parent Collection
-                               tempCollection = Collection.Collection(tempCollection.parent)
-                               # Add this Collection's name to the FRONT of the Node List
-                               nodeList = (tempCollection.id,) + nodeList
-                            # Get the DB Values
-                            tempID = line['SnapshotID']
-                            # If we're in Unicode mode, format the strings appropriately
-                            if 'unicode' in wx.PlatformInfo:
-                                tempID = DBInterface.ProcessDBDataForUTF8Encoding(tempID)
-                            # Now add the Search Root Node and the Search Name to the front of the Node List and the
-                            # Clip Name to the back of the Node List
-                            nodeList = (_('Search'), searchName) + nodeList + (tempID, )
-
-                            # Add the Node to the Tree
-                            self.dbTree.add_Node('SearchSnapshotNode', nodeList, line['SnapshotNum'], line['CollectNum'], sortOrder=line['SortOrder'])
-                            # Add the Snapshot to the list of Snapshots added to the Search Result
-                            addedSnapshots.append(line['SnapshotNum'])
-                            
-                            tmpNode = self.dbTree.select_Node(nodeList[:-1], 'SearchCollectionNode', ensureVisible=False)
-                            self.dbTree.SortChildren(tmpNode)
+                # Parse the Natural Language Search Terms specified in the Search Dialog.  The search is evaluated
+                # against the Keyword Index for Episodes, Clips, and Snapshots, and the database is only used to get
+                # the display data for the records that match.
+                searchTokens = self.ParseSearchTerms(searchTerms)
+
+                # Searches are cached by their Search Tokens, the types of results included, and the Collections
+                # selected, so running the same Search again doesn't have to evaluate it again
+                cacheKey = (tuple(searchTokens), includeEpisodes, includeClips, includeSnapshots,
+                            tuple(sorted([coll[0] for coll in self.collectionList])))
+                results = SearchCache.Get(cacheKey)
+                # If the results aren't cached, or the tables they came from have changed since they were cached ...
+                if results == None:
+                    # ... note the change counters of the tables the search reads BEFORE evaluating it ...
+                    changeCounts = SearchCache.GetChangeCounts(self.GetSearchTables(searchTokens, includeEpisodes, includeClips, includeSnapshots))
+                    # ... find the results ...
+                    results = self.FindResults(searchTokens, includeEpisodes, includeClips, includeSnapshots)
+                    # ... and cache them
+                    SearchCache.Add(cacheKey, changeCounts, results)
+                (episodeResults, collectionResults) = results
+
+                # Add all the results to the Database Tree at once
+                self.AddResultsToTree(nodeListBase, episodeResults, collectionResults)
 
             else:
                 self.searchCount = searchCount
@@ -314,47 +196,36 @@ class ProcessSearch(object):
         return self.searchCount
 
 
-    def BuildQueries(self, queryText):
-        """ Convert natural language search terms (as structured by the Transana Search Dialog) into
-            executable SQL that runs on MySQL. """
+    def ParseSearchTerms(self, queryText):
+        """ Convert natural language search terms (as structured by the Transana Search Dialog) into a list of
+            search tokens.  Each token is '(', ')', 'AND', 'OR', a (Keyword Group, Keyword, NOT Flag) tuple, a
+            (None, Transcript Text, NOT Flag) tuple, or a (Time-Window Operator, Gap) tuple, where the operator is
+            'OVERLAPS', 'WITHIN', or 'FOLLOWED BY' and the Gap is in milliseconds, or None if there is no limit. """
 
-        # Here are a couple of sample SQL Statements generated by this code:
+        # For example, the Query:
         #
-        # Query:  "Demo:Geometry AND NOT Demo:Teacher Commentary"
+        #   (Demo:Geometry OR
+        #   Demo:Algebra) AND
+        #   NOT Demo:Teacher Commentary OR
+        #   Demo:Question FOLLOWED BY WITHIN 5 SECONDS
+        #   TEXT "common denominator"
         #
-        # SELECT Ep.SeriesNum, SeriesID, Ep.EpisodeNum, EpisodeID,
-        #        COUNT(CASE WHEN ((CK1.KeywordGroup = 'Demo') AND (CK1.Keyword = 'Geometry')) THEN 1 ELSE NULL END) V1,
-        #        COUNT(CASE WHEN ((CK1.KeywordGroup = 'Demo') AND (CK1.Keyword = 'Teacher Commentary')) THEN 1 ELSE NULL END) V2
-        #   FROM ClipKeywords2 CK1, Series2 Se, Episodes2 Ep
-        #   WHERE (Ep.EpisodeNum = CK1.EpisodeNum) AND (Ep.SeriesNum = Se.SeriesNum) AND (CK1.EpisodeNum > 0)
-        #   GROUP BY SeriesNum, SeriesID, EpisodeNum, EpisodeID
-        #   HAVING (V1 > 0) AND (V2 = 0)
+        # becomes
         #
-        # SELECT Cl.CollectNum, ParentCollectNum, Cl.ClipNum, CollectID, ClipID,
-        #        COUNT(CASE WHEN ((CK1.KeywordGroup = 'Demo') AND (CK1.Keyword = 'Geometry')) THEN 1 ELSE NULL END) V1,
-        #        COUNT(CASE WHEN ((CK1.KeywordGroup = 'Demo') AND (CK1.Keyword = 'Teacher Commentary')) THEN 1 ELSE NULL END) V2
-        #   FROM ClipKeywords2 CK1, Collections2 Co, Clips2 Cl
-        #   WHERE (Cl.ClipNum = CK1.ClipNum) AND (Cl.CollectNum = Co.CollectNum) AND (CK1.ClipNum > 0)
-        #   GROUP BY Cl.CollectNum, CollectID, ClipID
-        #   HAVING (V1 > 0) AND (V2 = 0)
-        
-        # Initialize a Temporary Variable Counter
-        tempVarNum = 0
-        # Initialize a list for strings to store SQL "COUNT" lines
-        countStrings = []
-        # Initialize a list to hold the Search Parameters.
-        # NOTE:  Parameters are passed separately rather than being integrated into the SQL so that
-        #        MySQLdb can handle all parsing related to apostrophes and other non-SQL-friendly characters.
-        params = []
-        # Initialize a String to store the SQL "HAVING" clause
-        havingStr = ''
-
-        # We now will go through the Search Terms line by line and prepare to convert the Search Request to SQL
+        #   ['(', (u'Demo', u'Geometry', False), 'OR', (u'Demo', u'Algebra', False), ')', 'AND',
+        #    (u'Demo', u'Teacher Commentary', True), 'OR', (u'Demo', u'Question', False), ('FOLLOWED BY', 5000),
+        #    (None, u'common denominator', False)]
+
+        # Initialize the list of Search Tokens
+        searchTokens = []
+
+        # We now will go through the Search Terms line by line and convert them to tokens
         for lineNum in range(len(queryText)):
             # Capture the Line being processed, and remove whitespace from either end
             tempStr = string.strip(queryText[lineNum])
 
-            # Initialize the "Continuation" string, which holds a BOOLEAN Operator ("AND" or "OR")
+            # Initialize the "Continuation" string, which holds a BOOLEAN Operator ("AND" or "OR") or a
+            # Time-Window Operator tuple
             continStr = ''
             # Initialize the flag that signals the BOOLEAN "NOT" Operator
             notFlag = False
@@ -364,24 +235,39 @@ class ProcessSearch(object):
             # If a line ends with " AND"...
             if tempStr[-4:] == ' AND':
                 # ... put the Boolean Operator into the Continuation String ...
-                continStr = ' AND '
+                continStr = 'AND'
                 # ... and remove it from the line being processed.
                 tempStr = tempStr[:-4]
 
             # If a line ends with " OR"...
             if tempStr[-3:] == ' OR':
                 # ... put the Boolean Operator into the Continuation String ...
-                continStr = ' OR '
+                continStr = 'OR'
                 # ... and remove it from the line being processed.
                 tempStr = tempStr[:-3]
 
+            # If a line ends with a Time-Window Operator ...
+            operator = TEMPORAL_OPERATOR.search(tempStr)
+            if operator != None:
+                # ... put the operator and its gap, converted to milliseconds, into the Continuation String ...
+                if operator.group(1) == 'OVERLAPS':
+                    continStr = ('OVERLAPS', None)
+                elif operator.group(2) != None:
+                    continStr = ('WITHIN', int(operator.group(2)) * 1000)
+                elif operator.group(4) != None:
+                    continStr = ('FOLLOWED BY', int(operator.group(4)) * 1000)
+                else:
+                    continStr = ('FOLLOWED BY', None)
+                # ... and remove it from the line being processed.
+                tempStr = tempStr[:operator.start()]
+
             # Process characters at the beginning of the Line, including open parens and the "NOT" operator.
             # NOTE:  The Search Dialog allows "(NOT", but not "NOT(".
-            while (tempStr[0] == '(') or (tempStr[:4] == 'NOT '):
+            while (len(tempStr) > 0) and ((tempStr[0] == '(') or (tempStr[:4] == 'NOT ')):
                 # If the line starts with an open paren ...
                 if tempStr[0] == '(':
-                    # ... add it to the "HAVING" clause string ...
-                    havingStr += '('
+                    # ... add it to the Search Tokens ...
+                    searchTokens.append('(')
                     # ... and remove it from the line.
                     tempStr = tempStr[1:]
                 # If the line starts with a "NOT" operator ...
@@ -391,168 +277,400 @@ class ProcessSearch(object):
                     # ... and remove it from the line.
                     tempStr = tempStr[4:]
 
-            # Check for close parens in the line ...
-            while tempStr.find(')') > -1:
-                # ... keep track of how many are found in this line ...
-                closeParen += 1
-                # ... and remove them from the line.
-                tempStr = tempStr[:tempStr.find(')')] + tempStr[tempStr.find(')') + 1:]
-
-            # All that should be left in the line being processed now should be Keywords.
-            if len(tempStr) > 0:
-                # increment the Temporary Variable Counter.  (Every Keyword Group : Keyword combination gets a unique
-                # Temporary Variable Number.)
-                tempVarNum += 1
-
-                # The presence of a variable (or it's absence if NOT has been specified) is signalled in SQL by a combination of
-                # this "COUNT" statement, which creates a numbered variable in the SELECT Clause, and a "HAVING" line.
-                # I can't adequately explain it, but it DOES work.
-                # Please, don't mess with it.
-
-                # Add a line to the SQL "COUNT" statements to indicate the presence or absence of a Keyword Group : Keyword pair
-                tempStr2 = "COUNT(CASE WHEN ((CK1.KeywordGroup = %s) AND (CK1.Keyword = %s)) THEN 1 ELSE NULL END) " + "V%s" % tempVarNum
-                countStrings.append(tempStr2)
-                # Add the Keyword Group to the Parameters
-                kwg = tempStr[:tempStr.find(':')]
-                if 'unicode' in wx.PlatformInfo:
-                    kwg = kwg.encode(TransanaGlobal.encoding)
-                params.append(kwg)
-                # Add the Keyword to the Parameters
-                kw = tempStr[tempStr.find(':') + 1:]
-                if 'unicode' in wx.PlatformInfo:
-                    kw = kw.encode(TransanaGlobal.encoding)
-                params.append(kw)
-                # Add the Temporary Variable Number that corresponds to this Keyword Group : Keyword pair to the Parameters
-#                params.append(tempVarNum)
-
-                # If the "NOT" operator has been specified, we want the Temporary Variable to equal Zero in the "HAVING" clause
-                if notFlag:
-                    havingStr += '(V%s = 0)' % tempVarNum
-                # If the "NOT" operator has not been specified, we want the Temporary Variable to be greater than Zero in the "HAVING" clause
+            # If the line is a Transcript Text term, such as TEXT "some words" ...
+            if tempStr[:6] == 'TEXT "':
+                # ... the text runs to the last quotation mark, so it can include parens, and only close parens
+                # follow it.
+                textEnd = tempStr.rfind('"')
+                if textEnd < 6:
+                    textEnd = len(tempStr)
+                closeParen = tempStr[textEnd:].count(')')
+                # The Text, with a Keyword Group of None, and its NOT Flag
+                searchTerm = (None, tempStr[6:textEnd], notFlag)
+
+            # Otherwise ...
+            else:
+                # Check for close parens in the line ...
+                while tempStr.find(')') > -1:
+                    # ... keep track of how many are found in this line ...
+                    closeParen += 1
+                    # ... and remove them from the line.
+                    tempStr = tempStr[:tempStr.find(')')] + tempStr[tempStr.find(')') + 1:]
+
+                # All that should be left in the line being processed now should be Keywords.
+                if len(tempStr) > 0:
+                    # Split the Keyword Group : Keyword pair
+                    kwg = tempStr[:tempStr.find(':')]
+                    kw = tempStr[tempStr.find(':') + 1:]
+                    # The Keyword and its NOT Flag
+                    searchTerm = (kwg, kw, notFlag)
                 else:
-                    havingStr += '(V%s > 0)' % tempVarNum
+                    searchTerm = None
+
+            # If we have a Keyword or Text ...
+            if searchTerm != None:
+                # ... add it to the Search Tokens
+                searchTokens.append(searchTerm)
 
-                # Add any closing parentheses that were specified to the end of the "HAVING" clause
+                # Add any closing parentheses that were specified
                 for x in range(closeParen):
-                    havingStr += ')'
-                # Add the appropriate Boolean Operator to the end of the "HAVING" clause, if one was specified
-                havingStr += continStr
-
-        # Before we continue, let's build the part of the query that implements the Collections selections
-        # made on the Collections tab of the Search Form
-
-        if len(self.collectionList) > 0:
-            paramsCl = ()
-            paramsSn = ()
-            collectionSQL = ' AND ('
-            for coll in self.collectionList:
-                collectionSQL += "(%%s.CollectNum = %d) " % coll[0]
-                if coll != self.collectionList[-1]:
-                    collectionSQL += "or "
-                paramsCl+= ('Cl',)
-                paramsSn += ('Sn',)
-            collectionSQL += ") "
-
-        # Now that all the pieces (countStrings, params, and the havingStr) are assembled, we can build the
-        # SQL Statements for the searches.
-
-        # Define the start of the Series/Episode Query
-        episodeSQL = 'SELECT Ep.SeriesNum, SeriesID, Ep.EpisodeNum, EpisodeID, '
-        # Define the start of the Collection/Clip Query
-        clipSQL = 'SELECT Cl.CollectNum, ParentCollectNum, Cl.ClipNum, CollectID, ClipID, SortOrder, '
-        # Define the start of the Whole Snapshot Query
-        wholeSnapshotSQL = 'SELECT Sn.CollectNum, ParentCollectNum, Sn.SnapshotNum, CollectID, SnapshotID, SortOrder, '
-        # Define the start of the Snapshot Coding Query
-        snapshotCodingSQL = 'SELECT Sn.CollectNum, ParentCollectNum, Sn.SnapshotNum, CollectID, SnapshotID, SortOrder, '
-
-        # Add in the SQL "COUNT" variables that signal the presence or absence of Keyword Group : Keyword pairs
-        for lineNum in range(len(countStrings)):
-            # All SQL "COUNT" lines but he last one need to end with a comma
-            if lineNum < len(countStrings)-1:
-                tempStr = ', '
-            # The last SQL "COUNT" line does not need to end with a comma
+                    searchTokens.append(')')
+                # Add the appropriate Boolean or Time-Window Operator, if one was specified
+                if continStr != '':
+                    searchTokens.append(continStr)
+
+        # Return the Search Tokens
+        return searchTokens
+
+    def FindResults(self, searchTokens, includeEpisodes, includeClips, includeSnapshots):
+        """ Evaluate the Search Tokens and get the display data for the Episodes, Clips, and Snapshots that match.
+            Returns the lists of Episode results and of Clip and Snapshot results that AddResultsToTree() expects. """
+        # Initialize the list of Episode results, as (Series ID, Series Number, Episode ID, Episode Number) values
+        episodeResults = []
+        # Initialize the list of Clip and Snapshot results, as (Collection Path, Node Type, ID, Record Number,
+        # Collection Number, Sort Order) values
+        collectionResults = []
+
+        if includeEpisodes:
+            # Find the Episodes that match the search
+            episodeNums = self.EvaluateSearch(searchTokens, 'Episode')
+            # Define the query that gets the Series and Episode data for the results
+            episodeQuery = 'SELECT Ep.SeriesNum, SeriesID, Ep.EpisodeNum, EpisodeID '
+            episodeQuery += 'FROM Series2 Se, Episodes2 Ep '
+            episodeQuery += 'WHERE (Ep.SeriesNum = Se.SeriesNum) AND '
+            episodeQuery += '(Ep.EpisodeNum IN (%s))'
+
+            # Process the results of the Series/Episode query
+            for line in self.GetSearchResults(episodeQuery, episodeNums):
+                # Get the DB Values
+                seriesID = line['SeriesID']
+                episodeID = line['EpisodeID']
+                # If we're in Unicode mode, format the strings appropriately
+                if 'unicode' in wx.PlatformInfo:
+                    seriesID = DBInterface.ProcessDBDataForUTF8Encoding(seriesID)
+                    episodeID = DBInterface.ProcessDBDataForUTF8Encoding(episodeID)
+                # Add the Episode to the Episode results
+                episodeResults.append((seriesID, line['SeriesNum'], episodeID, line['EpisodeNum']))
+
+        if includeClips:
+            # Find the Clips that match the search
+            clipNums = self.EvaluateSearch(searchTokens, 'Clip')
+            # Define the query that gets the Collection and Clip data for the results
+            clipQuery = 'SELECT Cl.CollectNum, ParentCollectNum, Cl.ClipNum, CollectID, ClipID, SortOrder '
+            clipQuery += 'FROM Collections2 Co, Clips2 Cl '
+            clipQuery += 'WHERE (Cl.CollectNum = Co.CollectNum) AND '
+            clipQuery += '(Cl.ClipNum IN (%s))'
+
+            # Process all results of the Collection/Clip query 
+            for line in self.GetSearchResults(clipQuery, clipNums, 'Cl'):
+                # Get the DB Values
+                tempID = line['ClipID']
+                # If we're in Unicode mode, format the strings appropriately
+                if 'unicode' in wx.PlatformInfo:
+                    tempID = DBInterface.ProcessDBDataForUTF8Encoding(tempID)
+                # Add the Clip, with its Collection Path from the Collection Path Index, to the Collection results
+                collectionResults.append((DBInterface.GetCollectionPathItems(line['CollectNum']), 'SearchClipNode',
+                                          tempID, line['ClipNum'], line['CollectNum'], line['SortOrder']))
+
+        if includeSnapshots:
+            # Find the Snapshots whose Whole Snapshot keywords or whose visible Snapshot Coding keywords
+            # match the search
+            snapshotNums = self.EvaluateSearch(searchTokens, 'Snapshot') | self.EvaluateSearch(searchTokens, 'SnapshotCoding')
+            # Define the query that gets the Collection and Snapshot data for the results
+            snapshotQuery = 'SELECT Sn.CollectNum, ParentCollectNum, Sn.SnapshotNum, CollectID, SnapshotID, SortOrder '
+            snapshotQuery += 'FROM Collections2 Co, Snapshots2 Sn '
+            snapshotQuery += 'WHERE (Sn.CollectNum = Co.CollectNum) AND '
+            snapshotQuery += '(Sn.SnapshotNum IN (%s))'
+
+            # Process all results of the Collection/Snapshot query 
+            for line in self.GetSearchResults(snapshotQuery, snapshotNums, 'Sn'):
+                # Get the DB Values
+                tempID = line['SnapshotID']
+                # If we're in Unicode mode, format the strings appropriately
+                if 'unicode' in wx.PlatformInfo:
+                    tempID = DBInterface.ProcessDBDataForUTF8Encoding(tempID)
+                # Add the Snapshot, with its Collection Path from the Collection Path Index, to the Collection results
+                collectionResults.append((DBInterface.GetCollectionPathItems(line['CollectNum']), 'SearchSnapshotNode',
+                                          tempID, line['SnapshotNum'], line['CollectNum'], line['SortOrder']))
+
+        return (episodeResults, collectionResults)
+
+    def GetSearchTables(self, searchTokens, includeEpisodes, includeClips, includeSnapshots):
+        """ Return the names of the tables whose changes can change the results of a search, which the Search Cache
+            checks before using cached results """
+        # Every search reads the keywords of the records it includes
+        tables = set(['ClipKeywords2'])
+        # Episode results show their Series and Episode IDs
+        if includeEpisodes:
+            tables |= set(['Series2', 'Episodes2'])
+        # Clip and Snapshot results show their IDs, Collections, and Sort Order.  (Snapshot Coding keywords are
+        # saved with the Snapshot.)
+        if includeClips:
+            tables |= set(['Collections2', 'Clips2'])
+        if includeSnapshots:
+            tables |= set(['Collections2', 'Snapshots2'])
+        for searchToken in searchTokens:
+            # Time-Window Operators compare the positions of Clips and Snapshots
+            if self._IsTemporal(searchToken):
+                tables |= set(['Clips2', 'Snapshots2'])
+            # Transcript Text terms read the Text Index of the Transcripts
+            elif isinstance(searchToken, tuple) and (searchToken[0] == None):
+                tables.add('Transcripts2')
+        return tables
+
+    def EvaluateSearch(self, searchTokens, objectType):
+        """ Evaluate the Search Tokens against the Keyword Index for objectType ('Episode', 'Clip', 'Snapshot', or
+            'SnapshotCoding') and return the set of record numbers that match.  As in SQL, AND is evaluated before OR.
+            Time-Window Operators are evaluated before AND, from left to right. """
+        # If there are no keywords in the search, nothing matches
+        if len(searchTokens) == 0:
+            return set()
+        # Evaluate the whole search
+        (result, position) = self._EvaluateOr(searchTokens, 0, objectType)
+        return result
+
+    def _EvaluateOr(self, searchTokens, position, objectType):
+        """ Evaluate a series of terms joined by OR, starting at position.  Returns the matching record numbers and
+            the position of the first token that wasn't used. """
+        (result, position) = self._EvaluateAnd(searchTokens, position, objectType)
+        # As long as the next token is OR ...
+        while (position < len(searchTokens)) and (searchTokens[position] == 'OR'):
+            # ... evaluate the next term and add its records
+            (tempResult, position) = self._EvaluateAnd(searchTokens, position + 1, objectType)
+            result |= tempResult
+        return (result, position)
+
+    def _EvaluateAnd(self, searchTokens, position, objectType):
+        """ Evaluate a series of terms joined by AND, starting at position.  Returns the matching record numbers and
+            the position of the first token that wasn't used. """
+        (result, position) = self._EvaluateTemporal(searchTokens, position, objectType)
+        # As long as the next token is AND ...
+        while (position < len(searchTokens)) and (searchTokens[position] == 'AND'):
+            # ... evaluate the next term and keep only the records in both
+            (tempResult, position) = self._EvaluateTemporal(searchTokens, position + 1, objectType)
+            result &= tempResult
+        return (result, position)
+
+    def _EvaluateTemporal(self, searchTokens, position, objectType):
+        """ Evaluate a series of terms joined by Time-Window Operators, starting at position.  Returns the matching
+            record numbers and the position of the first token that wasn't used.  The operators compare the Clips and
+            Snapshots that match the terms on either side of them, and both sides of each match are included in the
+            results.  A Clip or Snapshot is never matched with itself, so "A OVERLAPS B" needs two different Clips or
+            Snapshots, even if one has both keywords.  Episodes match if they contain a match. """
+        # Remember where the terms start
+        startPosition = position
+        (result, position) = self._EvaluateTerm(searchTokens, position, objectType)
+        # If the term isn't followed by a Time-Window Operator, we're done
+        if (position >= len(searchTokens)) or not self._IsTemporal(searchTokens[position]):
+            return (result, position)
+        # The time-window matches are the same for every type of result, so we only need to find them once
+        key = (tuple(searchTokens), startPosition)
+        if not self.temporalResults.has_key(key):
+            # Get the Clips and Snapshots that match the first term
+            (result, position) = self._EvaluateTerm(searchTokens, startPosition, 'Segment')
+            # As long as the next token is a Time-Window Operator ...
+            while (position < len(searchTokens)) and self._IsTemporal(searchTokens[position]):
+                (operator, gap) = searchTokens[position]
+                # ... get the Clips and Snapshots that match the next term ...
+                (tempResult, position) = self._EvaluateTerm(searchTokens, position + 1, 'Segment')
+                # ... and compare the two sides' positions in their Episodes
+                if operator == 'OVERLAPS':
+                    (leftResult, rightResult) = TemporalSearch.Overlaps(self.GetSegments(result), self.GetSegments(tempResult))
+                elif operator == 'WITHIN':
+                    (leftResult, rightResult) = TemporalSearch.Within(self.GetSegments(result), self.GetSegments(tempResult), gap)
+                else:
+                    (leftResult, rightResult) = TemporalSearch.FollowedBy(self.GetSegments(result), self.GetSegments(tempResult), gap)
+                # Keep the Clips and Snapshots on both sides of the matches
+                result = leftResult | rightResult
+            self.temporalResults[key] = (result, position)
+        (result, position) = self.temporalResults[key]
+        # Convert the Clips and Snapshots to the type of result requested
+        if objectType == 'Segment':
+            return (set(result), position)
+        elif objectType == 'Clip':
+            return (set([num for (segmentType, num) in result if segmentType == 'Clip']), position)
+        elif objectType in ['Snapshot', 'SnapshotCoding']:
+            return (set([num for (segmentType, num) in result if segmentType == 'Snapshot']), position)
+        else:
+            return (set([self.segments[segment][0] for segment in result]), position)
+
+    def _EvaluateTerm(self, searchTokens, position, objectType):
+        """ Evaluate a single Keyword or a parenthesized expression, starting at position.  Returns the matching record
+            numbers and the position of the first token that wasn't used. """
+        # If we're out of tokens, or don't have a term, nothing matches
+        if (position >= len(searchTokens)) or (searchTokens[position] in [')', 'AND', 'OR']) or \
+           self._IsTemporal(searchTokens[position]):
+            return (set(), position)
+        # If we have an open paren ...
+        if searchTokens[position] == '(':
+            # ... evaluate the expression inside the parentheses ...
+            (result, position) = self._EvaluateOr(searchTokens, position + 1, objectType)
+            # ... and skip the close paren
+            if (position < len(searchTokens)) and (searchTokens[position] == ')'):
+                position += 1
+            return (result, position)
+        # Otherwise, we have a Keyword or Transcript Text
+        (kwg, kw, notFlag) = searchTokens[position]
+        # If we have Transcript Text, get the records whose Transcripts contain it
+        if kwg == None:
+            result = self._GetTextResults(objectType, kw)
+        # Otherwise, get the records that have the Keyword
+        else:
+            result = self._GetKeywordResults(objectType, kwg, kw)
+        # If the "NOT" operator has been specified, we want the records that DON'T have the Keyword or Text.  (Only
+        # records that have keywords can match, even when searching for records WITHOUT a keyword.)
+        if notFlag:
+            result = self._GetKeywordResults(objectType) - result
+        return (result, position + 1)
+
+    def _IsTemporal(self, searchToken):
+        """ Determine whether a Search Token is a Time-Window Operator """
+        return isinstance(searchToken, tuple) and (len(searchToken) == 2)
+
+    def _GetKeywordResults(self, objectType, kwg=None, kw=None):
+        """ Get the records of type objectType that have the Keyword kwg : kw from the Keyword Index, or that have any
+            keywords if no Keyword is passed.  The 'Segment' type gets the Clips and Snapshots, as ('Clip', ClipNum)
+            and ('Snapshot', SnapshotNum) values, for the Time-Window Operators. """
+        # If we're not getting Clips and Snapshots together ...
+        if objectType != 'Segment':
+            # ... we can use the Keyword Index directly
+            if kwg == None:
+                return KeywordIndex.GetAll(objectType)
             else:
-                tempStr = ' '
-
-            # Add the SQL "COUNT" Line and seperator to the Series/Episode Query
-            episodeSQL += countStrings[lineNum] + tempStr
-            # Add the SQL "COUNT" Line and seperator to the Collection/Clip Query
-            clipSQL += countStrings[lineNum] + tempStr
-            # Add the SQL "COUNT" Line and seperator to the Whole Snapshot Query
-            wholeSnapshotSQL += countStrings[lineNum] + tempStr
-            # Add the SQL "COUNT" Line and seperator to the Snapshot Coding Query
-            snapshotCodingSQL += countStrings[lineNum] + tempStr
-
-        # Now add the rest of the SQL for the Series/Episode Query
-        episodeSQL += 'FROM ClipKeywords2 CK1, Series2 Se, Episodes2 Ep '
-        episodeSQL += 'WHERE (Ep.EpisodeNum = CK1.EpisodeNum) AND '
-        episodeSQL += '(Ep.SeriesNum = Se.SeriesNum) AND '
-        episodeSQL += '(CK1.EpisodeNum > 0) '
-        episodeSQL += 'GROUP BY Ep.SeriesNum, SeriesID, Ep.EpisodeNum, EpisodeID '
-        # Add in the SQL "HAVING" Clause that was constructed above
-        episodeSQL += 'HAVING %s ' % havingStr
-
-        # Now add the rest of the SQL for the Collection/Clip Query
-        clipSQL += 'FROM ClipKeywords2 CK1, Collections2 Co, Clips2 Cl '
-        clipSQL += 'WHERE (Cl.ClipNum = CK1.ClipNum) AND '
-        clipSQL += '(Cl.CollectNum = Co.CollectNum) AND '
-        clipSQL += '(CK1.ClipNum > 0) '
-        if len(self.collectionList) > 0:
-            clipSQL += collectionSQL % paramsCl
-        clipSQL += 'GROUP BY Cl.CollectNum, CollectID, ClipID '
-        # Add in the SQL "HAVING" Clause that was constructed above
-        clipSQL += 'HAVING %s ' % havingStr
-        # Add an "ORDER BY" Clause to preserve Clip Sort Order
-        clipSQL += 'ORDER BY CollectID, SortOrder'
-
-        # Now add the rest of the SQL for the Whole Snapshot Query
-        wholeSnapshotSQL += 'FROM ClipKeywords2 CK1, Collections2 Co, Snapshots2 Sn '
-        wholeSnapshotSQL += 'WHERE (Sn.SnapshotNum = CK1.SnapshotNum) AND '
-        wholeSnapshotSQL += '(Sn.CollectNum = Co.CollectNum) AND '
-        wholeSnapshotSQL += '(CK1.SnapshotNum > 0) '
-        if len(self.collectionList) > 0:
-            wholeSnapshotSQL += collectionSQL % paramsSn
-        wholeSnapshotSQL += 'GROUP BY Sn.CollectNum, CollectID, SnapshotID '
-        # Add in the SQL "HAVING" Clause that was constructed above
-        wholeSnapshotSQL += 'HAVING %s ' % havingStr
-        # Add an "ORDER BY" Clause to preserve Snapshot Sort Order
-        wholeSnapshotSQL += 'ORDER BY CollectID, SortOrder'
-
-        # Now add the rest of the SQL for the Snapshot Coding Query
-        snapshotCodingSQL += 'FROM SnapshotKeywords2 CK1, Collections2 Co, Snapshots2 Sn '
-        snapshotCodingSQL += 'WHERE (Sn.SnapshotNum = CK1.SnapshotNum) AND '
-        snapshotCodingSQL += '(Sn.CollectNum = Co.CollectNum) AND '
-        snapshotCodingSQL += '(CK1.SnapshotNum > 0) '
-        # For Snapshot Coding, we ONLY want VISIBLE Keywords
-        snapshotCodingSQL += 'AND (CK1.Visible = 1) '
-        if len(self.collectionList) > 0:
-            snapshotCodingSQL += collectionSQL % paramsSn
-        snapshotCodingSQL += 'GROUP BY Sn.CollectNum, CollectID, SnapshotID '
-        # Add in the SQL "HAVING" Clause that was constructed above
-        snapshotCodingSQL += 'HAVING %s ' % havingStr
-        # Add an "ORDER BY" Clause to preserve Snapshot Sort Order
-        snapshotCodingSQL += 'ORDER BY CollectID, SortOrder'
-
-#        tempParams = ()
-#        for p in params:
-#            tempParams = tempParams + (p,)
-            
-        # dlg = wx.TextEntryDialog(None, "Transana Series/Episode SQL Statement:", "Transana", episodeSQL % tempParams, style=wx.OK)
-        # dlg.ShowModal()
-        # dlg.Destroy()
-
-#        dlg = wx.TextEntryDialog(None, "Transana Collection/Clip SQL Statement:", "Transana", clipSQL % tempParams, style=wx.OK)
-#        dlg.ShowModal()
-#        dlg.Destroy()
-
-#        dlg = wx.TextEntryDialog(None, "Transana Whole Snapshot SQL Statement:", "Transana", wholeSnapshotSQL % tempParams, style=wx.OK)
-#        dlg.ShowModal()
-#        dlg.Destroy()
-
-#        dlg = wx.TextEntryDialog(None, "Transana Snapshot Coding SQL Statement:", "Transana", snapshotCodingSQL % tempParams, style=wx.OK)
-#        dlg.ShowModal()
-#        dlg.Destroy()
-
-        # Return the Series/Episode Query, the Collection/Clip Query, the Whole Snapshot Query, the Snapshot Coding Query, 
-        # and the list of parameters to use with these queries to the calling routine.
-        return (episodeSQL, clipSQL, wholeSnapshotSQL, snapshotCodingSQL, params)
+                return KeywordIndex.Get(objectType, kwg, kw)
+        # Otherwise, combine the Clips with the Snapshots whose Whole Snapshot or Snapshot Coding keywords match
+        result = set()
+        for (keywordType, segmentType) in [('Clip', 'Clip'), ('Snapshot', 'Snapshot'), ('SnapshotCoding', 'Snapshot')]:
+            result |= set([(segmentType, num) for num in self._GetKeywordResults(keywordType, kwg, kw)])
+        return result
+
+    def _GetTextResults(self, objectType, text):
+        """ Get the records of type objectType whose Transcripts contain text.  Episodes match on their Episode
+            Transcripts and Clips on their Clip Transcripts.  Snapshots don't have Transcripts. """
+        # The Transcripts that contain the text are the same for every type of result, so we only need to find them once
+        if not self.textResults.has_key(text):
+            self.textResults[text] = DBInterface.list_transcripts_with_text(text)
+        if objectType == 'Episode':
+            return set([episodeNum for (transcriptNum, episodeNum, clipNum) in self.textResults[text] if clipNum == 0])
+        elif objectType == 'Clip':
+            return set([clipNum for (transcriptNum, episodeNum, clipNum) in self.textResults[text] if clipNum > 0])
+        elif objectType == 'Segment':
+            return set([('Clip', clipNum) for (transcriptNum, episodeNum, clipNum) in self.textResults[text] if clipNum > 0])
+        else:
+            return set()
+
+    def GetSegments(self, segmentKeys):
+        """ Get the (Episode Number, Start, Stop, key) values for the Clips and Snapshots in segmentKeys, which are
+            ('Clip', ClipNum) and ('Snapshot', SnapshotNum) values.  Clips and Snapshots without a position in an
+            Episode are skipped. """
+        # Find the Clips and Snapshots we haven't loaded yet
+        clipNums = [num for (segmentType, num) in segmentKeys if (segmentType == 'Clip') and not self.segments.has_key((segmentType, num))]
+        snapshotNums = [num for (segmentType, num) in segmentKeys if (segmentType == 'Snapshot') and not self.segments.has_key((segmentType, num))]
+        # Note that they have been looked up, even if they don't have a position ...
+        for num in clipNums:
+            self.segments[('Clip', num)] = None
+        for num in snapshotNums:
+            self.segments[('Snapshot', num)] = None
+        # ... and load them from the database
+        for segment in DBInterface.list_coded_segments(clipNums, snapshotNums):
+            self.segments[segment[3]] = segment
+        # Return the segments that have positions
+        return [self.segments[key] for key in segmentKeys if self.segments[key] != None]
+
+    def GetSearchResults(self, query, nums, alias=None):
+        """ Get the display data for the records in nums, the results of a search.  query must include an
+            "IN (%s)" clause for the record numbers.  If the table alias for Clips or Snapshots is passed in alias,
+            the results are limited to the Collections selected in the Search Dialog and sorted by Collection ID and
+            Sort Order. """
+        # Initialize the results
+        results = []
+        # If we're limiting the results to the selected Collections, add them to the query
+        if (alias != None) and (len(self.collectionList) > 0):
+            query += ' AND (%s.CollectNum IN (%s))' % (alias, ', '.join(['%d' % coll[0] for coll in self.collectionList]))
+        # Sort the record numbers so the batches are consistent
+        nums = sorted(nums)
+        # Get a Database Cursor
+        dbCursor = DBInterface.get_db().cursor()
+        # Process the records in batches
+        for start in range(0, len(nums), SEARCH_BATCH_SIZE):
+            batch = tuple(nums[start:start + SEARCH_BATCH_SIZE])
+            # Add a parameter for each record number in the batch, and adjust the query for sqlite if needed
+            tempQuery = DBInterface.FixQuery(query % ', '.join(['%s'] * len(batch)))
+            # Execute the query
+            dbCursor.execute(tempQuery, batch)
+            # Add the rows to the results
+            results += DBInterface.fetchall_named(dbCursor)
+        # Close the Database Cursor
+        dbCursor.close()
+        # If we have Clips or Snapshots, sort them to preserve the Sort Order
+        if alias != None:
+            results.sort(key=lambda line: (line['CollectID'], line['SortOrder']))
+        # Return the results
+        return results
+
+    def AddResultsToTree(self, nodeListBase, episodeResults, collectionResults):
+        """ Add the Search Results to the Search Results Node described by nodeListBase in the Database Tree.
+            All the nodes are added directly under their parent nodes, in order, while the tree is frozen.  Series
+            are listed alphabetically, followed by Collections.  Within a Collection, nested Collections are listed
+            alphabetically, followed by the Clips and Snapshots in Sort Order. """
+        # Get the Search Results Node
+        resultsNode = self.dbTree.select_Node(nodeListBase, 'SearchResultsNode', ensureVisible=False)
+        # Get the Transcripts for all the Episodes at once
+        transcripts = DBInterface.list_transcripts_for_episodes([episodeNum for (seriesID, seriesNum, episodeID, episodeNum) in episodeResults])
+        # Group the Episodes by Series
+        seriesResults = {}
+        for (seriesID, seriesNum, episodeID, episodeNum) in episodeResults:
+            seriesResults.setdefault((seriesID, seriesNum), []).append((episodeID, episodeNum))
+        # Build the Collection hierarchy.  Each Collection is a dictionary of its ID, its nested Collections
+        # (keyed by Collection Number), and its Clips and Snapshots.
+        collections = {'id' : None, 'collections' : {}, 'items' : []}
+        for (path, nodeType, itemID, recNum, collectNum, sortOrder) in collectionResults:
+            # Start at the top of the hierarchy
+            branch = collections
+            # Climb the Collection Path, adding any Collections we haven't seen yet
+            for (num, collectID) in path:
+                if not branch['collections'].has_key(num):
+                    branch['collections'][num] = {'id' : collectID, 'collections' : {}, 'items' : []}
+                branch = branch['collections'][num]
+            # Add the Clip or Snapshot to its Collection
+            branch['items'].append((sortOrder, nodeType, itemID, recNum, collectNum))
+
+        # Don't redraw the tree until all the nodes have been added
+        self.dbTree.Freeze()
+        try:
+            # Add the Series, alphabetically
+            for (seriesID, seriesNum) in sorted(seriesResults.keys(), key=lambda series: series[0].upper()):
+                seriesNode = self.dbTree.add_Search_Result_Node(resultsNode, 'SearchSeriesNode', seriesID, seriesNum, 0)
+                # Add the Series' Episodes, alphabetically
+                for (episodeID, episodeNum) in sorted(seriesResults[(seriesID, seriesNum)], key=lambda episode: episode[0].upper()):
+                    episodeNode = self.dbTree.add_Search_Result_Node(seriesNode, 'SearchEpisodeNode', episodeID, episodeNum, seriesNum)
+                    # If the Episode HAS defined transcripts ...
+                    if transcripts.has_key(episodeNum):
+                        # Add each Transcript to the Database Tree.  (An Episode with no transcripts still has the
+                        # keywords and SHOULD be displayed!)
+                        for (transcriptNum, transcriptID, tempEpisodeNum) in transcripts[episodeNum]:
+                            self.dbTree.add_Search_Result_Node(episodeNode, 'SearchTranscriptNode', transcriptID, transcriptNum, episodeNum)
+                        self.dbTree.Expand(episodeNode)
+                self.dbTree.Expand(seriesNode)
+            # Add the Collections
+            self.AddCollectionToTree(resultsNode, collections, 0)
+            # Expand the Search Results Node
+            if self.dbTree.ItemHasChildren(resultsNode):
+                self.dbTree.Expand(resultsNode)
+        finally:
+            # Now draw the tree
+            self.dbTree.Thaw()
+
+    def AddCollectionToTree(self, parentNode, collection, collectNum):
+        """ Add a Collection's nested Collections, Clips, and Snapshots, as built by AddResultsToTree(), to the
+            Database Tree node parentNode """
+        # Add the nested Collections, alphabetically, with their contents
+        for num in sorted(collection['collections'].keys(), key=lambda num: collection['collections'][num]['id'].upper()):
+            collectionNode = self.dbTree.add_Search_Result_Node(parentNode, 'SearchCollectionNode', collection['collections'][num]['id'], num, collectNum)
+            self.AddCollectionToTree(collectionNode, collection['collections'][num], num)
+            self.dbTree.Expand(collectionNode)
+        # Add the Clips and Snapshots in Sort Order.  (The sort is stable, so items with the same Sort Order stay
+        # in the order they were found.)
+        collection['items'].sort(key=lambda item: item[0])
+        for (sortOrder, nodeType, itemID, recNum, itemCollectNum) in collection['items']:
+            self.dbTree.add_Search_Result_Node(parentNode, nodeType, itemID, recNum, itemCollectNum, sortOrder=sortOrder)
@@ -38,6 +38,8 @@ import Clip
 import Collection
 # Import Transana's Database Interface
 import DBInterface
+# Import Transana's Data Object Cache
+import DataObjectCache
 # Import Transana's Dialog Boxes
 import Dialogs
 # Import Transana's Episode object
@@ -810,8 +812,9 @@ class ReportGenerator(wx.Object):
                    ((objType == 'Snapshot') and (filterVal in self.snapshotFilterList)):
                     # If we have Collection-based data ...
                     if (self.collection != None) or ((self.searchColl != None) and (self.treeCtrl != None)):
-                        # ... load the collection the current clip is in
-                        tempColl = Collection.Collection(parentCollNo)
+                        # ... get the collection the current clip is in.  Consecutive clips share collections, so
+                        # use the Data Object Cache rather than reloading the collection for each clip.
+                        tempColl = DataObjectCache.Get(Collection.Collection, parentCollNo)
 
                         # Check to see if we're showing Collection headers, if we're showing nested collections (since
                         # there's no point showing collection headers if there aren't different collections!), and
@@ -1507,8 +1510,8 @@ class ReportGenerator(wx.Object):
 
                     # If we have a Series Report ...
                     else:
-                        # Get the full Episode data
-                        episodeObj = Episode.Episode(groupNo)
+                        # Get the full Episode data from the Data Object Cache
+                        episodeObj = DataObjectCache.Get(Episode.Episode, groupNo)
                         # If we're supposed to show the Media File Name ...
                         if self.showFile:
                             # If we're using the Rich Text Ctrl ...
@@ -1836,8 +1839,8 @@ class ReportGenerator(wx.Object):
                     tmpObj = Snapshot.Snapshot(itemRecord['SnapshotNum'], suppressEpisodeError = True)
                 # now that we have the filter comparison data, we see if it's actually in the Filter List.
                 if filterVal in filterList:
-                    # First, load the collection the current clip is in
-                    collectionObj = Collection.Collection(itemRecord['CollectNum'])
+                    # First, get the collection the current clip is in from the Data Object Cache
+                    collectionObj = DataObjectCache.Get(Collection.Collection, itemRecord['CollectNum'])
                     # If we're using the Rich Text Ctrl ...
                     if TransanaConstants.USESRTC:
                         # Set the font for the heading.
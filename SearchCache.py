@@ -0,0 +1,153 @@
+# Copyright (C) 2003 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+#
+
+"""This module implements a shared cache of Search results, so that running the same Search or Quick Search again
+   doesn't have to evaluate the search and look up the display data for its results again.  It provides the following
+   public functions:
+
+    GetChangeCounts(tableNames)
+    Get(key)
+    Add(key, changeCounts, results)
+    Changed(tableName)
+    Clear()
+
+   Each table has a change counter, which is increased when records in the table are saved (see DataObject) or their
+   keywords change (see DBInterface).  A Search's results are stored with the counters of the tables it reads, taken
+   before the search was evaluated, and are only used while none of those counters have changed.  All results are
+   discarded after records are deleted (see DataObject) or imported (see XMLImport), after keywords are renamed, merged,
+   or deleted (see KeywordObject and DBInterface), when another user changes the database (see ChatWindow), and when
+   the database is closed (see DBInterface).
+"""
+
+__author__ = 'David Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "SearchCache DEBUG is ON!"
+
+# import Python's collections module for the OrderedDict, which keeps the cache in Least Recently Used order
+import collections
+# import Python's threading module, as background threads may save objects too
+import threading
+
+# The maximum number of Search results to keep in the cache
+CACHE_SIZE = 50
+
+
+class SearchCache(object):
+    """ A Least Recently Used cache of Search results, keyed by the search and checked against table change counters """
+
+    def __init__(self, size=CACHE_SIZE):
+        """ Initialize the cache """
+        # The maximum number of results to keep
+        self.size = size
+        # The cached (change counters, results) values, from least to most recently used
+        self.results = collections.OrderedDict()
+        # The change counter for each table
+        self.changeCounts = {}
+        # The number of times the cache has been cleared, which makes results from searches that were running at the
+        # time out of date
+        self.generation = 0
+        # A lock protecting the cache
+        self.lock = threading.Lock()
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+
+    def _GetChangeCounts(self, tableNames):
+        """ Return the change counters for the tables in tableNames.  The lock must be held. """
+        return (self.generation, tuple([(tableName, self.changeCounts.get(tableName, 0)) for tableName in sorted(tableNames)]))
+
+    def GetChangeCounts(self, tableNames):
+        """ Return the current change counters for the tables in tableNames """
+        self.lock.acquire()
+        try:
+            return self._GetChangeCounts(tableNames)
+        finally:
+            self.lock.release()
+
+    def Get(self, key):
+        """ Return the results cached for key, or None if there are none or the tables they came from have changed """
+        self.lock.acquire()
+        try:
+            # If there are results for the key ...
+            if self.results.has_key(key):
+                (changeCounts, results) = self.results.pop(key)
+                # ... and none of their tables have changed since the search was evaluated ...
+                if changeCounts == self._GetChangeCounts([tableName for (tableName, count) in changeCounts[1]]):
+                    # ... move them to the most recently used position and return them
+                    self.results[key] = (changeCounts, results)
+                    self.hits += 1
+                    return results
+            self.misses += 1
+            return None
+        finally:
+            self.lock.release()
+
+    def Add(self, key, changeCounts, results):
+        """ Cache the results of the search key, which was evaluated when the change counters were changeCounts """
+        self.lock.acquire()
+        try:
+            # Add the results as the most recently used
+            self.results.pop(key, None)
+            self.results[key] = (changeCounts, results)
+            # If the cache is too big, drop the least recently used results
+            while len(self.results) > self.size:
+                self.results.popitem(last=False)
+        finally:
+            self.lock.release()
+
+    def Changed(self, tableName):
+        """ Note that records in the table tableName have changed """
+        self.lock.acquire()
+        try:
+            self.changeCounts[tableName] = self.changeCounts.get(tableName, 0) + 1
+        finally:
+            self.lock.release()
+
+    def Clear(self):
+        """ Remove all results from the cache """
+        self.lock.acquire()
+        try:
+            self.results.clear()
+            self.generation += 1
+        finally:
+            self.lock.release()
+
+
+# The shared Search Cache
+_cache = SearchCache()
+
+def GetChangeCounts(tableNames):
+    """ Return the current change counters for the tables in tableNames (such as 'Clips2'), to pass to Add() """
+    return _cache.GetChangeCounts(tableNames)
+
+def Get(key):
+    """ Return the results cached for the search key, or None if they aren't cached or are out of date """
+    return _cache.Get(key)
+
+def Add(key, changeCounts, results):
+    """ Cache the results of the search key.  changeCounts must be taken with GetChangeCounts() BEFORE the search is
+        evaluated, so that changes made while it runs make the results out of date. """
+    _cache.Add(key, changeCounts, results)
+
+def Changed(tableName):
+    """ Note that records in the table tableName (such as 'Clips2') have changed """
+    _cache.Changed(tableName)
+
+def Clear():
+    """ Remove all results from the cache """
+    _cache.Clear()
@@ -319,6 +319,9 @@ class SearchDialog(wx.Dialog):
 
             panelKeywordsSizer.Add(r1Sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
+            # Add the Time-Window Operators row
+            panelKeywordsSizer.Add(self.CreateTimeWindowOperators(panelKeywords), 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
             r2Sizer = wx.BoxSizer(wx.HORIZONTAL)
             # Add Keyword Groups Label
             keywordGroupsText = wx.StaticText(panelKeywords, -1, _('Keyword Groups:'))
@@ -358,6 +361,9 @@ class SearchDialog(wx.Dialog):
             panelKeywordsSizer.Add(self.btnAdd, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
             wx.EVT_BUTTON(self, self.btnAdd.GetId(), self.OnBtnClick)
 
+            # Add the Transcript Text row
+            panelKeywordsSizer.Add(self.CreateTranscriptText(panelKeywords), 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
             # Add Search Query Label
             searchQueryText = wx.StaticText(panelKeywords, -1, _('Search Query:'))
             panelKeywordsSizer.Add(searchQueryText, 0, wx.LEFT | wx.RIGHT, 10)
@@ -459,6 +465,9 @@ class SearchDialog(wx.Dialog):
 
             mainSizer.Add(r1Sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
+            # Add the Time-Window Operators row
+            mainSizer.Add(self.CreateTimeWindowOperators(self), 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
             r2Sizer = wx.BoxSizer(wx.HORIZONTAL)
             # Add Keyword Groups Label
             keywordGroupsText = wx.StaticText(self, -1, _('Keyword Groups:'))
@@ -498,6 +507,9 @@ class SearchDialog(wx.Dialog):
             mainSizer.Add(self.btnAdd, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
             wx.EVT_BUTTON(self, self.btnAdd.GetId(), self.OnBtnClick)
 
+            # Add the Transcript Text row
+            mainSizer.Add(self.CreateTranscriptText(self), 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
             # Add Search Query Label
             searchQueryText = wx.StaticText(self, -1, _('Search Query:'))
             mainSizer.Add(searchQueryText, 0, wx.LEFT | wx.RIGHT, 10)
@@ -658,10 +670,13 @@ class SearchDialog(wx.Dialog):
             self.searchQuery.AppendText(' AND\n')
             # Enable the "Add" button
             self.btnAdd.Enable(True)
+            self.btnAddText.Enable(True)
             # Disable the "And" button
             self.btnAnd.Enable(False)
             # Disable the "Or" button
             self.btnOr.Enable(False)
+            # Disable the Time-Window Operator buttons
+            self.EnableTimeWindowOperators(False)
             # Enable the "Not" button
             self.btnNot.Enable(True)
             # Enable the "(" (Left Paren) button
@@ -680,10 +695,13 @@ class SearchDialog(wx.Dialog):
             self.searchQuery.AppendText(' OR\n')
             # Enable the "Add" button
             self.btnAdd.Enable(True)
+            self.btnAddText.Enable(True)
             # Disable the "And" button
             self.btnAnd.Enable(False)
             # Disable the "Or" button
             self.btnOr.Enable(False)
+            # Disable the Time-Window Operator buttons
+            self.EnableTimeWindowOperators(False)
             # Enable the "Not" button
             self.btnNot.Enable(True)
             # Enable the "(" (Left Paren) button
@@ -696,6 +714,39 @@ class SearchDialog(wx.Dialog):
             # Add to the Search Stack
             self.SaveSearchStack()
             
+        # Time-Window Operator Buttons
+        elif event.GetId() in [self.btnOverlaps.GetId(), self.btnWithin.GetId(), self.btnFollowedBy.GetId()]:
+            # Add the appropriate text to the Search Query
+            if event.GetId() == self.btnOverlaps.GetId():
+                self.searchQuery.AppendText(' OVERLAPS\n')
+            elif event.GetId() == self.btnWithin.GetId():
+                self.searchQuery.AppendText(' WITHIN %d SECONDS\n' % self.timeWindowSeconds.GetValue())
+            # FOLLOWED BY is limited to the number of seconds specified, unless that is 0
+            elif self.timeWindowSeconds.GetValue() > 0:
+                self.searchQuery.AppendText(' FOLLOWED BY WITHIN %d SECONDS\n' % self.timeWindowSeconds.GetValue())
+            else:
+                self.searchQuery.AppendText(' FOLLOWED BY\n')
+            # Enable the "Add" button
+            self.btnAdd.Enable(True)
+            self.btnAddText.Enable(True)
+            # Disable the "And" button
+            self.btnAnd.Enable(False)
+            # Disable the "Or" button
+            self.btnOr.Enable(False)
+            # Disable the Time-Window Operator buttons
+            self.EnableTimeWindowOperators(False)
+            # Enable the "Not" button
+            self.btnNot.Enable(True)
+            # Enable the "(" (Left Paren) button
+            self.btnLeftParen.Enable(True)
+            # Disable the ")" (Right Paren) button
+            self.btnRightParen.Enable(False)
+            # Disable the "Search" button
+            self.btnSearch.Enable(False)
+            self.btnFileSave.Enable(False)
+            # Add to the Search Stack
+            self.SaveSearchStack()
+
         # "NOT" Button
         elif event.GetId() == self.btnNot.GetId():
             # Add the appropriate text to the Search Query
@@ -721,6 +772,8 @@ class SearchDialog(wx.Dialog):
             self.btnAnd.Enable(False)
             # Disable the "Or" button
             self.btnOr.Enable(False)
+            # Disable the Time-Window Operator buttons
+            self.EnableTimeWindowOperators(False)
             # Disable the "Search" button
             self.btnSearch.Enable(False)
             self.btnFileSave.Enable(False)
@@ -749,9 +802,11 @@ class SearchDialog(wx.Dialog):
             self.lineStarted = False
             # You are starting over, so enable "Add"
             self.btnAdd.Enable(True)
-            # You can't add a Boolean Operator
+            self.btnAddText.Enable(True)
+            # You can't add a Boolean or Time-Window Operator
             self.btnAnd.Enable(False)
             self.btnOr.Enable(False)
+            self.EnableTimeWindowOperators(False)
             # You can add a NOT Operator
             self.btnNot.Enable(True)
             # You can't perform a Search yet
@@ -770,6 +825,41 @@ class SearchDialog(wx.Dialog):
             except:
                 pass
 
+        # "Add Text to Query" Button
+        elif event.GetId() == self.btnAddText.GetId():
+            # Get the Transcript Text
+            text = self.transcriptText.GetValue().strip()
+            # Some text MUST be entered!
+            if text != '':
+                # Add the appropriate text to the Search Query
+                self.searchQuery.AppendText('TEXT "%s"' % text)
+                # Disable the "Add" buttons
+                self.btnAdd.Enable(False)
+                self.btnAddText.Enable(False)
+                # Enable the "And" button
+                self.btnAnd.Enable(True)
+                # Enable the "Or" button
+                self.btnOr.Enable(True)
+                # Enable the Time-Window Operator buttons
+                self.EnableTimeWindowOperators(True)
+                # Disable the "Not" button
+                self.btnNot.Enable(False)
+                # See if there are still parens that need to be closed
+                if self.parensOpen > 0:
+                    # If there are parens that need to be closed, enable the ")" (Right Paren) button
+                    self.btnRightParen.Enable(True)
+                else:
+                    # If there are no parens that need to be closed, enable the "Search" button
+                    self.btnSearch.Enable(True)
+                    # and the save button
+                    self.btnFileSave.Enable(True)
+                # Disable the "(" (Left Paren) button
+                self.btnLeftParen.Enable(False)
+                # Clear the Transcript Text for the next term
+                self.transcriptText.SetValue('')
+                # Add to the Search Stack
+                self.SaveSearchStack()
+
         # "Add Keyword to Query" Button or (Keyword Double-Clicked when Add Button is enabled)
         elif (event.GetId() == self.btnAdd.GetId()) or \
              ((event.GetId() == self.kw_lb.GetId()) and (self.btnAdd.IsEnabled())):
@@ -782,10 +872,13 @@ class SearchDialog(wx.Dialog):
                 self.searchQuery.AppendText(keywordGroup + ':' + keyword)
                 # Disable the "Add" button
                 self.btnAdd.Enable(False)
+                self.btnAddText.Enable(False)
                 # Enable the "And" button
                 self.btnAnd.Enable(True)
                 # Enable the "Or" button
                 self.btnOr.Enable(True)
+                # Enable the Time-Window Operator buttons
+                self.EnableTimeWindowOperators(True)
                 # Disable the "Not" button
                 self.btnNot.Enable(False)
                 # See if there are still parens that need to be closed
@@ -817,10 +910,13 @@ class SearchDialog(wx.Dialog):
                 self.btnFileSave.Enable(self.searchStack[-1][1])
                 # Restore the Add Button
                 self.btnAdd.Enable(self.searchStack[-1][2])
+                self.btnAddText.Enable(self.searchStack[-1][2])
                 # Restore the And button
                 self.btnAnd.Enable(self.searchStack[-1][3])
                 # Restore the Or button
                 self.btnOr.Enable(self.searchStack[-1][3])
+                # Restore the Time-Window Operator buttons, which are enabled along with the And button
+                self.EnableTimeWindowOperators(self.searchStack[-1][3])
                 # Restore the Not button
                 self.btnNot.Enable(self.searchStack[-1][4])
                 # Restore the Left Parens button
@@ -853,6 +949,9 @@ class SearchDialog(wx.Dialog):
                 if (len(self.searchQuery.GetValue()) > 0) and (self.parensOpen == 0) and \
                    not (self.searchQuery.GetValue().rstrip().upper()[-4:] == ' AND') and \
                    not (self.searchQuery.GetValue().rstrip().upper()[-3:] == ' OR') and \
+                   not (self.searchQuery.GetValue().rstrip().upper()[-9:] == ' OVERLAPS') and \
+                   not (self.searchQuery.GetValue().rstrip().upper()[-8:] == ' SECONDS') and \
+                   not (self.searchQuery.GetValue().rstrip().upper()[-12:] == ' FOLLOWED BY') and \
                    not (self.searchQuery.GetValue().rstrip().upper()[-4:] in ['\nNOT', '(NOT']):
                     # Enable the Search Button
                     self.btnSearch.Enable(True)
@@ -867,6 +966,71 @@ class SearchDialog(wx.Dialog):
             self.btnFileSave.Enable(False)
             
 
+    def CreateTimeWindowOperators(self, parent):
+        """ Create the Time-Window Operator buttons on parent, and return the sizer that holds them """
+        # Create a HORIZONTAL sizer for the Time-Window Operators
+        timeSizer = wx.BoxSizer(wx.HORIZONTAL)
+        # Add OVERLAPS Button
+        self.btnOverlaps = wx.Button(parent, -1, _('OVERLAPS'), size=wx.Size(100, 24))
+        self.btnOverlaps.SetToolTip(wx.ToolTip(_('Different Clips and Snapshots that overlap in time.  Use AND for Clips and Snapshots with both keywords.')))
+        timeSizer.Add(self.btnOverlaps, 0)
+        wx.EVT_BUTTON(self, self.btnOverlaps.GetId(), self.OnBtnClick)
+
+        timeSizer.Add((10, 0))
+
+        # Add WITHIN Button
+        self.btnWithin = wx.Button(parent, -1, _('WITHIN'), size=wx.Size(80, 24))
+        self.btnWithin.SetToolTip(wx.ToolTip(_('Different Clips and Snapshots no more than the number of seconds apart')))
+        timeSizer.Add(self.btnWithin, 0)
+        wx.EVT_BUTTON(self, self.btnWithin.GetId(), self.OnBtnClick)
+
+        timeSizer.Add((10, 0))
+
+        # Add FOLLOWED BY Button
+        self.btnFollowedBy = wx.Button(parent, -1, _('FOLLOWED BY'), size=wx.Size(100, 24))
+        self.btnFollowedBy.SetToolTip(wx.ToolTip(_('Clips and Snapshots that start after the first ones stop, within the number of seconds if it is not 0')))
+        timeSizer.Add(self.btnFollowedBy, 0)
+        wx.EVT_BUTTON(self, self.btnFollowedBy.GetId(), self.OnBtnClick)
+
+        timeSizer.Add((1, 0), 1, wx.EXPAND)
+
+        # Add the number of seconds used by the WITHIN and FOLLOWED BY operators
+        secondsText = wx.StaticText(parent, -1, _('Seconds:'))
+        timeSizer.Add(secondsText, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+        self.timeWindowSeconds = wx.SpinCtrl(parent, -1, size=(60, -1), min=0, max=3600, initial=5)
+        timeSizer.Add(self.timeWindowSeconds, 0)
+
+        # The operators are not available until a Keyword has been added
+        self.EnableTimeWindowOperators(False)
+        return timeSizer
+
+    def CreateTranscriptText(self, parent):
+        """ Create the Transcript Text field and its "Add Text to Query" button on parent, and return the sizer that
+            holds them """
+        # Create a HORIZONTAL sizer for the Transcript Text
+        textSizer = wx.BoxSizer(wx.HORIZONTAL)
+        # Add Transcript Text Label
+        transcriptTextText = wx.StaticText(parent, -1, _('Transcript Text:'))
+        textSizer.Add(transcriptTextText, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+        # Add Transcript Text field
+        self.transcriptText = wx.TextCtrl(parent, -1)
+        textSizer.Add(self.transcriptText, 1, wx.EXPAND)
+
+        textSizer.Add((10, 0))
+
+        # Add "Add Text to Query" Button
+        self.btnAddText = wx.Button(parent, -1, _('Add Text to Query'), size=wx.Size(160, 24))
+        self.btnAddText.SetToolTip(wx.ToolTip(_('Episodes and Clips whose Transcripts contain the text')))
+        textSizer.Add(self.btnAddText, 0)
+        wx.EVT_BUTTON(self, self.btnAddText.GetId(), self.OnBtnClick)
+        return textSizer
+
+    def EnableTimeWindowOperators(self, enable):
+        """ Enable or disable the Time-Window Operator buttons, which are available when the AND and OR buttons are """
+        self.btnOverlaps.Enable(enable)
+        self.btnWithin.Enable(enable)
+        self.btnFollowedBy.Enable(enable)
+
     def OnKeywordGroupSelect(self, event):
         """ Implement Interface Changes needed when a Keyword Group is selected. """
         # Get the List of Keywords for the selected Keyword Group from the Database Interface
@@ -885,8 +1049,8 @@ class SearchDialog(wx.Dialog):
         # Set the initial values for the search stack:
         #   No Search Query
         #   Search and Save buttons disabled
-        #   Add Keyword button enabled
-        #   And and Or buttons disabled
+        #   Add Keyword and Add Text buttons enabled
+        #   And, Or, and Time-Window Operator buttons disabled
         #   Not button enabled
         #   Left paren button enabled
         #   Right parent button disabled
@@ -898,8 +1062,8 @@ class SearchDialog(wx.Dialog):
         # Save the state of all elements on the Search Dialog that need to be reset:
         #   Current Search Query
         #   Search and Save buttons states
-        #   Add Keyword button state
-        #   And and Or buttons states
+        #   Add Keyword and Add Text buttons state
+        #   And, Or, and Time-Window Operator buttons states
         #   Not button state
         #   Left paren button state
         #   Right parent button state
@@ -1023,10 +1187,13 @@ class SearchDialog(wx.Dialog):
                 # Only valid searches can be saved, so we know the desired state of the interface buttons
                 # Disable the "Add" button
                 self.btnAdd.Enable(False)
+                self.btnAddText.Enable(False)
                 # Enable the "And" button
                 self.btnAnd.Enable(True)
                 # Enable the "Or" button
                 self.btnOr.Enable(True)
+                # Enable the Time-Window Operator buttons
+                self.EnableTimeWindowOperators(True)
                 # Disable the "Not" button
                 self.btnNot.Enable(False)
                 # Enable the "Search" button
@@ -1155,9 +1322,9 @@ class SearchDialog(wx.Dialog):
                 if (configName != '') and (errorMsg == ''):
 
                     # Check to see if the Configuration record for the Query already exists
-                    if DBInterface.record_match_count('Filters2',
+                    if DBInterface.record_exists('Filters2',
                                                      ('ReportType', 'ReportScope', 'ConfigName'),
-                                                     (self.reportType, 0, configNameEnc)) > 0:
+                                                     (self.reportType, 0, configNameEnc)):
                         # Build the Update Query for Data
                         query = """ UPDATE Filters2
                                       SET FilterData = %s
@@ -1179,9 +1346,9 @@ class SearchDialog(wx.Dialog):
                     DBCursor.execute(query, values)
 
                     # Check to see if the Configuration record for the Collections already exists
-                    if DBInterface.record_match_count('Filters2',
+                    if DBInterface.record_exists('Filters2',
                                                      ('ReportType', 'ReportScope', 'ConfigName'),
-                                                     (self.reportType, 1, configNameEnc)) > 0:
+                                                     (self.reportType, 1, configNameEnc)):
                         # Build the Update Query for Data
                         query = """ UPDATE Filters2
                                       SET FilterData = %s
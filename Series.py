@@ -204,9 +204,9 @@ class Series(DataObject.DataObject):
         if (self._db_start_save() == 0):
 
             # duplicate Series IDs are not allowed
-            if DBInterface.record_match_count("Series2", \
+            if DBInterface.record_exists("Series2", \
                             ("SeriesID",), \
-                            (id,) ) > 0:
+                            (id,) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Series named "%s" already exists.\nPlease enter a different Series ID.'), 'utf8')
@@ -223,9 +223,9 @@ class Series(DataObject.DataObject):
             """
         else:
             # check for dupes
-            if DBInterface.record_match_count("Series2", \
+            if DBInterface.record_exists("Series2", \
                             ("SeriesID", "!SeriesNum"), \
-                            (id, self.number) ) > 0:
+                            (id, self.number) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Series named "%s" already exists.\nPlease enter a different Series ID.'), 'utf8')
@@ -40,6 +40,8 @@ import DBInterface
 import Dialogs
 # Import Transana's Filter Dialog
 import FilterDialog
+# Import Transana's Keyword Map Data model
+import KeywordMapData
 # import Transana's Keyword Object
 import KeywordObject
 # import Transana's Globals
@@ -76,7 +78,7 @@ ID_SERIESLIST        = wx.NewId()
 # Episode List Combo Box
 ID_EPISODELIST       = wx.NewId()
 
-class SeriesMap(wx.Frame):
+class SeriesMap(wx.Frame, KeywordMapData.KeywordMapData):
     """ This is the main class for the Series Map application. """
     def __init__(self, parent, title, seriesNum, seriesName, reportType, controlObject=None):
         # reportType 1 is the Sequence Mode, showing relative position of keywords in the Episodes
@@ -120,12 +122,7 @@ class SeriesMap(wx.Frame):
         # Initialize all the data Lists to empty
         self.episodeList = []
         self.filteredEpisodeList = []
-        self.clipList = []
-        self.clipFilterList = []
-        self.snapshotList = []
-        self.snapshotFilterList = []
-        self.unfilteredKeywordList = []
-        self.filteredKeywordList = []
+        self.ResetKeywordMapData()
 
         # To be able to show only parts of an Episode Time Line, we need variables for the time boundaries.
         self.startTime = 0
@@ -418,8 +415,10 @@ class SeriesMap(wx.Frame):
                 if keywordColors:
                     # ... then get the keyword color data from the Filter Dialog
                     self.keywordColors = dlgFilter.GetKeywordColors()
+                # Make sure the lists we got from the Filter Dialog are indexed
+                self.IndexKeywordMapData()
                 # Reset the Filtered Keyword List
-                self.filteredKeywordList = []
+                self.filteredKeywordList = KeywordMapData.KeywordMapList()
                 # Iterate through the entire Keword List ...
                 for (kwg, kw, checked) in self.unfilteredKeywordList:
                     # ... and determine which keywords were checked.
@@ -804,16 +803,16 @@ class SeriesMap(wx.Frame):
         # Initialize all the data Lists to empty
         self.episodeList = []
         self.filteredEpisodeList = []
-        self.clipList = []
-        self.clipFilterList = []
-        self.snapshotList = []
-        self.snapshotFilterList = []
-        self.unfilteredKeywordList = []
-        self.filteredKeywordList = []
+        self.ResetKeywordMapData()
 
         if self.reportType == 2:
             epLengths = {}
 
+        # Initialize a list of Episode Numbers in Episode List order, and a dictionary that maps Episode Numbers
+        # to (EpisodeID, SeriesID), for the coding queries below
+        episodeNums = []
+        episodeIDs = {}
+
         # Get Series Number, Episode Number, Media File Name, and Length
         SQLText = """SELECT e.EpisodeNum, e.EpisodeID, e.SeriesNum, e.MediaFile, e.EpLength, s.SeriesID
                        FROM Episodes2 e, Series2 s
@@ -831,6 +830,9 @@ class SeriesMap(wx.Frame):
             MediaFile = DBInterface.ProcessDBDataForUTF8Encoding(MediaFile)
 
             self.episodeList.append((EpisodeID, SeriesID, True))
+            # Remember the Episode Number and the Episode's IDs
+            episodeNums.append(EpisodeNum)
+            episodeIDs[EpisodeNum] = (EpisodeID, SeriesID)
 
             if (EpisodeLength > self.MediaLength):
                 self.MediaLength = EpisodeLength
@@ -839,130 +841,75 @@ class SeriesMap(wx.Frame):
             # Remember the Episode's length
             self.episodeLengths[(EpisodeID, SeriesID)] = EpisodeLength
 
-            # Get the list of Keywords to be displayed
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword
-                           FROM Clips2 cl, ClipKeywords2 ck
-                           WHERE cl.EpisodeNum = %s AND
-                                 cl.ClipNum = ck.ClipNum
-                           GROUP BY ck.keywordgroup, ck.keyword
-                           ORDER BY KeywordGroup, Keyword, ClipStart"""
-            # Adjust the query for sqlite if needed
-            SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-
-            for (kwg, kw) in self.DBCursor.fetchall():
-                kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
-                kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                if not (kwg, kw) in self.filteredKeywordList:
-                    self.filteredKeywordList.append((kwg, kw))
-                if not (kwg, kw, True) in self.unfilteredKeywordList:
-                    self.unfilteredKeywordList.append((kwg, kw, True))
-
-            # Get the list of WHOLE SNAPSHOT Keywords to be displayed
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword
-                           FROM Snapshots2 sn, ClipKeywords2 ck
-                           WHERE sn.EpisodeNum = %s AND
-                                 sn.SnapshotNum = ck.SnapshotNum
-                           GROUP BY ck.keywordgroup, ck.keyword
-                           ORDER BY KeywordGroup, Keyword, SnapshotTimeCode"""
-            # Adjust the query for sqlite if needed
-            SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-            for (kwg, kw) in self.DBCursor.fetchall():
-                kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
-                kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                if not (kwg, kw) in self.filteredKeywordList:
-                    self.filteredKeywordList.append((kwg, kw))
-                if not (kwg, kw, True) in self.unfilteredKeywordList:
-                    self.unfilteredKeywordList.append((kwg, kw, True))
-
-            # Get the list of SNAPSHOT CODING Keywords to be displayed
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword
-                           FROM Snapshots2 sn, SnapshotKeywords2 ck
-                           WHERE sn.EpisodeNum = %s AND
-                                 sn.SnapshotNum = ck.SnapshotNum
-                           GROUP BY ck.keywordgroup, ck.keyword
-                           ORDER BY KeywordGroup, Keyword, SnapshotTimeCode"""
-            # Adjust the query for sqlite if needed
-            SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-            for (kwg, kw) in self.DBCursor.fetchall():
-                kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
-                kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                if not (kwg, kw) in self.filteredKeywordList:
-                    self.filteredKeywordList.append((kwg, kw))
-                if not (kwg, kw, True) in self.unfilteredKeywordList:
-                    self.unfilteredKeywordList.append((kwg, kw, True))
-
-            # Sort the Keyword List
-            self.unfilteredKeywordList.sort()
-
-            # Create the Keyword Placement lines to be displayed.  We need them to be in ClipStart, ClipNum order so colors will be
-            # distributed properly across bands.
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword, cl.ClipStart, cl.ClipStop, cl.ClipNum, cl.ClipID, cl.CollectNum
-                           FROM Clips2 cl, ClipKeywords2 ck
-                           WHERE cl.EpisodeNum = %s AND
-                                 cl.ClipNum = ck.ClipNum
-                           ORDER BY ClipStart, cl.ClipNum, KeywordGroup, Keyword"""
-            # Adjust the query for sqlite if needed
-            SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-            for (kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum) in self.DBCursor.fetchall():
-                kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
-                kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                clipID = DBInterface.ProcessDBDataForUTF8Encoding(clipID)
-                # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
-                # If we're dealing with a Clip, we only want to deal with THIS clip!
-                if (self.clipNum == None) or (clipNum == self.clipNum):
-                    self.clipList.append((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, EpisodeID, SeriesID))
-
-                    if not ((clipID, collectNum, True) in self.clipFilterList):
-                        self.clipFilterList.append((clipID, collectNum, True))
-
-            # Create the WHOLE SNAPSHOT Keyword Placement lines to be displayed.  We need them to be in SnapshotTimeCode, SnapshotNum order so colors will be
-            # distributed properly across bands.
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword, sn.SnapshotTimeCode, sn.SnapshotDuration, sn.SnapshotNum, sn.SnapshotID, sn.CollectNum
-                           FROM Snapshots2 sn, ClipKeywords2 ck
-                           WHERE sn.EpisodeNum = %s AND
-                                 sn.SnapshotNum = ck.SnapshotNum
-                           ORDER BY SnapshotTimeCode, sn.SnapshotNum, KeywordGroup, Keyword"""
-            # Adjust the query for sqlite if needed
-            SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-            for (kwg, kw, SnapshotTimeCode, SnapshotDuration, SnapshotNum, SnapshotID, collectNum) in self.DBCursor.fetchall():
-                kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
-                kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
-                SnapshotID = DBInterface.ProcessDBDataForUTF8Encoding(SnapshotID)
-                # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
-                # If we're dealing with a Clip, we only want to deal with THIS clip!
-                if (self.clipNum == None):
-                    self.snapshotList.append((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum, EpisodeID, SeriesID))
-                    if not ((SnapshotID, collectNum, True) in self.snapshotFilterList):
-                        self.snapshotFilterList.append((SnapshotID, collectNum, True))
-
-            # Create the SNAPSHOT CODING Keyword Placement lines to be displayed.  We need them to be in SnapshotTimeCode, SnapshotNum order so colors will be
-            # distributed properly across bands.
-            SQLText = """SELECT ck.KeywordGroup, ck.Keyword, sn.SnapshotTimeCode, sn.SnapshotDuration, sn.SnapshotNum, sn.SnapshotID, sn.CollectNum
-                           FROM Snapshots2 sn, SnapshotKeywords2 ck
-                           WHERE sn.EpisodeNum = %s AND
+        # Rather than querying each Episode separately, we get the coding for ALL the Series' Episodes in one query for
+        # each kind of coding.  Ordering by EpisodeID first keeps the Episodes in the same order as the Episode List.
+        # Within each Episode, we need ClipStart, ClipNum order so colors will be distributed properly across bands.
+        # (The Keyword Lists are built from these same results, so no separate Keyword queries are needed.)
+
+        # Create the Keyword Placement lines to be displayed.
+        SQLText = """SELECT ck.KeywordGroup, ck.Keyword, cl.ClipStart, cl.ClipStop, cl.ClipNum, cl.ClipID, cl.CollectNum, cl.EpisodeNum
+                       FROM Episodes2 e, Clips2 cl, ClipKeywords2 ck
+                       WHERE e.SeriesNum = %s AND
+                             cl.EpisodeNum = e.EpisodeNum AND
+                             cl.ClipNum = ck.ClipNum
+                       ORDER BY e.EpisodeID, ClipStart, cl.ClipNum, KeywordGroup, Keyword"""
+        # Adjust the query for sqlite if needed
+        SQLText = DBInterface.FixQuery(SQLText)
+        self.DBCursor.execute(SQLText, (self.seriesNum, ))
+        for (kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, EpisodeNum) in self.DBCursor.fetchall():
+            kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
+            kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
+            clipID = DBInterface.ProcessDBDataForUTF8Encoding(clipID)
+            # Get the Episode and Series IDs for this Clip
+            (EpisodeID, SeriesID) = episodeIDs[EpisodeNum]
+            # All keywords applied to Clips are included in the Keyword Lists
+            self.AddKeyword(kwg, kw)
+            # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
+            # If we're dealing with a Clip, we only want to deal with THIS clip!
+            if (self.clipNum == None) or (clipNum == self.clipNum):
+                self.clipList.append((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, EpisodeID, SeriesID))
+                self.clipFilterList.AddUnique((clipID, collectNum, True))
+
+        # Initialize a dictionary of Snapshot Keyword Placement lines by Episode Number
+        snapshotsByEpisode = {}
+        # Create the WHOLE SNAPSHOT and SNAPSHOT CODING Keyword Placement lines to be displayed.  We need them to be in
+        # SnapshotTimeCode, SnapshotNum order so colors will be distributed properly across bands.
+        for keywordTable in ['ClipKeywords2', 'SnapshotKeywords2']:
+            SQLText = """SELECT ck.KeywordGroup, ck.Keyword, sn.SnapshotTimeCode, sn.SnapshotDuration, sn.SnapshotNum, sn.SnapshotID, sn.CollectNum, sn.EpisodeNum
+                           FROM Episodes2 e, Snapshots2 sn, %s ck
+                           WHERE e.SeriesNum = %%s AND
+                                 sn.EpisodeNum = e.EpisodeNum AND
                                  sn.SnapshotNum = ck.SnapshotNum
-                           ORDER BY SnapshotTimeCode, sn.SnapshotNum, KeywordGroup, Keyword"""
+                           ORDER BY e.EpisodeID, SnapshotTimeCode, sn.SnapshotNum, KeywordGroup, Keyword""" % keywordTable
             # Adjust the query for sqlite if needed
             SQLText = DBInterface.FixQuery(SQLText)
-            self.DBCursor.execute(SQLText, (EpisodeNum, ))
-            for (kwg, kw, SnapshotTimeCode, SnapshotDuration, SnapshotNum, SnapshotID, collectNum) in self.DBCursor.fetchall():
+            self.DBCursor.execute(SQLText, (self.seriesNum, ))
+            for (kwg, kw, SnapshotTimeCode, SnapshotDuration, SnapshotNum, SnapshotID, collectNum, EpisodeNum) in self.DBCursor.fetchall():
                 kwg = DBInterface.ProcessDBDataForUTF8Encoding(kwg)
                 kw = DBInterface.ProcessDBDataForUTF8Encoding(kw)
                 SnapshotID = DBInterface.ProcessDBDataForUTF8Encoding(SnapshotID)
+                # Get the Episode and Series IDs for this Snapshot
+                (EpisodeID, SeriesID) = episodeIDs[EpisodeNum]
+                # All keywords applied to Snapshots are included in the Keyword Lists
+                self.AddKeyword(kwg, kw)
                 # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
                 # If we're dealing with a Clip, we only want to deal with THIS clip!
                 if (self.clipNum == None):
-                    self.snapshotList.append((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum, EpisodeID, SeriesID))
-                    if not ((SnapshotID, collectNum, True) in self.snapshotFilterList):
-                        self.snapshotFilterList.append((SnapshotID, collectNum, True))
-
-        # Sort the Keyword List
+                    # Hold the line with its Episode, so all of an Episode's Snapshot lines stay together
+                    if not snapshotsByEpisode.has_key(EpisodeNum):
+                        snapshotsByEpisode[EpisodeNum] = []
+                    snapshotsByEpisode[EpisodeNum].append((kwg, kw, SnapshotTimeCode, SnapshotTimeCode + SnapshotDuration, SnapshotNum, SnapshotID, collectNum, EpisodeID, SeriesID))
+
+        # Add the Snapshot lines to the Snapshot List, Episode by Episode, whole Snapshot coding before Snapshot coding
+        for EpisodeNum in episodeNums:
+            for snapshotLine in snapshotsByEpisode.get(EpisodeNum, []):
+                self.snapshotList.append(snapshotLine)
+                # snapshotLine[5] is the SnapshotID, snapshotLine[6] is the CollectNum
+                self.snapshotFilterList.AddUnique((snapshotLine[5], snapshotLine[6], True))
+
+        # Sort the Keyword Lists
         self.filteredKeywordList.sort()
+        self.unfilteredKeywordList.sort()
 
     def UpdateKeywordVisualization(self):
         """ Update the Keyword Visualization following something that could have changed it. """
@@ -970,15 +917,15 @@ class SeriesMap(wx.Frame):
         print "SeriesMap.UpdateKeywordVisualization():  This should NEVER get called!!"
         
         # Clear the Clip List
-        self.clipList = []
+        self.clipList = KeywordMapData.KeywordMapList()
         # Clear the Filtered Clip List
-        self.clipFilterList = []
+        self.clipFilterList = KeywordMapData.KeywordMapList()
         # Clear the graphic itself
         self.graphic.Clear()
 
         # Before we start, make a COPY of the keyword list so we can check for keywords that are no longer
         # included on the Map and need to be deleted from the KeywordLists
-        delList = self.unfilteredKeywordList[:]
+        delList = KeywordMapData.KeywordMapList(self.unfilteredKeywordList)
         # Now let's create the SQL to get all relevant Clip and Clip Keyword records
         SQLText = """SELECT ck.KeywordGroup, ck.Keyword, cl.ClipStart, cl.ClipStop, cl.ClipNum, cl.ClipID, cl.CollectNum, ep.EpisodeName
                        FROM Clips2 cl, ClipKeywords2 ck, Episodes2 ep
@@ -999,35 +946,26 @@ class SeriesMap(wx.Frame):
             # If we're dealing with an Episode, self.clipNum will be None and we want all clips.
             # If we're dealing with a Clip, we only want to deal with THIS clip!
             if (self.clipNum == None) or (clipNum == self.clipNum):
-                # If a Clip is not found in the clipList ...
-                if not ((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, episodeName, seriesName) in self.clipList):
-                    # ... add it to the clipList ...
-                    self.clipList.append((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, episodeName, seriesName))
-                    # ... and if it's not in the clipFilter List (which it probably isn't!) ...
-                    if not ((clipID, collectNum, True) in self.clipFilterList):
-                        # ... add it to the clipFilterList.
-                        self.clipFilterList.append((clipID, collectNum, True))
-
-            # If the keyword is not in either of the Keyword Lists, ...
-            if not (((kwg, kw) in self.filteredKeywordList) or ((kwg, kw, False) in self.unfilteredKeywordList)):
-                # ... add it to both keyword lists.
-                self.filteredKeywordList.append((kwg, kw))
-                self.unfilteredKeywordList.append((kwg, kw, True))
+                # Add the Clip to the clipList and the clipFilterList if it's not already there
+                self.AddClip((kwg, kw, clipStart, clipStop, clipNum, clipID, collectNum, episodeName, seriesName), clipID, collectNum)
+
+            # If the keyword is not in either of the Keyword Lists, add it to both keyword lists.
+            self.AddNewKeyword(kwg, kw)
 
             # If the keyword is in query results, it should be removed from the list of keywords to be deleted.
             # Check that list for either True or False versions of the keyword!
             if (kwg, kw, True) in delList:
-                del(delList[delList.index((kwg, kw, True))])
+                delList.remove((kwg, kw, True))
             if (kwg, kw, False) in delList:
-                del(delList[delList.index((kwg, kw, False))])
+                delList.remove((kwg, kw, False))
         # Iterate through ANY keywords left in the list of keywords to be deleted ...
         for element in delList:
             # ... and delete them from the unfiltered Keyword List
-            del(self.unfilteredKeywordList[self.unfilteredKeywordList.index(element)])
+            self.unfilteredKeywordList.remove(element)
             # If the keyword is also in the filtered keyword list ...
             if (element[0], element[1]) in self.filteredKeywordList:
                 # ... it needs to be deleted from there too!
-                del(self.filteredKeywordList[self.filteredKeywordList.index((element[0], element[1]))])
+                self.filteredKeywordList.remove((element[0], element[1]))
 
         # Now that the underlying data structures have been corrected, we're ready to redraw the Keyword Visualization
         self.DrawGraph()
@@ -1887,6 +1825,9 @@ class SeriesMap(wx.Frame):
                 self.graphic.AddLines([(startX - 6, startY - 24, endX + 6, startY - 24), (endX + 6, startY - 24, endX + 6, endY - 4),
                                        (endX + 6, endY - 4, startX - 6, endY - 4), (startX - 6, endY - 4, startX - 6, startY - 24)])            
 
+        # Now that the keywordClipList is complete, build the Interval Indexes used to find the Clips under the mouse
+        self.IndexKeywordClipList()
+
     def DrawTimeLine(self, startVal, endVal):
         """ Draw the time line on the Series Map graphic """
         # Set the line thickness to 3
@@ -2010,8 +1951,6 @@ class SeriesMap(wx.Frame):
                 if (self.keywordClipList.has_key(overlapKey)):
                     # initialize the string that will hold the names of clips being pointed to
                     clipNames = ''
-                    # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                    clips = self.keywordClipList[overlapKey]
                     # For the single-line display ...
                     if self.singleLineDisplay:
                         # Initialize a string for the popup to show
@@ -2049,20 +1988,20 @@ class SeriesMap(wx.Frame):
                                         clipNames += "%s : %s (%s)" % (KWG, KW, Misc.time_in_ms_to_str(length))
                     # If we have the Series Keyword Sequence Map multi-line display ...
                     else:
+                        # Get the list of Clips with the current Keyword that include the current Time from the Interval Index
+                        clips = self.FindClips(overlapKey, time)
                         # Iterate through the Clip List ...
                         for (objType, startTime, endTime, clipNum, clipName) in clips:
-                            # If the current Time value falls between the Clip's StartTime and EndTime ...
-                            if (startTime < time) and (endTime > time):
-                                # ... calculate the length of the Clip ...
-                                clipLen = endTime - startTime
-                                # ... and add the Clip Name and Length to the list of Clips with this Keyword at this Time
-                                # First, see if the list is empty.
-                                if clipNames == '':
-                                    # If so, just add the keyword name and time
-                                    clipNames = "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
-                                else:
-                                    # ... add the keyword to the end of the list
-                                    clipNames += ', ' + "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
+                            # ... calculate the length of the Clip ...
+                            clipLen = endTime - startTime
+                            # ... and add the Clip Name and Length to the list of Clips with this Keyword at this Time
+                            # First, see if the list is empty.
+                            if clipNames == '':
+                                # If so, just add the keyword name and time
+                                clipNames = "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
+                            else:
+                                # ... add the keyword to the end of the list
+                                clipNames += ', ' + "%s (%s)" % (clipName, Misc.time_in_ms_to_str(clipLen))
                     # If any clips are found for the current mouse position ...
                     if (clipNames != ''):
                         # ... add the Clip Names to the ToolTip so they will show up on screen as a hint
@@ -2147,31 +2086,29 @@ class SeriesMap(wx.Frame):
                     prompt = _("Episode:  %s,  Keyword:  %s : %s,  Time: %s")
                 # Set the Status Text to indicate the current Keyword and Time values
                 self.SetStatusText(prompt % (kw[0], kw[1], kw[2], Misc.time_in_ms_to_str(time)))
-                # Get the list of Clips that contain the current Keyword from the keyword / Clip List dictionary
-                clips = self.keywordClipList[kw]
+                # Get the list of Clips with the current Keyword that include the current Time from the Interval Index
+                clips = self.FindClips(kw, time, inclusive=True)
                 # Iterate through the Clip List ...
                 for (objType, startTime, endTime, clipNum, clipName) in clips:
-                    # If the current Time value falls between the Clip's StartTime and EndTime ...
-                    if (startTime <= time) and (endTime >= time):
-                        # Check to see if this is a duplicate Clip
-                        if clipNames.has_key(clipName) and (clipNames[clipName] != clipNum):
-                            # If so, we need to count the number of duplicates.
-                            # NOTE:  This is not perfect.  If the Clip Name is a shorter version of another Clip Name, the count
-                            #        will be too high.
-                            tmpList = clipNames.keys()
-                            # Initialize the counter to 1 so our end number will be 1 higher than the number counted
-                            cnt = 1
-                            # iterate through the list
-                            for cl in tmpList:
-                                # If we have a match ...
-                                if cl.find(clipName) > -1:
-                                    # ... increment the counter
-                                    cnt += 1
-                            # Add the clipname and counter to the Clip Names dictionary
-                            clipNames["%s (%d)" % (clipName, cnt)] = (objType, clipNum)
-                        else:
-                            # Add the Clip Name as a Dictionary key pointing to the Clip Number
-                            clipNames[clipName] = (objType, clipNum)
+                    # Check to see if this is a duplicate Clip
+                    if clipNames.has_key(clipName) and (clipNames[clipName] != clipNum):
+                        # If so, we need to count the number of duplicates.
+                        # NOTE:  This is not perfect.  If the Clip Name is a shorter version of another Clip Name, the count
+                        #        will be too high.
+                        tmpList = clipNames.keys()
+                        # Initialize the counter to 1 so our end number will be 1 higher than the number counted
+                        cnt = 1
+                        # iterate through the list
+                        for cl in tmpList:
+                            # If we have a match ...
+                            if cl.find(clipName) > -1:
+                                # ... increment the counter
+                                cnt += 1
+                        # Add the clipname and counter to the Clip Names dictionary
+                        clipNames["%s (%d)" % (clipName, cnt)] = (objType, clipNum)
+                    else:
+                        # Add the Clip Name as a Dictionary key pointing to the Clip Number
+                        clipNames[clipName] = (objType, clipNum)
         # If only 1 Item is found ...
         if len(clipNames) == 1:
             # ... if that Item is a Clip ...
@@ -406,9 +406,9 @@ class Snapshot(DataObject.DataObject):
                       self.sort_order)
         if (self._db_start_save() == 0):
 
-            if DBInterface.record_match_count("Snapshots2", \
+            if DBInterface.record_exists("Snapshots2", \
                                 ("SnapshotID", "CollectNum"), \
-                                (id, self.collection_num) ) > 0:
+                                (id, self.collection_num) ):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Snapshot named "%s" already exists in this Collection.\nPlease enter a different Snapshot ID.'), 'utf8') % self.id
@@ -427,9 +427,9 @@ class Snapshot(DataObject.DataObject):
                 (%s, %s, %s , %s, %s , %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
             """
         else:
-            if DBInterface.record_match_count("Snapshots2", \
+            if DBInterface.record_exists("Snapshots2", \
                             ("SnapshotID", "CollectNum", "!SnapshotNum"), \
-                            (id, self.collection_num, self.number)) > 0:
+                            (id, self.collection_num, self.number)):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Snapshot named "%s" already exists in this Collection.\nPlease enter a different Snapshot ID.'), 'utf8') % self.id
@@ -501,9 +501,6 @@ class Snapshot(DataObject.DataObject):
         else:
             # ... then we haven't changed the object's number 
             numberChanged = False
-            # If we are dealing with an existing Snapshot, delete all the Keywords
-            # in anticipation of putting them all back in
-            DBInterface.delete_all_keywords_for_a_group(0, 0, self.number)
             # Define the query for deleting Snapshot Keywords
             query = "DELETE FROM SnapshotKeywords2 WHERE SnapshotNum = %s"
             # Adjust the query for sqlite if needed
@@ -517,19 +514,23 @@ class Snapshot(DataObject.DataObject):
             # Execute the query
             c.execute(query, (self.number, ))
 
+        # Record the Snapshot's Image Path
+        DBInterface.UpdateMediaPath(c, 'Snapshots2', self.number, tempImageFilename)
+
         # Initialize a blank error prompt
         prompt = ''
-        # Add the Snapshot keywords back.  Iterate through the Keyword List
-        for kws in self._kwlist:
-            # Try to add the Snapshot Keyword record.  If it is NOT added, the keyword has been changed by another user!
-            if not DBInterface.insert_clip_keyword(0, 0, self.number, kws.keywordGroup, kws.keyword, kws.example):
-                # if the prompt isn't blank ...
-                if prompt != '':
-                    # ... add a couple of line breaks to it
-                    prompt += u'\n\n'
-                # Add the current keyword to the error prompt
-                # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
-                prompt += unicode(_('Keyword "%s : %s" cannot be added to Snapshot "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kws.keywordGroup, kws.keyword, self.id)
+        # Bring the Snapshot keywords in the database up to date with the Keyword List.  Keywords that can't be added
+        # have been changed by another user!
+        missingKeywords = DBInterface.set_keywords_for_a_group(0, 0, self.number, [(kws.keywordGroup, kws.keyword, kws.example) for kws in self._kwlist])
+        # For each keyword that couldn't be added ...
+        for (kwg, kw) in missingKeywords:
+            # if the prompt isn't blank ...
+            if prompt != '':
+                # ... add a couple of line breaks to it
+                prompt += u'\n\n'
+            # Add the current keyword to the error prompt
+            # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
+            prompt += unicode(_('Keyword "%s : %s" cannot be added to Snapshot "%s".\nAnother user must have edited the keyword while you were adding it.'), 'utf8') % (kwg, kw, self.id)
 
         # If there is an error prompt ...
         if prompt != '':
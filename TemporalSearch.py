@@ -0,0 +1,141 @@
+# Copyright (C) 2003 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+#
+
+"""This module implements the time-window operators used in Searches, which compare the coded segments (Clips and
+   Snapshots) on the left of the operator with those on the right of it.  It provides the following public functions:
+
+    Overlaps(leftSegments, rightSegments)
+    Within(leftSegments, rightSegments, gap)
+    FollowedBy(leftSegments, rightSegments, gap=None)
+
+   Segments are (Episode Number, Start Time, Stop Time, key) values, with times in milliseconds.  Only segments from
+   the same Episode are compared, and a segment is never matched with itself, so a Clip or Snapshot that has the
+   keywords on both sides of an operator only matches if a different Clip or Snapshot is in the right position.
+   ("A AND B" finds the Clips and Snapshots that have both keywords.)  Each function returns a pair of sets, the keys of the left segments and the keys of
+   the right segments that are part of a match.  Segments are sorted by time once, and each segment is then matched
+   with a binary search, so a search takes O(n log n) time rather than comparing every pair of segments.
+"""
+
+__author__ = 'David Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "TemporalSearch DEBUG is ON!"
+
+# import Python's bisect module for binary searches of sorted lists
+import bisect
+
+
+def _GroupByEpisode(segments):
+    """ Return a dictionary of the (start, stop, key) values in segments, keyed by Episode Number.  Segments with
+        no length, such as Snapshots with no duration, are treated as lasting one millisecond. """
+    episodes = {}
+    for (episodeNum, start, stop, key) in segments:
+        episodes.setdefault(episodeNum, []).append((start, max(stop, start + 1), key))
+    return episodes
+
+def _Touching(segments, others, gap, strict):
+    """ Return the keys of the segments that are within gap milliseconds of one of the others, other than
+        themselves.  If strict is True, segments must actually overlap, not just meet. """
+    # Initialize the results
+    results = set()
+    # If there's nothing to compare with, nothing matches
+    if len(others) == 0:
+        return results
+    # Sort the other segments by start time
+    others = sorted(others)
+    starts = [start for (start, stop, key) in others]
+    # Build the running maximum of the other segments' stop times, so we know the latest stop time of all the
+    # segments that start before a given time.  As a segment can't match itself, we also need the latest stop time
+    # of the segments other than the one with the latest stop time.
+    maxStops = []
+    (maxStop, maxKey, nextStop) = (None, None, None)
+    for (start, stop, key) in others:
+        if stop > maxStop:
+            (maxStop, maxKey, nextStop) = (stop, key, maxStop)
+        elif stop > nextStop:
+            nextStop = stop
+        maxStops.append((maxStop, maxKey, nextStop))
+    for (start, stop, key) in segments:
+        # Count the other segments that start before (or, if not strict, at) the end of the window around this segment
+        if strict:
+            count = bisect.bisect_left(starts, stop + gap)
+        else:
+            count = bisect.bisect_right(starts, stop + gap)
+        # If there are none, there's no match
+        if count == 0:
+            continue
+        # Get the latest stop time of those segments, other than this segment itself
+        (maxStop, maxKey, nextStop) = maxStops[count - 1]
+        if maxKey == key:
+            maxStop = nextStop
+        # If one of them stops after (or, if not strict, at) the start of the window, we have a match
+        if (maxStop != None) and ((maxStop > start - gap) or (not strict and (maxStop == start - gap))):
+            results.add(key)
+    return results
+
+def Overlaps(leftSegments, rightSegments):
+    """ Match the left and right segments that overlap in time.  Segments don't overlap themselves. """
+    return Within(leftSegments, rightSegments, 0, True)
+
+def Within(leftSegments, rightSegments, gap, strict=False):
+    """ Match the left and right segments that overlap or are no more than gap milliseconds apart.  Segments aren't
+        matched with themselves. """
+    # Initialize the results
+    leftResults = set()
+    rightResults = set()
+    # Group the segments by Episode
+    leftEpisodes = _GroupByEpisode(leftSegments)
+    rightEpisodes = _GroupByEpisode(rightSegments)
+    # For each Episode that has segments on both sides ...
+    for episodeNum in leftEpisodes.keys():
+        if rightEpisodes.has_key(episodeNum):
+            # ... find the segments on each side that have a match on the other side
+            leftResults |= _Touching(leftEpisodes[episodeNum], rightEpisodes[episodeNum], gap, strict)
+            rightResults |= _Touching(rightEpisodes[episodeNum], leftEpisodes[episodeNum], gap, strict)
+    if DEBUG:
+        print "TemporalSearch.Within():", len(leftSegments), len(rightSegments), gap, strict, len(leftResults), len(rightResults)
+    return (leftResults, rightResults)
+
+def FollowedBy(leftSegments, rightSegments, gap=None):
+    """ Match the left segments that are followed by a right segment, and those right segments.  The right segment must
+        start after the left segment stops, and if gap is specified, no more than gap milliseconds after it.  Every
+        segment lasts at least a millisecond, so a segment never follows itself. """
+    # Initialize the results
+    leftResults = set()
+    rightResults = set()
+    # Group the segments by Episode
+    leftEpisodes = _GroupByEpisode(leftSegments)
+    rightEpisodes = _GroupByEpisode(rightSegments)
+    # For each Episode that has segments on both sides ...
+    for episodeNum in leftEpisodes.keys():
+        if rightEpisodes.has_key(episodeNum):
+            # Sort the right segments' start times and the left segments' stop times
+            rightStarts = sorted([start for (start, stop, key) in rightEpisodes[episodeNum]])
+            leftStops = sorted([stop for (start, stop, key) in leftEpisodes[episodeNum]])
+            # A left segment matches if the first right segment that starts after it stops is close enough
+            for (start, stop, key) in leftEpisodes[episodeNum]:
+                index = bisect.bisect_left(rightStarts, stop)
+                if (index < len(rightStarts)) and ((gap == None) or (rightStarts[index] <= stop + gap)):
+                    leftResults.add(key)
+            # A right segment matches if the last left segment that stops before it starts is close enough
+            for (start, stop, key) in rightEpisodes[episodeNum]:
+                index = bisect.bisect_right(leftStops, start)
+                if (index > 0) and ((gap == None) or (leftStops[index - 1] >= start - gap)):
+                    rightResults.add(key)
+    if DEBUG:
+        print "TemporalSearch.FollowedBy():", len(leftSegments), len(rightSegments), gap, len(leftResults), len(rightResults)
+    return (leftResults, rightResults)
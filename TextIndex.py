@@ -0,0 +1,180 @@
+# Copyright (C) 2003 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+#
+
+"""This module converts the text of Transcripts and Notes into the words held in the Text Index (the TextIndex2 table,
+   see DBInterface), which lets text searches look up the records that contain a word rather than reading the text
+   of every record.  It provides the following public functions:
+
+    GetPlainText(text)
+    GetWords(text)
+    GetIndexWords(text)
+
+   Transcript text may be in Transana's XML format or in RTF.  Note text is plain text.
+"""
+
+__author__ = 'David Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "TextIndex DEBUG is ON!"
+
+# import Python's htmlentitydefs module for the names of XML character entities
+import htmlentitydefs
+# import Python's Regular Expression module
+import re
+
+# The longest word kept in the Text Index.  (Longer words are shortened, so they can still be found by prefix.)
+MAX_WORD_LENGTH = 50
+
+# A word is a run of letters and digits in any language
+WORD = re.compile(r'\w+', re.UNICODE)
+# The text runs in Transana's XML format
+XML_TEXT = re.compile(r'<text[^>]*>(.*?)</text>', re.DOTALL)
+# The paragraph breaks in Transana's XML format
+XML_PARAGRAPH = re.compile(r'</paragraph>')
+# An XML character entity, such as "&amp;" or "&#164;"
+XML_ENTITY = re.compile(r'&(#x[0-9a-fA-F]+|#[0-9]+|[a-zA-Z]+);')
+# Transana's time codes, which are the time code character followed by the hidden time in milliseconds
+TIME_CODE = re.compile(u'\xa4\s*<\d+>')
+# The pieces of an RTF document:  control words, hex characters, control symbols, braces, and text
+RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|([^\\{}]+)", re.DOTALL)
+# The RTF groups that hold document information rather than text
+RTF_SKIP_GROUPS = ('fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'header', 'footer', 'listtable',
+                   'listoverridetable', 'rsidtbl', 'generator', 'xmlnstbl')
+# The RTF control words that are shown as white space
+RTF_BREAKS = {'par' : u'\n', 'line' : u'\n', 'tab' : u'\t', 'cell' : u'\t', 'row' : u'\n'}
+
+
+def _DecodeText(text):
+    """ Return text as unicode.  Transcript text may come from the database as UTF-8 """
+    if isinstance(text, str):
+        try:
+            return text.decode('utf8')
+        except UnicodeDecodeError:
+            return text.decode('latin-1')
+    return text
+
+def _ReplaceEntity(match):
+    """ Return the character for an XML character entity """
+    entity = match.group(1)
+    try:
+        if entity[:2] == '#x':
+            return unichr(int(entity[2:], 16))
+        elif entity[0] == '#':
+            return unichr(int(entity[1:]))
+        else:
+            return unichr(htmlentitydefs.name2codepoint[entity])
+    # If we don't know the entity, leave it as it is
+    except (KeyError, ValueError):
+        return match.group(0)
+
+def _XMLPlainText(text):
+    """ Return the plain text of a Transcript in Transana's XML format """
+    # Initialize the list of paragraphs
+    paragraphs = []
+    for paragraph in XML_PARAGRAPH.split(text):
+        # Join the paragraph's text runs
+        runs = []
+        for run in XML_TEXT.findall(paragraph):
+            # Runs with spaces at either end are quoted
+            if (len(run) > 1) and (run[0] == '"') and (run[-1] == '"'):
+                run = run[1:-1]
+            runs.append(XML_ENTITY.sub(_ReplaceEntity, run))
+        paragraphs.append(u''.join(runs))
+    return u'\n'.join(paragraphs)
+
+def _RTFPlainText(text):
+    """ Return the plain text of a Transcript in RTF """
+    # Initialize the text pieces
+    pieces = []
+    # The stack of flags that note whether each open group is skipped
+    skipStack = [False]
+    # Whether we're at the start of a group, where the control word that names the group appears
+    groupStart = False
+    # The number of characters to skip after a Unicode character, which replace it for programs that can't read it
+    skipChars = 0
+    for (word, param, hexChar, symbol, brace, chars) in RTF_TOKEN.findall(text):
+        if brace == '{':
+            # A new group is skipped if its parent is
+            skipStack.append(skipStack[-1])
+            groupStart = True
+            continue
+        elif brace == '}':
+            # Close the group, but never the document itself
+            if len(skipStack) > 1:
+                skipStack.pop()
+            groupStart = False
+            continue
+        # Groups that hold document information, and "\*" groups, which hold information other programs may ignore,
+        # are skipped
+        if groupStart and ((word in RTF_SKIP_GROUPS) or (symbol == '*')):
+            skipStack[-1] = True
+        groupStart = False
+        if skipStack[-1]:
+            continue
+        # Add the text the token represents
+        if word != '':
+            if RTF_BREAKS.has_key(word):
+                pieces.append(RTF_BREAKS[word])
+            elif (word == 'u') and (param != ''):
+                # Unicode characters are signed 16-bit numbers
+                pieces.append(unichr(int(param) % 65536))
+                skipChars = 1
+            continue
+        if hexChar != '':
+            # Skip the character that replaces a Unicode character
+            if skipChars > 0:
+                skipChars -= 1
+            else:
+                pieces.append(chr(int(hexChar, 16)).decode('cp1252', 'replace'))
+        elif symbol != '':
+            # Escaped characters stand for themselves
+            if symbol in '\\{}':
+                pieces.append(symbol)
+            elif symbol == '~':
+                pieces.append(u' ')
+        elif chars != '':
+            # Skip the character that replaces a Unicode character
+            if skipChars > 0:
+                chars = chars[1:]
+                skipChars = 0
+            # Line breaks in RTF source aren't part of the text
+            pieces.append(chars.replace('\r', '').replace('\n', ''))
+    return u''.join(pieces)
+
+def GetPlainText(text):
+    """ Return the plain text of Transcript or Note text, without formatting or time codes """
+    # If there's no text, there's no plain text
+    if text == None:
+        return u''
+    text = _DecodeText(text)
+    # Convert XML or RTF to plain text
+    if text[:5].lower() == '<?xml':
+        text = _XMLPlainText(text)
+    elif text[:5].lower() == '{\\rtf':
+        text = _RTFPlainText(text)
+    # Remove the time codes
+    return TIME_CODE.sub(u'', text)
+
+def GetWords(text):
+    """ Return the set of lower case words in plain text, each no longer than MAX_WORD_LENGTH """
+    return set([word[:MAX_WORD_LENGTH] for word in WORD.findall(_DecodeText(text).lower())])
+
+def GetIndexWords(text):
+    """ Return the set of lower case words in plain text and all their endings, each no longer than MAX_WORD_LENGTH.
+        Search text can start in the middle of a word ("eta" is found in "beta"), so every word in search text starts
+        one of the index words of the text that contains it. """
+    return set([word[start:start + MAX_WORD_LENGTH] for word in set(WORD.findall(_DecodeText(text).lower())) for start in range(len(word))])
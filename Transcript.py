@@ -431,9 +431,9 @@ class Transcript(DataObject.DataObject):
 
         if (self._db_start_save() == 0):
             # Duplicate Transcript IDs within an Episode are not allowed.
-            if DBInterface.record_match_count("Transcripts2", \
+            if DBInterface.record_exists("Transcripts2", \
                     ("TranscriptID", "EpisodeNum", "ClipNum", "SortOrder"),
-                    (id, self.episode_num, self.clip_num, self.sort_order)) > 0:
+                    (id, self.episode_num, self.clip_num, self.sort_order)):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Transcript named "%s" already exists in this Episode.\nPlease enter a different Transcript ID.'), 'utf8')
@@ -454,9 +454,9 @@ class Transcript(DataObject.DataObject):
             query += 'CURRENT_TIMESTAMP)'
         else:
             # Duplicate Transcript IDs within an Episode are not allowed.
-            if DBInterface.record_match_count("Transcripts2", \
+            if DBInterface.record_exists("Transcripts2", \
                     ("TranscriptID", "!TranscriptNum", "EpisodeNum", "ClipNum", "SortOrder"),
-                    (id, self.number, self.episode_num, self.clip_num, self.sort_order)) > 0:
+                    (id, self.number, self.episode_num, self.clip_num, self.sort_order)):
                 if 'unicode' in wx.PlatformInfo:
                     # Encode with UTF-8 rather than TransanaGlobal.encoding because this is a prompt, not DB Data.
                     prompt = unicode(_('A Transcript named "%s" already exists in this Episode.\nPlease enter a different Transcript ID.'), 'utf8')
@@ -557,6 +557,8 @@ class Transcript(DataObject.DataObject):
                 raise RecordNotFoundError, (self.id, len(recs))
             # Close the temporary database cursor
             tempDBCursor.close()
+        # Update the Text Index with the Transcript's words
+        DBInterface.UpdateTextIndex(c, 'Transcript', self.number, self.text)
 
         # For Partial Transcript Editing, update the Paragraph Information for long transcripts
         self.UpdateParagraphs()
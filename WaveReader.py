@@ -0,0 +1,142 @@
+# Copyright (C) 2004 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""This module provides memory-mapped, random access to the Wave Files used for Visualization. """
+
+__author__ = 'David K. Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "WaveReader DEBUG is ON."
+
+# Import Python's mmap module for memory-mapped file access
+import mmap
+# Import Python's struct module for reading the RIFF header
+import struct
+# Import Python's wave module, whose Error exception we share
+import wave
+
+
+class WaveReader(object):
+    """ Memory-mapped access to a PCM Wave File.  The RIFF header is parsed once, and sample data is returned as
+        read-only buffers into the memory map, so only the pages that are actually used are read from disk.
+        The get...() methods match those of Python's wave module so the two can be used interchangeably. """
+
+    def __init__(self, filename):
+        """ Open and memory-map a Wave File and parse its RIFF header """
+        # Remember the file name
+        self.filename = filename
+        # Initialize the memory map so close() always works
+        self.map = None
+        # Open the file
+        self.file = open(filename, 'rb')
+        try:
+            # Memory-map the whole file, read-only.  (This fails for an empty file.)
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Parse the RIFF header
+            self._ParseHeader()
+        except:
+            # If anything goes wrong, don't leave the file open
+            self.close()
+            raise
+
+    def _ParseHeader(self):
+        """ Locate the format and data chunks in the RIFF structure """
+        # A Wave File starts with "RIFF", the RIFF size, and "WAVE"
+        if (len(self.map) < 12) or (self.map[0:4] != 'RIFF') or (self.map[8:12] != 'WAVE'):
+            raise wave.Error('%s is not a RIFF WAVE file' % self.filename)
+        # Initialize the format values
+        self.nchannels = None
+        # Initialize the data chunk position
+        self.dataOffset = None
+        # Chunks begin after the RIFF header
+        position = 12
+        # While there's room for another chunk header ...
+        while position + 8 <= len(self.map):
+            # ... read the chunk's ID and size
+            (chunkID, chunkSize) = struct.unpack('<4sI', self.map[position:position + 8])
+            # If this is the format chunk ...
+            if chunkID == 'fmt ':
+                # ... read the format information
+                (audioFormat, self.nchannels, self.framerate, byteRate, blockAlign, bitsPerSample) = \
+                    struct.unpack('<HHIIHH', self.map[position + 8:position + 24])
+                # Only uncompressed PCM data can be read directly
+                if audioFormat != 1:
+                    raise wave.Error('%s is not a PCM wave file' % self.filename)
+                # Remember the sample width in bytes, and the size of a frame (all channels)
+                self.sampwidth = (bitsPerSample + 7) / 8
+                self.framesize = self.sampwidth * self.nchannels
+            # If this is the data chunk ...
+            elif chunkID == 'data':
+                # ... remember where the data starts
+                self.dataOffset = position + 8
+                # Audio extraction that is still under way, or that was interrupted, may not have a correct data size
+                # in the header, so the data chunk can't be assumed to be any larger than the file itself.
+                self.dataSize = min(chunkSize, len(self.map) - self.dataOffset)
+                # We have what we need.
+                break
+            # Move to the next chunk.  Chunks are padded to an even number of bytes.
+            position += 8 + chunkSize + (chunkSize % 2)
+        # If we didn't find both chunks, this isn't a usable Wave File
+        if (self.nchannels is None) or (self.dataOffset is None):
+            raise wave.Error('%s is missing its fmt or data chunk' % self.filename)
+        # Calculate the number of complete frames in the file
+        self.nframes = self.dataSize / self.framesize
+
+    def getnchannels(self):
+        """ Return the number of audio channels """
+        return self.nchannels
+
+    def getsampwidth(self):
+        """ Return the sample width in bytes """
+        return self.sampwidth
+
+    def getframerate(self):
+        """ Return the sampling frequency """
+        return self.framerate
+
+    def getnframes(self):
+        """ Return the number of audio frames """
+        return self.nframes
+
+    def GetFrames(self, startFrame, frameCount):
+        """ Return a read-only buffer of up to frameCount frames starting at startFrame.  No data is copied.
+            The buffer must not be used after the WaveReader is closed. """
+        # Keep the requested range inside the data chunk
+        startFrame = max(0, min(int(startFrame), self.nframes))
+        frameCount = max(0, min(int(frameCount), self.nframes - startFrame))
+        # Return a buffer into the memory map
+        return buffer(self.map, self.dataOffset + startFrame * self.framesize, frameCount * self.framesize)
+
+    def GetFramesByTime(self, startTime, endTime):
+        """ Return a read-only buffer of the frames between startTime and endTime, in milliseconds """
+        # Convert the times to frame numbers
+        startFrame = int(float(startTime) / 1000.0 * self.framerate)
+        endFrame = int(float(endTime) / 1000.0 * self.framerate)
+        # Return the frames in that range
+        return self.GetFrames(startFrame, endFrame - startFrame)
+
+    def close(self):
+        """ Close the memory map and the file """
+        # If the memory map is open ...
+        if self.map is not None:
+            # ... close it
+            self.map.close()
+            self.map = None
+        # If the file is open ...
+        if self.file is not None:
+            # ... close it
+            self.file.close()
+            self.file = None
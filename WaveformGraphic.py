@@ -27,11 +27,59 @@ import wx
 import Dialogs
 # Import Python's sys module
 import sys
-# Import Python's wave module for processing Wave files
-import wave
-
-
-# import numpy
+# Import Transana's memory-mapped Wave File reader
+import WaveReader
+# Import Transana's Waveform Peak Cache
+import WaveformPeaks
+# Import numpy for processing wave data a whole graphic at a time
+import numpy
+
+
+def _ReadColumns(waveFile, startFrame, chunkSize, columns):
+    """ Get the 8-bit wave data for a graphic in a single block, returning a numpy array with one row of
+        chunkSize samples for each pixel position that has data """
+    # Get all the frames needed for the graphic at once.  This is a view into the memory-mapped wave file,
+    # so only the part of the file being displayed is actually read.
+    frames = waveFile.GetFrames(startFrame, chunkSize * columns)
+    # Interpret the data as unsigned bytes, without copying it
+    samples = numpy.frombuffer(frames, dtype=numpy.uint8)
+    # Drop any partial chunk at the end of the wave file, as the old pixel-by-pixel drawing did
+    samples = samples[:(len(samples) / chunkSize) * chunkSize]
+    # Return the samples with one row per pixel position
+    return samples.reshape(-1, chunkSize)
+
+def _WaveformLines(startX, columnMax, height):
+    """ Build the list of lines for a waveform from the maximum sample value for each pixel position """
+    # The byte value represents sound, with 128 being silence and deviation from it being louder.
+    # Therefore, determine the distance the Byte Values differ from silence.
+    amplitude = numpy.abs(columnMax.astype(numpy.int32) - 128)
+    # Adjust the raw amplitude (0 .. 255 range) for the size of the graphic canvas
+    amplitude = numpy.round(amplitude * height / 256.0)
+    # The horizontal values count up from the starting pixel position
+    x = numpy.arange(startX, startX + len(columnMax))
+    # The vertical values represent the divergence of amplitude from the center of the graphic
+    y1 = numpy.round(height / 2.0 - amplitude).astype(numpy.int32)
+    y2 = numpy.round(height / 2.0 + amplitude).astype(numpy.int32)
+    # Return the lines as a list of (x1, y1, x2, y2) values, as DrawLineList() expects
+    return numpy.column_stack((x, y1, x, y2)).tolist()
+
+def _SpectrogramBitmap(columns, height):
+    """ Create a spectrogram Bitmap from 8-bit wave data with one row of samples per pixel position """
+    # Determine the distance the Byte Values differ from silence
+    signal = numpy.abs(columns.astype(numpy.int32) - 128)
+    # Calculate the spectrum for every pixel position at once.  Silence produces -inf, which we treat as 0.
+    oldSettings = numpy.seterr(divide='ignore')
+    spectrum = 10 * numpy.log10(numpy.abs(numpy.fft.rfft(signal, axis=1)))
+    numpy.seterr(**oldSettings)
+    spectrum[numpy.isinf(spectrum)] = 0
+    # Convert the spectrum to shades of gray, darker being stronger
+    shade = (255 - numpy.clip((5 * spectrum).astype(numpy.int32), 0, 255)).astype(numpy.uint8)
+    # Frequencies run down the graphic and pixel positions across it, limited to the height of the graphic
+    shade = shade[:, :height].T
+    # Build an RGB pixel buffer from the gray values
+    pixels = numpy.ascontiguousarray(numpy.dstack((shade, shade, shade)))
+    # Create the Bitmap directly from the pixel buffer
+    return wx.BitmapFromBuffer(shade.shape[1], shade.shape[0], pixels)
 
 
 def WaveformGraphicCreate(waveFilename, waveformFilename, startPoint, mediaLength, graphicSize, colors = (wx.CYAN, wx.GREEN, wx.BLUE, wx.RED), style='waveform'):
@@ -71,8 +119,8 @@ def WaveformGraphicCreate(waveFilename, waveformFilename, startPoint, mediaLengt
                 # Set the pen in the device context
                 dc.SetPen(pen)
                 
-                # Open the Wave File  (NOTE:  Python 2.4.2 can take a Unicode filename here.  Python 2.3.5 can't.)
-                waveFile = wave.open(wavFile['filename'], 'r')            
+                # Open the Wave File.  It is memory-mapped, so we can go directly to the part we need.
+                waveFile = WaveReader.WaveReader(wavFile['filename'])
                   
                 # Added for Batch Waveform Generation, when we don't know the media file length
                 if mediaLength <= 0:
@@ -82,6 +130,9 @@ def WaveformGraphicCreate(waveFilename, waveformFilename, startPoint, mediaLengt
                 # Read the appropriate number of frames to position properly in the wave file
                 # Number of seconds into the file * Frame Rate
 
+                # Unless we're indenting into a clip, we start at the first frame of the wave file
+                startFrame = 0
+
                 # If we are at the beginning of the virtual media file ...
                 if startPoint == 0:
                     # ... the start point for THIS media file needs to be adjusted for its offset
@@ -110,11 +161,11 @@ def WaveformGraphicCreate(waveFilename, waveformFilename, startPoint, mediaLengt
                         # ... then set the media to the beginning.  It'll join in later.
                         sp = 0
 
+                        # Determine the number of frames to indent to get to the right part of the wave file
+                        startFrame = int(float(abs(indent)) / 1000.0 * waveFile.getframerate())
+
                         if DEBUG:
-                            print "read to ",float(abs(indent)) / 1000.0 * waveFile.getframerate(),"frames"
-                            
-                        # Indent the wave file the appropriate number of frames to get to the right part of the wave file
-                        frames = waveFile.readframes(float(abs(indent)) / 1000.0 * waveFile.getframerate())
+                            print "read to ", startFrame, "frames"
 
 #                        print "**", startPoint, indent, float(abs(indent)) / 1000.0 * waveFile.getframerate(), float(indent) / 1000.0 * waveFile.getframerate()
 
@@ -132,97 +183,45 @@ def WaveformGraphicCreate(waveFilename, waveformFilename, startPoint, mediaLengt
                     print "\n\nTODO:  Zoomed in so that Number of Lines is less than Graphic Width!!\n\n"
 
 
-                max1 = min1 = 0
-                
-                # Draw the actual WaveForm
-                # for each pixel position in the graphic's width ...
-                for loop in range(sp, ep):
-                    # Read the appropriate number of chunks from the wave file
-                    frames = waveFile.readframes(ChunkSize)
-
-                    # Don't break all of Transana if we couldn't extract the wave
-                    if len(frames) == 0:
-                        break
-
-                    # Determine the largest value in the data read (this produces the best-looking graph!)
-                    frame = max(frames)
-                    # Process the data differently based on the Bytes Per Sample value of the Wave File
-                    if waveFile.getsampwidth() == 1:
-                        if style == 'waveform':
-                            #This is for the 8-bit Bytes per Sample setting
-                            # The byte value represents sound, with 128 being silence and deviation from it being louder.
-                            # Therefore, determine the distance the Byte Value (frame) differs from silence.
-                            if ord(frame) > 128:
-                               amplitude = ord(frame) - 128
-                            else:
-                               amplitude = 128 - ord(frame)
-                            # Adjust the raw amplitude (0 .. 255 range) for the size of the graphic canvas
-                            amplitude = round(amplitude * graphicSize[1] / 256.0)
-                            # Determine the coordinates for drawing the amplitude line on the Device Context
-                            # The horizontal value equals the value of the loop
-                            x = loop
-                            # The vertical values represent the divergence of amplitude from the center of the graphic
-                            y1 = round((graphicSize[1]/2.0 - amplitude))
-                            y2 = round((graphicSize[1]/2.0 + amplitude))
-
-                            # draw the line on the Device Context
-                            dc.DrawLine(int(x), int(y1), int(x), int(y2))
-                        elif style == 'spectrogram':
-
-#                            print "Waveform style = spectrogram", sp, ep, ep-sp
-
-#                            print frames, type(frames), len(frames)
-#                            print
-
-                            sigList = []
-                            for loop2 in range(len(frames)):
-
-                                val = ord(frames[loop2])
-                                if val > 128:
-                                    sigList.append(val - 128)
-                                else:
-                                    sigList.append(128 - val)
-
-#                            print sigList
-#                            print
-
-                            max1 = max(max1, max(sigList))
-                            min1 = min(min1, min(sigList))
-
-                            sig = numpy.array(sigList)
-                            
-#                            print sig
-#                            print
-
-                            spectrum = 10*numpy.log10(abs(numpy.fft.rfft(sig)))
-
-#                            print spectrum, len(spectrum)
-
-#                            print "Max =", max1, "Min =", min1
-
-                            x = loop
-                            for loop2 in range(len(spectrum)):
-
-#                                print loop2, spectrum[loop2], type(spectrum[loop2]),
-
-                                if spectrum[loop2] in [numpy.inf, -numpy.inf]:
-                                    n = 0
-                                else:
-                                    n = max(0, int(5 * spectrum[loop2]))
-
-#                                    print 5 * spectrum[loop2], n
-
-                                    n = max(0, int(5 * spectrum[loop2]))
-                                
-                                pen.SetColour(wx.Colour(255-n, 255-n, 255-n))
-                                dc.SetPen(pen)
-                                dc.DrawPoint(x, loop2)
-                                              
-                        
+                # If this is an 8-bit wave file ...
+                if waveFile.getsampwidth() == 1:
+                    # Initialize the peak data
+                    peaks = None
+                    # If we're drawing a waveform ...
+                    if style == 'waveform':
+                        # ... get the Peak Cache for this wave file, which is built the first time it's needed
+                        peakCache = WaveformPeaks.GetPeakCache(wavFile['filename'])
+                        # If we have a Peak Cache ...
+                        if peakCache != None:
+                            # ... get the peaks for each pixel position from the appropriate pyramid level.
+                            # (This returns None if we're zoomed in too far for the Peak Cache to help.)
+                            peaks = peakCache.GetColumnPeaks(startFrame, ChunkSize, ep - sp)
+                    # If we have peak data ...
+                    if peaks != None:
+                        # ... we only need the maximum values, which produce the best-looking graph
+                        columnMax = numpy.array(peaks[0], dtype=numpy.uint8)
+                    # If we don't have peak data, we need to read the wave file itself
                     else:
-                        #This is for the 16-bit Bytes per Sample setting
-                        print "Waveform for 16-bit wave files not yet implemented."
+                        # Get all the data for the graphic in one block, starting at the right part of the wave file,
+                        # and split it into one row per pixel position
+                        columns = _ReadColumns(waveFile, startFrame, ChunkSize, ep - sp)
+                        # Determine the largest value for each pixel position (this produces the best-looking graph!)
+                        columnMax = columns.max(axis=1)
+
+                    if style == 'waveform':
+                        # Draw all the amplitude lines on the Device Context at once
+                        dc.DrawLineList(_WaveformLines(sp, columnMax, graphicSize[1]))
+                    elif style == 'spectrogram':
+                        # If there is data to draw ...
+                        if len(columns) > 0:
+                            # ... create the spectrogram for all the pixel positions at once and draw it on the Device Context
+                            dc.DrawBitmap(_SpectrogramBitmap(columns, graphicSize[1]), sp, 0)
+                else:
+                    #This is for the 16-bit Bytes per Sample setting
+                    print "Waveform for 16-bit wave files not yet implemented."
 
+                # Release the wave data, which refers to the memory-mapped file, before closing the Wave File
+                columns = None
                 # Close the Wave File   
                 waveFile.close()
             # Iterate the color index, so the next waveform will be in the next color
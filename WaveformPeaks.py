@@ -0,0 +1,340 @@
+# Copyright (C) 2004 - 2014 The Board of Regents of the University of Wisconsin System
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""This module creates and reads the multi-resolution Peak Cache files that allow Waveforms to be drawn
+   without re-reading the entire Wave File. """
+
+__author__ = 'David K. Woods <dwoods@wcer.wisc.edu>'
+
+DEBUG = False
+if DEBUG:
+    print "WaveformPeaks DEBUG is ON."
+
+# Import Python's array module for compact storage of peak values
+import array
+# Import Python's os module
+import os
+# Import Python's struct module for reading and writing the Peak File header
+import struct
+# Import Python's sys module
+import sys
+# Import Python's wave module for writing Wave files
+import wave
+# Import Transana's memory-mapped Wave File reader
+import WaveReader
+
+# Peak Files have the same root name as the Wave File they summarize, with this extension
+PEAK_FILE_EXTENSION = '.pks'
+# The signature and version number that start every Peak File
+PEAK_FILE_SIGNATURE = 'TPKS'
+PEAK_FILE_VERSION = 1
+# The Peak File header holds signature, version, sample width, frame rate, frame count, wave file size,
+# wave file modification time, and the number of pyramid levels
+PEAK_FILE_HEADER = '<4sHHIIQdH'
+# Each pyramid level is described by its decimation factor and its number of peak values
+PEAK_LEVEL_HEADER = '<II'
+# The decimation factors (wave frames per peak value) of the pyramid levels.  Each level is 4 times coarser
+# than the one before it, so the render can always find a level within a factor of 4 of the pixel width.
+DECIMATION_LEVELS = (4, 16, 64, 256, 1024, 4096)
+# Number of bytes read from the Wave File at a time while building the pyramid.  (A multiple of every level.)
+READ_BLOCK_SIZE = 4096 * 64
+
+
+def GetPeakFilename(waveFilename):
+    """ Return the name of the Peak File that goes with the specified Wave File """
+    # The Peak File is stored next to the Wave File, with the Peak File extension
+    return os.path.splitext(waveFilename)[0] + PEAK_FILE_EXTENSION
+
+def _Decimate(values, factor, func):
+    """ Reduce an array of peak values to one value per group of "factor" values, using func (min or max) """
+    # Determine how many values fall into complete groups
+    full = len(values) - (len(values) % factor)
+    # Apply the function across the parallel slices that make up the complete groups.  (map() does this in C.)
+    result = array.array('B', map(func, *[values[offset:full:factor] for offset in range(factor)]))
+    # If there is a partial group at the end ...
+    if full < len(values):
+        # ... reduce it too, so the end of the media file is not lost.
+        result.append(func(values[full:]))
+    # Return the reduced values
+    return result
+
+
+class PeakBuilder(object):
+    """ Build a min/max Peak Pyramid from 8-bit PCM wave data.  Data can be fed in any size pieces, so the
+        pyramid can be built from a Wave File or while audio extraction is still streaming. """
+
+    def __init__(self, levels=DECIMATION_LEVELS):
+        """ Initialize the Peak Builder """
+        # Remember the decimation factors to build
+        self.levels = levels
+        # Initialize the finest level's maximum and minimum values
+        self.maxValues = array.array('B')
+        self.minValues = array.array('B')
+        # Initialize the bytes not yet making up a full group at the finest level
+        self.remainder = ''
+        # Initialize the number of frames processed
+        self.frameCount = 0
+
+    def Feed(self, data):
+        """ Add a block of 8-bit PCM data to the pyramid """
+        # Add any left-over data from the last block to the front of this block
+        data = self.remainder + data
+        # Determine how much of the data makes up complete groups for the finest level
+        usable = len(data) - (len(data) % self.levels[0])
+        # Save the rest for later
+        self.remainder = data[usable:]
+        # If there is complete data to process ...
+        if usable > 0:
+            # ... convert it to an array of unsigned bytes
+            samples = array.array('B', data[:usable])
+            # ... and add the maximum and minimum values for each group to the finest level
+            self.maxValues.extend(_Decimate(samples, self.levels[0], max))
+            self.minValues.extend(_Decimate(samples, self.levels[0], min))
+        # Count the frames processed
+        self.frameCount += len(data) - len(self.remainder)
+
+    def Finish(self):
+        """ Complete the pyramid, returning a list of (factor, maxValues, minValues) tuples, finest level first """
+        # If there is a partial group left over ...
+        if len(self.remainder) > 0:
+            # ... convert it to an array of unsigned bytes
+            samples = array.array('B', self.remainder)
+            # ... add its maximum and minimum values to the finest level
+            self.maxValues.append(max(samples))
+            self.minValues.append(min(samples))
+            # ... count the frames
+            self.frameCount += len(self.remainder)
+            # ... and clear the remainder
+            self.remainder = ''
+        # Start the pyramid with the finest level
+        pyramid = [(self.levels[0], self.maxValues, self.minValues)]
+        # Each coarser level is built from the level before it
+        for factor in self.levels[1:]:
+            # Get the previous level
+            (prevFactor, prevMax, prevMin) = pyramid[-1]
+            # Reduce it by the ratio of the two factors
+            pyramid.append((factor, _Decimate(prevMax, factor / prevFactor, max), _Decimate(prevMin, factor / prevFactor, min)))
+        # Return the pyramid
+        return pyramid
+
+
+def WritePeakFile(peakFilename, waveFilename, sampWidth, frameRate, frameCount, pyramid):
+    """ Save a Peak Pyramid as a Peak File, identifying the Wave File it summarizes by size and modification time """
+    # Build a temporary file name, so a partial file is never mistaken for a complete one
+    tempFilename = peakFilename + '.tmp'
+    # Open the temporary file
+    peakFile = open(tempFilename, 'wb')
+    try:
+        # Write the file header
+        peakFile.write(struct.pack(PEAK_FILE_HEADER, PEAK_FILE_SIGNATURE, PEAK_FILE_VERSION, sampWidth, frameRate, frameCount,
+                                   os.path.getsize(waveFilename), os.path.getmtime(waveFilename), len(pyramid)))
+        # Write the level headers
+        for (factor, maxValues, minValues) in pyramid:
+            peakFile.write(struct.pack(PEAK_LEVEL_HEADER, factor, len(maxValues)))
+        # Write the level data, maximum values followed by minimum values for each level
+        for (factor, maxValues, minValues) in pyramid:
+            maxValues.tofile(peakFile)
+            minValues.tofile(peakFile)
+    finally:
+        # Close the temporary file
+        peakFile.close()
+    # Windows won't rename over an existing file, so remove any old Peak File first
+    if os.path.exists(peakFilename):
+        os.remove(peakFilename)
+    # Put the completed Peak File in place
+    os.rename(tempFilename, peakFilename)
+
+def BuildPeakFile(waveFilename):
+    """ Read an 8-bit Wave File and create its Peak File.  Returns True if the Peak File was created. """
+    # Open the Wave File
+    waveFile = WaveReader.WaveReader(waveFilename)
+    try:
+        # We can only summarize 8-bit mono wave files, which is what Transana's audio extraction creates
+        if (waveFile.getsampwidth() != 1) or (waveFile.getnchannels() != 1):
+            return False
+        # Create a Peak Builder
+        builder = PeakBuilder()
+        # Process the Wave File in large blocks
+        for startFrame in range(0, waveFile.getnframes(), READ_BLOCK_SIZE):
+            # Add the block to the pyramid
+            builder.Feed(str(waveFile.GetFrames(startFrame, READ_BLOCK_SIZE)))
+        # Save the pyramid
+        WritePeakFile(GetPeakFilename(waveFilename), waveFilename, waveFile.getsampwidth(), waveFile.getframerate(),
+                      waveFile.getnframes(), builder.Finish())
+    finally:
+        # Close the Wave File
+        waveFile.close()
+    # Signal success
+    return True
+
+
+class WaveAndPeakWriter(object):
+    """ Write a Wave File and its Peak File together from streamed 8-bit mono PCM data, so a newly extracted
+        Wave File never needs to be read again to build its Peak File. """
+
+    def __init__(self, waveFilename, frameRate):
+        """ Create the Wave File """
+        # Remember the file name and frame rate
+        self.waveFilename = waveFilename
+        self.frameRate = frameRate
+        # Create the Wave File as 8-bit mono
+        self.waveFile = wave.open(waveFilename, 'wb')
+        self.waveFile.setnchannels(1)
+        self.waveFile.setsampwidth(1)
+        self.waveFile.setframerate(frameRate)
+        # Create the Peak Builder
+        self.builder = PeakBuilder()
+
+    def Write(self, data):
+        """ Add a block of data to both the Wave File and the Peak Pyramid """
+        # Write the data to the Wave File.  (The header is corrected when the file is closed.)
+        self.waveFile.writeframesraw(data)
+        # Add the data to the Peak Pyramid
+        self.builder.Feed(data)
+
+    def GetFrameCount(self):
+        """ Return the number of frames written so far """
+        return self.builder.frameCount + len(self.builder.remainder)
+
+    def Close(self):
+        """ Complete the Wave File, then save its Peak File """
+        # Close the Wave File, which writes the final header
+        self.waveFile.close()
+        # Save the Peak Pyramid.  This has to follow closing the Wave File, as it records the Wave File's final size.
+        WritePeakFile(GetPeakFilename(self.waveFilename), self.waveFilename, 1, self.frameRate, self.GetFrameCount(),
+                      self.builder.Finish())
+
+    def Abort(self):
+        """ Discard the Wave File, as when extraction is cancelled or fails """
+        # Close the Wave File
+        self.waveFile.close()
+        # Delete it, if it exists
+        if os.path.exists(self.waveFilename):
+            os.remove(self.waveFilename)
+
+
+class PeakCache(object):
+    """ Read access to a Peak File.  Only the level and range needed for a drawing is read from disk. """
+
+    def __init__(self, peakFilename):
+        """ Open a Peak File and read its header """
+        # Remember the file name
+        self.peakFilename = peakFilename
+        # Open the Peak File
+        peakFile = open(peakFilename, 'rb')
+        try:
+            # Read the file header
+            headerSize = struct.calcsize(PEAK_FILE_HEADER)
+            (signature, version, self.sampWidth, self.frameRate, self.frameCount, self.waveSize, self.waveTime,
+             levelCount) = struct.unpack(PEAK_FILE_HEADER, peakFile.read(headerSize))
+            # If this isn't a Peak File we understand, signal the problem
+            if (signature != PEAK_FILE_SIGNATURE) or (version != PEAK_FILE_VERSION):
+                raise ValueError('%s is not a version %d Peak File' % (peakFilename, PEAK_FILE_VERSION))
+            # Read the level headers
+            levelHeaderSize = struct.calcsize(PEAK_LEVEL_HEADER)
+            levelInfo = [struct.unpack(PEAK_LEVEL_HEADER, peakFile.read(levelHeaderSize)) for level in range(levelCount)]
+        finally:
+            # Close the Peak File
+            peakFile.close()
+        # Build the list of levels as (factor, count, file position of the maximum values) tuples
+        self.levels = []
+        # Level data starts right after the headers
+        position = headerSize + levelCount * levelHeaderSize
+        for (factor, count) in levelInfo:
+            self.levels.append((factor, count, position))
+            # Each level holds a maximum and a minimum value for each peak
+            position += 2 * count
+
+    def IsCurrent(self, waveFilename):
+        """ Determine whether this Peak File still matches the specified Wave File """
+        # The Peak File is current if the Wave File has the same size and modification time as when the pyramid was built
+        return (os.path.getsize(waveFilename) == self.waveSize) and (os.path.getmtime(waveFilename) == self.waveTime)
+
+    def GetColumnPeaks(self, startFrame, framesPerColumn, columns):
+        """ Return (maxValues, minValues) lists with one value per column, where each column covers framesPerColumn
+            frames starting at startFrame.  Returns None if the Peak File is too coarse for this resolution. """
+        # Find the coarsest level that is still at least as fine as a single column
+        level = None
+        for levelData in self.levels:
+            if levelData[0] <= framesPerColumn:
+                level = levelData
+        # If even the finest level is too coarse, the caller needs to read the Wave File itself
+        if level is None:
+            return None
+        (factor, count, position) = level
+        # Don't read columns that fall past the end of the media file
+        columns = max(0, min(columns, int((self.frameCount - startFrame + framesPerColumn - 1) / framesPerColumn)))
+        # Determine the range of peak values that covers the requested columns
+        first = min(int(startFrame / factor), count)
+        last = min(int((startFrame + columns * framesPerColumn + factor - 1) / factor), count)
+        # Initialize the arrays that will hold the peak values
+        maxValues = array.array('B')
+        minValues = array.array('B')
+        # Open the Peak File
+        peakFile = open(self.peakFilename, 'rb')
+        try:
+            # Read only the maximum values we need from this level ...
+            peakFile.seek(position + first)
+            maxValues.fromstring(peakFile.read(last - first))
+            # ... and the matching minimum values
+            peakFile.seek(position + count + first)
+            minValues.fromstring(peakFile.read(last - first))
+        finally:
+            # Close the Peak File
+            peakFile.close()
+        # Initialize the results
+        columnMax = []
+        columnMin = []
+        # For each column ...
+        for column in range(columns):
+            # ... determine which peak values overlap the column, relative to the data we read.  (Rounding the
+            #     end up means a peak on a column boundary shows in both columns rather than being lost.)
+            lo = int((startFrame + column * framesPerColumn) / factor) - first
+            hi = max(lo + 1, int((startFrame + (column + 1) * framesPerColumn + factor - 1) / factor) - first)
+            # If we've run out of data, stop
+            if lo >= len(maxValues):
+                break
+            # Add the column's peaks to the results
+            columnMax.append(max(maxValues[lo:hi]))
+            columnMin.append(min(minValues[lo:hi]))
+        # Return the results
+        return (columnMax, columnMin)
+
+
+def GetPeakCache(waveFilename):
+    """ Return a PeakCache for the specified Wave File, building the Peak File if it is missing or out of date.
+        Returns None if no Peak File can be used, in which case the Wave File should be read directly. """
+    # Get the name of the Peak File
+    peakFilename = GetPeakFilename(waveFilename)
+    try:
+        # If a Peak File exists ...
+        if os.path.exists(peakFilename):
+            # ... open it
+            cache = PeakCache(peakFilename)
+            # If it still matches the Wave File, we can use it
+            if cache.IsCurrent(waveFilename):
+                return cache
+        # If we don't have a usable Peak File, build one.  If that's not possible, signal the caller.
+        if not BuildPeakFile(waveFilename):
+            return None
+        # Open and return the new Peak File
+        return PeakCache(peakFilename)
+    # If anything goes wrong (a read-only Waveforms directory, a damaged Peak File) ...
+    except:
+        if DEBUG:
+            import traceback
+            traceback.print_exc(file=sys.stdout)
+        # ... the Wave File can still be drawn the slow way.
+        return None
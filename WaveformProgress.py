@@ -24,7 +24,11 @@ if DEBUG:
     print "WaveformProgres DEBUG is ON!!!!!"
 
 import wx      # import wxPython
+# import Python's multiprocessing module so we can tell how many processors are available
+import multiprocessing
 import os, sys
+# import Python's regular expression module
+import re
 # import Python's time module
 import time
 
@@ -32,13 +36,140 @@ if __name__ == '__main__':
     # This module expects i18n.  Enable it here.
     __builtins__._ = wx.GetTranslation
 
+# Import Transana's Dialogs
+import Dialogs
 # Import Transana's Miscellaneous functions
 import Misc
 # Import Transana's Global Variables
 import TransanaGlobal
+# Import Transana's Waveform Peak Cache
+import WaveformPeaks
 
 ID_BTNCANCEL    =  wx.NewId()
 
+# A wave file this size or smaller holds no audio, only the RIFF header
+WAVE_HEADER_SIZE = 44
+# The sampling rate of extracted audio
+EXTRACTION_FRAME_RATE = 2756
+# The number of FFmpeg messages shown for each file whose batch extraction failed
+FAILED_FILE_MESSAGE_LINES = 5
+
+
+def GetAudioExtractionCommand():
+    """ Return the FFmpeg command used for Audio Extraction, with a %s placeholder for the media file name.
+        The audio is sent to standard output so the Wave File and its Peak File can be written in one pass. """
+    # -i              input file
+    # -vn             disable video
+    # -ar 2756        Audio Sampling rate 2756 Hz
+    # -ac 1           Audio Channels 1 (mono)
+    # -acodec pcm_u8  8-bit PCM audio codec
+    # -f u8           raw unsigned 8-bit output
+    # -               write to standard output
+    # (We can't use "-embedded" here, as its progress lines would be mixed in with the audio data.)
+    programStr = os.path.join(TransanaGlobal.programDir, 'ffmpeg_Transana')
+    if 'wxMSW' in wx.PlatformInfo:
+        programStr += '.exe'
+    return '"' +  programStr + '" "-i" "%s" "-vn" "-ar" "' + str(EXTRACTION_FRAME_RATE) + '" "-ac" "1" "-acodec" "pcm_u8" "-f" "u8" "-"'
+
+def WaveFileIsCurrent(mediaFilename, waveFilename):
+    """ Determine whether the extracted audio for a media file is up to date, by modification time and size """
+    # If there is no wave file, it's not current
+    if not os.path.exists(waveFilename):
+        return False
+    # A wave file with no audio data is left over from a failed or cancelled extraction
+    if os.path.getsize(waveFilename) <= WAVE_HEADER_SIZE:
+        return False
+    # A wave file older than its media file was extracted from an earlier version of the media
+    return os.path.getmtime(waveFilename) >= os.path.getmtime(mediaFilename)
+
+class AudioExtractionStream(object):
+    """ Receive the raw audio FFmpeg sends to standard output during Audio Extraction, writing the Wave File and
+        its Peak File as the data arrives, and track extraction progress from the data received. """
+
+    def __init__(self, waveFilename):
+        """ Create the Wave File for the extracted audio """
+        # Create the writer for the Wave File and Peak File
+        self.writer = WaveformPeaks.WaveAndPeakWriter(waveFilename, EXTRACTION_FRAME_RATE)
+        # Initialize the text FFmpeg sends to standard error
+        self.errorText = ''
+        # Initialize the media file duration, in seconds, which FFmpeg reports on standard error
+        self.duration = 0.0
+
+    def ReadOutput(self, process, timeLimit=0):
+        """ Process the output that is waiting from the FFmpeg process.  If timeLimit is not 0, stop after that
+            many seconds so the user interface stays responsive.  Otherwise, read all available data. """
+        # Note when we started
+        startTime = time.time()
+        # Get the process input stream, which carries the audio data
+        stream = process.GetInputStream()
+        # While there is audio data waiting ...
+        while stream and stream.CanRead():
+            # ... read it
+            data = stream.read(65536)
+            # If nothing was read, stop
+            if not data:
+                break
+            # Add the data to the Wave File and Peak File
+            self.writer.Write(data)
+            # If we've used up our time, stop
+            if (timeLimit > 0) and (time.time() - startTime > timeLimit):
+                break
+        # Get the process error stream
+        errStream = process.GetErrorStream()
+        # While there is text waiting ...
+        while errStream and errStream.CanRead():
+            # ... read it
+            text = errStream.read(4096)
+            # If nothing was read, stop
+            if not text:
+                break
+            # Add it to the error text
+            self.errorText += text
+        # If we don't know the media file duration yet, see if FFmpeg has reported it
+        if self.duration == 0.0:
+            match = re.search(r'Duration: (\d+):(\d+):(\d+(\.\d+)?)', self.errorText)
+            if match:
+                self.duration = int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3))
+
+    def GetProgress(self):
+        """ Return (percent, seconds processed, total seconds).  Total is 0 if the duration is not yet known. """
+        # Determine the number of seconds of audio received
+        seconds = float(self.writer.GetFrameCount()) / EXTRACTION_FRAME_RATE
+        # If we know the duration, calculate the percentage complete
+        if self.duration > 0:
+            percent = min(100.0, seconds / self.duration * 100.0)
+        else:
+            percent = 0.0
+        return (percent, seconds, self.duration)
+
+    def GetErrorMessages(self):
+        """ Return the non-blank lines FFmpeg sent to standard error """
+        # Split the text into lines, allowing for \r\n newlines
+        return [line for line in self.errorText.replace('\r\n', '\n').split('\n') if line != '']
+
+    def Finish(self):
+        """ Complete the Wave File and Peak File.  Returns False, removing the Wave File, if no audio was received. """
+        # If FFmpeg sent no audio, the extraction failed
+        if self.writer.GetFrameCount() == 0:
+            self.writer.Abort()
+            return False
+        # Otherwise, close the Wave File and save the Peak File
+        self.writer.Close()
+        return True
+
+    def Abort(self):
+        """ Discard the Wave File, as when extraction is cancelled """
+        self.writer.Abort()
+
+def GetDefaultProcessCount():
+    """ Return the default number of simultaneous audio extractions, which is the number of processors """
+    try:
+        return multiprocessing.cpu_count()
+    # Some platforms can't tell us how many processors there are
+    except NotImplementedError:
+        return 1
+
+
 
 class WaveformProgress(wx.Dialog):
     """ This class implements the Progress Dialog for Waveform Creation. 
@@ -71,6 +202,8 @@ class WaveformProgress(wx.Dialog):
 
         # Define the process variable
         self.process = None
+        # Define the audio stream variable, used for Audio Extraction
+        self.stream = None
         # Initialize a list to collect error messages
         self.errorMessages = []
 
@@ -157,6 +290,11 @@ class WaveformProgress(wx.Dialog):
             if result == 0:
                 # ... signal the calling routine through the Error Message process
                 self.errorMessages=['Cancelled']
+                # If we're writing the Destination File ourselves ...
+                if self.stream is not None:
+                    # ... discard it
+                    self.stream.Abort()
+                    self.stream = None
                 # Delete the Destination File, if it exists
                 if os.path.exists(self.destFile):
                     os.remove(self.destFile)
@@ -252,19 +390,10 @@ class WaveformProgress(wx.Dialog):
             
         # Build the command line for the appropriate media conversion call
         if mode == 'AudioExtraction':
-            # -i              input file
-            # -vn             disable video
-            # -ar 2756        Audio Sampling rate 2756 Hz
-            # -ab 8k          Audio Bitrate 8kb/s
-            # -ac 1           Audio Channels 1 (mono)
-            # -acodec pcm_u8  8-bit PCM audio codec
-            # -y              overwrite existing destination file
-            programStr = os.path.join(TransanaGlobal.programDir, 'ffmpeg_Transana')
-            if 'wxMSW' in wx.PlatformInfo:
-                programStr += '.exe'
-            process = '"' +  programStr + '" "-embedded" "1" "-i" "%s" "-vn" "-ar" "2756" "-ab" "8k" "-ac" "1" "-acodec" "pcm_u8" "-y" "%s"'
+            process = GetAudioExtractionCommand()
             tempMediaFilename = inputFile
-            tempWaveFilename = outputFile
+            # FFmpeg sends the audio to us, and we write the Wave File and its Peak File as it arrives
+            self.stream = AudioExtractionStream(outputFile)
         elif mode == 'AudioExtraction-OLD':
             programStr = os.path.join(TransanaGlobal.programDir, 'audioextract')
             if 'wxMSW' in wx.PlatformInfo:
@@ -295,17 +424,25 @@ class WaveformProgress(wx.Dialog):
         # Encode the filenames to UTF8 so that unicode files are handled properly
         process = process.encode('utf8')
 
+        # If we're writing the Wave File ourselves ...
+        if self.stream is not None:
+            # ... FFmpeg only needs the media file name
+            process = process % tempMediaFilename
+        # Otherwise ...
+        else:
+            # ... FFmpeg needs both file names
+            process = process % (tempMediaFilename, tempWaveFilename)
+
         if DEBUG:
             print "WaveformProgress.Extract():"
-            st = process % (tempMediaFilename, tempWaveFilename)
-            if isinstance(st, unicode):
-                print st.encode('utf8')
+            if isinstance(process, unicode):
+                print process.encode('utf8')
             else:
-                print st
+                print process
             print
 
         # Call the Audio Extraction program using wxExecute, capturing the output via wxProcess.  This call MUST be asynchronous. 
-        self.pid = wx.Execute(process % (tempMediaFilename, tempWaveFilename), wx.EXEC_ASYNC, self.process)
+        self.pid = wx.Execute(process, wx.EXEC_ASYNC, self.process)
 
         # On Windows ...
         if 'wxMSW' in wx.PlatformInfo:
@@ -314,8 +451,14 @@ class WaveformProgress(wx.Dialog):
 
         # Note the time when the progress bar started
         self.progressStartTime = time.time()
-        # Start the timer to get feedback and post progress
-        self.timer.Start(500)
+        # If we're receiving the audio data ...
+        if self.stream is not None:
+            # ... we need to collect it often, so FFmpeg isn't kept waiting
+            self.timer.Start(50)
+        # Otherwise ...
+        else:
+            # ... we only need to check for progress feedback
+            self.timer.Start(500)
 
         # Show the Progress Dialog modally
         self.ShowModal()
@@ -326,10 +469,21 @@ class WaveformProgress(wx.Dialog):
         self.timer.Stop()
         # If the process exists ...
         if self.process is not None:
+            # If we're receiving the audio data ...
+            if self.stream is not None:
+                # ... collect whatever remains
+                self.stream.ReadOutput(self.process)
+                # ... keep what FFmpeg reported
+                self.errorMessages += self.stream.GetErrorMessages()
+                # ... and complete the Wave File and Peak File.  (If no audio was received, the Wave File is removed,
+                #     so the calling routine can see that the extraction failed.)
+                self.stream.Finish()
+                self.stream = None
             # Get the Process Error Stream
             errStream = self.process.GetErrorStream()
-            # If the stream exists and can be read ...
-            if errStream and errStream.CanRead():
+            # If the stream exists and can be read, and the user didn't cancel ...
+            # (Cancellation is signalled to the calling routine by "Cancelled" being the only error message.)
+            if errStream and errStream.CanRead() and (self.errorMessages != ['Cancelled']):
                 # ... read the stream
                 text = errStream.read()
                 # If the newlines are in the form of \r\n, we need to replace them with \n only for Python.
@@ -351,8 +505,16 @@ class WaveformProgress(wx.Dialog):
 
     def OnTimer(self, event):
         """ Handle the EVT_TIMER event, which updates the progress dialog """
+        # If we're receiving the audio data ...
+        if (self.process is not None) and (self.stream is not None):
+            # ... collect the data that's waiting, leaving time for the interface to respond
+            self.stream.ReadOutput(self.process, timeLimit=0.2)
+            # Determine our progress from the amount of audio received
+            (percent, seconds, total) = self.stream.GetProgress()
+            # Report the progress
+            self.Update(long(percent), long(seconds), int(total))
         # If the process exists ...
-        if self.process is not None:
+        elif self.process is not None:
             # Get the process input stream
             stream = self.process.GetInputStream()
             # If the stream can be read ...
@@ -401,6 +563,297 @@ class WaveformProgress(wx.Dialog):
                     # ... just do output so I'll notice during testing and handle it!
 #                    print ' WaveformProgress.OnTimer() --> ', progress
 
+
+class BatchWaveformProgress(wx.Dialog):
+    """ This class implements the Progress Dialog for Batch Waveform Creation.  It performs audio extraction for a
+        list of files, running several extractions at once, and reports the progress of the batch as a whole.
+        To use it, you create it, call the Extract() method, which shows it modally, and then Destroy() it. """
+
+    def __init__(self, parent, fileList, maxProcesses=0):
+        """ Initialize the Batch Progress Dialog.  fileList is a list of (media file, wave file) tuples.
+            maxProcesses is the number of extractions to run at once, defaulting to the number of processors. """
+
+        # Reset the Locale, for the same reason as in the WaveformProgress dialog above.
+        self.locale = wx.Locale(TransanaGlobal.menuWindow.locale.Language)
+
+        # Remember the files waiting for extraction
+        self.queue = list(fileList)
+        # Remember the total number of files
+        self.fileCount = len(fileList)
+        # Determine the number of extractions to run at once
+        if maxProcesses <= 0:
+            maxProcesses = GetDefaultProcessCount()
+        self.maxProcesses = maxProcesses
+        # Initialize a dictionary of the running extractions, keyed by process ID
+        self.processes = {}
+        # Initialize the number of completed extractions
+        self.filesCompleted = 0
+        # Note that we have not been cancelled
+        self.cancelled = False
+        # Initialize a list to collect error messages
+        self.errorMessages = []
+        # Initialize a list of the files whose extraction failed, with the messages for each
+        self.failedFiles = []
+
+        # Encode the prompt
+        prompt = unicode(_('Media File Conversion Progress'), 'utf8')
+        # Define the Dialog Box.
+        wx.Dialog.__init__(self, parent, -1, prompt, size=(400, 160), style=wx.CAPTION | wx.STAY_ON_TOP)
+
+        # To look right, the Mac needs the Small Window Variant.
+        if "__WXMAC__" in wx.PlatformInfo:
+            self.SetWindowVariant(wx.WINDOW_VARIANT_SMALL)
+
+        # Create the main Sizer, which is Vertical
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        # Create a horizontal sizer for the text below the progress bar.
+        fileSizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        # Create a label showing the files currently being processed
+        self.lbl = wx.StaticText(self, -1, '', style=wx.ST_NO_AUTORESIZE)
+        sizer.Add(self.lbl, 0, wx.EXPAND | wx.ALL, 10)
+
+        # Progress Bar
+        self.progressBar = wx.Gauge(self, -1, 100, style=wx.GA_HORIZONTAL | wx.GA_SMOOTH)
+        sizer.Add(self.progressBar, 0, wx.ALIGN_CENTER | wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+
+        # Files Processed label
+        # Encode the prompt
+        prompt = unicode(_("%d of %d files processed"), 'utf8')
+        self.lblFiles = wx.StaticText(self, -1, prompt % (0, self.fileCount), style=wx.ST_NO_AUTORESIZE)
+        fileSizer.Add(self.lblFiles, 1, wx.ALIGN_LEFT | wx.LEFT | wx.RIGHT | wx.TOP, 10)
+
+        # Percent Processed label
+        self.lblPercent = wx.StaticText(self, -1, "%3d %%" % 0, style=wx.ST_NO_AUTORESIZE | wx.ALIGN_RIGHT)
+        fileSizer.Add(self.lblPercent, 0, wx.ALIGN_RIGHT | wx.LEFT | wx.RIGHT | wx.TOP, 10)
+        sizer.Add(fileSizer, 1, wx.EXPAND)
+
+        elapsedSizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        # Time Elapsed label
+        # Encode the prompt
+        prompt = unicode(_("%s elapsed"), 'utf8')
+        self.lblElapsed = wx.StaticText(self, -1, prompt % '0:00:00', style=wx.ST_NO_AUTORESIZE | wx.ALIGN_LEFT)
+        elapsedSizer.Add(self.lblElapsed, 0, wx.ALIGN_LEFT | wx.LEFT, 10)
+        elapsedSizer.Add((0, 5), 1, wx.EXPAND)
+
+        # Time Remaining label
+        # Encode the prompt
+        prompt = unicode(_("%s remaining"), 'utf8')
+        self.lblRemaining = wx.StaticText(self, -1, prompt % '0:00:00', style=wx.ST_NO_AUTORESIZE | wx.ALIGN_RIGHT)
+        elapsedSizer.Add(self.lblRemaining, 0, wx.ALIGN_RIGHT | wx.RIGHT, 10)
+        sizer.Add(elapsedSizer, 1, wx.EXPAND | wx.BOTTOM, 4)
+
+        # Cancel button
+        # Encode the prompt
+        prompt = unicode(_("Cancel"), 'utf8')
+        self.btnCancel = wx.Button(self, -1, prompt)
+        sizer.Add(self.btnCancel, 0, wx.ALIGN_CENTER | wx.BOTTOM, 10)
+        self.btnCancel.Bind(wx.EVT_BUTTON, self.OnInterrupt)
+
+        self.SetSizer(sizer)
+        # Set this as the minimum size for the form.
+        sizer.SetMinSize(wx.Size(400, 180))
+        # Call Layout to "place" the widgits
+        self.Layout()
+        self.SetAutoLayout(True)
+        self.Fit()
+
+        # Create a Timer that will check for progress feedback
+        self.timer = wx.Timer()
+        self.timer.Bind(wx.EVT_TIMER, self.OnTimer)
+
+        self.CenterOnScreen()
+
+    def GetErrorMessages(self):
+        """ Return the error messages from all the extractions """
+        # Return the error messages list
+        return self.errorMessages
+
+    def Extract(self):
+        """ Perform Audio Extraction for all the files, showing the dialog modally until they are done. """
+        # If there's nothing to do, we're done.
+        if self.fileCount == 0:
+            return
+        # Be prepared to capture the wxProcess objects' EVT_END_PROCESS
+        self.Bind(wx.EVT_END_PROCESS, self.OnEndProcess)
+        # Note the time when the progress bar started
+        self.progressStartTime = time.time()
+        # Start as many extractions as we're allowed to run at once
+        self.StartExtractions()
+        # If any extractions are running ...
+        if len(self.processes) > 0:
+            # ... start the timer to collect the audio data and post progress
+            self.timer.Start(50)
+            # ... and show the Progress Dialog modally.  (If none could be started, no process will ever end to
+            #     close the dialog, so we don't show it.)
+            self.ShowModal()
+        # Tell the user about any files that could not be processed
+        self.ShowFailedFiles()
+
+    def StartExtractions(self):
+        """ Start extractions for the files in the queue until we're running as many as we're allowed to, or the
+            queue is empty.  (Files whose extraction can't be started are skipped.) """
+        while (len(self.queue) > 0) and (len(self.processes) < self.maxProcesses):
+            self.StartNextExtraction()
+
+    def StartNextExtraction(self):
+        """ Start the audio extraction for the next file in the queue """
+        # Get the next file from the queue
+        (mediaFilename, waveFilename) = self.queue.pop(0)
+        # Get the Audio Extraction command, encoded to UTF8 so that unicode files are handled properly
+        process = GetAudioExtractionCommand().encode('utf8')
+        # Create the Wave File, which we write as FFmpeg sends us the audio data
+        stream = AudioExtractionStream(waveFilename)
+        # Windows requires that we change the default encoding for Python for the audio extraction code to work
+        # properly with Unicode files.  (See WaveformProgress.Extract().)
+        if 'wxMSW' in wx.PlatformInfo:
+            wx.SetDefaultPyEncoding('mbcs')
+        # Create a wxProcess object, which sends its events to this dialog
+        wxProcess = wx.Process(self)
+        # Call the wxProcess Object's Redirect method.  This allows us to capture the process's output!
+        wxProcess.Redirect()
+        # Call the Audio Extraction program.  This call MUST be asynchronous.
+        pid = wx.Execute(process % mediaFilename, wx.EXEC_ASYNC, wxProcess)
+        # On Windows ...
+        if 'wxMSW' in wx.PlatformInfo:
+            # ... reset the default Python encoding to UTF-8
+            wx.SetDefaultPyEncoding('utf_8')
+        # If the process could not be started ...
+        if pid == 0:
+            # ... note the problem
+            self.errorMessages.append('%s:  %s' % (mediaFilename, _('Audio extraction could not be started.')))
+            self.failedFiles.append((mediaFilename, [unicode(_('Audio extraction could not be started.'), 'utf8')]))
+            # ... count the file as done
+            self.filesCompleted += 1
+            # ... discard the empty Wave File
+            stream.Abort()
+            # ... and clean up the process object
+            wxProcess.Destroy()
+        # If the process is running ...
+        else:
+            # ... remember it
+            self.processes[pid] = {'process' : wxProcess, 'stream' : stream, 'mediaFilename' : mediaFilename,
+                                   'waveFilename' : waveFilename, 'percent' : 0.0}
+        # Show which files are being processed
+        self.UpdateFileLabel()
+
+    def ShowFailedFiles(self):
+        """ Show the messages for each file whose extraction failed, unless the user cancelled """
+        # If the user cancelled, or nothing failed, there's nothing to report
+        if self.cancelled or (len(self.failedFiles) == 0):
+            return
+        # Encode the prompt
+        msg = unicode(_("Audio extraction failed for the following files:"), 'utf8') + "\n"
+        # For each file that failed ...
+        for (mediaFilename, messages) in self.failedFiles:
+            # ... add the file name ...
+            msg += "\n" + mediaFilename + "\n"
+            # ... and the last few messages for the file, which describe the problem
+            for line in messages[-FAILED_FILE_MESSAGE_LINES:]:
+                if isinstance(line, str):
+                    line = unicode(line, sys.getfilesystemencoding(), 'replace')
+                msg += "    " + line + "\n"
+        # Display the messages
+        errordlg = Dialogs.ErrorDialog(self, msg)
+        errordlg.ShowModal()
+        errordlg.Destroy()
+
+    def UpdateFileLabel(self):
+        """ Show the names of the files currently being processed """
+        # Build a list of the names of the media files being processed, sorted for a stable display
+        names = [os.path.split(job['mediaFilename'])[1] for job in self.processes.values()]
+        names.sort()
+        # Display the names
+        self.lbl.SetLabel('\n'.join(names))
+
+    def OnInterrupt(self, event):
+        """ Cancel Button Event Handler """
+        # Disable the Cancel button to prevent multiple presses while processing occurs
+        self.btnCancel.Enable(False)
+        # Signal that we've been cancelled
+        self.cancelled = True
+        # Don't start any more extractions
+        self.queue = []
+        # Signal the calling routine through the Error Message process
+        self.errorMessages = ['Cancelled']
+        # Kill all the running processes.  Partial wave files are discarded when each process ends.
+        for (pid, job) in self.processes.items():
+            job['process'].Kill(pid, wx.SIGKILL, wx.KILL_NOCHILDREN)
+        # If nothing was running, we're done
+        if len(self.processes) == 0:
+            self.Close()
+
+    def OnEndProcess(self, event):
+        """ End of wx.Process event handler, called as each extraction finishes """
+        # Find the extraction that just ended
+        job = self.processes.pop(event.GetPid(), None)
+        # If it's one of ours ...
+        if job is not None:
+            # If we were cancelled ...
+            if self.cancelled:
+                # ... discard the partial wave file
+                job['stream'].Abort()
+            # Otherwise ...
+            else:
+                # ... collect whatever audio data remains
+                job['stream'].ReadOutput(job['process'])
+                # ... keep what FFmpeg reported
+                self.errorMessages += job['stream'].GetErrorMessages()
+                # ... and complete the Wave File and its Peak File.  If no audio was received, the extraction failed.
+                if not job['stream'].Finish():
+                    self.failedFiles.append((job['mediaFilename'], job['stream'].GetErrorMessages()))
+            # Destroy the now-completed process
+            job['process'].Destroy()
+            # Count the file as completed
+            self.filesCompleted += 1
+        # If there are files waiting, start the next ones.  (If one can't be started, we keep going, so the dialog
+        # isn't closed while files are still waiting.)
+        self.StartExtractions()
+        # Show the files still being processed
+        self.UpdateFileLabel()
+        # Show our progress
+        self.UpdateProgress()
+        # If all the extractions are done ...
+        if len(self.processes) == 0:
+            # ... stop the Progress Timer
+            self.timer.Stop()
+            # ... and close the Progress Dialog
+            self.Close()
+
+    def OnTimer(self, event):
+        """ Handle the EVT_TIMER event, which collects the audio data from each extraction and updates the progress dialog """
+        # For each running extraction ...
+        for job in self.processes.values():
+            # ... collect the data that's waiting, sharing the time available between the extractions
+            job['stream'].ReadOutput(job['process'], timeLimit=0.2 / len(self.processes))
+            # ... and remember the percentage this extraction has completed
+            job['percent'] = job['stream'].GetProgress()[0]
+        # Show our progress
+        self.UpdateProgress()
+
+    def UpdateProgress(self):
+        """ Display the progress of the batch as a whole """
+        # Completed files count fully, and running extractions count by how far along they are
+        percent = 100.0 * (self.filesCompleted + sum([job['percent'] / 100.0 for job in self.processes.values()])) / self.fileCount
+        # Update the Progress Bar
+        self.progressBar.SetValue(int(percent))
+        # Update the number of files processed
+        self.lblFiles.SetLabel(_("%d of %d files processed") % (self.filesCompleted, self.fileCount))
+        # Display % processed
+        self.lblPercent.SetLabel("%d %%" % percent)
+        # If we've made SOME progress ...
+        if percent > 0:
+            # ... calculate time elapsed ...
+            t1 = (time.time() - self.progressStartTime)
+            # ... calculate total estimated time for completion
+            t2 = t1 * 100.0 / percent
+            # Display elapsed time
+            self.lblElapsed.SetLabel(_("%s elapsed") % Misc.TimeMsToStr(t1 * 1000))
+            # Display time remaining
+            self.lblRemaining.SetLabel(_("%s remaining") % Misc.TimeMsToStr((t2 - t1) * 1000))
+
+
 # If running in stand-alone mode for testing ...
 if __name__ == '__main__':
     # Create a PySimpleApp
@@ -38,6 +38,8 @@ import Collection
 import CoreData
 import DBInterface
 import Dialogs
+import KeywordIndex
+import SearchCache
 import Episode
 import KeywordObject as Keyword
 import Misc
@@ -56,6 +58,25 @@ import re
 # import Python's cPickle module
 import cPickle
 
+# Register the Named Queries used for each record of the import, so they only need to be prepared once
+DBInterface.RegisterQuery('XMLImport.AdditionalVids',
+                          "INSERT INTO AdditionalVids2 (EpisodeNum, ClipNum, MediaFile, VidLength, Offset, Audio) VALUES (%s, %s, %s, %s, %s, %s)")
+DBInterface.RegisterQuery('XMLImport.SnapshotKeyword',
+                          """ INSERT INTO SnapshotKeywords2
+                                (SnapshotNum, KeywordGroup, Keyword, x1, y1, x2, y2, visible)
+                              VALUES
+                                (%s, %s, %s, %s, %s, %s, %s, %s) """)
+DBInterface.RegisterQuery('XMLImport.SnapshotKeywordStyle',
+                          """ INSERT INTO SnapshotKeywordStyles2
+                                (SnapshotNum, KeywordGroup, Keyword, DrawMode, LineColorName, LineColorDef, LineWidth, LineStyle)
+                              VALUES
+                                (%s, %s, %s, %s, %s, %s, %s, %s) """)
+DBInterface.RegisterQuery('XMLImport.Filter',
+                          """ INSERT INTO Filters2
+                                (ReportType, ReportScope, ConfigName, FilterDataType, FilterData)
+                              VALUES
+                                (%s, %s, %s, %s, %s) """)
+
 MENU_FILE_EXIT = wx.NewId()
 
 class XMLImport(Dialogs.GenForm):
@@ -687,17 +708,14 @@ class XMLImport(Dialogs.GenForm):
                                if not currentObj.has_key('Audio'):
                                    currentObj['Audio'] = 0
 
-                               # Define the query to insert the additional media files into the databse
-                               query = "INSERT INTO AdditionalVids2 (EpisodeNum, ClipNum, MediaFile, VidLength, Offset, Audio) VALUES (%s, %s, %s, %s, %s, %s)"
-                               query = DBInterface.FixQuery(query)
                                # Substitute the generic OS seperator "/" for the Windows "\".
                                tmpFilename = currentObj['MediaFile'].replace('\\', '/')
                                # Encode the filename
                                tmpFilename = tmpFilename.encode(TransanaGlobal.encoding)
                                # Get the data for each insert query
                                data = (currentObj['EpisodeNum'], currentObj['ClipNum'], tmpFilename, currentObj['VidLength'], currentObj['Offset'], currentObj['Audio'])
-                               # Execute the query
-                               dbCursor.execute(query, data)
+                               # Execute the query to insert the additional media files into the databse
+                               DBInterface.ExecuteQuery(dbCursor, 'XMLImport.AdditionalVids', data)
 
                            elif  objectType == 'CoreData':
                                currentObj.number = 0
@@ -727,13 +745,7 @@ class XMLImport(Dialogs.GenForm):
 
                            elif objectType == 'SnapshotKeyword':
                                if self.snapshotKeyword['SnapshotNum'] > 0:
-                                   # Create the query to save the Snapshot Keyword record    
-                                   query = """ INSERT INTO SnapshotKeywords2
-                                                 (SnapshotNum, KeywordGroup, Keyword, x1, y1, x2, y2, visible)
-                                               VALUES
-                                                 (%s, %s, %s, %s, %s, %s, %s, %s) """
-                                   query = DBInterface.FixQuery(query)
-                                   # Build the values to match the query
+                                   # Build the values to match the query to save the Snapshot Keyword record
                                    values = (self.snapshotKeyword['SnapshotNum'],
                                              self.snapshotKeyword['KeywordGroup'].encode('utf8'),
                                              self.snapshotKeyword['Keyword'].encode('utf8'),
@@ -742,19 +754,13 @@ class XMLImport(Dialogs.GenForm):
                                              self.snapshotKeyword['X2'],
                                              self.snapshotKeyword['Y2'],
                                              self.snapshotKeyword['Visible'])
-                                   # Save the Filter data
+                                   # Save the Snapshot Keyword data
                                    if db != None:
-                                       dbCursor.execute(query, values)
+                                       DBInterface.ExecuteQuery(dbCursor, 'XMLImport.SnapshotKeyword', values)
                                    
                            elif objectType == 'SnapshotKeywordStyle':
                                if self.snapshotKeywordStyle['SnapshotNum'] > 0:
-                                   # Create the query to save the Snapshot Keyword Style record    
-                                   query = """ INSERT INTO SnapshotKeywordStyles2
-                                                 (SnapshotNum, KeywordGroup, Keyword, DrawMode, LineColorName, LineColorDef, LineWidth, LineStyle)
-                                               VALUES
-                                                 (%s, %s, %s, %s, %s, %s, %s, %s) """
-                                   query = DBInterface.FixQuery(query)
-                                   # Build the values to match the query
+                                   # Build the values to match the query to save the Snapshot Keyword Style record
                                    values = (self.snapshotKeywordStyle['SnapshotNum'],
                                              self.snapshotKeywordStyle['KeywordGroup'].encode('utf8'),
                                              self.snapshotKeywordStyle['Keyword'].encode('utf8'),
@@ -763,9 +769,9 @@ class XMLImport(Dialogs.GenForm):
                                              self.snapshotKeywordStyle['ColorDef'],
                                              self.snapshotKeywordStyle['LineWidth'],
                                              self.snapshotKeywordStyle['LineStyle'])
-                                   # Save the Filter data
+                                   # Save the Snapshot Keyword Style data
                                    if db != None:
-                                       dbCursor.execute(query, values)
+                                       DBInterface.ExecuteQuery(dbCursor, 'XMLImport.SnapshotKeywordStyle', values)
                                    
                            elif objectType == 'Filter':
                                # Starting with XML Version 1.3, we have to deal with encoding issues for the Filter data
@@ -845,12 +851,6 @@ class XMLImport(Dialogs.GenForm):
                                                filterData.append((collNum, dataRec[1]))
                                    # Now re-pickle the filter data
                                    self.FilterFilterData = cPickle.dumps(filterData)
-                               # Create the query to save the Filter record    
-                               query = """ INSERT INTO Filters2
-                                               (ReportType, ReportScope, ConfigName, FilterDataType, FilterData)
-                                             VALUES
-                                               (%s, %s, %s, %s, %s) """
-                               query = DBInterface.FixQuery(query)
 
 #                               print 'XMLImport: Saving Filter Record:', self.FilterReportType, self.FilterScope, \
 #                                     self.FilterConfigName, self.FilterFilterDataType, type(self.FilterFilterData)
@@ -860,7 +860,7 @@ class XMLImport(Dialogs.GenForm):
                                          self.FilterFilterData)
                                # Save the Filter data
                                if db != None:
-                                   dbCursor.execute(query, values)
+                                   DBInterface.ExecuteQuery(dbCursor, 'XMLImport.Filter', values)
                        except:
 
                            if DEBUG or DEBUG_Exceptions:
@@ -1843,6 +1843,10 @@ class XMLImport(Dialogs.GenForm):
 
                # If we made it this far, we can commit the database transaction
                SQLText = 'COMMIT'
+               # The imported records' keywords aren't in the Keyword Index
+               KeywordIndex.Clear()
+               # ... and the imported records aren't in cached Search results
+               SearchCache.Clear()
            else:
                # If contin is False, there's been an error and we should roll back the database transaction
                SQLText = 'ROLLBACK'
@@ -0,0 +1,461 @@
+import wx
+
+# This module expects i18n.  Enable it here.
+__builtins__._ = wx.GetTranslation
+
+import DBInterface
+import KeywordIndex
+import KeywordMapData
+import SearchCache
+import TemporalSearch
+import TextIndex
+import TransanaConstants
+import TransanaGlobal
+
+
+class FormCheck(wx.Frame):
+    """ This window runs the tests of Transana's in-memory indexes and caches, which don't need a database. """
+    def __init__(self,parent,id,title):
+
+        wx.Frame.__init__(self,parent,-1, title, size = (800,600), style=wx.DEFAULT_FRAME_STYLE|wx.NO_FULL_REPAINT_ON_RESIZE)
+        self.testsRun = 0
+        self.testsSuccessful = 0
+        self.testsFailed = 0
+
+        mainSizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.txtCtrl = wx.TextCtrl(self, -1, "Unit Test:  Indexes and Caches\n\n", style=wx.TE_LEFT | wx.TE_MULTILINE)
+        self.txtCtrl.AppendText("Transana Version:  %s     singleUserVersion:  %s\n\n" % (TransanaConstants.versionNumber, TransanaConstants.singleUserVersion))
+
+        mainSizer.Add(self.txtCtrl, 1, wx.EXPAND | wx.ALL, 5)
+
+        self.SetSizer(mainSizer)
+        self.SetAutoLayout(True)
+        self.Layout()
+        self.CenterOnScreen()
+        # Status Bar
+        self.CreateStatusBar()
+        self.SetStatusText("")
+        self.Show(True)
+        self.RunTests()
+
+    def RunTests(self):
+        # Tests defined:
+        testsNotToSkip = []
+        startAtTest = 1  # Should start at 1, not 0!
+        endAtTest = 500   # Should be one more than the last test to be run!
+        testsToRun = testsNotToSkip + range(startAtTest, endAtTest)
+
+        # Keyword Map rows for the Interval Index tests.  Entries are (type, start, end, number, name).
+        clipList = {('Demo', 'A') : [('Clip', 1000, 5000, 1, 'Clip 1'),
+                                     ('Clip', 4000, 9000, 2, 'Clip 2'),
+                                     ('Snapshot', 6000, 6000, 3, 'Snapshot 3'),
+                                     ('Clip', 20000, 30000, 4, 'Clip 4')],
+                    ('Demo', 'B') : [('Clip', 0, 100000, 5, 'Clip 5')]}
+
+        if 10 in testsToRun:
+            # FindClips() before the Keyword Clip List is indexed
+            testName = 'KeywordMapData.FindClips() : Row not indexed'
+            self.SetStatusText(testName)
+            mapData = KeywordMapData.KeywordMapData()
+            mapData.ResetKeywordMapData()
+            mapData.keywordClipList = clipList
+            self.CheckTest(mapData.FindClips(('Demo', 'A'), 2000) == [], testName)
+
+        if 11 in testsToRun:
+            # FindClips() finds the Clip under a point
+            testName = 'KeywordMapData.FindClips() : Clip under a point'
+            self.SetStatusText(testName)
+            mapData = KeywordMapData.KeywordMapData()
+            mapData.ResetKeywordMapData()
+            mapData.keywordClipList = clipList
+            mapData.IndexKeywordClipList()
+            self.CheckTest((mapData.FindClips(('Demo', 'A'), 2000) == [clipList[('Demo', 'A')][0]]) and
+                           (mapData.FindClips(('Demo', 'A'), 25000) == [clipList[('Demo', 'A')][3]]) and
+                           (mapData.FindClips(('Demo', 'B'), 25000) == [clipList[('Demo', 'B')][0]]) and
+                           (mapData.FindClips(('Demo', 'A'), 15000) == []) and
+                           (mapData.FindClips(('Demo', 'C'), 2000) == []), testName)
+
+        if 12 in testsToRun:
+            # FindClips() returns overlapping Clips in their original order
+            testName = 'KeywordMapData.FindClips() : Overlapping Clips'
+            self.SetStatusText(testName)
+            self.CheckTest(mapData.FindClips(('Demo', 'A'), 4500) == clipList[('Demo', 'A')][:2], testName)
+
+        if 13 in testsToRun:
+            # FindClips() only includes the ends of Clips when inclusive is True
+            testName = 'KeywordMapData.FindClips() : Inclusive'
+            self.SetStatusText(testName)
+            self.CheckTest((mapData.FindClips(('Demo', 'A'), 5000) == [clipList[('Demo', 'A')][1]]) and
+                           (mapData.FindClips(('Demo', 'A'), 5000, inclusive=True) == clipList[('Demo', 'A')][:2]) and
+                           (mapData.FindClips(('Demo', 'A'), 6000) == [clipList[('Demo', 'A')][1]]) and
+                           (mapData.FindClips(('Demo', 'A'), 6000, inclusive=True) == [clipList[('Demo', 'A')][1], clipList[('Demo', 'A')][2]]), testName)
+
+        # Database values as the database returns them.  MySQLdb returns each byte of UTF-8 data as a separate
+        # character, while sqlite returns UTF-8 strings.
+        if TransanaConstants.DBInstalled in ['MySQLdb-embedded', 'MySQLdb-server']:
+            dbValues = [u'Caf\xc3\xa9', u'\xe4\xba\xb0 \xe4\xba\xb0', u'plain', u'', 42]
+        else:
+            dbValues = ['Caf\xc3\xa9', '\xe4\xba\xb0 \xe4\xba\xb0', 'plain', '', 42]
+
+        if 20 in testsToRun:
+            # ProcessDBDataForUTF8Encoding() gives the same results as the character-by-character version
+            testName = 'DBInterface.ProcessDBDataForUTF8Encoding()'
+            self.SetStatusText(testName)
+            self.CheckTest([DBInterface.ProcessDBDataForUTF8Encoding(value) for value in dbValues] ==
+                           [DBInterface.ProcessDBDataForUTF8EncodingLegacy(value) for value in dbValues], testName)
+
+        if 21 in testsToRun:
+            # ProcessDBDataForUTF8Encoding() decodes multi-byte characters
+            testName = 'DBInterface.ProcessDBDataForUTF8Encoding() : Multi-byte characters'
+            self.SetStatusText(testName)
+            self.CheckTest((DBInterface.ProcessDBDataForUTF8Encoding(dbValues[0]) == u'Caf\xe9') and
+                           (DBInterface.ProcessDBDataForUTF8Encoding(dbValues[1]) == u'\u4eb0 \u4eb0'), testName)
+
+        if 22 in testsToRun:
+            # ProcessDBColumnForUTF8Encoding() gives the same results as decoding the values one at a time
+            testName = 'DBInterface.ProcessDBColumnForUTF8Encoding()'
+            self.SetStatusText(testName)
+            self.CheckTest((DBInterface.ProcessDBColumnForUTF8Encoding(dbValues) ==
+                            [DBInterface.ProcessDBDataForUTF8Encoding(value) for value in dbValues]) and
+                           (DBInterface.ProcessDBColumnForUTF8Encoding([]) == []) and
+                           (DBInterface.ProcessDBColumnForUTF8Encoding(dbValues[:1]) == [u'Caf\xe9']), testName)
+
+        if 30 in testsToRun:
+            # NamedRow values can be read by field name and by position
+            testName = 'DBInterface.NamedRow : Field names and positions'
+            self.SetStatusText(testName)
+            rowClass = DBInterface.named_row_class((('ClipNum', ), ('ClipID', ), ('CollectNum', )))
+            row = rowClass((5, u'Clip 5', 2))
+            self.CheckTest((row['ClipID'] == u'Clip 5') and (row[0] == 5) and (row[-1] == 2) and
+                           (tuple(row) == (5, u'Clip 5', 2)) and (len(row) == 3), testName)
+
+        if 31 in testsToRun:
+            # NamedRows can be used like the dictionaries they replace
+            testName = 'DBInterface.NamedRow : Dictionary methods'
+            self.SetStatusText(testName)
+            self.CheckTest((row.has_key('CollectNum')) and (not row.has_key('SnapshotNum')) and
+                           (row.get('ClipNum') == 5) and (row.get('SnapshotNum', 0) == 0) and
+                           (row.keys() == ['ClipNum', 'ClipID', 'CollectNum']) and
+                           (row.values() == [5, u'Clip 5', 2]) and
+                           (row.items() == [('ClipNum', 5), ('ClipID', u'Clip 5'), ('CollectNum', 2)]), testName)
+
+        if 32 in testsToRun:
+            # The row class is created once for each set of field names, and the last column with a name wins
+            testName = 'DBInterface.named_row_class()'
+            self.SetStatusText(testName)
+            duplicateClass = DBInterface.named_row_class((('Num', ), ('Num', )))
+            self.CheckTest((DBInterface.named_row_class((('ClipNum', ), ('ClipID', ), ('CollectNum', ))) is rowClass) and
+                           (duplicateClass((1, 2))['Num'] == 2), testName)
+
+        if 33 in testsToRun:
+            # fetchall_named() and fetch_named() return NamedRows
+            testName = 'DBInterface.fetchall_named() and fetch_named()'
+            self.SetStatusText(testName)
+            dbCursor = TestCursor((('SeriesNum', ), ('SeriesID', )), [(1, u'Series 1'), (2, u'Series 2')])
+            rows = DBInterface.fetchall_named(dbCursor)
+            dbCursor = TestCursor((('SeriesNum', ), ('SeriesID', )), [])
+            self.CheckTest(([row['SeriesID'] for row in rows] == [u'Series 1', u'Series 2']) and
+                           (DBInterface.fetch_named(dbCursor) == {}), testName)
+
+        # Keyword assignments for the Keyword Index tests.  Entries are (num, kwg, kw) by object type.
+        keywordAssignments = TestKeywordAssignments({'Episode' : [(1, 'Demo', 'A')],
+                                                     'Clip' : [(1, 'Demo', 'A'), (2, 'Demo', 'A'), (2, 'Demo', 'B')],
+                                                     'Snapshot' : [(1, 'Demo', 'C')],
+                                                     'SnapshotCoding' : [(1, 'Demo', 'C')]})
+        # The Keyword Index reads the database through iter_keyword_assignments(), so use the test assignments instead
+        iterKeywordAssignments = DBInterface.iter_keyword_assignments
+        DBInterface.iter_keyword_assignments = keywordAssignments
+
+        if 40 in testsToRun:
+            # The Keyword Index is loaded the first time it is used
+            testName = 'KeywordIndex.Get() and GetAll() : Load'
+            self.SetStatusText(testName)
+            index = KeywordIndex.KeywordIndex()
+            self.CheckTest((index.Get('Clip', ('Demo', 'A')) == set([1, 2])) and
+                           (index.Get('Clip', ('Demo', 'B')) == set([2])) and
+                           (index.Get('Clip', ('Demo', 'C')) == set()) and
+                           (index.Get('Episode', ('Demo', 'A')) == set([1])) and
+                           (index.GetAll('Clip') == set([1, 2])) and
+                           (keywordAssignments.calls == [(objectType, None) for objectType in KeywordIndex.OBJECT_TYPES]), testName)
+
+        if 41 in testsToRun:
+            # Only invalidated objects are re-read, and keywords no object has any more are dropped
+            testName = 'KeywordIndex.Invalidate()'
+            self.SetStatusText(testName)
+            keywordAssignments.calls = []
+            # Clip 2 loses Demo : B and gains Demo : C.  Clip 1 changes too, but isn't invalidated.
+            keywordAssignments.assignments['Clip'] = [(1, 'Demo', 'B'), (2, 'Demo', 'A'), (2, 'Demo', 'C')]
+            index.Invalidate('Clip', 2)
+            self.CheckTest((index.Get('Clip', ('Demo', 'A')) == set([1, 2])) and
+                           (index.Get('Clip', ('Demo', 'B')) == set()) and
+                           (index.Get('Clip', ('Demo', 'C')) == set([2])) and
+                           (not index.objects['Clip'].has_key(('Demo', 'B'))) and
+                           (keywordAssignments.calls == [('Clip', set([2]))]), testName)
+
+        if 42 in testsToRun:
+            # Invalidating a Snapshot re-reads its coding too, and results are copies the caller can change
+            testName = 'KeywordIndex.Invalidate() : Snapshot Coding'
+            self.SetStatusText(testName)
+            keywordAssignments.calls = []
+            keywordAssignments.assignments['Snapshot'] = []
+            keywordAssignments.assignments['SnapshotCoding'] = [(1, 'Demo', 'D')]
+            index.Invalidate('Snapshot', 1)
+            index.Get('Snapshot', ('Demo', 'C')).add(5)
+            self.CheckTest((index.Get('Snapshot', ('Demo', 'C')) == set()) and
+                           (index.GetAll('Snapshot') == set()) and
+                           (index.Get('SnapshotCoding', ('Demo', 'C')) == set()) and
+                           (index.Get('SnapshotCoding', ('Demo', 'D')) == set([1])) and
+                           (keywordAssignments.calls == [('Snapshot', set([1])), ('SnapshotCoding', set([1]))]), testName)
+
+        if 43 in testsToRun:
+            # Clear() discards the index, which is reloaded the next time it is used
+            testName = 'KeywordIndex.Clear()'
+            self.SetStatusText(testName)
+            index.Clear()
+            # Objects invalidated while the index isn't loaded are read when it is
+            index.Invalidate('Clip', 1)
+            keywordAssignments.calls = []
+            self.CheckTest((index.Get('Clip', ('Demo', 'B')) == set([1])) and
+                           (keywordAssignments.calls == [(objectType, None) for objectType in KeywordIndex.OBJECT_TYPES]), testName)
+
+        # Put the database version of iter_keyword_assignments() back
+        DBInterface.iter_keyword_assignments = iterKeywordAssignments
+
+        # Segments for the Temporal Search tests are (Episode Number, Start, Stop, key)
+        if 50 in testsToRun:
+            # Overlaps() matches segments in the same Episode that overlap in time
+            testName = 'TemporalSearch.Overlaps()'
+            self.SetStatusText(testName)
+            self.CheckTest(TemporalSearch.Overlaps([(1, 1000, 5000, 'L1'), (1, 10000, 12000, 'L2')],
+                                                   [(1, 4000, 8000, 'R1'), (1, 20000, 21000, 'R2'), (2, 1000, 5000, 'R3')]) ==
+                           (set(['L1']), set(['R1'])), testName)
+
+        if 51 in testsToRun:
+            # Segments that only meet don't overlap
+            testName = 'TemporalSearch.Overlaps() : Boundaries'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.Overlaps([(1, 1000, 5000, 'L1')], [(1, 5000, 6000, 'R1'), (1, 0, 1000, 'R2')]) ==
+                            (set(), set())) and
+                           (TemporalSearch.Overlaps([(1, 1000, 5000, 'L1')], [(1, 4999, 6000, 'R3'), (1, 0, 1001, 'R4')]) ==
+                            (set(['L1']), set(['R3', 'R4']))), testName)
+
+        if 52 in testsToRun:
+            # Segments with no length last one millisecond
+            testName = 'TemporalSearch.Overlaps() : Zero-length segments'
+            self.SetStatusText(testName)
+            self.CheckTest(TemporalSearch.Overlaps([(1, 6000, 6000, 'S1'), (1, 9000, 9000, 'S2'), (1, 7000, 7000, 'S3'), (1, 12000, 12000, 'S4')],
+                                                   [(1, 5000, 7000, 'R1'), (1, 9000, 9000, 'R2'), (1, 3000, 6000, 'R3'), (1, 12000, 13000, 'R4')]) ==
+                           (set(['S1', 'S2', 'S4']), set(['R1', 'R2', 'R4'])), testName)
+
+        if 53 in testsToRun:
+            # Within() matches segments that overlap or are no more than gap milliseconds apart, including segments that meet
+            testName = 'TemporalSearch.Within()'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.Within([(1, 1000, 5000, 'L1')], [(1, 6000, 7000, 'R1'), (1, 6001, 7000, 'R2'), (1, 0, 0, 'R3')], 1000) ==
+                            (set(['L1']), set(['R1', 'R3']))) and
+                           (TemporalSearch.Within([(1, 1000, 5000, 'L1')], [(1, 5000, 6000, 'R4'), (2, 5000, 6000, 'R5')], 0) ==
+                            (set(['L1']), set(['R4']))), testName)
+
+        if 54 in testsToRun:
+            # FollowedBy() matches right segments that start at or after a left segment stops
+            testName = 'TemporalSearch.FollowedBy()'
+            self.SetStatusText(testName)
+            self.CheckTest(TemporalSearch.FollowedBy([(1, 1000, 5000, 'L1'), (1, 8000, 9000, 'L2')],
+                                                     [(1, 5000, 6000, 'R1'), (1, 2000, 3000, 'R2'), (2, 10000, 11000, 'R3')]) ==
+                           (set(['L1']), set(['R1'])), testName)
+
+        if 55 in testsToRun:
+            # FollowedBy() with a gap only matches right segments that start within gap milliseconds
+            testName = 'TemporalSearch.FollowedBy() : Gap'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.FollowedBy([(1, 1000, 5000, 'L1')], [(1, 6000, 7000, 'R1'), (1, 6001, 7000, 'R2')], 1000) ==
+                            (set(['L1']), set(['R1']))) and
+                           (TemporalSearch.FollowedBy([(1, 1000, 5000, 'L1')], [(1, 6001, 7000, 'R2')], 1000) ==
+                            (set(), set())), testName)
+
+        if 56 in testsToRun:
+            # A segment with no length stops one millisecond after it starts
+            testName = 'TemporalSearch.FollowedBy() : Zero-length segments'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.FollowedBy([(1, 6000, 6000, 'S1')], [(1, 6000, 7000, 'R1'), (1, 6001, 6001, 'S2')]) ==
+                            (set(['S1']), set(['S2']))) and
+                           (TemporalSearch.FollowedBy([(1, 6000, 6000, 'S1')], [(1, 6001, 6001, 'S2')], 0) ==
+                            (set(['S1']), set(['S2']))), testName)
+
+        if 57 in testsToRun:
+            # A segment doesn't overlap itself, but does overlap a different segment at the same position
+            testName = 'TemporalSearch.Overlaps() : Same segment'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.Overlaps([(1, 1000, 5000, 'S1'), (1, 8000, 9000, 'S2')], [(1, 1000, 5000, 'S1'), (1, 8000, 9000, 'S3')]) ==
+                            (set(['S2']), set(['S3']))) and
+                           (TemporalSearch.Overlaps([(1, 1000, 5000, 'S1'), (1, 2000, 3000, 'S2')], [(1, 1000, 5000, 'S1')]) ==
+                            (set(['S2']), set(['S1']))), testName)
+
+        if 58 in testsToRun:
+            # A segment isn't within the time window of itself
+            testName = 'TemporalSearch.Within() : Same segment'
+            self.SetStatusText(testName)
+            self.CheckTest((TemporalSearch.Within([(1, 1000, 5000, 'S1')], [(1, 1000, 5000, 'S1'), (1, 7000, 8000, 'S2')], 1000) ==
+                            (set(), set())) and
+                           (TemporalSearch.Within([(1, 1000, 5000, 'S1')], [(1, 1000, 5000, 'S1'), (1, 5500, 6000, 'S2')], 1000) ==
+                            (set(['S1']), set(['S2']))), testName)
+
+        if 60 in testsToRun:
+            # GetPlainText() gets the text of Transana's XML format
+            testName = 'TextIndex.GetPlainText() : XML'
+            self.SetStatusText(testName)
+            xmlText = '<?xml version="1.0" encoding="UTF-8"?>\n<transcript>\n<paragraph>\n<text>Hello </text>\n<text>"world "</text>\n</paragraph>\n' + \
+                      '<paragraph>\n<text>caf&#233; &amp; tea</text>\n</paragraph>\n</transcript>'
+            self.CheckTest(TextIndex.GetPlainText(xmlText) == u'Hello world \ncaf\xe9 & tea\n', testName)
+
+        if 61 in testsToRun:
+            # GetPlainText() gets the text of RTF, skipping the font table and other document information
+            testName = 'TextIndex.GetPlainText() : RTF'
+            self.SetStatusText(testName)
+            rtfText = "{\\rtf1\\ansi{\\fonttbl{\\f0 Arial;}}{\\*\\generator Test;}\\f0 Hello\\par caf\\'e9 \\{\\u20320?x\\tab end}"
+            self.CheckTest(TextIndex.GetPlainText(rtfText) == u'Hello\ncaf\xe9 {\u4f60x\tend', testName)
+
+        if 62 in testsToRun:
+            # GetPlainText() removes time codes, and leaves plain text alone
+            testName = 'TextIndex.GetPlainText() : Time codes and plain text'
+            self.SetStatusText(testName)
+            self.CheckTest((TextIndex.GetPlainText(u'A \xa4<1000>B') == u'A B') and
+                           (TextIndex.GetPlainText('Caf\xc3\xa9') == u'Caf\xe9') and
+                           (TextIndex.GetPlainText(None) == u''), testName)
+
+        if 63 in testsToRun:
+            # GetWords() returns the distinct lower case words, shortened to MAX_WORD_LENGTH
+            testName = 'TextIndex.GetWords()'
+            self.SetStatusText(testName)
+            self.CheckTest((TextIndex.GetWords(u'Caf\xe9 caf\xe9, the THE x_y 42') == set([u'caf\xe9', u'the', u'x_y', u'42'])) and
+                           (TextIndex.GetWords(u'a' * 60) == set([u'a' * TextIndex.MAX_WORD_LENGTH])) and
+                           (TextIndex.GetWords(u' ... ') == set()), testName)
+
+        if 64 in testsToRun:
+            # GetIndexWords() returns the words and all their endings, so search text can start in the middle of a word
+            testName = 'TextIndex.GetIndexWords()'
+            self.SetStatusText(testName)
+            self.CheckTest((TextIndex.GetIndexWords(u'Beta be') == set([u'beta', u'eta', u'ta', u'a', u'be', u'e'])) and
+                           (TextIndex.GetIndexWords(u'x' * 55 + u'y') == set([(u'x' * 55 + u'y')[start:start + TextIndex.MAX_WORD_LENGTH] for start in range(56)])) and
+                           (TextIndex.GetIndexWords(u' ... ') == set()), testName)
+
+        if 65 in testsToRun:
+            # Index words are encoded as UTF-8, whatever the database encoding
+            testName = 'DBInterface._TextIndexRows() : Encoding'
+            self.SetStatusText(testName)
+            encoding = TransanaGlobal.encoding
+            TransanaGlobal.encoding = 'latin1'
+            try:
+                rows = DBInterface._TextIndexRows('Note', 1, u'\u4f60 caf\xe9')
+            finally:
+                TransanaGlobal.encoding = encoding
+            self.CheckTest(sorted(rows) == [('Note', 1, ''), ('Note', 1, 'af\xc3\xa9'), ('Note', 1, 'caf\xc3\xa9'),
+                                            ('Note', 1, 'f\xc3\xa9'), ('Note', 1, '\xc3\xa9'), ('Note', 1, '\xe4\xbd\xa0')], testName)
+
+        if 70 in testsToRun:
+            # Results are returned while none of the tables they came from have changed
+            testName = 'SearchCache.Get() : Hit and miss'
+            self.SetStatusText(testName)
+            cache = SearchCache.SearchCache(size=2)
+            changeCounts = cache.GetChangeCounts(['Clips2', 'ClipKeywords2'])
+            cache.Add('Search 1', changeCounts, ['Clip 1'])
+            self.CheckTest((cache.Get('Search 1') == ['Clip 1']) and
+                           (cache.Get('Search 2') == None) and
+                           (cache.hits == 1) and (cache.misses == 1), testName)
+
+        if 71 in testsToRun:
+            # A change to one of the search's tables makes its results out of date, but other tables don't matter
+            testName = 'SearchCache.Changed()'
+            self.SetStatusText(testName)
+            cache.Changed('Snapshots2')
+            result1 = cache.Get('Search 1')
+            cache.Changed('ClipKeywords2')
+            result2 = cache.Get('Search 1')
+            self.CheckTest((result1 == ['Clip 1']) and (result2 == None), testName)
+
+        if 72 in testsToRun:
+            # Results of a search evaluated before a change are out of date as soon as they are added
+            testName = 'SearchCache.Add() : Changed while evaluating'
+            self.SetStatusText(testName)
+            changeCounts = cache.GetChangeCounts(['Clips2'])
+            cache.Changed('Clips2')
+            cache.Add('Search 1', changeCounts, ['Clip 1'])
+            self.CheckTest(cache.Get('Search 1') == None, testName)
+
+        if 73 in testsToRun:
+            # Clear() discards all results, including those of searches that were being evaluated
+            testName = 'SearchCache.Clear()'
+            self.SetStatusText(testName)
+            cache.Add('Search 1', cache.GetChangeCounts(['Clips2']), ['Clip 1'])
+            changeCounts = cache.GetChangeCounts(['Clips2'])
+            cache.Clear()
+            cache.Add('Search 2', changeCounts, ['Clip 2'])
+            self.CheckTest((cache.Get('Search 1') == None) and (cache.Get('Search 2') == None), testName)
+
+        if 74 in testsToRun:
+            # The least recently used results are dropped when the cache is full
+            testName = 'SearchCache.Add() : Least recently used'
+            self.SetStatusText(testName)
+            cache.Add('Search 1', cache.GetChangeCounts(['Clips2']), ['Clip 1'])
+            cache.Add('Search 2', cache.GetChangeCounts(['Clips2']), ['Clip 2'])
+            cache.Get('Search 1')
+            cache.Add('Search 3', cache.GetChangeCounts(['Clips2']), ['Clip 3'])
+            self.CheckTest((cache.Get('Search 1') == ['Clip 1']) and
+                           (cache.Get('Search 2') == None) and
+                           (cache.Get('Search 3') == ['Clip 3']), testName)
+
+        self.txtCtrl.AppendText('All tests completed.')
+        self.txtCtrl.AppendText('\nFinal Summary:  Total Tests Run:  %d  Tests passes:  %d  Tests failed:  %d.\n' % (self.testsRun, self.testsSuccessful, self.testsFailed))
+
+    def CheckTest(self, result, testName):
+        self.testsRun += 1
+        self.txtCtrl.AppendText('Test "%s" ' % testName)
+        if result:
+            self.txtCtrl.AppendText('Passed.')
+            self.testsSuccessful += 1
+        else:
+            self.txtCtrl.AppendText('FAILED.')
+            self.testsFailed += 1
+        self.txtCtrl.AppendText('\nTotal Tests Run:  %d  Tests passes:  %d  Tests failed:  %d.\n\n' % (self.testsRun, self.testsSuccessful, self.testsFailed))
+
+
+class TestCursor(object):
+    """ A stand-in for a database cursor that returns fixed rows """
+    def __init__(self, description, rows):
+        self.description = description
+        self.rows = rows
+
+    def fetchone(self):
+        if len(self.rows) > 0:
+            return self.rows.pop(0)
+        return None
+
+    def fetchall(self):
+        rows = self.rows
+        self.rows = []
+        return rows
+
+
+class TestKeywordAssignments(object):
+    """ A stand-in for DBInterface.iter_keyword_assignments() that returns fixed keyword assignments and records its calls """
+    def __init__(self, assignments):
+        self.assignments = assignments
+        self.calls = []
+
+    def __call__(self, objectType, nums=None):
+        if nums != None:
+            nums = set(nums)
+        self.calls.append((objectType, nums))
+        return [(num, kwg, kw) for (num, kwg, kw) in self.assignments[objectType] if (nums == None) or (num in nums)]
+
+
+class MyApp(wx.App):
+   def OnInit(self):
+      frame = FormCheck(None, -1, "Unit Test: Indexes and Caches")
+      self.SetTopWindow(frame)
+      return True
+
+
+app = MyApp(0)
+app.MainLoop()